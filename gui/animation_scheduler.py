@@ -0,0 +1,160 @@
+"""
+Uygulama genelinde tek bir animasyon zamanlayıcısı.
+
+Her canvas'ın kendi sürekli çalışan QTimer'ları yerine bileşenler aktif
+animasyonlarını buraya kaydeder. Zamanlayıcı yalnızca en az bir animasyon
+sürerken ve sahibi görünürken tik atar; her tikte geçen süre (dt) iletilir,
+böylece animasyonlar kare hızından bağımsız (zamana göre) ilerler.
+
+Tik fonksiyonu imzası: tick(now: float, dt: float) -> bool | float
+True dönerse animasyon her karede sürer, False dönerse kaydı silinir.
+Pozitif bir sayı (saniye) dönerse animasyon o süre boyunca değişmeyecek
+demektir: kare zamanlayıcısı durur ve tek seferlik bir zamanlayıcı
+animasyonu vakti gelince yeniden uyandırır.
+
+Görünmeyen sahiplerin animasyonları sürülmez; sahip tekrar boyandığında
+(paintEvent) veya gösterildiğinde wake() ile devam eder.
+"""
+import logging
+import time
+from typing import Callable, Dict, Optional, Set, Tuple, Union
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+from PyQt6.QtWidgets import QWidget
+
+from .frame_coalescer import display_frame_interval_ms
+
+TickFunc = Callable[[float, float], Union[bool, float]]
+
+
+class AnimationScheduler(QObject):
+    """Kayıtlı animasyonları tek bir zamanlayıcıyla süren sınıf."""
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._animations: Dict[Tuple[int, str], Tuple[QWidget, TickFunc]] = {}
+        # Bekleyen animasyonların bir sonraki tik zamanı (time.monotonic)
+        self._due: Dict[Tuple[int, str], float] = {}
+        # Sahibi görünmediği için bekletilen animasyonlar (wake() ile devam eder)
+        self._paused: Set[Tuple[int, str]] = set()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(display_frame_interval_ms())
+        self._timer.timeout.connect(self._on_tick)
+        # En yakın bekleme bitince uyandıran tek seferlik zamanlayıcı
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(lambda: self.wake())
+        self._last_tick: Optional[float] = None
+
+    def start(self, owner: QWidget, key: str, tick: TickFunc):
+        """Animasyonu kaydeder (aynı sahip/anahtar zaten varsa günceller) ve zamanlayıcıyı uyandırır."""
+        entry_key = (id(owner), key)
+        if entry_key not in self._animations:
+            owner.destroyed.connect(lambda *_args, k=entry_key: self._remove(k))
+        self._animations[entry_key] = (owner, tick)
+        self._due.pop(entry_key, None)
+        self.wake(owner)
+
+    def stop(self, owner: QWidget, key: Optional[str] = None):
+        """Sahibin verilen (veya key None ise tüm) animasyonlarını durdurur."""
+        for entry_key in list(self._animations):
+            if entry_key[0] == id(owner) and (key is None or entry_key[1] == key):
+                self._remove(entry_key)
+        if not self._animations:
+            self._sleep()
+
+    def is_running(self, owner: QWidget, key: str) -> bool:
+        return (id(owner), key) in self._animations
+
+    def wake(self, owner: Optional[QWidget] = None):
+        """Vakti gelmiş animasyon varsa kare zamanlayıcısını başlatır.
+
+        owner verilirse (sahip boyandığında/gösterildiğinde) o sahibin
+        görünmediği için bekletilen animasyonları da devam ettirilir. Tüm
+        animasyonlar bekliyorsa yalnızca en yakın bekleme için tek seferlik
+        zamanlayıcı kurulur; bu yüzden her paintEvent'te çağrılması ucuzdur.
+        """
+        if owner is not None and self._paused:
+            self._paused = {entry_key for entry_key in self._paused if entry_key[0] != id(owner)}
+        if self._timer.isActive():
+            return
+        now = time.monotonic()
+        if any(self._due.get(entry_key, now) <= now for entry_key in self._animations if entry_key not in self._paused):
+            self._idle_timer.stop()
+            self._last_tick = now
+            self._timer.start()
+        else:
+            self._arm_idle_timer(now)
+
+    def _remove(self, entry_key: Tuple[int, str]):
+        self._animations.pop(entry_key, None)
+        self._due.pop(entry_key, None)
+        self._paused.discard(entry_key)
+
+    def _arm_idle_timer(self, now: float):
+        """Bekletilmeyen animasyonların en yakın bekleme sonuna tek seferlik zamanlayıcı kurar."""
+        pending = [due for entry_key, due in self._due.items() if entry_key not in self._paused]
+        if not pending:
+            return
+        delay_ms = max(1, int((min(pending) - now) * 1000) + 1)
+        if not self._idle_timer.isActive() or self._idle_timer.remainingTime() > delay_ms:
+            self._idle_timer.start(delay_ms)
+
+    def _sleep(self):
+        self._timer.stop()
+        self._last_tick = None
+        if not self._animations:
+            self._idle_timer.stop()
+
+    @staticmethod
+    def _is_visible(owner: QWidget) -> bool:
+        try:
+            return owner.isVisible() and not owner.visibleRegion().isEmpty()
+        except RuntimeError:
+            # C++ nesnesi silinmiş
+            return False
+
+    def _on_tick(self):
+        now = time.monotonic()
+        dt = now - self._last_tick if self._last_tick is not None else 0.0
+        self._last_tick = now
+        any_running = False
+        for entry_key, (owner, tick) in list(self._animations.items()):
+            if self._due.get(entry_key, now) > now:
+                # Bekleme süresi dolmadı; tik atılmaz
+                continue
+            if not self._is_visible(owner):
+                # Görünmeyen canvas'lar sürülmez; kayıt tekrar boyanana kadar bekletilir
+                self._paused.add(entry_key)
+                continue
+            self._paused.discard(entry_key)
+            try:
+                keep = tick(time.time(), dt)
+            except Exception as e:
+                logging.error(f"AnimationScheduler: '{entry_key[1]}' animasyonu hata verdi: {e}", exc_info=True)
+                keep = False
+            if keep is True:
+                self._due.pop(entry_key, None)
+                any_running = True
+            elif keep:
+                # Animasyon verilen süre boyunca değişmeyecek
+                self._due[entry_key] = now + float(keep)
+            else:
+                self._remove(entry_key)
+        if not any_running:
+            # Boşta: kare tikini bırak; bekleyenler tek seferlik zamanlayıcıyla,
+            # görünmeyenler tekrar boyanınca wake() ile uyanır
+            self._sleep()
+            self._arm_idle_timer(now)
+
+
+_scheduler: Optional[AnimationScheduler] = None
+
+
+def get_animation_scheduler() -> AnimationScheduler:
+    """Uygulama genelindeki tekil zamanlayıcıyı döndürür (ilk çağrıda oluşturur)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AnimationScheduler()
+    return _scheduler
@@ -13,14 +13,17 @@ from PyQt6.QtCore import Qt, QSize, pyqtSlot, QTimer, QPoint, QRectF # QTimer ek
 import qtawesome as qta # qtawesome import edildi
 from typing import List
 import time
-import shutil
 import uuid
 import sys
-import hashlib
 
 from .page import Page
 from .page_manager import PageManager
 from utils.undo_redo_manager import UndoRedoManager # YENİ: _log_and_call içinde isinstance için gerekli
+from utils.background_saver import BackgroundSaver
+from utils.operation_journal import OperationJournal, DEFAULT_FLUSH_INTERVAL_MS
+from utils.asset_store import get_asset_store
+from utils.pdf_page_renderer import default_disk_cache_dir, get_pdf_page_renderer, shutdown_pdf_page_renderer
+from utils.pdf_render_cache import DEFAULT_CACHE_MB as DEFAULT_PDF_PAGE_CACHE_MB
 from .enums import TemplateType, ToolType, Orientation # YENİDEN EKLENDİ
 from .grid_settings_dialog import GridSettingsDialog # YENİ EKLENDİ
 
@@ -53,6 +56,7 @@ DEFAULT_TEMPLATE_SETTINGS = {
     "line_color": [0.0, 0.3333333432674408, 1.0, 0.6980392336845398],
     "grid_color": [0.8980392217636108, 0.8980392217636108, 0.8980392217636108, 0.800000011920929],
     "pdf_export_image_dpi": 150,
+    "pdf_export_stroke_tolerance_pt": 0.25,
     "default_page_orientation": "landscape"
 }
 
@@ -123,6 +127,28 @@ class MainWindow(QMainWindow):
         # --- --- --- --- --- --- --- --- --- --- --- ---
 
         self.current_notebook_path: str | None = None # Geçerli dosya yolunu tut
+
+        # --- YENİ: Arka plan kaydı (serileştirme/yazma GUI iş parçacığı dışında) --- #
+        self.background_saver = BackgroundSaver(lambda: file_handler._collect_pages(self.page_manager), parent=self)
+        self.background_saver.save_progress.connect(lambda path, done, total: file_handler.on_background_save_progress(self, path, done, total))
+        self.background_saver.save_finished.connect(lambda path: file_handler.on_background_save_finished(self, path))
+        self.background_saver.save_failed.connect(lambda path, message: file_handler.on_background_save_failed(self, path, message))
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
+        # --- YENİ: Çökme kurtarma için işlem günlüğü --- #
+        self.journal = OperationJournal(
+            self.page_manager, os.path.dirname(CONFIG_FILE),
+            flush_interval_ms=self.settings.get('journal_flush_interval_ms', DEFAULT_FLUSH_INTERVAL_MS), parent=self)
+        self.page_manager.journal = self.journal
+        self.page_manager.page_count_changed.connect(lambda *_: self.journal.record_layout())
+        # Önceki oturum düzgün kapanmadıysa kurtarmayı öner, sonra günlüğü başlat
+        QTimer.singleShot(0, lambda: file_handler.recover_after_unclean_exit(self, self.page_manager))
+        # --- --- --- --- --- --- --- --- --- --- --- --- #
+
+        # --- YENİ: Çizilmiş PDF sayfaları için disk önbelleği ('pdf_page_cache_mb', 0 = kapalı) --- #
+        get_pdf_page_renderer().set_disk_cache(
+            default_disk_cache_dir(), self.settings.get('pdf_page_cache_mb', DEFAULT_PDF_PAGE_CACHE_MB) * 1024 * 1024)
+        # --- --- --- --- --- --- --- --- --- --- --- --- #
         self._update_window_title() # Başlangıç başlığını ayarla (Artık page_manager var)
         
         # --- YENİ: Renk/Kalınlık Başlangıç Değerleri --- #
@@ -219,10 +245,8 @@ class MainWindow(QMainWindow):
 
         logging.info("MainWindow başlatıldı.")
 
-        # Timer'ı başlat
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(16) # Yaklaşık 60 FPS için
+        # Sürekli yeniden çizim timer'ı kaldırıldı: canvas'lar değişiklikte update()
+        # çağırır, animasyonlar gui/animation_scheduler.py ile yalnızca gerektiğinde sürülür.
 
         # --- YENİ: Son kullanılan kaydet/yükle dizinini saklamak için --- #
         self.last_save_load_directory = ""
@@ -458,6 +482,11 @@ class MainWindow(QMainWindow):
         # --- DÜZELTME: Lambda yerine doğrudan metod bağlantısı --- #
         self.export_pdf_action.triggered.connect(self._trigger_export_pdf)
         # --- --- --- --- --- --- --- --- --- --- --- --- --- --- -- #
+        # --- YENİ: Mürekkebi kaynak PDF'e kaydetme --- #
+        self.save_ink_to_pdf_action = QAction(qta.icon('fa5s.file-signature', color='green'), "Mürekkebi PDF'e Kaydet", self)
+        self.save_ink_to_pdf_action.setStatusTip("PDF'ten içe aktarılan sayfaların mürekkebini kaynak PDF'e not olarak kaydet")
+        self.save_ink_to_pdf_action.triggered.connect(lambda checked=False, mw=self, pm=self.page_manager: pdf_handler.handle_save_ink_to_pdf(parent_window=mw, page_manager=pm))
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- -- #
         self.exit_action = QAction(QIcon(":/icons/exit.png"), "Çıkış", self)
         self.exit_action.triggered.connect(self.close) # closeEvent tetikler
 
@@ -714,6 +743,7 @@ class MainWindow(QMainWindow):
         file_menu.addAction(self.load_action)
         file_menu.addAction(self.import_pdf_action) # PDF İçe Aktar Menü Öğesi
         file_menu.addAction(self.export_pdf_action)
+        file_menu.addAction(self.save_ink_to_pdf_action)
         file_menu.addAction(self.exit_action)
         # PDF Export vs. buraya eklenecek
         file_menu.addSeparator() # Ayraç ekleyelim
@@ -813,8 +843,8 @@ class MainWindow(QMainWindow):
         if hasattr(self, '_last_connected_page') and self._last_connected_page:
             try:
                 self._last_connected_page.modified_status_changed.disconnect(self._update_window_title)
-            except TypeError:
-                 pass # Bağlantı yoksa hata vermez
+            except (TypeError, RuntimeError):
+                 pass # Bağlantı yoksa veya sayfa silinmişse (ör. clear_all_pages sonrası) hata vermez
         self._last_connected_page = None # Referansı temizle
 
         # Undo manager referansını temizle
@@ -913,6 +943,15 @@ class MainWindow(QMainWindow):
                 self.apply_pointer_settings_to_canvas(current_pointer_settings)
             # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
 
+            # --- YENİ: Kalem girdisi ön işleme ayarları ve vuruş istatistikleri --- #
+            canvas.apply_input_filter_settings(self.settings.get('pen_input_filter'))
+            try:
+                canvas.stroke_input_finished.disconnect()
+            except Exception:
+                pass
+            canvas.stroke_input_finished.connect(self._show_stroke_input_stats)
+            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
             self.clear_action.setEnabled(True)
             # --- YENİ: Seçim değiştiğinde spinbox'ı güncelle --- #
             try:
@@ -991,6 +1030,7 @@ class MainWindow(QMainWindow):
         # Dosya İşlemleri (Kaydet/PDF Aktar sadece sayfa varsa aktif)
         self.save_action.setEnabled(has_pages)
         self.export_pdf_action.setEnabled(has_pages)
+        self.save_ink_to_pdf_action.setEnabled(has_pages)
         # Aç her zaman aktif olabilir
         self.load_action.setEnabled(True) 
         
@@ -1200,6 +1240,8 @@ class MainWindow(QMainWindow):
         Returns:
             bool: Eyleme devam edilip edilmeyeceği (True) veya iptal edildiği (False).
         """
+        # Sürmekte olan arka plan kaydı varsa önce bitsin (sayfalar kapatılmadan/dosya değişmeden)
+        self.background_saver.wait()
         if not self.page_manager.has_unsaved_changes():
             return True # Değişiklik yoksa devam et
 
@@ -1222,7 +1264,7 @@ class MainWindow(QMainWindow):
             # Eğer kaydetme başarılı olursa orijinal eyleme devam etmeli.
             
             # Önce save_as=False ile deneyelim (mevcut dosya varsa)
-            success = file_handler.handle_save_notebook(self, self.page_manager, save_as=False)
+            success = file_handler.handle_save_notebook(self, self.page_manager, save_as=False, blocking=True)
             if success:
                  # Başarılı kayıttan sonra devam et
                  return True 
@@ -1249,8 +1291,10 @@ class MainWindow(QMainWindow):
         # --- --- --- --- --- #
 
         if self._prompt_save_before_action(self.close): # Devam edilecek eylem yok, sadece kontrol
-            # --- YENİ: Kullanılmayan resim dosyalarını sil --- #
-            self._delete_unused_images_on_exit()
+            # --- YENİ: Temiz kapanış, işlem günlüğü artık gerekli değil --- #
+            self.journal.discard()
+            self.page_manager.cancel_pdf_import()
+            shutdown_pdf_page_renderer()
             # --- YENİ: Kapatmadan önce ayarları kaydet --- #
             self._save_settings(self.settings)
             # --- --- --- --- --- --- --- --- --- --- --- #
@@ -1259,6 +1303,13 @@ class MainWindow(QMainWindow):
             event.ignore() # Kapatma
 
     # --- YENİ: İşaretçi Ayarlarını Canvas'a Uygula --- #
+    def _show_stroke_input_stats(self, stats: dict):
+        """Son kalem vuruşunda alınan ve tutulan örnek sayılarını durum çubuğunda gösterir."""
+        if stats.get('received'):
+            self.statusBar().showMessage(
+                f"Kalem: {stats['received']} örnek alındı, {stats['kept']} nokta tutuldu "
+                f"({stats['duplicates']} tekrar, {stats['reduction']:.1f}x azaltma)", 3000)
+
     def apply_pointer_settings_to_canvas(self, settings: dict):
         """Verilen işaretçi ayarlarını mevcut aktif canvas'a uygular."""
         current_page = self.page_manager.get_current_page()
@@ -1751,19 +1802,6 @@ class MainWindow(QMainWindow):
                 # Canvas için add_image_from_path metodu yoksa ekle
                 import types
                 
-                # --- Dosyanın MD5 özetini hesaplayan fonksiyon --- #
-                def get_file_md5(file_path):
-                    """Dosyanın MD5 özetini hesaplar"""
-                    hash_md5 = hashlib.md5()
-                    try:
-                        with open(file_path, 'rb') as f:
-                            for chunk in iter(lambda: f.read(4096), b""):
-                                hash_md5.update(chunk)
-                        return hash_md5.hexdigest()
-                    except Exception as e:
-                        logging.error(f"MD5 hesaplanırken hata: {e}")
-                        return None
-                
                 if not hasattr(canvas, 'add_image_from_path'):
                     def add_image_from_path(self, original_image_path):
                         """Verilen yoldaki resmi aktif sayfaya ekler."""
@@ -1772,36 +1810,16 @@ class MainWindow(QMainWindow):
                                 logging.error(f"Resim dosyası bulunamadı: {original_image_path}")
                                 return
 
-                            # images klasörünü oluştur (yoksa)
-                            images_dir = os.path.join(os.getcwd(), "images")
-                            os.makedirs(images_dir, exist_ok=True)
-                            
-                            # Resmin MD5 özetini hesapla
-                            img_hash = get_file_md5(original_image_path)
+                            # --- DEĞİŞİKLİK: images klasörüne kopyalamak yerine içerik özetiyle depoya ekle --- #
+                            # Baytlar kayıtta not defteri dosyasına gömülür; aynı resim bir kez saklanır
+                            store = get_asset_store()
+                            img_hash = store.add_file(original_image_path)
                             if img_hash is None:
-                                logging.error("Resmin hash değeri hesaplanamadı.")
+                                logging.error("Resim depoya eklenemedi.")
                                 return
-                                
-                            # Resmin uzantısını al
-                            _, ext = os.path.splitext(original_image_path)
-                            
-                            # Hedef dosya adı oluştur (MD5 + orijinal uzantı)
-                            target_filename = f"{img_hash}{ext.lower()}"
-                            target_path = os.path.join(images_dir, target_filename)
-                            
-                            # Resim zaten images klasöründe var mı kontrol et
-                            if not os.path.exists(target_path):
-                                # Resmi images klasörüne kopyala
-                                shutil.copy2(original_image_path, target_path)
-                                logging.info(f"Resim images klasörüne kopyalandı: {target_path}")
-                            else:
-                                logging.info(f"Resim zaten images klasöründe mevcut: {target_path}")
-
-                            # Resmin QPixmap'ini yükle
-                            from PyQt6.QtGui import QPixmap
-                            pixmap = QPixmap(target_path)
-                            if pixmap.isNull():
-                                logging.error(f"Resim dosyası yüklenemedi: {target_path}")
+                            pixmap = store.pixmap(img_hash)  # Aynı resmi kullanan sayfalarla paylaşılır
+                            if pixmap is None or pixmap.isNull():
+                                logging.error(f"Resim dosyası yüklenemedi: {original_image_path}")
                                 return
 
                             # Benzersiz bir UUID oluştur
@@ -1829,12 +1847,10 @@ class MainWindow(QMainWindow):
                             image_data = {
                                 'rect': rect,
                                 'angle': 0.0,
-                                'path': target_path,  # Kopyalanan dosyanın yolu
-                                'pixmap': pixmap,    # Geçici QPixmap nesnesi (Performans için)
+                                'path': original_image_path,  # Orijinal yol (bilgi amaçlı)
+                                'asset': img_hash,   # İçerik özeti (utils/asset_store.py)
+                                'pixmap': pixmap,    # Paylaşılan QPixmap nesnesi
                                 'uuid': img_uuid,    # Benzersiz tanımlayıcı
-                                'hash': img_hash,    # İçerik özeti
-                                'original_path': original_image_path,  # Orijinal yol (bilgi amaçlı)
-                                'filepath': target_path  # YENİ: resim_islem_handler için dosya yolu
                             }
                             
                             # --- DEĞİŞİKLİK: Doğrudan ekleme yerine komut ile ekle --- #
@@ -1844,7 +1860,7 @@ class MainWindow(QMainWindow):
                             # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
 
                             # YENİ: resim_islem_handler kullan
-                            resim_islem_handler.handle_select_image(target_path)
+                            resim_islem_handler.handle_select_image(original_image_path)
 
                             # Sayfayı değişti olarak işaretle ve güncelle (komut zaten yapıyor ama güvenli olsun)
                             page.mark_as_modified()
@@ -1888,62 +1904,13 @@ class MainWindow(QMainWindow):
             if selected[0] == 'images':
                 img_index = selected[1]
                 if hasattr(canvas._parent_page, 'images') and 0 <= img_index < len(canvas._parent_page.images):
-                    # YENİ: Resim dosya yolunu al ve handler'a bildir
-                    image_data = canvas._parent_page.images[img_index]
-                    image_path = image_data.get('filepath') or image_data.get('path')
-                    
-                    # Resim bilgisini handler'a bildir (dosyayı SİLMEZ)
-                    if image_path:
-                        resim_islem_handler.handle_delete_image(image_path)
-                    
-                    # Undo/redo ile silme işlemi yap (sadece veritabanı referansını siler)
+                    # Undo/redo ile silme işlemi yap (yalnızca sayfadaki başvuruyu siler; baytlar
+                    # resim deposunda kalır, hiçbir sayfa kullanmıyorsa sonraki kayıtta dosyaya yazılmaz)
                     from utils.commands import DeleteItemsCommand
                     command = DeleteItemsCommand(canvas, [selected])
                     canvas.undo_manager.execute(command)
         # Artık burada dosya silme yok
 
-    def _delete_unused_images_on_exit(self):
-        """
-        Uygulama kapatılırken, images klasöründeki kullanılmayan dosyaları siler.
-        Eğer not defteri kaydedilmemişse, içindeki resimler de silinir.
-        """
-        import os
-        images_dir = os.path.join(os.getcwd(), "images")
-        if not os.path.exists(images_dir):
-            return
-
-        # Not defteri kaydedilmemişse ve değişiklikler varsa, resimlerin silinmesi gerekir
-        is_notebook_saved = self.current_notebook_path is not None
-        notebook_has_changes = self.page_manager.has_unsaved_changes()
-        delete_all_current_images = not is_notebook_saved or (is_notebook_saved and notebook_has_changes)
-        
-        if delete_all_current_images:
-            logging.info(f"Not defteri kaydedilmemiş veya değişiklikler var. Resimler silinecek.")
-
-        # Mevcut sayfalardan tüm dosya yollarını topla
-        all_image_paths = set()
-        if not delete_all_current_images:  # Eğer not kaydedilmişse, kullanılan resimleri koru
-            for i in range(self.page_manager.count()):
-                scroll_area = self.page_manager.widget(i)
-                if hasattr(scroll_area, 'widget') and scroll_area.widget():
-                    page = scroll_area.widget()
-                    if hasattr(page, 'images'):
-                        for img in page.images:
-                            path = img.get('path')
-                            if path and os.path.exists(path):
-                                all_image_paths.add(os.path.abspath(path))
-        
-        # images klasöründeki her dosyayı kontrol et
-        for fname in os.listdir(images_dir):
-            if not fname.startswith('.'):  # Gizli dosyaları atla
-                fpath = os.path.abspath(os.path.join(images_dir, fname))
-                if os.path.isfile(fpath) and (delete_all_current_images or fpath not in all_image_paths):
-                    try:
-                        os.remove(fpath)
-                        logging.info(f"[EXIT] Kullanılmayan resim dosyası silindi: {fpath}")
-                    except Exception as e:
-                        logging.error(f"[EXIT] Resim dosyası silinirken hata: {e}")
-
     def _handle_zoom_in_pdf_only(self):
         current_page = self.page_manager.get_current_page()
         if hasattr(current_page, 'is_pdf_page') and current_page.is_pdf_page:
@@ -13,6 +13,8 @@ from PyQt6.QtWidgets import QApplication, QGraphicsPixmapItem
 from utils import selection_helpers
 from gui.enums import ToolType
 from utils.commands import MoveItemsCommand, ResizeItemsCommand, RotateItemsCommand # Moved import
+from utils.item_ids import tag_item
+from .frame_coalescer import TabletEventSnapshot
 from handlers import resim_islem_handler  # YENİ: Resim işlem handler'ını ekle
 from .tool_handlers import pen_tool_handler # YENİ: Pen tool handler importu
 from .tool_handlers import shape_tool_handler # YENİ: Shape tool handler importu
@@ -463,6 +465,71 @@ def handle_tablet_press(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEve
         canvas.update()  # Çizimi güncelle
         event.accept()
 
+def _apply_image_resize_move(canvas: 'DrawingCanvas', pos: QPointF):
+    """Resim boyutlandırma hareketini (kare başına bir kez) uygular."""
+    if not (canvas.resizing_selection and canvas._parent_page and canvas.selected_item_indices):
+        return
+    item_type, index = canvas.selected_item_indices[0]
+    if item_type != 'images' or index >= len(canvas._parent_page.images) or canvas.resize_original_bbox.isNull():
+        return
+    new_bbox = selection_helpers.calculate_rotated_bbox_from_handle(
+        canvas.resize_original_bbox, 
+        canvas.original_angle or 0.0,
+        pos, 
+        canvas.grabbed_handle_type, 
+        True,  # aspect_ratio_locked
+        10.0   # min_size
+    )
+    if new_bbox.isNull():
+        return
+    canvas._parent_page.images[index]['rect'] = new_bbox
+    if 'filepath' in canvas._parent_page.images[index]:
+        img_path = canvas._parent_page.images[index]['filepath']
+        resim_islem_handler.handle_resize_image(img_path, int(new_bbox.width()), int(new_bbox.height()))
+    canvas.invalidate_cache(reason="Resim boyutlandırma hareketi")
+
+def _apply_image_rotate_move(canvas: 'DrawingCanvas', pos: QPointF):
+    """Resim döndürme hareketini (kare başına bir kez) uygular."""
+    if not (canvas.rotating_selection and canvas._parent_page and canvas.selected_item_indices):
+        return
+    item_type, index = canvas.selected_item_indices[0]
+    if item_type != 'images' or index >= len(canvas._parent_page.images):
+        return
+    img_data = canvas._parent_page.images[index]
+    rect = img_data.get('rect')
+    if not rect or rect.isNull():
+        return
+    center = rect.center()
+    original_angle = canvas.original_angle or 0.0
+    # Başlangıçtan itibaren kaç derece döndüğünü hesapla
+    start_angle = math.degrees(math.atan2(canvas.rotation_start_point.y() - center.y(), 
+                                          canvas.rotation_start_point.x() - center.x()))
+    current_angle = math.degrees(math.atan2(pos.y() - center.y(), pos.x() - center.x()))
+    new_angle = original_angle + (current_angle - start_angle)
+    img_data['angle'] = new_angle
+    if 'filepath' in img_data:
+        resim_islem_handler.handle_rotate_image(img_data['filepath'], new_angle)
+    canvas.invalidate_cache(reason="Resim döndürme hareketi")
+
+def _apply_image_move(canvas: 'DrawingCanvas', pos: QPointF):
+    """Resim taşıma hareketini uygular; son uygulanan konumdan (last_move_pos) farkı kullanır."""
+    if not (canvas.moving_selection and canvas._parent_page and canvas.selected_item_indices):
+        return
+    dx = pos.x() - canvas.last_move_pos.x()
+    dy = pos.y() - canvas.last_move_pos.y()
+    moved = False
+    for item_type, index in canvas.selected_item_indices:
+        if item_type == 'images' and index < len(canvas._parent_page.images):
+            rect = canvas._parent_page.images[index]['rect']
+            rect.translate(dx, dy)
+            if 'filepath' in canvas._parent_page.images[index]:
+                img_path = canvas._parent_page.images[index]['filepath']
+                resim_islem_handler.handle_move_image(img_path, int(rect.x()), int(rect.y()))
+            moved = True
+    canvas.last_move_pos = pos
+    if moved:
+        canvas.invalidate_cache(reason="Resim taşıma hareketi")
+
 def handle_tablet_move(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEvent):
     #print(f"[DEBUG] TOOL (MOVE): {canvas.current_tool}")
     #logging.info(f"TOOL (MOVE): {canvas.current_tool}")
@@ -474,104 +541,23 @@ def handle_tablet_move(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEven
     action_performed = False
 
     # --- RESİM SEÇME ARACI İÇİN HAREKET --- #
+    # Boyutlandırma/döndürme/taşıma mutlak konuma (veya last_move_pos'a) göre
+    # hesaplandığından yalnızca son örnek önemlidir: iş kare başına bir kez yapılır.
     if canvas.current_tool == ToolType.IMAGE_SELECTOR:
         if canvas.resizing_selection and canvas.grabbed_handle_type and canvas._parent_page and canvas.selected_item_indices:
-            # Boyutlandırma işlemi
-            item_type, index = canvas.selected_item_indices[0]
-            if item_type == 'images' and index < len(canvas._parent_page.images):
-                # Yeni boyutu hesapla
-                if not canvas.resize_original_bbox.isNull():
-                    # Aspect ratio'yu koru
-                    aspect_ratio = canvas.resize_original_bbox.width() / canvas.resize_original_bbox.height() if canvas.resize_original_bbox.height() > 0 else 1.0
-                    
-                    new_bbox = selection_helpers.calculate_rotated_bbox_from_handle(
-                        canvas.resize_original_bbox, 
-                        canvas.original_angle or 0.0,
-                        pos, 
-                        canvas.grabbed_handle_type, 
-                        True,  # aspect_ratio_locked
-                        10.0   # min_size
-                    )
-                    
-                    if not new_bbox.isNull():
-                        canvas._parent_page.images[index]['rect'] = new_bbox
-                        
-                        # YENİ: resim_islem_handler'ı kullan
-                        if 'filepath' in canvas._parent_page.images[index]:
-                            img_path = canvas._parent_page.images[index]['filepath']
-                            resim_islem_handler.handle_resize_image(
-                                img_path, 
-                                int(new_bbox.width()), 
-                                int(new_bbox.height())
-                            )
-                        
-                        canvas.invalidate_cache(reason="Resim boyutlandırma hareketi")
-                        canvas.update()
-                        action_performed = True
-                        
+            canvas.frame_coalescer.schedule('image_resize', lambda p=QPointF(pos): _apply_image_resize_move(canvas, p))
+            action_performed = True
         elif canvas.rotating_selection and canvas.grabbed_handle_type == 'rotation' and canvas._parent_page and canvas.selected_item_indices:
-            # Döndürme işlemi
-            item_type, index = canvas.selected_item_indices[0]
-            if item_type == 'images' and index < len(canvas._parent_page.images):
-                img_data = canvas._parent_page.images[index]
-                rect = img_data.get('rect')
-                
-                if rect and not rect.isNull():
-                    # Resim merkezini al
-                    center = rect.center()
-                    
-                    # Orijinal açıyı al (veya 0 derece)
-                    original_angle = canvas.original_angle or 0.0
-                    
-                    # Başlangıç ve şu anki açıları hesapla
-                    start_angle = math.degrees(math.atan2(canvas.rotation_start_point.y() - center.y(), 
-                                                          canvas.rotation_start_point.x() - center.x()))
-                    current_angle = math.degrees(math.atan2(pos.y() - center.y(), 
-                                                           pos.x() - center.x()))
-                    
-                    # Açı farkını hesapla (başlangıçtan itibaren kaç derece döndü)
-                    angle_delta = current_angle - start_angle
-                    
-                    # Yeni açıyı hesapla ve uygula
-                    new_angle = original_angle + angle_delta
-                    img_data['angle'] = new_angle
-                    
-                    # YENİ: resim_islem_handler'ı kullan
-                    if 'filepath' in img_data:
-                        img_path = img_data['filepath']
-                        resim_islem_handler.handle_rotate_image(img_path, new_angle)
-                    
-                    canvas.invalidate_cache(reason="Resim döndürme hareketi")
-                    canvas.update()
-                    action_performed = True
-                    
+            canvas.frame_coalescer.schedule('image_rotate', lambda p=QPointF(pos): _apply_image_rotate_move(canvas, p))
+            action_performed = True
         elif canvas.moving_selection:
-            # Mevcut taşıma kodunu koru (değişiklik yok)
             if canvas._parent_page and canvas.selected_item_indices:
-                # Kaydırma miktarını hesapla
-                dx = pos.x() - canvas.last_move_pos.x()
-                dy = pos.y() - canvas.last_move_pos.y()
-                
-                for item_type, index in canvas.selected_item_indices:
-                    if item_type == 'images' and index < len(canvas._parent_page.images):
-                        # Resmi kaydır
-                        rect = canvas._parent_page.images[index]['rect']
-                        rect.translate(dx, dy)
-                        
-                        # YENİ: resim_islem_handler'ı kullan
-                        if 'filepath' in canvas._parent_page.images[index]:
-                            img_path = canvas._parent_page.images[index]['filepath']
-                            img_x = int(rect.x())
-                            img_y = int(rect.y())
-                            resim_islem_handler.handle_move_image(img_path, img_x, img_y)
-                        canvas.invalidate_cache(reason="Resim taşıma hareketi")
-                
-                canvas.last_move_pos = pos
+                canvas.frame_coalescer.schedule('image_move', lambda p=QPointF(pos): _apply_image_move(canvas, p))
                 action_performed = True
     
     # --- KALEM ARACI İÇİN HAREKET --- #
     elif canvas.current_tool == ToolType.PEN:
-        pen_tool_handler.handle_pen_move(canvas, pos)
+        pen_tool_handler.handle_pen_move(canvas, pos, event)
         action_performed = True
     
     # --- ŞEKİL ARAÇLARI İÇİN HAREKET --- #
@@ -582,14 +568,24 @@ def handle_tablet_move(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEven
     # --- SEÇİM ARACI İÇİN HAREKET --- #
     elif canvas.current_tool == ToolType.SELECTOR:
         # Farklı seçici durumlarına göre ilgili handler çağrılır
+        # Taşıma/boyutlandırma orijinal durumlara göre mutlak hesaplanır; yalnızca
+        # son örnek kare başına bir kez uygulanır (büyük seçimler kalemin gerisinde kalmaz).
         if canvas.selecting: # Dikdörtgenle seçim yapılıyorsa
             selector_tool_handler.handle_selector_rect_select_move(canvas, pos, event)
             action_performed = True
         elif canvas.moving_selection: # Seçili öğeler taşınıyorsa
-            selector_tool_handler.handle_selector_move_selection(canvas, pos, event)
+            snapshot = TabletEventSnapshot(event)
+            canvas.frame_coalescer.schedule(
+                'selector_move',
+                lambda p=QPointF(pos): selector_tool_handler.handle_selector_move_selection(canvas, p, snapshot)
+            )
             action_performed = True 
         elif canvas.resizing_selection: # Seçili öğeler boyutlandırılıyorsa
-            selector_tool_handler.handle_selector_resize_move(canvas, pos, event)
+            snapshot = TabletEventSnapshot(event)
+            canvas.frame_coalescer.schedule(
+                'selector_resize',
+                lambda p=QPointF(pos): selector_tool_handler.handle_selector_resize_move(canvas, p, snapshot)
+            )
             action_performed = True
         # Diğer selector durumları (örn. döndürme) buraya eklenebilir
         
@@ -623,6 +619,8 @@ def handle_tablet_move(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEven
         current_time = time.time()
         logging.info(f"TEMPORARY_POINTER MOVE: Adding point at {pos}, time={current_time}")
         canvas.current_temporary_line_points.append((pos, current_time))
+        if hasattr(canvas, 'start_pointer_animations'):
+            canvas.start_pointer_animations()
         action_performed = True
     
     # --- DÜZENLENEBİLİR ÇİZGİ ARACI İÇİN HAREKET --- #
@@ -662,6 +660,9 @@ def handle_tablet_release(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletE
     """
     # logging.debug(f"--- CanvasTabletHandler.handle_tablet_release --- Tool: {canvas.current_tool}, World Pos: {pos}") # Log eklendi
 
+    # Kareye ertelenmiş hareket işlerini bitir: komutlar son durumu görmeli
+    canvas.frame_coalescer.flush()
+
     action_performed = False
 
     if canvas.current_tool == ToolType.IMAGE_SELECTOR:
@@ -800,6 +801,9 @@ def handle_tablet_release(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletE
             canvas.current_temporary_line_points = []
         
         canvas.temporary_drawing_active = False
+        # Solma animasyonunu ortak zamanlayıcıya kaydet
+        if hasattr(canvas, 'start_pointer_animations'):
+            canvas.start_pointer_animations()
         action_performed = True
     
     # --- DÜZENLENEBİLİR ÇİZGİ ARACI İÇİN BIRAKMA --- #
@@ -829,7 +833,7 @@ def handle_tablet_release(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletE
                 path_points,
                 canvas.line_style
             ]
-            canvas.shapes.append(path_shape)
+            canvas.shapes.append(tag_item(path_shape))
             print(f"[DEBUG] PATH SHAPE EKLENDİ: {path_shape}")
             logging.info(f"PATH SHAPE EKLENDİ: {path_shape}")
             print(f"[DEBUG] PATH EKLEME SONRASI: shapes len={len(canvas.shapes)}, içerik={canvas.shapes}")
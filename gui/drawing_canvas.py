@@ -3,7 +3,7 @@ from scipy.interpolate import splev, splprep
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 from PyQt6.QtWidgets import QWidget, QSizePolicy, QApplication
 from PyQt6.QtGui import QColor, QTabletEvent, QPainter, QPen, QBrush, QCursor, QPaintEvent, QPainterPath, QRadialGradient, QPixmap, QVector2D, QTransform, QTouchEvent, QEventPoint
-from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer, QSize, QEvent
+from PyQt6.QtCore import Qt, QPointF, QRectF, QSize, QEvent
 from collections import defaultdict
 from OpenGL import GL
 import logging
@@ -27,6 +27,11 @@ from utils.commands import (
     UpdateBsplineControlPointCommand # YENİ: UpdateBsplineControlPointCommand import edildi
 )
 from utils.undo_redo_manager import UndoRedoManager
+from utils.item_ids import ItemIdIndex
+from utils.pdf_page_renderer import get_pdf_page_renderer, make_page_reference
+from utils.stroke_input import StrokeInputProcessor
+from .frame_coalescer import FrameCoalescer
+from .animation_scheduler import get_animation_scheduler
 from .enums import TemplateType, ToolType, Orientation 
 from typing import List, Any
 from utils import selection_helpers
@@ -69,6 +74,38 @@ CANVAS_DEFAULT_GRID_SETTINGS = {
 }
 # --- --- --- --- --- --- --- --- --- --- --- --- --- ---
 
+# --- YENİ: Sayfalar arasında paylaşılan kaynaklar --- #
+# Şablon resimleri her canvas için diskten ayrı ayrı okunmaz; aynı dosya için tek
+# bir QPixmap paylaşılır (dosya yeniden üretilirse değişiklik zamanıyla fark edilir).
+_TEMPLATE_PIXMAP_CACHE: dict = {}
+# settings.json'daki grid ayarları süreç başına bir kez okunur
+_FILE_GRID_SETTINGS: dict | None = None
+
+def _shared_template_pixmap(filepath: str) -> QPixmap:
+    mtime = os.path.getmtime(filepath)
+    cached = _TEMPLATE_PIXMAP_CACHE.get(filepath)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    pixmap = QPixmap(filepath)
+    if not pixmap.isNull():
+        _TEMPLATE_PIXMAP_CACHE[filepath] = (mtime, pixmap)
+    return pixmap
+
+def _file_grid_settings() -> dict:
+    global _FILE_GRID_SETTINGS
+    if _FILE_GRID_SETTINGS is None:
+        import json
+        config_path = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'settings.json'))
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                file_settings = json.load(f)
+            _FILE_GRID_SETTINGS = {key: file_settings[key] for key in CANVAS_DEFAULT_GRID_SETTINGS if key in file_settings}
+        except Exception as e:
+            logging.warning(f"DrawingCanvas: settings.json dosyasından grid ayarları okunamadı: {e}")
+            _FILE_GRID_SETTINGS = {}
+    return _FILE_GRID_SETTINGS
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
 def rgba_to_qcolor(rgba: tuple) -> QColor:
     if not isinstance(rgba, (list, tuple)) or len(rgba) < 3:
         return QColor(Qt.GlobalColor.black) 
@@ -146,6 +183,12 @@ class FakeTabletEventFromTouch:
 class DrawingCanvas(QWidget):
     content_changed = pyqtSignal()
     selection_changed = pyqtSignal()
+    stroke_input_finished = pyqtSignal(dict) # Kalem vuruşu bitince girdi istatistikleri (bkz. StrokeInputProcessor.stats)
+
+    # Sayfa arka planının asıl deposu (bkz. _page_background_pixmap özelliği)
+    _page_background_pixmap_data: QPixmap | None = None
+    # PDF sayfası arka planı (PDF yolu, sayfa indeksi); görünür oldukça çizilir (bkz. utils/pdf_page_renderer.py)
+    _pdf_page_source: Tuple[str, int] | None = None
 
     def __init__(self, undo_manager: UndoRedoManager, parent=None, template_settings: dict | None = None):
         super().__init__(parent)
@@ -207,6 +250,9 @@ class DrawingCanvas(QWidget):
         self.setMouseTracking(True)  # Fare takibi
         
         # Seçim ve taşıma değişkenleri
+        # Öğe kimlikleri indeksi: seçim ve komutlar öğeleri ID ile adresler
+        self.item_ids = ItemIdIndex(self)
+        self._selected_item_ids = []
         self.selected_item_indices = []
         self.current_handles = {}
         self.active_handle = None
@@ -291,6 +337,7 @@ class DrawingCanvas(QWidget):
         # YENİ: Düzenlenebilir çizgiler için ayrı bir depo
         self.editable_lines = []
         self._selected_item_indices = []
+        self._selected_item_ids = []
         self.current_handles = {}
         self.hovered_handle = None
         self.current_resize_handle = None
@@ -310,10 +357,6 @@ class DrawingCanvas(QWidget):
         # Geçici işaretçi (kuyruklu yıldız) için değişkenler
         self.pointer_trail_points = []
         self.pointer_trail_duration = 4.0  # İzlerin ekranda kalma süresi (saniye)
-        self.pointer_trail_timer = QTimer(self)
-        self.pointer_trail_timer.setInterval(100)  # 100ms'de bir güncelle
-        self.pointer_trail_timer.timeout.connect(self._update_pointer_trail)
-        self.pointer_trail_timer.start()
         
         # Geçici çizgi değişkenleri
         self.temp_pointer_color = QColor(255, 80, 80, 220)  # Kırmızımsı renk
@@ -378,9 +421,9 @@ class DrawingCanvas(QWidget):
             logging.error(f"Başlangıç şablon tipi okunurken hata: {e}")
         self.temporary_lines: List[Tuple[List[Tuple[QPointF, float]], tuple, float]] = [] 
         self.current_temporary_line_points: List[Tuple[QPointF, float]] = [] 
-        self.current_temporary_line_timer = QTimer(self) 
-        self.current_temporary_line_timer.timeout.connect(self._check_temporary_lines)
-        self.current_temporary_line_timer.start(30)  # Daha akıcı animasyon için 30ms
+        # Geçici çizgi / iz animasyonları sürekli timer yerine ortak zamanlayıcıyla,
+        # yalnızca ekranda bir şey solarken sürülür (bkz. start_pointer_animations)
+        self.animation_scheduler = get_animation_scheduler()
         self.temporary_line_duration = 5.0 
         self.temp_pointer_color = QColor('#FFA500') 
         self.temp_pointer_width = 3.0 
@@ -392,7 +435,8 @@ class DrawingCanvas(QWidget):
         self.laser_pointer_size = 10.0 
         self._parent_page: 'Page' | None = None 
         self._background_pixmap: QPixmap | None = None 
-        self._page_background_pixmap: QPixmap | None = None
+        self._page_background_pixmap = None  # Özellik; görünür pencere dışındayken bırakılabilir
+        self._page_background_size: QSize | None = None
         self._pdf_background_source_path: str | None = None
         self._has_page_background: bool = False
         self._current_background_image_path: str | None = None
@@ -419,19 +463,9 @@ class DrawingCanvas(QWidget):
         if page_parent and hasattr(page_parent, 'main_window') and page_parent.main_window and hasattr(page_parent.main_window, 'settings'):
             main_window_settings = page_parent.main_window.settings
 
-            # --- YENİ: Eksik grid ayarlarını settings.json'dan tamamla ---
-            import json
-            import os
-            config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'settings.json')
-            config_path = os.path.normpath(config_path)
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    file_settings = json.load(f)
-                for key in CANVAS_DEFAULT_GRID_SETTINGS.keys():
-                    if key in file_settings:
-                        main_window_settings[key] = file_settings[key]
-            except Exception as e:
-                logging.warning(f"DrawingCanvas: settings.json dosyasından grid ayarları okunamadı: {e}")
+            # --- YENİ: Eksik grid ayarlarını settings.json'dan tamamla (dosya bir kez okunur) ---
+            for key, value in _file_grid_settings().items():
+                main_window_settings.setdefault(key, value)
         else:
             self.grid_thick_line_interval = CANVAS_DEFAULT_GRID_SETTINGS['grid_thick_line_interval']
             self.grid_thin_color = CANVAS_DEFAULT_GRID_SETTINGS['grid_thin_color']
@@ -443,11 +477,15 @@ class DrawingCanvas(QWidget):
             self.snap_lines_to_grid = CANVAS_DEFAULT_GRID_SETTINGS['grid_snap_enabled']
             self.grid_visible_on_snap = CANVAS_DEFAULT_GRID_SETTINGS['grid_visible_on_snap']
 
+        # --- Kalem girdisi ön işleme (tekrar atma / yumuşatma / seyreltme) --- #
+        self.input_processor = StrokeInputProcessor(
+            main_window_settings.get('pen_input_filter') if main_window_settings else None
+        )
+        # --- Hareket olaylarındaki pahalı işleri kare başına bire indiren birleştirici --- #
+        self.frame_coalescer = FrameCoalescer(self)
+
         self.pointer_trail_points = []  # (QPointF, timestamp)
         self.pointer_trail_duration = 1.2  # Saniye
-        self.pointer_trail_timer = QTimer(self)
-        self.pointer_trail_timer.timeout.connect(self._update_pointer_trail)
-        self.pointer_trail_timer.start(20)
 
         # --- YENİ: Kontrol Noktası Seçici Aracı Özellikleri (B-Spline için) --- #
         self.active_bspline_stroke_index: int | None = None
@@ -496,6 +534,8 @@ class DrawingCanvas(QWidget):
 
     def paintEvent(self, event: QPaintEvent):
         #logging.info(f"[PAINT] paintEvent çağrıldı. dirty={self._cache_dirty}, cache var mı={self._static_content_cache is not None}")
+        # Kaydırılıp tekrar görünen sayfa showEvent almaz; görünmediği için duran animasyonlar burada devam eder
+        self.animation_scheduler.wake(self)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
@@ -1039,7 +1079,7 @@ class DrawingCanvas(QWidget):
         if not page_ref:
              logging.error("_get_current_selection_states: Fonksiyona geçerli bir 'page_ref' sağlanmadı!")
              return states
-        for item_type, index in self._selected_item_indices:
+        for item_type, index in self.selected_item_indices:
             item_data_source = None
             current_item_state = None
             try:
@@ -1096,7 +1136,7 @@ class DrawingCanvas(QWidget):
 
     def _get_combined_bbox(self, states: List[Any]) -> QRectF:
         combined_bbox = QRectF()
-        for item_type, index in self._selected_item_indices:
+        for item_type, index in self.selected_item_indices:
             item_data = None
             bbox = QRectF() # Önce null yap
             if item_type == 'lines' and 0 <= index < len(self.lines):
@@ -1240,116 +1280,70 @@ class DrawingCanvas(QWidget):
         """
         Seçili öğeleri, sürüklemenin başlangıcındaki orijinal durumlarına göre
         total_dx ve total_dy kadar yeniden konumlandırır.
-        self.move_original_states (başlangıç durumları) ve 
-        self.selected_item_indices (tür ve orijinal indeks) kullanılır.
+        self.move_original_states (başlangıç durumları) seçimle aynı sıradadır;
+        öğeler kalıcı kimlikleriyle (selected_item_ids) çözülür, indeks
+        doğrulaması gerekmez.
         """
-        if len(self.selected_item_indices) != len(self.move_original_states):
+        selected_ids = self.selected_item_ids
+        if len(selected_ids) != len(self.move_original_states):
             logging.error(
-                "_reposition_selected_items_from_initial: self.selected_item_indices uzunluğu (%d) "
+                "_reposition_selected_items_from_initial: seçim uzunluğu (%d) "
                 "ile self.move_original_states uzunluğu (%d) eşleşmiyor.",
-                len(self.selected_item_indices), len(self.move_original_states)
+                len(selected_ids), len(self.move_original_states)
             )
-            logging.error(f"  selected_item_indices: {self.selected_item_indices}")
-            logging.error(f"  move_original_states: {[type(s) for s in self.move_original_states]}")
             return
 
-        # LOG: Taşıma başında hangi öğeler taşınacak?
-        #logging.debug(f"[TAŞIMA BAŞLANGICI] Seçili öğeler: {self.selected_item_indices}")
-        for i, (item_type, item_original_idx) in enumerate(self.selected_item_indices):
-            #logging.debug(f"  {i}: type={item_type}, index={item_original_idx}")
-            pass
+        snap = getattr(self, 'snap_lines_to_grid', False)
 
-        something_moved = False
-        for i, (item_type, item_original_idx) in enumerate(self.selected_item_indices):
-            if i >= len(self.move_original_states):
-                logging.warning(f"_reposition_selected_items_from_initial: move_original_states öğe sayısı yetersiz (index {i}). Atlama.")
-                continue
+        def _shift(p: QPointF, use_snap: bool = False) -> QPointF:
+            moved = QPointF(p.x() + total_dx, p.y() + total_dy)
+            return self._snap_point_to_grid(moved) if use_snap else moved
 
-            original_item_data = self.move_original_states[i]
+        something_moved = False
+        for item_id, original_item_data in zip(selected_ids, self.move_original_states):
             if original_item_data is None:
-                # logging.warning(f"_reposition_selected_items_from_initial: original_item_data None (index {i}). Atlama.") # Çok sık log üretebilir
                 continue
+            location = self.item_ids.locate(item_id)
+            if location is None:
+                continue
+            item_type, _ = location
+            item = self.item_ids.get(item_id)
 
             if item_type == 'lines':
-                if 0 <= item_original_idx < len(self.lines):
-                    original_points = original_item_data[2] 
-                    if original_points and all(isinstance(p, QPointF) for p in original_points):
-                        # --- SNAP TO GRID --- #
-                        if getattr(self, 'snap_lines_to_grid', False):
-                            new_points = [self._snap_point_to_grid(QPointF(p.x() + total_dx, p.y() + total_dy)) for p in original_points]
-                        else:
-                            new_points = [QPointF(p.x() + total_dx, p.y() + total_dy) for p in original_points]
-                        self.lines[item_original_idx][2] = new_points
-                    else:
-                        pass
-                else:
-                    pass
+                original_points = original_item_data[2]
+                if original_points and all(isinstance(p, QPointF) for p in original_points):
+                    item[2] = [_shift(p, snap) for p in original_points]
             elif item_type == 'shapes':
-                if 0 <= item_original_idx < len(self.shapes):
-                    shape_tool_type = self.shapes[item_original_idx][0]
-                    if shape_tool_type == ToolType.EDITABLE_LINE: # Bezier eğrileri için
-                        original_control_points = original_item_data[3] # Bezier kontrol noktaları (QPointF listesi)
-                        if original_control_points and all(isinstance(p, QPointF) for p in original_control_points):
-                            new_control_points = [QPointF(p.x() + total_dx, p.y() + total_dy) for p in original_control_points]
-                            self.shapes[item_original_idx][3] = new_control_points
-                        else:
-                            pass
-                    elif shape_tool_type in [ToolType.LINE, ToolType.RECTANGLE, ToolType.CIRCLE]:
-                        original_p1 = original_item_data[3]
-                        original_p2 = original_item_data[4];
-                        if isinstance(original_p1, QPointF) and isinstance(original_p2, QPointF):
-                            # --- SNAP TO GRID --- #
-                            if getattr(self, 'snap_lines_to_grid', False):
-                                new_p1 = self._snap_point_to_grid(QPointF(original_p1.x() + total_dx, original_p1.y() + total_dy))
-                                new_p2 = self._snap_point_to_grid(QPointF(original_p2.x() + total_dx, original_p2.y() + total_dy))
-                            else:
-                                new_p1 = QPointF(original_p1.x() + total_dx, original_p1.y() + total_dy)
-                                new_p2 = QPointF(original_p2.x() + total_dx, original_p2.y() + total_dy)
-                            self.shapes[item_original_idx][3] = new_p1
-                            self.shapes[item_original_idx][4] = new_p2
-                        else:
-                            pass
-                    else: # Diğer şekiller
-                        original_p1 = original_item_data[3]
-                        original_p2 = original_item_data[4]
-                        if isinstance(original_p1, QPointF) and isinstance(original_p2, QPointF):
-                            self.shapes[item_original_idx][3] = QPointF(original_p1.x() + total_dx, original_p1.y() + total_dy)
-                            self.shapes[item_original_idx][4] = QPointF(original_p2.x() + total_dx, original_p2.y() + total_dy)
-                        else:
-                            pass
+                shape_tool_type = item[0]
+                if shape_tool_type == ToolType.EDITABLE_LINE: # Bezier eğrileri için
+                    original_control_points = original_item_data[3]
+                    if original_control_points and all(isinstance(p, QPointF) for p in original_control_points):
+                        item[3] = [_shift(p) for p in original_control_points]
                 else:
-                    pass
+                    original_p1 = original_item_data[3]
+                    original_p2 = original_item_data[4]
+                    if isinstance(original_p1, QPointF) and isinstance(original_p2, QPointF):
+                        # Grid'e yapıştırma sadece çizgi/dikdörtgen/daire için
+                        use_snap = snap and shape_tool_type in [ToolType.LINE, ToolType.RECTANGLE, ToolType.CIRCLE]
+                        item[3] = _shift(original_p1, use_snap)
+                        item[4] = _shift(original_p2, use_snap)
             elif item_type == 'images':
-                if self._parent_page and 0 <= item_original_idx < len(self._parent_page.images):
-                    original_rect = original_item_data.get('rect')
-                    if isinstance(original_rect, QRectF):
-                        new_rect = QRectF(original_rect)
-                        new_rect.translate(total_dx, total_dy)
-                        self._parent_page.images[item_original_idx]['rect'] = new_rect
-                    else:
-                        pass
-                else:
-                    pass
+                original_rect = original_item_data.get('rect')
+                if isinstance(original_rect, QRectF):
+                    new_rect = QRectF(original_rect)
+                    new_rect.translate(total_dx, total_dy)
+                    item['rect'] = new_rect
             elif item_type == 'bspline_strokes':
-                if 0 <= item_original_idx < len(self.b_spline_strokes):
-                    if original_item_data and 'control_points' in original_item_data:
-                        original_control_points = original_item_data['control_points']
-                        if isinstance(original_control_points, np.ndarray) and original_control_points.ndim == 2 and original_control_points.shape[1] == 2:
-                            original_control_points = [np.array(row) for row in original_control_points]
-                        if isinstance(original_control_points, list) and original_control_points and all(isinstance(cp, np.ndarray) and cp.shape == (2,) for cp in original_control_points):
-                            new_control_points = [
-                                np.array([cp[0] + total_dx, cp[1] + total_dy]) for cp in original_control_points
-                            ]
-                            self.b_spline_strokes[item_original_idx]['control_points'] = new_control_points
-                        else:
-                            logging.error(f"_reposition: bspline_strokes[{item_original_idx}] için original_control_points beklenen formatta değil. Veri: {original_control_points}")
-                            continue # Bu stroke için işlemi atla
-                    else:
-                        logging.warning(f"_reposition: bspline_strokes[{item_original_idx}] için original_item_data (move_original_states'ten) veya control_points bulunamadı.")
+                original_control_points = original_item_data.get('control_points') if original_item_data else None
+                if isinstance(original_control_points, np.ndarray) and original_control_points.ndim == 2 and original_control_points.shape[1] == 2:
+                    original_control_points = [np.array(row) for row in original_control_points]
+                if isinstance(original_control_points, list) and original_control_points and all(isinstance(cp, np.ndarray) and cp.shape == (2,) for cp in original_control_points):
+                    item['control_points'] = [
+                        np.array([cp[0] + total_dx, cp[1] + total_dy]) for cp in original_control_points
+                    ]
                 else:
-                    logging.warning(f"_reposition: Geçersiz bspline_strokes index: {item_original_idx}")
-            else:
-                pass
+                    logging.error(f"_reposition: bspline {item_id} için original_control_points beklenen formatta değil.")
+                    continue
             something_moved = True
         if something_moved:
             if self._parent_page:
@@ -1418,12 +1412,10 @@ class DrawingCanvas(QWidget):
             
         # --- YENİ: Geçici İşaretçi Ayarları --- #
         if tool == ToolType.TEMPORARY_POINTER:
-            # Geçici işaretçi seçildiğinde timeri başlat
-            if not self.pointer_trail_timer.isActive():
-                self.pointer_trail_timer.start()
             self.setCursor(Qt.CursorShape.CrossCursor)
         elif previous_tool == ToolType.TEMPORARY_POINTER:
-            # Geçici işaretçiden çıkınca timer'ı durdur ve noktaları temizle
+            # Geçici işaretçiden çıkınca iz animasyonunu durdur ve noktaları temizle
+            self.animation_scheduler.stop(self, 'pointer_trail')
             self.pointer_trail_points = []
             self.temporary_drawing_active = False
         # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
@@ -1460,14 +1452,6 @@ class DrawingCanvas(QWidget):
 
         # TODO: Diğer araçlara özel cursorlar eklenebilir (örn. Crosshair)
 
-        # Pointer trail timer kontrolü
-        if tool == ToolType.TEMPORARY_POINTER:
-            if not self.pointer_trail_timer.isActive():
-                self.pointer_trail_timer.start(20)
-        else:
-            if self.pointer_trail_timer.isActive():
-                self.pointer_trail_timer.stop()
-
     def clear_canvas(self):
         command = ClearCanvasCommand(self)
         self.undo_manager.execute(command)
@@ -1670,45 +1654,84 @@ class DrawingCanvas(QWidget):
         self.update()
     # --- --- --- --- --- --- --- --- --- ---
 
-    def _check_temporary_lines(self):
-        """Zamanlayıcı tarafından çağrılır, süresi dolan geçici pointer çizgilerini animasyonlu olarak siler."""
-        current_time = time.time()
+    def _check_temporary_lines(self, now: float = None, dt: float = 0.0) -> bool:
+        """Animasyon zamanlayıcısı tarafından çağrılır, süresi dolan geçici pointer çizgilerini animasyonlu olarak siler.
+
+        Silme animasyonu kare sayısına değil geçen süreye bağlıdır: animasyon
+        başladığında çizginin nokta sayısı 5. alanda saklanır ve kalan nokta
+        sayısı geçen sürenin oranından hesaplanır. Solan çizgi varsa True
+        döner (zamanlayıcı her karede sürer); çizgiler yalnızca solmayı
+        bekliyorsa en yakın solma başlangıcına kalan süreyi (saniye) döndürür,
+        böylece bekleme boyunca kare tiki atılmaz. Çizgi kalmadıysa False.
+        """
+        current_time = now if now is not None else time.time()
         something_changed = False
         new_temporary_lines = []
         animasyon_suresi = 1.0  # Silme animasyonu süresi (saniye)
-        # timer_interval = 0.05   # Timer aralığı (saniye) - Artık kullanılmayacak
+        fading = False
+        next_fade_start = None  # Bekleyen çizgilerin en yakın solma zamanı
 
         for line in self.temporary_lines:
             points, color, width, start_time, animasyon_basladi = line
-            if not animasyon_basladi:
-                if current_time - start_time < self.temporary_line_duration:
-                    new_temporary_lines.append([points, color, width, start_time, False])
-                else:
-                    if len(points) > 0:
-                        new_temporary_lines.append([points, color, width, start_time, True])
-                        something_changed = True
+            if not points:
+                something_changed = True
+                continue
+            fade_start = start_time + self.temporary_line_duration
+            if current_time < fade_start:
+                new_temporary_lines.append(line)
+                next_fade_start = fade_start if next_fade_start is None else min(next_fade_start, fade_start)
+                continue
+            fading = True
+            # İlk kez solmaya başlıyorsa başlangıç nokta sayısını kaydet
+            # (eski kayıtlarda True olabilir; bu durumda mevcut sayı kullanılır)
+            initial_count = animasyon_basladi if animasyon_basladi and animasyon_basladi is not True else len(points)
+            progress = (current_time - fade_start) / animasyon_suresi
+            remaining = int(initial_count * max(0.0, 1.0 - progress))
+            if remaining < len(points):
+                del points[remaining:]
+                something_changed = True
+            if points:
+                new_temporary_lines.append([points, color, width, start_time, initial_count])
             else:
-                # Animasyon başladıysa, her adımda sadece 1 nokta sil
-                if len(points) > 0:
-                    points.pop()
-                    if len(points) > 0:
-                        new_temporary_lines.append([points, color, width, start_time, True])
-                        something_changed = True
-                    else:
-                        something_changed = True
-                else:
-                    something_changed = True
+                something_changed = True
         # --- paintEvent'te aktif çizim için fade-out başlat ---
         if self.temporary_drawing_active and len(self.current_temporary_line_points) > 1:
-            ilk_zaman = self.current_temporary_line_points[0][1]
-            if current_time - ilk_zaman > self.temporary_line_duration:
-                self.current_temporary_line_points.pop(0)
+            esik = current_time - self.temporary_line_duration
+            eski = 0
+            while eski < len(self.current_temporary_line_points) - 1 and self.current_temporary_line_points[eski][1] < esik:
+                eski += 1
+            if eski:
+                del self.current_temporary_line_points[:eski]
                 something_changed = True
+            if len(self.current_temporary_line_points) > 1:
+                # Aktif çizimin en eski noktası süresi dolunca kırpılacak
+                trim_at = self.current_temporary_line_points[0][1] + self.temporary_line_duration
+                next_fade_start = trim_at if next_fade_start is None else min(next_fade_start, trim_at)
         self.temporary_lines = new_temporary_lines
         # Sadece bir değişiklik olduysa ve ekranda geçici çizgi veya aktif çizim varsa update çağır
-        if something_changed and (self.temporary_lines or self.temporary_drawing_active):
+        if something_changed:
             self.update()
-        # Timer'ı durdurma kodu kaldırıldı
+        if fading:
+            return True
+        if next_fade_start is not None:
+            return max(next_fade_start - current_time, 0.001)
+        return False
+
+    def start_pointer_animations(self):
+        """Geçici işaretçi çizgileri/izi için animasyonları ortak zamanlayıcıya kaydeder.
+
+        Çizgi eklendiğinde veya iz noktası geldiğinde çağrılır; animasyonlar
+        bitince (her şey silinince) zamanlayıcı kendiliğinden durur.
+        """
+        if self.temporary_lines or self.current_temporary_line_points:
+            self.animation_scheduler.start(self, 'temporary_lines', self._check_temporary_lines)
+        if self.pointer_trail_points:
+            self.animation_scheduler.start(self, 'pointer_trail', self._update_pointer_trail)
+
+    def showEvent(self, event):
+        # Gizliyken duraklatılan animasyonlar sayfa tekrar görününce sürsün
+        super().showEvent(event)
+        self.animation_scheduler.wake(self)
 
     # --- YENİ: İşaretçi Ayarlarını Uygula --- #
     def apply_pointer_settings(self, settings: dict):
@@ -1746,6 +1769,10 @@ class DrawingCanvas(QWidget):
         self.update() # Gerekirse görünümü güncelle
     # --- --- --- --- --- --- --- --- --- --- #
 
+    def apply_input_filter_settings(self, settings: dict):
+        """Kalem girdisi ön işleme ayarlarını ('pen_input_filter') uygular."""
+        self.input_processor.apply_settings(settings or {})
+
     # --- YENİ: Belirli Bir Noktadaki Öğeyi Bulma --- #
     def _get_item_at(self, world_pos: QPointF, tolerance: float = 5.0) -> Tuple[str, int] | None:
         """Verilen dünya koordinatındaki en üstteki öğeyi (varsa) döndürür.
@@ -1953,7 +1980,7 @@ class DrawingCanvas(QWidget):
 
         if os.path.exists(filepath):
             try:
-                loaded_pixmap = QPixmap(filepath)
+                loaded_pixmap = _shared_template_pixmap(filepath)
                 if loaded_pixmap.isNull():
                     logging.error(f"Canvas: Arka plan resmi yüklenemedi (isNull): {filepath}")
                     self._background_pixmap = None
@@ -1987,8 +2014,10 @@ class DrawingCanvas(QWidget):
 
     def set_page_background_pixmap(self, pixmap: QPixmap, image_path: str | None = None):
         """Sayfaya özel bir arka plan pixmap'i (örn. PDF sayfasından) ayarlar."""
+        self._pdf_page_source = None
         if pixmap and not pixmap.isNull():
             self._page_background_pixmap = pixmap
+            self._page_background_size = pixmap.size()
             self._has_page_background = True
             if image_path: # YENİ
                 self._pdf_background_source_path = image_path # YENİ
@@ -2001,6 +2030,7 @@ class DrawingCanvas(QWidget):
             self.adjustSize() # Boyutu içeriğe göre ayarla
         else:
             self._page_background_pixmap = None
+            self._page_background_size = None
             self._has_page_background = False
             self._pdf_background_source_path = None # YENİ: Arka plan kaldırılırsa yolu da temizle
             logging.warning(f"DrawingCanvas ({id(self)}): set_page_background_pixmap çağrıldı ama pixmap geçersiz. Özel arka plan kaldırıldı. _has_page_background = {self._has_page_background}")
@@ -2008,6 +2038,39 @@ class DrawingCanvas(QWidget):
             self.update()
             self.updateGeometry()
             self.adjustSize()
+
+    # --- YENİ: PDF Sayfası Arka Planı --- #
+    def set_pdf_page_background(self, pdf_path: str, page_index: int, page_size: QSize):
+        """Arka planı bir PDF sayfasına bağlar; sayfa yalnızca görünür olduğunda çizilir.
+
+        page_size, sayfanın canvas boyutudur (bkz. PdfPageRenderer.page_size).
+        """
+        renderer = get_pdf_page_renderer()
+        if self._pdf_page_source is None:
+            renderer.rendered.connect(self._on_pdf_page_rendered)
+        self._page_background_pixmap = None
+        self._page_background_size = QSize(page_size)
+        self._has_page_background = True
+        self._pdf_page_source = (pdf_path, page_index)
+        self._pdf_background_source_path = make_page_reference(pdf_path, page_index)
+        logging.info(f"DrawingCanvas ({id(self)}): PDF sayfası arka planı ayarlandı: {self._pdf_background_source_path}, boyut: {page_size}")
+        self.setMinimumSize(page_size)
+        self.updateGeometry()
+        self.adjustSize()
+        self.invalidate_cache("PDF sayfası arka planı ayarlandı")
+
+    def _on_pdf_page_rendered(self, pdf_path: str, page_index: int):
+        if self._pdf_page_source == (pdf_path, page_index):
+            self.invalidate_cache("PDF sayfası çizildi")
+
+    def _draw_pdf_page_background(self, painter: QPainter, dpr: float):
+        """Sayfa önbelleği güncellenirken çağrılır; henüz çizilmemiş sayfa kuyruğa alınır."""
+        renderer = get_pdf_page_renderer()
+        pdf_path, page_index = self._pdf_page_source
+        size = self._page_background_size
+        page_image = renderer.request(pdf_path, page_index, dpr)
+        if page_image is not None:
+            painter.drawImage(QRectF(0, 0, size.width(), size.height()), page_image)
     # --- --- --- --- --- --- --- --- --- --- --- -- #
 
     def sizeHint(self) -> QSize:
@@ -2015,8 +2078,9 @@ class DrawingCanvas(QWidget):
         base_size = QSize(600, 800) # Varsayılan boyut
         current_pixmap_to_use = None
 
-        if self._has_page_background and self._page_background_pixmap and not self._page_background_pixmap.isNull():
-            current_pixmap_to_use = self._page_background_pixmap
+        if self._has_page_background and self._page_background_size is not None:
+            # Boyut saklanır; bırakılmış arka plan yalnızca boyut için yeniden yüklenmez
+            base_size = QSize(self._page_background_size)
         elif self._background_pixmap and not self._background_pixmap.isNull():
             current_pixmap_to_use = self._background_pixmap
         
@@ -2260,13 +2324,60 @@ class DrawingCanvas(QWidget):
 
     @property
     def selected_item_indices(self):
+        self._sync_selection_with_ids()
         return self._selected_item_indices
 
     @selected_item_indices.setter
     def selected_item_indices(self, value):
         self._selected_item_indices = value
+        self._selected_item_ids = self.item_ids.ids_for(value) if value else []
         self.selection_changed.emit()
 
+    @property
+    def selected_item_ids(self) -> List[str]:
+        """Seçili öğelerin kalıcı kimlikleri (selected_item_indices ile aynı sırada)."""
+        self._sync_selection_with_ids()
+        return list(self._selected_item_ids)
+
+    def _sync_selection_with_ids(self):
+        """Seçimdeki indeksleri kimliklere göre günceller.
+
+        Seçimden önceki bir öğe silinir/eklenirse indeksler kayar; kimlikler
+        sabit kaldığından konumlar ID indeksinden O(1) yeniden çözülür. Silinmiş
+        öğeler seçimden düşer. Liste nesnesi yerinde güncellenir.
+        """
+        indices = self._selected_item_indices
+        if len(self._selected_item_ids) != len(indices):
+            # Liste doğrudan (clear/append) değiştirilmiş: kimlikleri yeniden yakala
+            self._selected_item_ids = self.item_ids.ids_for(indices)
+            return
+        changed = False
+        synced_indices, synced_ids = [], []
+        for (item_type, index), item_id in zip(indices, self._selected_item_ids):
+            if item_id is None:
+                synced_indices.append((item_type, index))
+                synced_ids.append(item_id)
+                continue
+            if self.item_ids.id_at(item_type, index) != item_id:
+                location = self.item_ids.locate(item_id)
+                changed = True
+                if location is None:
+                    continue
+                item_type, index = location
+            synced_indices.append((item_type, index))
+            synced_ids.append(item_id)
+        if changed:
+            indices[:] = synced_indices
+            self._selected_item_ids = synced_ids
+
+    def find_item_by_id(self, item_id: str) -> Tuple[str, int] | None:
+        """Kimliğe karşılık gelen (tip, indeks) konumunu döndürür."""
+        return self.item_ids.locate(item_id)
+
+    def get_item_by_id(self, item_id: str) -> Any:
+        """Kimliğe karşılık gelen öğe verisini döndürür (yoksa None)."""
+        return self.item_ids.get(item_id)
+
     def set_fill_rgba(self, rgba_tuple):
         self.current_fill_rgba = rgba_tuple
 
@@ -2390,16 +2501,21 @@ class DrawingCanvas(QWidget):
         self.grid_visible_on_snap = settings_dict.get('grid_visible_on_snap', getattr(self, 'grid_visible_on_snap', CANVAS_DEFAULT_GRID_SETTINGS['grid_visible_on_snap']))
         self.update()
 
-    def _update_pointer_trail(self):
-        if self.current_tool == ToolType.TEMPORARY_POINTER:
-            now = time.time()
-            self.pointer_trail_points = [(p, t) for (p, t) in self.pointer_trail_points if now - t < self.pointer_trail_duration]
-            self.update()
+    def _update_pointer_trail(self, now: float = None, dt: float = 0.0) -> bool:
+        """Süresi dolan iz noktalarını atar; iz tamamen silinince False döner."""
+        if self.current_tool != ToolType.TEMPORARY_POINTER:
+            self.pointer_trail_points = []
+            return False
+        now = now if now is not None else time.time()
+        self.pointer_trail_points = [(p, t) for (p, t) in self.pointer_trail_points if now - t < self.pointer_trail_duration]
+        self.update()
+        return bool(self.pointer_trail_points)
 
     def mousePressEvent(self, event):
         if self.current_tool == ToolType.TEMPORARY_POINTER and event.button() == Qt.MouseButton.LeftButton:
             logging.info(f"Mouse PRESS for TEMPORARY_POINTER at {event.position()}")
             self.pointer_trail_points = [(event.position(), time.time())]
+            self.start_pointer_animations()
             self.update()
         super().mousePressEvent(event)
 
@@ -2407,6 +2523,7 @@ class DrawingCanvas(QWidget):
         if self.current_tool == ToolType.TEMPORARY_POINTER and event.buttons() & Qt.MouseButton.LeftButton:
             logging.info(f"Mouse MOVE for TEMPORARY_POINTER at {event.position()}")
             self.pointer_trail_points.append((event.position(), time.time()))
+            self.start_pointer_animations()
             self.update()
         super().mouseMoveEvent(event)
 
@@ -2569,6 +2686,28 @@ class DrawingCanvas(QWidget):
         logging.info(f"[apply_grid_settings] Grid ayarları uygulandı. Snap: {self.snap_lines_to_grid}, Visible on Snap: {self.grid_visible_on_snap}")
         self.update()
 
+    # --- YENİ: Sayfa Arka Planı Kaynakları --- #
+    # PageManager canvas'ları yalnızca aktif sayfa ve komşuları için oluşturur
+    # (bkz. Page.create_view/release_view); pencere dışındaki sayfaların
+    # canvas'ı, cache pixmap'ı ve arka planı hiç tutulmaz.
+    @property
+    def _page_background_pixmap(self) -> QPixmap | None:
+        if self._pdf_page_source is not None:
+            # PDF sayfası saklanmaz; istenirse (ör. dışa aktarma) sayfa boyutunda çizilir
+            image = get_pdf_page_renderer().render_now(*self._pdf_page_source)
+            return QPixmap.fromImage(image) if image is not None else None
+        return self._page_background_pixmap_data
+
+    @_page_background_pixmap.setter
+    def _page_background_pixmap(self, pixmap: QPixmap | None):
+        self._page_background_pixmap_data = pixmap
+
+    def preload_page_background(self):
+        """PDF sayfası arka planını önceden çizdirir (komşu sayfaya geçiş beklemesin)."""
+        if self._pdf_page_source is not None:
+            get_pdf_page_renderer().request(*self._pdf_page_source, self.devicePixelRatioF())
+    # --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
     def invalidate_cache(self, reason: str = ""): 
         """Cache'i geçersiz kılar, bir sonraki paint'te güncellenir. Sebep loglanır."""
         #logging.info(f"[CACHE] invalidate_cache çağrıldı. Sebep: {reason}, Önceki dirty={self._cache_dirty}")
@@ -2598,7 +2737,9 @@ class DrawingCanvas(QWidget):
         with QPainter(image) as painter:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
             painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-            if self._has_page_background and self._page_background_pixmap and not self._page_background_pixmap.isNull():
+            if self._pdf_page_source is not None:
+                self._draw_pdf_page_background(painter, dpr)
+            elif self._has_page_background and self._page_background_pixmap and not self._page_background_pixmap.isNull():
                 painter.drawPixmap(0, 0, self._page_background_pixmap)
             elif self._background_pixmap and not self._background_pixmap.isNull():
                 painter.drawPixmap(0, 0, self._background_pixmap)
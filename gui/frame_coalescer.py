@@ -0,0 +1,104 @@
+"""
+Tablet hareket olaylarını ekran yenileme hızına göre birleştiren yardımcı.
+
+Tablet 200-500 Hz örnek gönderirken ekran 60-144 Hz yenilenir. Kalem örnekleri
+vuruş tamponuna her olayda eklenmeye devam eder; ancak pahalı işler (cache
+geçersiz kılma, seçimi yeniden konumlandırma, resim işleme handler'ları,
+yeniden çizim) bir anahtar altında kuyruğa alınır ve her yenileme aralığında
+en fazla bir kez, yalnızca en son istekle çalıştırılır.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QTimer, QPointF, Qt
+from PyQt6.QtGui import QGuiApplication
+
+DEFAULT_FRAME_INTERVAL_MS = 16
+
+
+def display_frame_interval_ms() -> int:
+    """Birincil ekranın yenileme aralığını (ms) döndürür."""
+    try:
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0.0
+        if rate and rate > 1.0:
+            return max(1, int(1000.0 / rate))
+    except Exception as e:
+        logging.debug(f"display_frame_interval_ms: Yenileme hızı okunamadı: {e}")
+    return DEFAULT_FRAME_INTERVAL_MS
+
+
+class TabletEventSnapshot:
+    """QTabletEvent'in ertelenmiş işlerde güvenle kullanılabilecek kopyası.
+
+    Qt olay nesnesi handler döndükten sonra yok edilir; birleştirilen işler
+    bu nedenle olayın kendisini değil bu anlık görüntüyü alır.
+    """
+    def __init__(self, event):
+        self._position = QPointF(event.position())
+        self._pressure = event.pressure() if hasattr(event, 'pressure') else 1.0
+        self._modifiers = event.modifiers()
+        self._buttons = event.buttons() if hasattr(event, 'buttons') else Qt.MouseButton.NoButton
+        self._button = event.button() if hasattr(event, 'button') else Qt.MouseButton.NoButton
+
+    def position(self) -> QPointF:
+        return QPointF(self._position)
+
+    def pressure(self) -> float:
+        return self._pressure
+
+    def modifiers(self):
+        return self._modifiers
+
+    def buttons(self):
+        return self._buttons
+
+    def button(self):
+        return self._button
+
+    def accept(self):
+        pass
+
+    def ignore(self):
+        pass
+
+
+class FrameCoalescer(QObject):
+    """Anahtar başına en son işi saklayıp kare başına bir kez çalıştırır."""
+
+    def __init__(self, parent: Optional[QObject] = None, interval_ms: Optional[int] = None):
+        super().__init__(parent)
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms if interval_ms is not None else display_frame_interval_ms())
+        self._timer.timeout.connect(self.flush)
+
+    def schedule(self, key: str, work: Callable[[], None]):
+        """İşi kuyruğa alır; aynı anahtardaki önceki (henüz çalışmamış) iş değiştirilir."""
+        self._pending[key] = work
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def cancel(self, key: Optional[str] = None):
+        """Bekleyen işi (veya key None ise tümünü) iptal eder."""
+        if key is None:
+            self._pending.clear()
+        else:
+            self._pending.pop(key, None)
+        if not self._pending:
+            self._timer.stop()
+
+    def flush(self):
+        """Bekleyen tüm işleri eklenme sırasıyla hemen çalıştırır."""
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        for key, work in pending.items():
+            try:
+                work()
+            except Exception as e:
+                logging.error(f"FrameCoalescer: '{key}' işi çalıştırılırken hata: {e}", exc_info=True)
@@ -1,12 +1,15 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
-from PyQt6.QtCore import pyqtProperty, pyqtSignal, QPointF, QSize
-from PyQt6.QtGui import QColor, QPalette, QPixmap
+from PyQt6.QtCore import QObject, pyqtProperty, pyqtSignal, QPointF, QRectF, QSize
+from PyQt6.QtGui import QColor, QImageReader, QPalette, QPixmap
 import logging
 from typing import List, TYPE_CHECKING
 import os
 
 from .drawing_canvas import DrawingCanvas
 from utils.undo_redo_manager import UndoRedoManager
+from utils.item_ids import new_item_id
+from utils.asset_store import get_asset_store
+from utils.pdf_page_renderer import background_source_exists, get_pdf_page_renderer, make_page_reference, parse_page_reference
 from .enums import Orientation, TemplateType
 
 # --- YENİ: MainWindow tipi --- #
@@ -14,8 +17,62 @@ from .enums import Orientation, TemplateType
 # from .arayuz import MainWindow
 # --- --- --- --- --- --- --- -- #
 
-class Page(QWidget):
-    """Tek bir not sayfasını ve ilişkili çizim alanını/yöneticisini temsil eder."""
+# --- YENİ: Görünür pencere dışındaki sayfanın canvas verisi --- #
+# Canvas bırakılırken saklanıp yeniden bağlanınca geri yüklenen oturum ayarları
+CANVAS_VIEW_STATE_ATTRS = (
+    'current_color', 'current_pen_width', 'eraser_width', 'line_style', 'current_template',
+    'template_line_color', 'template_grid_color', 'line_spacing_pt', 'grid_spacing_pt',
+    'grid_thick_line_interval', 'grid_thin_color', 'grid_thick_color', 'grid_thin_width', 'grid_thick_width',
+    'grid_apply_to_all_pages', 'grid_show_for_line_tool_only', 'snap_lines_to_grid', 'grid_visible_on_snap',
+    'current_fill_rgba', 'fill_enabled',
+)
+
+class DetachedCanvas:
+    """Widget'ı olmayan sayfanın canvas verisi (çizgiler, şekiller, B-spline'lar, arka plan kaynağı).
+
+    Sayfa PageManager'ın görünür penceresi dışındayken Page.drawing_canvas bunu
+    döndürür; veriyi okuyan kod (kayıt, PageSnapshot, mürekkep yazma) canvas ile
+    aynı alanları görür. Tüm sayfalara uygulanan ayarlar saklanır ve sayfa
+    yeniden bağlandığında canvas'a uygulanır.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.shapes = []
+        self.b_spline_strokes = []
+        self._pdf_page_source = None
+        self._pdf_background_source_path = None
+        self._page_background_size = None
+        self._page_background_pixmap = None  # Yalnızca diskten yeniden okunamayan resim arka planı
+        self._has_page_background = False
+        self.current_tool = None
+        self.view_state = {}
+        self.template_settings = None
+        self.grid_settings = None
+
+    def update(self):
+        pass
+
+    def invalidate_cache(self, reason: str = ""):
+        pass
+
+    def load_background_template_image(self, image_path: str | None = None, force_reload: bool = False):
+        pass  # Şablon bağlanırken yüklenir
+
+    def apply_template_settings(self, settings: dict):
+        self.template_settings = dict(settings)
+
+    def apply_grid_settings(self, settings_dict: dict):
+        self.grid_settings = dict(settings_dict)
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
+class Page(QObject):
+    """Tek bir not sayfasının verisini ve geri al geçmişini tutar.
+
+    Sayfanın widget'ları (beyaz zeminli görünüm ve DrawingCanvas) yalnızca sayfa
+    PageManager'ın görünür penceresindeyken vardır (bkz. create_view/release_view);
+    pencere dışındayken çizim verisi DetachedCanvas'ta saklanır.
+    """
 
     # --- Sinyaller ---
     modified_status_changed = pyqtSignal(bool)
@@ -27,17 +84,12 @@ class Page(QWidget):
                  default_orientation_str: str = "portrait",
                  parent=None):
         super().__init__(parent)
-        
-        # --- Arka Plan Rengini Ayarla ---
-        self.setAutoFillBackground(True)
-        palette = self.palette()
-        palette.setColor(QPalette.ColorRole.Window, QColor('white'))
-        self.setPalette(palette)
-        # --- --- --- --- --- --- --- ---
-        
+
         self.page_number = page_number
         self.template_settings = template_settings if template_settings is not None else {}
         self._is_modified = False
+        self.page_uid = new_item_id() # İşlem günlüğünde sayfayı oturum boyunca tanımlar (bkz. utils/operation_journal.py)
+        self.modification_generation = 0 # Her değişiklikte artar; arka plan kaydı bitince anlık görüntüyle karşılaştırılır
         self._orientation = Orientation.PORTRAIT # YENİ: İlk atama
         self.zoom_level = 1.0
         self.pan_offset = QPointF(0.0, 0.0)
@@ -46,8 +98,26 @@ class Page(QWidget):
         self.images: List[dict] = []
         # --- --- --- --- --- --- --- -- #
 
+        # --- YENİ: Tembel yükleme kaynağı (NotebookLoader, sayfa indeksi) --- #
+        # Dosyadan açılan sayfaların içeriği ilk erişimde çözülür (bkz. ensure_content_loaded)
+        self._content_source = None
+        # Sayfanın kayıtlı dosyadaki parçası (dosya yolu, PageEntry); artımlı kayıtta değişmeyen sayfalar yeniden yazılmaz
+        self.file_chunk = None
+        # PDF'e son geri yazılan mürekkebin özeti (pdf_helper.ink_strokes_digest); her değişiklikte silinir
+        self.ink_digest = None
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
+        # --- YENİ: Widget'lar yalnızca görünür penceredeyken vardır (bkz. create_view) --- #
+        self._canvas: DrawingCanvas | None = None
+        self._detached = DetachedCanvas()
+        self.view: QWidget | None = None
+        self._view_host = None # PageManager'ın sayfayı sekmesine bağlayan geri çağrısı (bkz. set_view_host)
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
         # --- Undo/Redo Manager Önce Oluşturulmalı --- #
+        # Geri al geçmişi sayfada kalır; komutlar o an veriyi tutan canvas'a yönlendirilir
         self.undo_manager = UndoRedoManager()
+        self.undo_manager.canvas = self._detached
         self.undo_manager.content_modified.connect(self.mark_as_modified)
         # --- --- --- --- --- --- --- --- --- --- #
 
@@ -55,13 +125,6 @@ class Page(QWidget):
         self.main_window = main_window
         # --- --- --- --- --- --- --- --- --- --- #
 
-        # Sayfa düzeni
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self.drawing_canvas = DrawingCanvas(undo_manager=self.undo_manager, template_settings=self.template_settings)
-        self.drawing_canvas.set_parent_page(self)
-        layout.addWidget(self.drawing_canvas, 1)
-
         logging.info(f"Sayfa {self.page_number} oluşturuluyor.")
         
         # --- YENİ: Başlangıç Yönünü Ayarla (Setter aracılığıyla) ---
@@ -73,16 +136,230 @@ class Page(QWidget):
         self.orientation = initial_orientation_enum # Setter'ı çağırır
         # --- --- --- --- --- --- --- --- --- --- --- --- --- ---
 
+    @property
+    def drawing_canvas(self) -> 'DrawingCanvas | DetachedCanvas':
+        """Bağlı DrawingCanvas; sayfa görünür pencere dışındaysa verisini tutan DetachedCanvas (widget oluşturmaz)."""
+        return self._canvas if self._canvas is not None else self._detached
+
     def get_canvas(self) -> 'DrawingCanvas | None':
-        """Çizim canvas'ını döndürür. Pixmap'ların yüklenmesini sağlar."""
+        """Çizim canvas'ını döndürür. İçeriğin ve pixmap'ların yüklenmesini sağlar.
+
+        Sayfanın widget'ları yoksa oluşturulur (PageManager pencere dışındaki
+        sayfaları sonra yeniden bırakır).
+        """
+        # --- YENİ: Tembel yüklenen sayfa içeriğini çöz ---
+        self.ensure_content_loaded()
         # --- YENİ: Pixmap yüklemesini tetikle ---
         self._ensure_pixmaps_loaded()
         # --- QGraphicsPixmapItem yükleme kısmı zaten kaldırılmıştı ---
-        if hasattr(self, 'drawing_canvas') and self.drawing_canvas:
-            return self.drawing_canvas
-        else:
-            logging.error("Page.get_canvas(): drawing_canvas bulunamadı!")
-            return None
+        if self._canvas is None:
+            if self._view_host is not None:
+                self._view_host(self)
+            else:
+                self.create_view()
+        if self._canvas is None:
+            logging.error("Page.get_canvas(): drawing_canvas oluşturulamadı!")
+        return self._canvas
+
+    # --- YENİ: Sayfa Widget'ları (Görünür Pencere) --- #
+    @property
+    def has_view(self) -> bool:
+        """Sayfanın widget'ları (görünüm ve canvas) oluşturulmuşsa True."""
+        return self._canvas is not None
+
+    def set_view_host(self, host):
+        """get_canvas widget'sız sayfada çağrılınca sayfayı sekmesine bağlayacak geri çağrıyı ayarlar."""
+        self._view_host = host
+
+    def create_view(self) -> QWidget:
+        """Sayfanın görünümünü ve DrawingCanvas'ını oluşturur; saklanan veri canvas'a bağlanır."""
+        if self.view is not None:
+            return self.view
+        view = QWidget()
+        view.setAutoFillBackground(True)
+        palette = view.palette()
+        palette.setColor(QPalette.ColorRole.Window, QColor('white'))
+        view.setPalette(palette)
+        layout = QVBoxLayout(view)
+        layout.setContentsMargins(0, 0, 0, 0)
+        canvas = DrawingCanvas(undo_manager=self.undo_manager, template_settings=self.template_settings)
+        canvas.set_parent_page(self)
+        layout.addWidget(canvas, 1)
+        self._attach_canvas(canvas)
+        self.view = view
+        return view
+
+    def _attach_canvas(self, canvas: DrawingCanvas):
+        state = self._detached
+        canvas.lines = state.lines
+        canvas.shapes = state.shapes
+        canvas.b_spline_strokes = state.b_spline_strokes
+        canvas.b_spline_widget.strokes = canvas.b_spline_strokes
+        for name, value in state.view_state.items():
+            setattr(canvas, name, value)
+        canvas.b_spline_widget.setDefaultStrokeColor(tuple(canvas.current_color))
+        if state.template_settings is not None:
+            canvas.apply_template_settings(state.template_settings)
+        if state.grid_settings is not None:
+            canvas.apply_grid_settings(state.grid_settings)
+        if state.current_tool is not None:
+            canvas.set_tool(state.current_tool)
+        canvas.load_background_template_image()
+        if state._pdf_page_source is not None:
+            canvas.set_pdf_page_background(*state._pdf_page_source, state._page_background_size)
+        elif state._has_page_background:
+            path = state._pdf_background_source_path
+            pixmap = state._page_background_pixmap if state._page_background_pixmap is not None else QPixmap(path)
+            canvas.set_page_background_pixmap(pixmap, path)
+        canvas.item_ids.mark_dirty()
+        canvas.invalidate_cache("Sayfa verisi canvas'a bağlandı")
+        self._canvas = canvas
+        self._detached = None
+        self.undo_manager.canvas = canvas
+
+    def release_view(self):
+        """Görünümü ve canvas'ı bırakır; veri DetachedCanvas'a taşınır, geri al geçmişi sayfada kalır."""
+        canvas = self._canvas
+        if canvas is None:
+            return
+        state = DetachedCanvas()
+        state.lines = canvas.lines
+        state.shapes = canvas.shapes
+        state.b_spline_strokes = canvas.b_spline_strokes
+        state._pdf_page_source = canvas._pdf_page_source
+        state._pdf_background_source_path = canvas._pdf_background_source_path
+        state._page_background_size = canvas._page_background_size
+        state._has_page_background = canvas._has_page_background
+        path = canvas._pdf_background_source_path
+        if canvas._has_page_background and canvas._pdf_page_source is None and not (path and os.path.exists(path)):
+            state._page_background_pixmap = canvas._page_background_pixmap
+        state.current_tool = canvas.current_tool
+        state.view_state = {name: getattr(canvas, name) for name in CANVAS_VIEW_STATE_ATTRS if hasattr(canvas, name)}
+        self._detached = state
+        self._canvas = None
+        self.undo_manager.canvas = state
+        if canvas._pdf_page_source is not None:
+            try:
+                get_pdf_page_renderer().rendered.disconnect(canvas._on_pdf_page_rendered)
+            except (TypeError, RuntimeError):
+                pass
+        canvas.b_spline_widget.deleteLater() # Ebeveynsiz; canvas ile birlikte silinmez
+        view, self.view = self.view, None
+        view.deleteLater()
+    # --- --- --- --- --- --- --- --- --- --- --- --- #
+
+    # --- YENİ: Tembel İçerik Yükleme --- #
+    def set_content_source(self, loader, index: int):
+        """Sayfa içeriğinin daha sonra loader.load_page(index) ile yükleneceğini belirtir."""
+        self._content_source = (loader, index)
+
+    def set_file_chunk(self, chunk):
+        """Sayfanın dosyadaki güncel parçasını kaydeder; içerik henüz çözülmediyse okuyucuyu da yönlendirir."""
+        self.file_chunk = chunk
+        if chunk is not None and self._content_source is not None:
+            loader, index = self._content_source
+            if hasattr(loader, 'relocate'):
+                loader.relocate(index, *chunk)
+
+    @property
+    def has_pending_content(self) -> bool:
+        """İçerik henüz dosyadan çözülmediyse True."""
+        return self._content_source is not None
+
+    def prefetch_content(self):
+        """Bekleyen içeriğin arka planda çözülmesini başlatır."""
+        if self._content_source is not None:
+            loader, index = self._content_source
+            loader.prefetch(index)
+
+    def ensure_content_loaded(self):
+        """Bekleyen içerik varsa çözüp canvas'a uygular (bir kez)."""
+        if self._content_source is None:
+            return
+        loader, index = self._content_source
+        self._content_source = None
+        try:
+            page_content = loader.load_page(index)
+        except Exception as e:
+            logging.error(f"Sayfa {self.page_number} içeriği yüklenemedi: {e}", exc_info=True)
+            return
+        self.apply_loaded_content(page_content)
+
+    def set_loaded_content(self, page_content: dict):
+        """Başka yoldan (ör. NotebookLoader.load_pages) çözülmüş bekleyen içeriği uygular."""
+        if self._content_source is None:
+            return
+        self._content_source = None
+        self.apply_loaded_content(page_content)
+
+    def apply_loaded_content(self, page_content: dict):
+        """Dosyadan çözülmüş sayfa verisini (file_io_helpers.deserialize_page) sayfaya uygular.
+
+        Yükleme bir düzenleme değildir; sayfanın 'değiştirildi' durumu korunur.
+        """
+        was_modified = self._is_modified
+        ink_digest = self.ink_digest
+        canvas = self.drawing_canvas
+
+        # Yüklenen veriyi canvas'a ata
+        canvas.lines = page_content.get('lines', [])
+        canvas.shapes = page_content.get('shapes', [])
+        # --- YENİ: B-Spline strokes verilerini canvas'a ata --- #
+        if 'bspline_strokes' in page_content and hasattr(canvas, 'b_spline_strokes'):
+            canvas.b_spline_strokes = page_content.get('bspline_strokes', [])
+            # ÖNEMLİ: b_spline_widget.strokes referansını güncelle (bu olmadığında görsel olarak çizilmiyor)
+            if hasattr(canvas, 'b_spline_widget') and canvas.b_spline_widget:
+                canvas.b_spline_widget.strokes = canvas.b_spline_strokes
+            logging.debug(f"B-Spline strokes yüklendi: {len(canvas.b_spline_strokes)} adet")
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
+        # --- Resim verisi: pixmap'lar _ensure_pixmaps_loaded ile sonradan yüklenir --- #
+        self.images = []
+        for img_data_loaded in page_content.get('images', []):
+            # Gerekli alanları kontrol et (path veya asset, rect, angle, uuid)
+            if all(k in img_data_loaded for k in ('rect', 'angle', 'uuid')) and (
+                    img_data_loaded.get('asset') or img_data_loaded.get('path')):
+                rect = img_data_loaded['rect']
+                image = {
+                    'uuid': img_data_loaded['uuid'],
+                    'path': img_data_loaded.get('path'),
+                    'rect': QRectF(*rect) if isinstance(rect, list) else rect, # rect list ise QRectF yap
+                    'angle': img_data_loaded['angle'],
+                    'pixmap': None, # Başlangıçta pixmap None
+                    'pixmap_item': None # Başlangıçta None
+                }
+                if img_data_loaded.get('asset'):
+                    image['asset'] = img_data_loaded['asset']
+                self.images.append(image)
+            else:
+                logging.warning(f"Skipping loaded image data due to missing keys: {img_data_loaded}")
+        # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
+        # Sayfa yönü (dizinden zaten atanmış olabilir)
+        loaded_orientation_name = page_content.get('orientation', Orientation.PORTRAIT.name)
+        try:
+            self.orientation = Orientation[loaded_orientation_name]
+        except KeyError:
+            logging.warning(f"Geçersiz orientation değeri '{loaded_orientation_name}' bulundu, varsayılan (PORTRAIT) kullanılıyor.")
+            self.orientation = Orientation.PORTRAIT
+
+        # YENİ: PDF'ten gelen özel arka planı yükle
+        pdf_bg_path = page_content.get('pdf_background_source_path')
+        if pdf_bg_path and background_source_exists(pdf_bg_path):
+            logging.info(f"Sayfa {self.page_number} için PDF arka planı yükleniyor: {pdf_bg_path}")
+            self.set_background_image(pdf_bg_path)
+        elif pdf_bg_path:
+            logging.warning(f"Sayfa {self.page_number} için kayıtlı PDF arka plan yolu ({pdf_bg_path}) bulunamadı.")
+
+        if hasattr(canvas, 'item_ids'):
+            canvas.item_ids.mark_dirty()
+        if hasattr(canvas, 'invalidate_cache'):
+            canvas.invalidate_cache("Sayfa içeriği yüklendi")
+        canvas.update()
+        if not was_modified:
+            self.mark_as_saved()
+            self.ink_digest = ink_digest
+    # --- --- --- --- --- --- --- --- --- #
 
     def get_undo_manager(self) -> UndoRedoManager:
         """Undo/Redo yöneticisini döndürür."""
@@ -95,6 +372,8 @@ class Page(QWidget):
 
     def mark_as_modified(self):
         """Sayfayı 'değiştirildi' olarak işaretler ve sinyal yayınlar."""
+        self.modification_generation += 1
+        self.ink_digest = None
         if not self._is_modified:
             self._is_modified = True
             self.modified_status_changed.emit(True)
@@ -120,8 +399,8 @@ class Page(QWidget):
             self._orientation = orientation # Set internal variable
             logging.debug(f"Page {self.page_number} orientation set to {orientation.name}")
             # Yön değişikliği canvas'ın yeni arkaplan resmini yüklemesini gerektirir
-            if hasattr(self, 'drawing_canvas') and self.drawing_canvas:
-                self.drawing_canvas.load_background_template_image()
+            if self._canvas is not None:
+                self._canvas.load_background_template_image()
             # self.drawing_widget.update() # Bu satır kaldırıldı/yorum yapıldı
 
     # --- Template Property --- #
@@ -140,11 +419,10 @@ class Page(QWidget):
             logging.debug(f"Sayfa {self.page_number} zoom seviyesi: {self.zoom_level:.2f}")
             self.view_changed.emit()
             # self.drawing_canvas.update() # Canvas'ı yeniden çiz -> updateGeometry ile yönetilecek
-            if hasattr(self.drawing_canvas, 'updateGeometry'):
-                self.drawing_canvas.updateGeometry() # Boyut ipuçlarının değiştiğini bildir
-            if hasattr(self.drawing_canvas, 'adjustSize'):
-                 self.drawing_canvas.adjustSize() # Canvas'ı yeni sizeHint'e göre ayarla
-            self.drawing_canvas.update() # Son olarak yeniden çizim yap
+            if self._canvas is not None:
+                self._canvas.updateGeometry() # Boyut ipuçlarının değiştiğini bildir
+                self._canvas.adjustSize() # Canvas'ı yeni sizeHint'e göre ayarla
+                self._canvas.update() # Son olarak yeniden çizim yap
             
     def set_pan(self, pan_offset: QPointF):
         """Kaydırma ofsetini ayarlar ve görünümü günceller."""
@@ -153,7 +431,8 @@ class Page(QWidget):
              self.pan_offset = pan_offset
              logging.debug(f"Sayfa {self.page_number} pan ofseti: ({self.pan_offset.x():.1f}, {self.pan_offset.y():.1f})")
              self.view_changed.emit()
-             self.drawing_canvas.update()
+             if self._canvas is not None:
+                 self._canvas.update()
              
     def reset_view(self):
         """Yakınlaştırma ve kaydırmayı sıfırlar."""
@@ -169,26 +448,45 @@ class Page(QWidget):
             logging.info(f"Sayfa {self.page_number} görünümü sıfırlandı.")
             self.view_changed.emit()
             # self.drawing_canvas.update() 
-            if hasattr(self.drawing_canvas, 'updateGeometry'):
-                self.drawing_canvas.updateGeometry()
-            if hasattr(self.drawing_canvas, 'adjustSize'):
-                self.drawing_canvas.adjustSize()
-            self.drawing_canvas.update()
+            if self._canvas is not None:
+                self._canvas.updateGeometry()
+                self._canvas.adjustSize()
+                self._canvas.update()
 
     # --- YENİ: Pixmap Yükleme Metodu --- #
     def _ensure_pixmaps_loaded(self):
-        """images listesindeki pixmap'ı None olan resimleri yükler."""
+        """images listesindeki pixmap'ı None olan resimleri yükler.
+
+        Resimler içerik özetiyle ('asset') resim deposundan alınır; aynı resmi
+        kullanan tüm sayfalar tek bir QPixmap'ı paylaşır. Yalnızca dosya yolu
+        olan eski resimler depoya taşınır ve sayfa değiştirildi olarak
+        işaretlenir (bir sonraki kayıtta not defterine gömülürler).
+        """
         # logging.debug(f"Page {self.page_number}: Checking if pixmaps need loading...") # Çok sık log olabilir
         pixmaps_loaded = 0
+        store = get_asset_store()
+        migrated = False
         for i, img_data in enumerate(self.images):
-            # Pixmap yoksa VE path varsa yüklemeyi dene
+            if img_data.get('pixmap') is None and img_data.get('asset'):
+                pixmap = store.pixmap(img_data['asset'])
+                if pixmap is not None:
+                    self.images[i]['pixmap'] = pixmap
+                    pixmaps_loaded += 1
+                else:
+                    logging.warning(f"Page {self.page_number}: Image asset {img_data['asset'][:12]} not found for image {i}")
+                continue
+            # Pixmap yoksa VE path varsa yüklemeyi dene (eski biçim)
             if img_data.get('pixmap') is None and img_data.get('path'):
                 img_path = img_data['path']
                 if os.path.exists(img_path):
                     try:
-                        loaded_pixmap = QPixmap(img_path)
-                        if not loaded_pixmap.isNull():
+                        digest = store.add_file(img_path)
+                        loaded_pixmap = store.pixmap(digest) if digest else QPixmap(img_path)
+                        if loaded_pixmap is not None and not loaded_pixmap.isNull():
                             self.images[i]['pixmap'] = loaded_pixmap
+                            if digest:
+                                self.images[i]['asset'] = digest
+                                migrated = True
                             pixmaps_loaded += 1
                             logging.debug(f"Page {self.page_number}: Loaded pixmap for image {i} (UUID: {img_data.get('uuid')}) from {img_path}")
                         else:
@@ -201,6 +499,8 @@ class Page(QWidget):
                     # Dosya bulunamadıysa path'i None yapabiliriz, böylece tekrar denenmez?
                     # self.images[i]['path'] = None 
             # Else: Ya pixmap var ya da path yok, bir şey yapma
+        if migrated:
+            self.mark_as_modified()
         
         # if pixmaps_loaded > 0:
         #     logging.debug(f"Page {self.page_number}: Loaded {pixmaps_loaded} new pixmaps.")
@@ -209,11 +509,30 @@ class Page(QWidget):
     # --- --- --- --- --- --- --- --- --- 
 
     def set_background_image(self, image_path: str):
-        """Verilen yoldaki resmi sayfanın özel arka planı olarak ayarlar."""
+        """Verilen yoldaki resmi ya da PDF sayfası başvurusunu ('belge.pdf#page=3') sayfanın özel arka planı olarak ayarlar."""
+        pdf_reference = parse_page_reference(image_path)
+        if pdf_reference is not None:
+            return self._set_pdf_page_background(*pdf_reference)
         if not os.path.exists(image_path):
             logging.error(f"Page {self.page_number}: Arka plan resmi dosyası bulunamadı: {image_path}")
             return False
 
+        if self._canvas is None:
+            # Widget'sız sayfa: resim bağlanınca yüklenir; burada yalnızca boyutu okunur
+            image_size = QImageReader(image_path).size()
+            if not image_size.isValid():
+                logging.error(f"Page {self.page_number}: Arka plan resmi okunamadı: {image_path}")
+                return False
+            state = self._detached
+            state._pdf_page_source = None
+            state._page_background_pixmap = None
+            state._page_background_size = image_size
+            state._has_page_background = True
+            state._pdf_background_source_path = image_path
+            logging.info(f"Sayfa {self.page_number} için arka plan resmi ayarlandı: {image_path}")
+            self.mark_as_modified()
+            return True
+
         pixmap = QPixmap(image_path)
         if pixmap.isNull():
             logging.error(f"Page {self.page_number}: Arka plan resmi yüklenemedi (null döndü): {image_path}")
@@ -228,9 +547,47 @@ class Page(QWidget):
             logging.error(f"Page {self.page_number}: DrawingCanvas'ta 'set_page_background_pixmap' metodu bulunamadı.")
             return False
 
+    def _set_pdf_page_background(self, pdf_path: str, page_index: int) -> bool:
+        # Sayfa burada çizilmez; yalnızca boyutu okunur
+        page_size = get_pdf_page_renderer().page_size(pdf_path, page_index)
+        if page_size is None:
+            logging.error(f"Page {self.page_number}: PDF sayfası okunamadı: {pdf_path} (sayfa {page_index + 1})")
+            return False
+        if self._canvas is not None:
+            self._canvas.set_pdf_page_background(pdf_path, page_index, page_size)
+        else:
+            state = self._detached
+            state._pdf_page_source = (pdf_path, page_index)
+            state._page_background_pixmap = None
+            state._page_background_size = QSize(page_size)
+            state._has_page_background = True
+            state._pdf_background_source_path = make_page_reference(pdf_path, page_index)
+        logging.info(f"Sayfa {self.page_number} için PDF sayfası arka planı ayarlandı: {pdf_path} (sayfa {page_index + 1})")
+        self.mark_as_modified()
+        return True
+
+    @property
+    def is_pdf_page(self) -> bool:
+        """Sayfanın arka planı bir PDF sayfasına bağlı mı (zoom yalnızca bu sayfalarda kullanılabilir)."""
+        return getattr(self.drawing_canvas, '_pdf_page_source', None) is not None
+
+    @property
+    def pdf_page_source(self):
+        """Arka plandaki PDF sayfası (pdf yolu, sayfa indeksi) ya da None.
+
+        İçerik henüz çözülmediyse kaynak dosyanın sayfa dizininden okunur; sayfa çözülmez.
+        """
+        source = getattr(self.drawing_canvas, '_pdf_page_source', None)
+        if source is None and self._content_source is not None:
+            loader, index = self._content_source
+            source = parse_page_reference(loader.page_meta(index).get('pdf_background_source_path'))
+        return source
+
     def get_canvas_size(self) -> QSize:
-        """Canvas'ın mevcut boyutunu döndürür."""
-        return self.drawing_canvas.size()
+        """Canvas'ın mevcut boyutunu döndürür (widget'sız sayfada arka plan boyutu)."""
+        if self._canvas is not None:
+            return self._canvas.size()
+        return QSize(self._detached._page_background_size or QSize(600, 800))
 
     def get_page_data_for_export(self) -> dict:
         """Bu sayfanın içeriğini (çizgiler, şekiller, resimler)
@@ -249,6 +606,7 @@ class Page(QWidget):
             # Bu metod, resimlerin yollarını, konumlarını, boyutlarını ve açılarını döndürmeli.
             if hasattr(self.drawing_canvas, 'get_image_export_data'):
                 canvas_data['images'] = self.drawing_canvas.get_image_export_data()
+            canvas_data['bspline_strokes'] = getattr(self.drawing_canvas, 'b_spline_strokes', [])
             
             # YENİ: PDF'ten gelen özel arka planın yolunu ekle
             if hasattr(self.drawing_canvas, '_pdf_background_source_path'):
@@ -1,8 +1,22 @@
-from PyQt6.QtWidgets import QStackedWidget, QWidget, QMessageBox, QApplication, QTabWidget, QMainWindow, QScrollArea
-from PyQt6.QtCore import pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QStackedWidget, QWidget, QMessageBox, QApplication, QTabWidget, QMainWindow, QScrollArea, QToolButton, QVBoxLayout
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QTimer
 import logging
 
 from .page import Page # Page sınıfını import et
+from .enums import Orientation
+from utils.asset_store import get_asset_store
+
+# --- YENİ: Sekmede Sayfanın Yerini Tutan Widget --- #
+class _PageSlot(QWidget):
+    """Sekmede sayfanın yerini tutar; sayfa görünür penceredeyken ScrollArea'sını (görünüm + canvas) taşır."""
+
+    def __init__(self, page: Page):
+        super().__init__()
+        self.page = page
+        self.scroll_area: QScrollArea | None = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+# --- --- --- --- --- --- --- --- --- --- --- --- --- #
 
 class PageManager(QTabWidget):
     """Birden fazla not sayfasını (Page) yönetir."""
@@ -14,6 +28,14 @@ class PageManager(QTabWidget):
     def __init__(self, parent=None, template_settings: dict | None = None):
         super().__init__(parent)
         self.pages: list[Page] = []
+        self.notebook_loader = None # YENİ: Tembel yüklenen not defterinin okuyucusu (utils.notebook_loader)
+        self.prefetch_radius = 1 # YENİ: Aktif sayfanın kaç komşusu arka planda önceden çözülsün
+        self.render_pool_radius = 1 # YENİ: Aktif sayfanın kaç komşusu widget'larını (canvas, cache, arka plan) tutsun
+        self._bound_slots: set[_PageSlot] = set() # YENİ: Widget'ları oluşturulmuş sayfaların sekmeleri
+        self._trim_scheduled = False
+        self._bulk_loading = False # YENİ: Toplu sayfa oluştururken içerik yükleme/ön yükleme yapılmaz
+        self.journal = None # YENİ: Komutları kaydeden işlem günlüğü (utils.operation_journal), MainWindow atar
+        self.pdf_importer = None # YENİ: Arka planda süren PDF içe aktarma (utils.pdf_importer)
         self.template_settings = template_settings if template_settings is not None else {} # Ayarları sakla
         # --- YENİ: MainWindow referansını sakla --- #
         self.main_window = parent # PageManager'ın parent'ı MainWindow olmalı
@@ -22,8 +44,13 @@ class PageManager(QTabWidget):
             logging.warning("PageManager başlatılırken parent MainWindow değil!")
             self.main_window = None # Referansı sıfırla
         # --- --- --- --- --- --- --- --- --- --- --- #
-        self.setTabsClosable(True)
-        self.tabCloseRequested.connect(self.remove_page)
+        # Sekme başına kapatma düğmesi sekme eklemeyi sayfa sayısıyla yavaşlatır; tek düğme aktif sayfayı kapatır
+        close_button = QToolButton(self)
+        close_button.setText("✕")
+        close_button.setToolTip("Sayfayı Kapat")
+        close_button.setAutoRaise(True)
+        close_button.clicked.connect(self.remove_current_page)
+        self.setCornerWidget(close_button)
         self.currentChanged.connect(self._on_current_changed)
         logging.info("PageManager başlatıldı.")
 
@@ -38,14 +65,7 @@ class PageManager(QTabWidget):
 
     def get_current_page(self) -> Page | None:
         """Aktif sayfayı (Page nesnesi) döndürür."""
-        # --- DEĞİŞİKLİK: ScrollArea'dan widget'ı al --- #
-        scroll_area = self.currentWidget()
-        if isinstance(scroll_area, QScrollArea):
-            page_widget = scroll_area.widget()
-            if isinstance(page_widget, Page):
-                return page_widget
-        # --- --- --- --- --- --- --- --- --- --- --- -- #
-        return None
+        return self._page_at(self.currentIndex())
 
     def add_page(self, page: Page | None = None, create_new: bool = True):
         """Yeni bir sayfa ekler veya var olanı ekler.
@@ -78,25 +98,17 @@ class PageManager(QTabWidget):
              logging.error("add_page: Ne yeni sayfa oluşturulacak ne de var olan sayfa verildi.")
              return None
 
-        # --- YENİ: Sayfayı ScrollArea içine koy --- #
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True) # İçerik boyutuna uyum sağla
-        scroll_area.setWidget(new_page)      # Page'i scroll area'nın widget'ı yap
+        # --- YENİ: Sekmeye yalnızca yer tutucu eklenir; widget'lar sayfa görünür pencereye girince oluşturulur --- #
+        slot = self._create_slot(new_page)
         # --- --- --- --- --- --- --- --- --- --- -- #
 
-        # YENİ: Event Filter Kurulumu (DrawingCanvas için)
-        if hasattr(new_page, 'drawing_canvas') and new_page.drawing_canvas:
-            scroll_area.viewport().installEventFilter(new_page.drawing_canvas)
-            logging.debug(f"Event filter installed on ScrollArea viewport for Page {new_page_number}")
-        else:
-            logging.warning(f"Event filter KURULAMADI: Page {new_page_number} için drawing_canvas bulunamadı.")
-
         # Sekme başlığını oluştur
         tab_title = f"Sayfa {new_page_number}"
 
-        # Sekmeyi ekle (ScrollArea'yı ekle)
-        index = self.addTab(scroll_area, tab_title)
-        self.setCurrentIndex(index) # Yeni eklenen sekmeyi aktif yap
+        # Sekmeyi ekle (yer tutucuyu ekle)
+        index = self.addTab(slot, tab_title)
+        if not self._bulk_loading: # Toplu yüklemede her sayfa tek tek etkinleştirilmez
+            self.setCurrentIndex(index) # Yeni eklenen sekmeyi aktif yap
 
         self.page_count_changed.emit(self.count(), self.currentIndex())
         logging.info(f"Sayfa eklendi. Toplam sayfa: {self.count()}")
@@ -112,29 +124,21 @@ class PageManager(QTabWidget):
             logging.warning("Son sayfa silinemez.")
             return
 
-        # --- DEĞİŞİKLİK: ScrollArea'yı al ve içindeki Page'e eriş --- #
-        scroll_area_to_remove = self.widget(index)
-        if isinstance(scroll_area_to_remove, QScrollArea):
-            page_to_remove = scroll_area_to_remove.widget()
-            if isinstance(page_to_remove, Page):
-                page_number = page_to_remove.page_number
-                self.removeTab(index) # Sekmeyi (ScrollArea içeren) kaldır
-                # Page widget'ının bellekten silinmesini planla
-                page_to_remove.deleteLater()
-                # ScrollArea'nın da silinmesini planlayabiliriz, QTabWidget otomatik yapmıyorsa
-                scroll_area_to_remove.deleteLater()
-                # self.pages listesini kullanmıyoruz artık
-                # if page_to_remove in self.pages:
-                #      self.pages.remove(page_to_remove)
-
-                logging.info(f"Sayfa {page_number} (Indeks: {index}) silindi.")
-                self.page_count_changed.emit(self.page_count(), self.current_index())
-            else:
-                logging.error(f"Silinmeye çalışılan ScrollArea içindeki widget bir Page değil: Indeks {index}")
-                self.removeTab(index) # Sorunlu sekmeyi yine de kaldır
-                scroll_area_to_remove.deleteLater()
+        # --- DEĞİŞİKLİK: Yer tutucuyu al; sayfanın widget'larını bırak --- #
+        slot_to_remove = self.widget(index)
+        if isinstance(slot_to_remove, _PageSlot):
+            page_to_remove = slot_to_remove.page
+            page_number = page_to_remove.page_number
+            self._release_slot(slot_to_remove)
+            self.removeTab(index) # Sekmeyi kaldır
+            # Sayfanın ve yer tutucunun bellekten silinmesini planla
+            page_to_remove.deleteLater()
+            slot_to_remove.deleteLater()
+
+            logging.info(f"Sayfa {page_number} (Indeks: {index}) silindi.")
+            self.page_count_changed.emit(self.page_count(), self.current_index())
         else:
-            logging.error(f"Silinmeye çalışılan widget bir QScrollArea değil: Indeks {index}")
+            logging.error(f"Silinmeye çalışılan widget bir sayfa sekmesi değil: Indeks {index}")
         # --- --- --- --- --- --- --- --- --- --- --- --- --- --- -- #
 
     def remove_current_page(self):
@@ -151,69 +155,253 @@ class PageManager(QTabWidget):
         prev_index = (self.current_index() - 1 + self.page_count()) % self.page_count()
         self.setCurrentIndex(prev_index)
 
+    def cancel_pdf_import(self):
+        """Süren PDF içe aktarmayı durdurur; eklenmiş sayfalar kalır."""
+        if self.pdf_importer is not None:
+            importer, self.pdf_importer = self.pdf_importer, None
+            importer.cancel()
+
     def clear_all_pages(self):
         """Tüm not sayfalarını widget'tan ve listeden kaldırır."""
         logging.info("Tüm sayfalar temizleniyor...")
-        for i in range(self.count() - 1, -1, -1):
-            # --- DEĞİŞİKLİK: ScrollArea ve içindeki Page'i sil --- #
-            scroll_area = self.widget(i)
-            self.removeTab(i)
-            if isinstance(scroll_area, QScrollArea):
-                page_widget = scroll_area.widget()
-                if isinstance(page_widget, Page):
-                    page_widget.deleteLater()
-                scroll_area.deleteLater() # ScrollArea'yı da sil
-            else:
-                 logging.warning(f"clear_all_pages: QScrollArea olmayan bir widget bulundu ve kaldırıldı: {scroll_area}")
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- #
+        self.cancel_pdf_import()
+        # Silinen sayfalar arası aktif sekme geçişleri sayfa etkinleştirmemeli (widget oluşturmamalı)
+        self.blockSignals(True)
+        try:
+            for i in range(self.count() - 1, -1, -1):
+                # --- DEĞİŞİKLİK: Yer tutucuyu ve sayfayı sil --- #
+                slot = self.widget(i)
+                self.removeTab(i)
+                if isinstance(slot, _PageSlot):
+                    self._release_slot(slot)
+                    slot.page.deleteLater()
+                else:
+                     logging.warning(f"clear_all_pages: Sayfa sekmesi olmayan bir widget bulundu ve kaldırıldı: {slot}")
+                slot.deleteLater()
+                # --- --- --- --- --- --- --- --- --- --- --- --- --- #
+        finally:
+            self.blockSignals(False)
+        self._bound_slots.clear()
+
+        # Önceki not defterinin bekleyen ön yüklemelerini iptal et
+        if self.notebook_loader is not None:
+            self.notebook_loader.close()
+            self.notebook_loader = None
+        get_asset_store().clear()
                 
         logging.info(f"Tüm sayfalar temizlendi. Kalan sayfa: {self.count()}")
         self.page_count_changed.emit(0, -1)
 
+    # --- YENİ: Tembel Not Defteri Yükleme --- #
+    def load_from_notebook(self, loader) -> int:
+        """NotebookLoader'daki her sayfa için boş bir Page oluşturur; içerikler ilk etkinleştirmede çözülür.
+
+        Açılışta yalnızca sayfa dizinindeki hafif alanlar (yön) uygulanır.
+        Oluşturulan sayfa sayısını döndürür.
+        """
+        self.notebook_loader = loader
+        get_asset_store().attach(loader.filepath, loader.assets)
+        created = 0
+        self._bulk_loading = True
+        try:
+            for index in range(loader.page_count):
+                new_page = self.add_page(create_new=True)
+                if not new_page: # Ekleme başarısızsa atla
+                    logging.error("Yeni sayfa yükleme sırasında oluşturulamadı.")
+                    continue
+                meta = loader.page_meta(index)
+                try:
+                    new_page.orientation = Orientation[meta['orientation']]
+                except KeyError:
+                    new_page.orientation = Orientation.PORTRAIT
+                new_page.ink_digest = meta.get('ink_digest')
+                new_page.set_content_source(loader, index)
+                new_page.set_file_chunk(loader.file_chunk(index))
+                created += 1
+        finally:
+            self._bulk_loading = False
+        # İlk sayfa gösterilir; yalnızca o (ve komşuları) çözülür
+        if self.count() > 0 and self.currentIndex() != 0:
+            self.setCurrentIndex(0)
+        else:
+            self._activate_page_content(self.currentIndex())
+        return created
+
+    def _page_at(self, index: int) -> Page | None:
+        slot = self.widget(index)
+        return slot.page if isinstance(slot, _PageSlot) else None
+
+    # --- YENİ: Sayfa Widget'ları Yalnızca Görünür Pencerede --- #
+    def _create_slot(self, page: Page) -> _PageSlot:
+        slot = _PageSlot(page)
+        page.set_view_host(lambda page, slot=slot: self._bind_slot(slot))
+        # Sayfanın komutlarını işlem günlüğüne ilet
+        page.undo_manager.command_applied.connect(
+            lambda operation, command, page=page: self._on_page_command(page, operation, command))
+        return slot
+
+    def _bind_slot(self, slot: _PageSlot):
+        """Sayfanın görünümünü ve canvas'ını oluşturup sekmesine yerleştirir."""
+        if slot.scroll_area is not None:
+            return
+        page = slot.page
+        view = page.create_view()
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True) # İçerik boyutuna uyum sağla
+        scroll_area.setWidget(view)
+        # Event Filter Kurulumu (DrawingCanvas için)
+        scroll_area.viewport().installEventFilter(page.drawing_canvas)
+        slot.layout().addWidget(scroll_area)
+        slot.scroll_area = scroll_area
+        self._bound_slots.add(slot)
+        # Pencere dışında oluşturulduysa (ör. tüm sayfaları gezen bir işlem) sonra bırakılır
+        index = self.indexOf(slot)
+        if abs(index - self.currentIndex()) > self.render_pool_radius:
+            self._schedule_trim()
+
+    def _release_slot(self, slot: _PageSlot):
+        """Sayfanın widget'larını bırakır; veri ve geri al geçmişi sayfada kalır."""
+        if slot.scroll_area is None:
+            return
+        scroll_area, slot.scroll_area = slot.scroll_area, None
+        scroll_area.takeWidget()
+        slot.page.release_view()
+        scroll_area.deleteLater()
+        self._bound_slots.discard(slot)
+
+    def _schedule_trim(self):
+        if not self._trim_scheduled:
+            self._trim_scheduled = True
+            QTimer.singleShot(0, self._trim_views)
+
+    def _trim_views(self):
+        self._trim_scheduled = False
+        self._update_view_window(self.currentIndex())
+
+    def _update_view_window(self, index: int):
+        """Sayfa widget'larını yalnızca aktif sayfa ve komşularında tutar.
+
+        Pencere dışındaki sayfaların canvas'ları (tam boy cache pixmap'ları ve
+        arka planlarıyla) bırakılır; sayfa verisi ve geri al geçmişi Page'de
+        kaldığı için etkilenmez. Maliyet sayfa sayısıyla değil pencere
+        boyutuyla orantılıdır.
+        """
+        first = max(0, index - self.render_pool_radius)
+        last = min(self.count() - 1, index + self.render_pool_radius)
+        released = 0
+        for slot in list(self._bound_slots):
+            if not first <= self.indexOf(slot) <= last:
+                self._release_slot(slot)
+                released += 1
+        if index < 0:
+            return
+        for i in range(first, last + 1):
+            slot = self.widget(i)
+            if isinstance(slot, _PageSlot):
+                self._bind_slot(slot)
+                if i != index and not slot.page.has_pending_content:
+                    slot.page.drawing_canvas.preload_page_background()
+        if released:
+            logging.debug(f"Görünür pencere: {released} sayfanın widget'ları bırakıldı (aktif: {index}, pencere: {first}-{last})")
+    # --- --- --- --- --- --- --- --- --- #
+
+    def ensure_all_content_loaded(self, progress_callback=None) -> int:
+        """Henüz çözülmemiş tüm sayfa içeriklerini yükler (PDF'e aktarma, JSON'a kaydetme öncesi).
+
+        Sayfalar NotebookLoader.load_pages ile toplu çözülür: her sayfa
+        uygulanırken sıradaki arka planda önceden çözülür.
+        Yüklenen sayfa sayısını döndürür.
+        """
+        return self.ensure_pages_loaded([self._page_at(i) for i in range(self.count())], progress_callback)
+
+    def ensure_pages_loaded(self, pages, progress_callback=None) -> int:
+        """Verilen sayfalardan içeriği henüz çözülmemiş olanları toplu yükler (bkz. ensure_all_content_loaded)."""
+        pending = {}
+        for page in pages:
+            if page is not None and page.has_pending_content:
+                loader, index = page._content_source
+                if loader is self.notebook_loader:
+                    pending[index] = page
+                else:
+                    page.ensure_content_loaded()
+        if not pending:
+            return 0
+        loaded = 0
+        try:
+            for index, content in self.notebook_loader.load_pages(sorted(pending), progress_callback):
+                pending[index].set_loaded_content(content)
+                loaded += 1
+        except Exception as e:
+            logging.error(f"Sayfalar toplu yüklenirken hata: {e}", exc_info=True)
+        # Hata durumunda kalanlar tek tek denenir
+        for page in pending.values():
+            page.ensure_content_loaded()
+        logging.info(f"Bekleyen {loaded} sayfa içeriği toplu yüklendi.")
+        return loaded
+
+    def _activate_page_content(self, index: int):
+        """Sayfanın içeriğini yükler ve komşularını arka planda önceden çözmeye başlar."""
+        page = self._page_at(index)
+        if page is None or self._bulk_loading:
+            return
+        if page.has_pending_content:
+            # Önce komşuları kuyruğa al: aktif sayfa ana iş parçacığında çözülürken onlar hazırlanır
+            self._prefetch_neighbors(index)
+            page.ensure_content_loaded()
+        self._prefetch_neighbors(index)
+        self._update_view_window(index)
+
+    def _prefetch_neighbors(self, index: int):
+        for offset in range(1, self.prefetch_radius + 1):
+            for neighbor_index in (index + offset, index - offset):
+                if 0 <= neighbor_index < self.count():
+                    neighbor = self._page_at(neighbor_index)
+                    if neighbor is not None and neighbor.has_pending_content:
+                        neighbor.prefetch_content()
+    # --- --- --- --- --- --- --- --- --- #
+
+    def _on_page_command(self, page: Page, operation: str, command):
+        if self.journal is not None:
+            self.journal.record_command(page, operation, command)
+
     def has_unsaved_changes(self) -> bool:
         """Yönetilen sayfalardan herhangi birinde kaydedilmemiş değişiklik olup olmadığını kontrol eder."""
         for i in range(self.count()):
-            # --- DEĞİŞİKLİK: ScrollArea içindeki Page'i kontrol et --- #
-            scroll_area = self.widget(i)
-            if isinstance(scroll_area, QScrollArea):
-                page_widget = scroll_area.widget()
-                if isinstance(page_widget, Page) and page_widget.is_modified:
-                    return True
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- -- #
+            page = self._page_at(i)
+            if page is not None and page.is_modified:
+                return True
         return False
 
     def mark_all_pages_as_saved(self):
         """Yönetilen tüm sayfaları 'kaydedildi' olarak işaretler."""
         logging.debug("Tüm sayfalar kaydedildi olarak işaretleniyor...")
         for i in range(self.count()):
-            # --- DEĞİŞİKLİK: ScrollArea içindeki Page'i işaretle --- #
-            scroll_area = self.widget(i)
-            if isinstance(scroll_area, QScrollArea):
-                page_widget = scroll_area.widget()
-                if isinstance(page_widget, Page):
-                    page_widget.mark_as_saved()
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- -- #
+            page = self._page_at(i)
+            if page is not None:
+                page.mark_as_saved()
 
     @pyqtSlot(int)
     def _on_current_changed(self, index: int):
         """QTabWidget'in currentChanged sinyaline bağlı slot."""
-        # --- DEĞİŞİKLİK: ScrollArea içindeki Page'i al ve sinyali gönder --- #
-        scroll_area = self.widget(index)
-        if isinstance(scroll_area, QScrollArea):
-            current_page = scroll_area.widget()
-            if isinstance(current_page, Page):
-                logging.debug(f"Aktif sayfa değişti: Indeks {index}, Sayfa No {current_page.page_number}")
-                self.current_page_changed.emit(current_page)
-            else:
-                 logging.warning(f"Aktif widget bir QScrollArea ama içindeki Page değil: Indeks {index}")
-        elif scroll_area is not None: # Eğer None değilse ama ScrollArea da değilse, bu bir sorun
-            logging.error(f"Aktif widget bir QScrollArea değil: Indeks {index}, Tip: {type(scroll_area)}")
+        # --- DEĞİŞİKLİK: Yer tutucudaki Page'i al ve sinyali gönder --- #
+        current_page = self._page_at(index)
+        if current_page is not None:
+            logging.debug(f"Aktif sayfa değişti: Indeks {index}, Sayfa No {current_page.page_number}")
+            # YENİ: Tembel yüklenen içerik ilk etkinleştirmede çözülür; pencere widget'ları oluşturulur
+            self._activate_page_content(index)
+            self.current_page_changed.emit(current_page)
+        elif self.widget(index) is not None: # Eğer None değilse ama sayfa sekmesi de değilse, bu bir sorun
+            logging.error(f"Aktif widget bir sayfa sekmesi değil: Indeks {index}, Tip: {type(self.widget(index))}")
         # index == -1 durumu (hiç tab kalmayınca) olabilir, bu durumda current_page None olur.
         # current_page_changed(None) sinyali göndermeli miyiz? MainWindow bunu handle etmeli.
         # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- -- # 
 
-    def add_page_from_image(self, image_path: str):
-        """Verilen yoldaki resmi arka plan olarak kullanan yeni bir sayfa ekler."""
+    def add_page_from_image(self, image_path: str, make_current: bool = True):
+        """Verilen yoldaki resmi arka plan olarak kullanan yeni bir sayfa ekler.
+
+        make_current=False ise (ör. arka planda PDF içe aktarılırken) aktif sayfa
+        değişmez; görüntüleme penceresi dışındaki sayfanın arka planı hemen bırakılır.
+        """
         # Yeni sayfa numarası, mevcut sayfa sayısına göre belirlenir
         new_page_number = self.count() + 1
         default_orientation = "portrait" # Varsayılan, ayarlanabilir
@@ -232,30 +420,21 @@ class PageManager(QTabWidget):
         if hasattr(new_page, 'set_background_image'):
             success = new_page.set_background_image(image_path)
             logging.info(f"Sayfa {new_page_number} için arka plan resmi ayarlandı: {image_path}")
-        elif hasattr(new_page.get_canvas(), 'set_background_image'):
-            success = new_page.get_canvas().set_background_image(image_path)
-            logging.info(f"Sayfa {new_page_number} canvas'ı için arka plan resmi ayarlandı: {image_path}")
         else:
             logging.warning(f"Page veya Canvas üzerinde `set_background_image` metodu bulunamadı. Arka plan ayarlanamadı: {image_path}")
             # Arka plan ayarlanamazsa bile sayfayı ekleyebiliriz veya hata verebiliriz.
             # Şimdilik devam edelim.
         
-        # Sayfayı ScrollArea içine yerleştirip ekle
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(new_page)
-
-        # Event Filter Kurulumu (DrawingCanvas için)
-        if hasattr(new_page, 'drawing_canvas') and new_page.drawing_canvas:
-            scroll_area.viewport().installEventFilter(new_page.drawing_canvas)
-            logging.debug(f"Event filter (from image) installed on ScrollArea viewport for Page {new_page_number}")
-        else:
-            logging.warning(f"Event filter (from image) KURULAMADI: Page {new_page_number} için drawing_canvas bulunamadı.")
+        # Sayfayı yer tutucuyla ekle; widget'ları görünür pencereye girince oluşturulur
+        slot = self._create_slot(new_page)
 
         # Sayfa başlığını ayarla ve sekmeyi ekle
         tab_title = f"Sayfa {new_page_number}"
-        index = self.addTab(scroll_area, tab_title)
-        self.setCurrentIndex(index)  # Yeni eklenen sayfayı aktif yap
+        index = self.addTab(slot, tab_title)
+        if make_current or self.count() == 1:
+            self.setCurrentIndex(index)  # Yeni eklenen sayfayı aktif yap
+        elif abs(index - self.currentIndex()) <= self.render_pool_radius:
+            self._bind_slot(slot)
         
         # Sayfa sayısı değişikliği bildirimi
         self.page_count_changed.emit(self.count(), index)
@@ -268,17 +447,9 @@ class PageManager(QTabWidget):
         """Tüm sayfalardaki DrawingCanvas nesnelerine verilen grid ayarlarını uygular."""
         logging.debug(f"apply_grid_settings_to_all_canvases çağrıldı: {settings_dict}")
         for i in range(self.count()):
-            scroll_area = self.widget(i)
-            if isinstance(scroll_area, QScrollArea):
-                page_widget = scroll_area.widget()
-                if isinstance(page_widget, Page) and hasattr(page_widget, 'drawing_canvas') and page_widget.drawing_canvas:
-                    if hasattr(page_widget.drawing_canvas, 'apply_grid_settings'):
-                        page_widget.drawing_canvas.apply_grid_settings(settings_dict)
-                        # logging.debug(f"  Ayarlar Sayfa {page_widget.page_number} canvas'ına uygulandı.")
-                    else:
-                        logging.warning(f"  Sayfa {page_widget.page_number} canvas'ında 'apply_grid_settings' metodu bulunamadı.")
-                # else:
-                #     logging.debug(f"  Sekme {i} bir Page veya drawing_canvas içermiyor.")
-            # else:
-            #     logging.debug(f"  Sekme {i} bir QScrollArea değil.")
+            page = self._page_at(i)
+            if page is not None:
+                # Widget'sız sayfada ayarlar saklanır ve canvas oluşturulunca uygulanır
+                page.drawing_canvas.apply_grid_settings(settings_dict)
+                # logging.debug(f"  Ayarlar Sayfa {page.page_number} canvas'ına uygulandı.")
     # --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
\ No newline at end of file
@@ -84,6 +84,16 @@ class TemplateSettingsDialog(QDialog):
         }
         for text, dpi_val in self.pdf_dpi_options.items():
             self.pdf_dpi_combo.addItem(text, userData=dpi_val)
+
+        # --- YENİ: PDF Kalem Çizgisi Sadeleştirme ---
+        self.pdf_stroke_tolerance_spin = QDoubleSpinBox()
+        self.pdf_stroke_tolerance_spin.setRange(0.0, 2.0)
+        self.pdf_stroke_tolerance_spin.setSingleStep(0.05)
+        self.pdf_stroke_tolerance_spin.setDecimals(2)
+        self.pdf_stroke_tolerance_spin.setSuffix(" pt")
+        self.pdf_stroke_tolerance_spin.setSpecialValueText("Kapalı")
+        self.pdf_stroke_tolerance_spin.setToolTip(
+            "PDF'e aktarılan kalem çizgilerinin en fazla sapması. Daha büyük değerler daha küçük dosya üretir.")
         
         # --- YENİ: Varsayılan Sayfa Yönü ---
         self.page_orientation_combo = QComboBox()
@@ -101,6 +111,7 @@ class TemplateSettingsDialog(QDialog):
         form_layout.addRow("Izgara Aralığı:", self.grid_spacing_spin)
         form_layout.addRow("Izgara Rengi:", self.grid_color_button)
         form_layout.addRow("PDF Resim Çözünürlüğü:", self.pdf_dpi_combo)
+        form_layout.addRow("PDF Çizgi Sadeleştirme:", self.pdf_stroke_tolerance_spin)
         form_layout.addRow("Varsayılan Sayfa Yönü:", self.page_orientation_combo)
 
         # --- YENİ: Şablon Oluşturma Butonu ---
@@ -182,6 +193,7 @@ class TemplateSettingsDialog(QDialog):
         else: # Varsayılan olarak 150 DPI (veya listedeki ilk uygun olan)
             default_dpi_index = self.pdf_dpi_combo.findData(150)
             self.pdf_dpi_combo.setCurrentIndex(default_dpi_index if default_dpi_index !=-1 else 0)
+        self.pdf_stroke_tolerance_spin.setValue(float(self.current_settings.get('pdf_export_stroke_tolerance_pt', 0.25)))
 
         # --- YENİ: Sayfa Yönü ---
         current_orientation = self.current_settings.get('default_page_orientation', "portrait")
@@ -277,6 +289,7 @@ class TemplateSettingsDialog(QDialog):
             settings['pdf_export_image_dpi'] = int(selected_dpi_data)
         else: # Bir sorun olursa varsayılan
             settings['pdf_export_image_dpi'] = 150 
+        settings['pdf_export_stroke_tolerance_pt'] = self.pdf_stroke_tolerance_spin.value()
 
         selected_orientation_data = self.page_orientation_combo.currentData()
         if selected_orientation_data is not None:
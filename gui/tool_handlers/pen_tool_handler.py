@@ -13,6 +13,17 @@ from utils.commands import DrawLineCommand, EraseCommand
 if TYPE_CHECKING:
     from ..drawing_canvas import DrawingCanvas # ../drawing_canvas.py olarak düzeltildi
 
+def _event_timestamp(event) -> float | None:
+    """Olayın zaman damgasını saniye cinsinden döndürür (yoksa None)."""
+    try:
+        return event.timestamp() / 1000.0 if event is not None and hasattr(event, 'timestamp') else None
+    except Exception:
+        return None
+
+def _canvas_zoom(canvas: 'DrawingCanvas') -> float:
+    page = getattr(canvas, '_parent_page', None)
+    return getattr(page, 'zoom_level', 1.0) or 1.0
+
 def handle_pen_press(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEvent):
     """Kalem basma olayını yönetir."""
     # logging.debug(f"handle_pen_press: Tool={canvas.current_tool.name}, WorldPos={pos}, Button={event.button()}")
@@ -45,11 +56,16 @@ def handle_pen_press(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEvent)
         logging.debug("Pen Press: Start drawing line.")
         canvas.drawing = True
         canvas.temporary_erasing = False # Geçici silmeyi kapat
-        canvas.current_line_points = [pos]
+        # Girdi ön işleme aşaması: ilk nokta her zaman tutulur
+        canvas.current_line_points = canvas.input_processor.begin(pos, _canvas_zoom(canvas), _event_timestamp(event))
     # canvas.update() # Bu, ana tablet handler'da çağrılmalı veya DrawingCanvas kendi içinde yönetmeli
 
-def handle_pen_move(canvas: 'DrawingCanvas', pos: QPointF):
-    """Kalem hareket olayını yönetir."""
+def handle_pen_move(canvas: 'DrawingCanvas', pos: QPointF, event: QTabletEvent | None = None):
+    """Kalem hareket olayını yönetir.
+
+    Örnekler doğrudan vuruş tamponuna eklenmez; önce canvas.input_processor
+    (tekrar atma, yumuşatma, seyreltme) aşamasından geçer.
+    """
     # logging.debug(f"handle_pen_move: Drawing={canvas.drawing}, TempErasing={canvas.temporary_erasing}, WorldPos={pos}")
     if canvas.temporary_erasing: # Eğer geçici silme modundaysak
         if not canvas.erasing: # Bir şekilde erasing kapandıysa (beklenmedik)
@@ -67,7 +83,7 @@ def handle_pen_move(canvas: 'DrawingCanvas', pos: QPointF):
         canvas.last_move_pos = pos # Son konumu güncelle
         canvas.update() # Geçici silgi yolunu göstermek için güncelle
     elif canvas.drawing: # Normal çizim modundaysak
-        canvas.current_line_points.append(pos)
+        canvas.current_line_points.extend(canvas.input_processor.add(pos, _event_timestamp(event)))
         # canvas.update() # Çizgiyi anlık olarak göstermek için güncelle
 
 def handle_pen_release(canvas: 'DrawingCanvas', pos: QPointF, event):
@@ -113,6 +129,9 @@ def handle_pen_release(canvas: 'DrawingCanvas', pos: QPointF, event):
     # --- NORMAL ÇİZİM KONTROLÜ --- #
     elif canvas.drawing and canvas.current_line_points:
         #logging.debug("Pen Release: Finalizing drawing line.")
+        # Seyreltmede bekleyen son örneği ve bırakma noktasını ekle (uç nokta korunur)
+        canvas.current_line_points.extend(canvas.input_processor.finish(pos, _event_timestamp(event)))
+        canvas.stroke_input_finished.emit(canvas.input_processor.last_stats)
         if len(canvas.current_line_points) > 1: # En az 2 nokta varsa çizgi oluştur
             final_points = [QPointF(p.x(), p.y()) for p in canvas.current_line_points]
             line_data = [
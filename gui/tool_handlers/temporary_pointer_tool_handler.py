@@ -23,6 +23,7 @@ def handle_temporary_drawing_move(canvas: 'DrawingCanvas', pos: QPointF, event):
     """Geçici çizim aracı için hareket olayını yönetir."""
     if canvas.temporary_drawing_active:
         canvas.current_temporary_line_points.append((pos, time.time()))
+        canvas.start_pointer_animations()
         canvas.update() # Geçici çizgiyi anlık göstermek için güncelle
 
 def handle_temporary_drawing_release(canvas: 'DrawingCanvas', pos: QPointF, event):
@@ -43,6 +44,7 @@ def handle_temporary_drawing_release(canvas: 'DrawingCanvas', pos: QPointF, even
         ])
     canvas.temporary_drawing_active = False
     canvas.current_temporary_line_points = [] # Her zaman temizle
+    canvas.start_pointer_animations() # Solma animasyonu ortak zamanlayıcıyla sürer
     canvas.update() # Canvas'ı son durumu yansıtacak şekilde güncelle
 
     # --- Undo/redo butonlarını güncelle (MainWindow üzerinden) ---
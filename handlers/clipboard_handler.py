@@ -25,33 +25,30 @@ def handle_copy_selection(canvas) -> bool:
         return False
     global _CLIPBOARD
     _CLIPBOARD['items'] = []
-    for item_type, idx in canvas.selected_item_indices:
-        if item_type == 'lines' and 0 <= idx < len(canvas.lines):
-            _CLIPBOARD['items'].append(('lines', copy.deepcopy(canvas.lines[idx])))
-        elif item_type == 'shapes' and 0 <= idx < len(canvas.shapes):
-            # Şekil tipine göre kontrol yap - düzenlenebilir çizgi için özel işlem
-            shape_data = canvas.shapes[idx]
-            if len(shape_data) > 0 and shape_data[0] == ToolType.EDITABLE_LINE:
-                # Düzenlenebilir çizgi özel formatı
-                editable_line_data = copy.deepcopy(shape_data)
-                _CLIPBOARD['items'].append(('shapes', editable_line_data))
-                logging.debug(f"handle_copy_selection: Düzenlenebilir çizgi kopyalandı: {editable_line_data}")
-            else:
-                # Normal şekiller
-                _CLIPBOARD['items'].append(('shapes', copy.deepcopy(shape_data)))
-        elif item_type == 'bspline_strokes' and hasattr(canvas, 'b_spline_strokes') and 0 <= idx < len(canvas.b_spline_strokes):
-            # B-Spline özel işlemi
-            bspline_data = copy.deepcopy(canvas.b_spline_strokes[idx])
-            _CLIPBOARD['items'].append(('bspline_strokes', bspline_data))
-            logging.debug(f"handle_copy_selection: B-Spline kopyalandı: {idx}")
-        elif item_type == 'images' and hasattr(canvas._parent_page, 'images') and 0 <= idx < len(canvas._parent_page.images):
-            img = canvas._parent_page.images[idx]
+    # Seçim kalıcı kimliklerle çözülür; indeks geçerlilik kontrolü gerekmez
+    for item_id in canvas.selected_item_ids:
+        location = canvas.find_item_by_id(item_id)
+        if location is None:
+            continue
+        item_type = location[0]
+        item_data = canvas.get_item_by_id(item_id)
+        if item_type == 'lines':
+            _CLIPBOARD['items'].append(('lines', copy.deepcopy(item_data)))
+        elif item_type == 'shapes':
+            # Düzenlenebilir çizgi dahil tüm şekiller aynı liste formatında kopyalanır
+            _CLIPBOARD['items'].append(('shapes', copy.deepcopy(item_data)))
+            if len(item_data) > 0 and item_data[0] == ToolType.EDITABLE_LINE:
+                logging.debug(f"handle_copy_selection: Düzenlenebilir çizgi kopyalandı: {item_id}")
+        elif item_type == 'bspline_strokes':
+            _CLIPBOARD['items'].append(('bspline_strokes', copy.deepcopy(item_data)))
+            logging.debug(f"handle_copy_selection: B-Spline kopyalandı: {item_id}")
+        elif item_type == 'images':
             # Sadece temel alanları kopyala (QPixmap ve pixmap_item hariç)
             img_copy = {
-                'path': img.get('path'),
-                'rect': img.get('rect'),
-                'angle': img.get('angle', 0.0),
-                'uuid': img.get('uuid', None)
+                'path': item_data.get('path'),
+                'rect': item_data.get('rect'),
+                'angle': item_data.get('angle', 0.0),
+                'uuid': item_data.get('uuid', None)
             }
             _CLIPBOARD['items'].append(('images', img_copy))
     _CLIPBOARD['type'] = 'mixed' if len(_CLIPBOARD['items']) > 1 else (_CLIPBOARD['items'][0][0] if _CLIPBOARD['items'] else None)
@@ -116,7 +113,7 @@ def handle_paste_selection(canvas) -> bool:
     
     # Komutun başarılı olduğunu kontrol et
     if hasattr(paste_command, 'pasted_indices') and paste_command.pasted_indices:
-        canvas.selected_item_indices = paste_command.pasted_indices
+        canvas.selected_item_indices = list(paste_command.pasted_indices)
         canvas.update()
         logging.info(f"handle_paste_selection: {len(paste_command.pasted_indices)} öğe başarıyla yapıştırıldı.")
         return True
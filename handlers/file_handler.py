@@ -3,17 +3,17 @@
 
 import logging
 from typing import TYPE_CHECKING, List
-from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication, QInputDialog, QScrollArea
-from PyQt6.QtCore import QRectF, QPointF # QRectF ve QPointF importları eksik
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication, QInputDialog, QProgressDialog
+from PyQt6.QtCore import Qt
 import re # Sayfa aralığı ayrıştırma için eklendi
 import os # Dosya işlemleri için eklendi
 import time # Zaman işlemleri için eklendi
 
 # Helperları import et
-from utils import file_io_helpers, pdf_export_helpers
+from utils import file_io_helpers, pdf_export_helpers, notebook_loader, notebook_format, operation_journal
+from utils.asset_store import get_asset_store, page_asset_refs
 # from utils.pdf_export_helpers import REPORTLAB_AVAILABLE # Kaldırıldı
 from utils.pdf_export_helpers import PYMUPDF_AVAILABLE, export_notebook_to_pdf, export_selected_pages_to_pdf, export_page_to_pdf # PYMUPDF bayrağı ve fonksiyonlar
-from gui.enums import Orientation # Orientation enum'unu import et
 # from gui.drawing_canvas import DrawingCanvas # DrawingCanvas import edildi - Döngüsel import sorunu yaratabilir
 # from gui.arayuz import MAX_RECENT_FILES # Sabiti import et - KALDIRILDI
 
@@ -32,10 +32,28 @@ NOTEBOOK_FILTER = f"Not Defteri (*{NOTEBOOK_EXTENSION})"
 PDF_EXTENSION = ".pdf"
 PDF_FILTER = "PDF Dosyası (*.pdf)"
 
-def handle_save_notebook(main_window: 'MainWindow', page_manager: 'PageManager', save_as: bool = False) -> bool:
+def _collect_pages(page_manager: 'PageManager') -> List['Page']:
+    """PageManager sekmelerindeki Page nesnelerini sırayla döndürür."""
+    pages = []
+    for i in range(page_manager.count()):
+        # Sayfalar, widget'ları oluşturulmamış olsa da sekmenin yer tutucusundan alınır
+        page = page_manager._page_at(i)
+
+        if page: # Sadece geçerli Page nesnelerini ekle
+            pages.append(page)
+        else:
+             logging.warning(f"Kaydederken {i}. sekmedeki widget alınamadı veya Page değil.")
+    return pages
+
+def handle_save_notebook(main_window: 'MainWindow', page_manager: 'PageManager', save_as: bool = False,
+                         blocking: bool = False) -> bool:
     """Mevcut not defterini bir dosyaya kaydeder.
     Eğer save_as True ise veya daha önce kaydedilmemişse dosya adı sorar.
-    Başarı durumunu bool olarak döndürür.
+
+    Varsayılan olarak kayıt arka planda yapılır (bkz. utils/background_saver.py);
+    sonuç on_background_save_finished/failed ile bildirilir ve dönüş değeri
+    kaydın başlatıldığını/sıraya alındığını gösterir. blocking=True ise (ör.
+    kapanışta) kayıt bitene kadar beklenir ve gerçek başarı durumu döndürülür.
     """
     if page_manager.count() == 0:
         QMessageBox.information(main_window, "Kaydetme", "Kaydedilecek sayfa bulunmuyor.")
@@ -69,41 +87,113 @@ def handle_save_notebook(main_window: 'MainWindow', page_manager: 'PageManager',
     logging.info(f"Not defteri kaydediliyor: {filepath}")
     main_window.statusBar().showMessage(f"Not defteri kaydediliyor: {filepath}...", 3000)
 
-    # Sayfa verilerini topla (Page nesneleri olarak)
-    pages_to_save = []  # Type hinting için import'u Type_CHECKING içine taşıdık
-    for i in range(page_manager.count()):
-        # --- DEĞİŞİKLİK: ScrollArea'dan Page'i al --- #
-        scroll_area = page_manager.widget(i)
-        page = None
-        if isinstance(scroll_area, QScrollArea):
-            widget_inside = scroll_area.widget()
-            # Tip kontrolü için doğrudan sınıf ismini kontrol etmek daha güvenli olabilir
-            # Döngüsel importu önlemek için isinstance yerine sınıf adını kontrol ediyoruz
-            if widget_inside.__class__.__name__ == 'Page':
-                page = widget_inside
-        # --- --- --- --- --- --- --- --- --- --- --- -- #
-
-        if page: # Sadece geçerli Page nesnelerini ekle
-            pages_to_save.append(page)
-        else:
-             logging.warning(f"Kaydederken {i}. sekmedeki widget alınamadı veya Page değil.")
-
-    # Yardımcı fonksiyon ile kaydet
-    success = file_io_helpers.save_notebook(filepath, pages_to_save)
-
-    if success:
-        # Kayıt başarılıysa, geçerli yolu ve pencere başlığını güncelle
-        main_window.set_current_notebook_path(filepath)
-        main_window.statusBar().showMessage(f"Not defteri başarıyla kaydedildi: {filepath}", 5000)
-        # YENİ: Başarılı kayıttan sonra tüm sayfaları 'kaydedildi' olarak işaretle
-        page_manager.mark_all_pages_as_saved()
-        # Başarı durumunu döndür
-        return True
-    else:
-        main_window.statusBar().showMessage(f"Not defteri kaydedilemedi!", 5000)
-        QMessageBox.critical(main_window, "Kaydetme Hatası", f"Not defteri kaydedilirken bir hata oluştu.\nDosya: {filepath}")
-        # Başarısızlık durumunu döndür
+    # 'notebook_file_format': 'binary' (.dnd v2) veya 'json'
+    file_format = main_window.settings.get('notebook_file_format', file_io_helpers.DEFAULT_FILE_FORMAT)
+    compression = main_window.settings.get('notebook_compression', 'zlib')
+    # Koordinat adımı (px): ikili kayıtta noktalar bu hassasiyetle nicemlenir; 0 = kayıpsız float32
+    precision = main_window.settings.get('notebook_coordinate_precision', notebook_format.DEFAULT_COORDINATE_PRECISION)
+    if file_format == file_io_helpers.FILE_FORMAT_JSON:
+        # JSON'a tüm sayfalar yeniden yazılır; açılmamış sayfalar anlık görüntüden önce toplu çözülür
+        page_manager.ensure_all_content_loaded()
+    saver = main_window.background_saver
+    if blocking:
+        return saver.save_now(filepath, file_format, compression, precision)
+    if not saver.request_save(filepath, file_format, compression, precision):
+        main_window.statusBar().showMessage("Önceki kayıt sürüyor; bittiğinde tekrar kaydedilecek.", 3000)
+    return True
+
+def on_background_save_progress(main_window: 'MainWindow', filepath: str, done: int, total: int):
+    """Arka plan kaydının ilerlemesini durum çubuğunda gösterir."""
+    main_window.statusBar().showMessage(f"Not defteri kaydediliyor: {os.path.basename(filepath)} ({done}/{total})")
+
+def on_background_save_finished(main_window: 'MainWindow', filepath: str):
+    """Kayıt başarılıysa geçerli yolu ve pencere başlığını günceller.
+
+    Sayfaların 'kaydedildi' işaretlemesi BackgroundSaver tarafından yapılır
+    (kayıt sürerken düzenlenen sayfalar değiştirilmiş olarak kalır).
+    """
+    main_window.set_current_notebook_path(filepath)
+    # Değişiklikler ana dosyaya geçti; işlem günlüğü bu kayda göre sıfırlanır
+    main_window.journal.rebase(filepath)
+    # Hiçbir sayfanın kullanmadığı resimlerin çözülmüş pixmap'larını bırak
+    referenced = set()
+    for page in _collect_pages(main_window.page_manager):
+        referenced.update(page_asset_refs(getattr(page, 'images', None)))
+    get_asset_store().collect_garbage(referenced)
+    main_window.statusBar().showMessage(f"Not defteri başarıyla kaydedildi: {filepath}", 5000)
+
+def on_background_save_failed(main_window: 'MainWindow', filepath: str, message: str):
+    main_window.statusBar().showMessage(f"Not defteri kaydedilemedi!", 5000)
+    QMessageBox.critical(main_window, "Kaydetme Hatası", f"Not defteri kaydedilirken bir hata oluştu.\nDosya: {filepath}\n{message}")
+
+# --- YENİ: İşlem Günlüğü ile Çökme Kurtarma --- #
+def _journal_dir(main_window: 'MainWindow') -> str:
+    return main_window.journal.untitled_dir
+
+def offer_journal_recovery(main_window: 'MainWindow', page_manager: 'PageManager', journal_path: str) -> bool:
+    """Kalmış bir işlem günlüğü varsa kurtarmayı önerir; kabul edilirse sayfaları günlükle yükler.
+
+    Kurtarılan sayfalar 'değiştirildi' olarak işaretlenir (kullanıcı kaydedene kadar
+    ana dosya değişmez). Kurtarma yapıldıysa True döner.
+    """
+    if not operation_journal.has_recoverable_changes(journal_path):
+        return False
+    try:
+        records = operation_journal.read_journal(journal_path)
+        base_path = records[0].get('notebook')
+    except Exception as e:
+        logging.error(f"İşlem günlüğü okunamadı: {journal_path} - {e}", exc_info=True)
+        return False
+    name = os.path.basename(base_path) if base_path else "Başlıksız"
+    reply = QMessageBox.question(
+        main_window, "Kaydedilmemiş Değişiklikleri Kurtar",
+        f"'{name}' not defteri düzgün kapatılmamış. Son kayıttan sonraki {len(records) - 1} değişiklik kurtarılsın mı?",
+        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes)
+    if reply != QMessageBox.StandardButton.Yes:
+        return False
+    try:
+        recovered = operation_journal.replay_journal(journal_path)
+    except Exception as e:
+        logging.error(f"İşlem günlüğü yeniden oynatılamadı: {journal_path} - {e}", exc_info=True)
+        QMessageBox.warning(main_window, "Kurtarma Hatası", f"Değişiklikler kurtarılamadı.\n{e}")
         return False
+    page_manager.clear_all_pages()
+    loader = notebook_loader.NotebookLoader(recovered.base_path or journal_path, raw_pages=recovered.pages,
+                                            assets=recovered.assets)
+    if loader.page_count == 0:
+        page_manager.add_page()
+    else:
+        page_manager.load_from_notebook(loader)
+    main_window.set_current_notebook_path(recovered.base_path)
+    for page in _collect_pages(page_manager):
+        page.mark_as_modified()
+    main_window.statusBar().showMessage(f"{recovered.record_count} değişiklik işlem günlüğünden kurtarıldı.", 5000)
+    logging.info(f"İşlem günlüğünden kurtarıldı: {journal_path} ({recovered.record_count} kayıt)")
+    return True
+
+def recover_after_unclean_exit(main_window: 'MainWindow', page_manager: 'PageManager'):
+    """Açılışta çağrılır: başlıksız ve son açılan not defterlerinin kalmış günlüklerini kontrol eder."""
+    journal_dir = _journal_dir(main_window)
+    candidates = [None] + [path for path in main_window.settings.get('recent_files', []) if isinstance(path, str)]
+    for notebook_path in candidates:
+        journal_path = operation_journal.journal_path_for(notebook_path, journal_dir)
+        if not os.path.exists(journal_path):
+            continue
+        if offer_journal_recovery(main_window, page_manager, journal_path):
+            main_window.journal.rebase(main_window.current_notebook_path)
+            return
+        if notebook_path is not None:
+            # Kullanıcı kurtarmayı reddetti: bir daha sorulmasın
+            operation_journal.OperationJournal._remove(journal_path)
+    main_window.journal.rebase(main_window.current_notebook_path)
+
+def _resume_journal(main_window: 'MainWindow', page_manager: 'PageManager', filepath: str):
+    """Dosya açıldıktan sonra: o dosyanın kalmış günlüğünü kurtarmayı önerir ve günlüğü başlatır."""
+    journal_path = operation_journal.journal_path_for(filepath, _journal_dir(main_window))
+    if main_window.journal.path != journal_path:
+        offer_journal_recovery(main_window, page_manager, journal_path)
+    main_window.journal.rebase(main_window.current_notebook_path)
+# --- --- --- --- --- --- --- --- --- --- --- --- #
 
 def handle_save_notebook_as(main_window: 'MainWindow', page_manager: 'PageManager') -> bool:
     """Not defterini her zaman yeni bir dosya adı sorarak kaydeder.
@@ -144,9 +234,9 @@ def handle_load_notebook(main_window: 'MainWindow', page_manager: 'PageManager')
     main_window.statusBar().showMessage(f"Not defteri yükleniyor: {filepath}...", 3000)
     
     # Yardımcı fonksiyon ile yükle
-    loaded_data = file_io_helpers.load_notebook(filepath)
+    loader = notebook_loader.open_notebook(filepath)
 
-    if loaded_data is None:
+    if loader is None:
         main_window.statusBar().showMessage(f"Not defteri yüklenemedi!", 5000)
         QMessageBox.critical(main_window, "Yükleme Hatası", f"Not defteri yüklenirken bir hata oluştu veya dosya geçersiz.\nDosya: {filepath}")
         # Yükleme başarısızsa mevcut yolu temizle
@@ -179,80 +269,13 @@ def handle_load_notebook(main_window: 'MainWindow', page_manager: 'PageManager')
              main_window._update_recent_files_menu()
     # --- --- --- --- --- --- --- --- --- --- ---
 
-    if not loaded_data: # Dosya boşsa
-         page_manager.add_page() # Yeni boş bir sayfa ekle
-         logging.info("Yüklenen dosya boştu, yeni bir boş sayfa eklendi.")
+    if loader.page_count == 0: # Dosya boşsa
+        page_manager.add_page() # Yeni boş bir sayfa ekle
+        logging.info("Yüklenen dosya boştu, yeni bir boş sayfa eklendi.")
     else:
-        for page_content in loaded_data:
-            # Yeni sayfa ve canvas oluştur
-            new_page = page_manager.add_page(create_new=True) # Yeni, boş sayfa ekletelim
-            if not new_page: # Ekleme başarısızsa atla
-                 logging.error(f"Yeni sayfa yükleme sırasında oluşturulamadı.")
-                 continue
-
-            # Yüklenen veriyi canvas'a ata
-            new_page.get_canvas().lines = page_content.get('lines', [])
-            new_page.get_canvas().shapes = page_content.get('shapes', [])
-              # --- YENİ: B-Spline strokes verilerini canvas'a ata --- #
-            if 'bspline_strokes' in page_content and hasattr(new_page.get_canvas(), 'b_spline_strokes'):
-                canvas = new_page.get_canvas()
-                # B-spline veri listesini canvas'a ata
-                b_spline_data = page_content.get('bspline_strokes', [])
-                canvas.b_spline_strokes = b_spline_data
-                
-                # ÖNEMLİ: b_spline_widget.strokes referansını güncelle (bu olmadığında görsel olarak çizilmiyor)
-                if hasattr(canvas, 'b_spline_widget') and canvas.b_spline_widget:
-                    canvas.b_spline_widget.strokes = canvas.b_spline_strokes
-                    
-                logging.debug(f"B-Spline strokes yüklendi: {len(canvas.b_spline_strokes)} adet")
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
-
-            # --- YENİ: Resim verisini Page nesnesine ata --- #
-            loaded_images_data = page_content.get('images', [])
-            if loaded_images_data:
-                # Pixmap'ları None olarak başlatmamız gerekiyor.
-                # _ensure_pixmaps_loaded daha sonra bunları yükleyecek.
-                new_page.images = [] # Önce temizle
-                for img_data_loaded in loaded_images_data:
-                    # Gerekli alanları kontrol et (path, rect, angle, uuid)
-                    if all(k in img_data_loaded for k in ('path', 'rect', 'angle', 'uuid')):
-                        img_data_for_page = {
-                            'uuid': img_data_loaded['uuid'],
-                            'path': img_data_loaded['path'],
-                            'rect': QRectF(*img_data_loaded['rect']) if isinstance(img_data_loaded['rect'], list) else img_data_loaded['rect'], # rect list ise QRectF yap
-                            'angle': img_data_loaded['angle'],
-                            'pixmap': None, # Başlangıçta pixmap None
-                            'pixmap_item': None # Başlangıçta None
-                        }
-                        new_page.images.append(img_data_for_page)
-                        logging.debug(f"Loaded image data for page {new_page.page_number}: uuid={img_data_for_page['uuid']}")
-                    else:
-                        logging.warning(f"Skipping loaded image data due to missing keys: {img_data_loaded}")
-            else:
-                 new_page.images = [] # Resim yoksa boş liste
-            # --- --- --- --- --- --- --- --- --- --- --- -- #
-
-            # YENİ: Sayfa yönünü yükle
-            loaded_orientation_name = page_content.get('orientation', Orientation.PORTRAIT.name) # String olarak al
-            try:
-                loaded_orientation = Orientation[loaded_orientation_name] # String'den Enum'a çevir
-            except KeyError:
-                logging.warning(f"Geçersiz orientation değeri '{loaded_orientation_name}' bulundu, varsayılan (PORTRAIT) kullanılıyor.")
-                loaded_orientation = Orientation.PORTRAIT
-            # --- DÜZELTME: set_orientation yerine property kullan ---\
-            new_page.orientation = loaded_orientation
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
-
-            # YENİ: PDF'ten gelen özel arka planı yükle
-            pdf_bg_path = page_content.get('pdf_background_source_path')
-            if pdf_bg_path and os.path.exists(pdf_bg_path):
-                logging.info(f"Sayfa {new_page.page_number} için PDF arka planı yükleniyor: {pdf_bg_path}")
-                new_page.set_background_image(pdf_bg_path)
-            elif pdf_bg_path:
-                logging.warning(f"Sayfa {new_page.page_number} için kayıtlı PDF arka plan yolu ({pdf_bg_path}) bulunamadı.")
-
-            # Sayfayı manager'a ekle -> add_page zaten ekledi
-            # page_manager.add_page(page=new_page)
+        # Sayfalar yalnızca dizinden oluşturulur; içerikler ilk etkinleştirmede çözülür
+        page_manager.load_from_notebook(loader)
+    _resume_journal(main_window, page_manager, filepath)
 
     # Mevcut sayfaları temizledikten sonra, widget'ları hemen silmek QStackedWidget için sorun yaratabilir.
     # Belki clear_pages sonrası bir processEvents çağrısı gerekir?
@@ -313,6 +336,15 @@ def handle_export_pdf(main_window: 'MainWindow'):
         export_dpi = 150
     # --- --- --- --- --- --- --- --- --- --- --- -- #
 
+    # --- YENİ: Kalem Çizgisi Sadeleştirme Toleransı (punto) --- #
+    try:
+        stroke_tolerance_pt = max(0.0, float(main_window.settings.get('template_settings', {}).get(
+            'pdf_export_stroke_tolerance_pt', pdf_export_helpers.DEFAULT_STROKE_TOLERANCE_PT)))
+    except (TypeError, ValueError) as e:
+        logging.error(f"Ayarlardan çizgi sadeleştirme toleransı okunamadı: {e}. Varsayılan kullanılacak.")
+        stroke_tolerance_pt = pdf_export_helpers.DEFAULT_STROKE_TOLERANCE_PT
+    # --- --- --- --- --- --- --- --- --- --- --- -- #
+
     logging.debug("handle_export_pdf fonksiyonuna girildi.")
     if not PYMUPDF_AVAILABLE:
         QMessageBox.warning(main_window, "PDF Dışa Aktarma Hatası",
@@ -341,19 +373,17 @@ def handle_export_pdf(main_window: 'MainWindow'):
     main_window.last_save_load_directory = os.path.dirname(filepath)
     logging.info(f"Tüm not defteri PDF olarak dışa aktarılıyor: {filepath}")
 
+    # Açılmamış sayfaları tek tek değil toplu çöz (bkz. NotebookLoader.load_pages)
+    page_manager.ensure_all_content_loaded()
+
     all_pages_render_data = []
     for i in range(page_manager.count()):
-        scroll_area = page_manager.widget(i)
-        page_widget: Page | None = None
+        page_widget: Page | None = page_manager._page_at(i)
         canvas: DrawingCanvas | None = None
 
-        if isinstance(scroll_area, QScrollArea):
-            widget_inside = scroll_area.widget()
-            # Döngüsel import sorununu önlemek için sınıf adını string olarak kontrol ediyoruz
-            if widget_inside.__class__.__name__ == 'Page':
-                page_widget = widget_inside
-                if hasattr(page_widget, 'get_canvas'):
-                    canvas = page_widget.get_canvas()
+        if page_widget is not None:
+            # Pencere dışındaki sayfanın canvas'ı geçici oluşturulur; PageManager sonra bırakır
+            canvas = page_widget.get_canvas()
         
         if not page_widget or not canvas:
             logging.error(f"PDF Export: {i}. sayfa veya canvas alınamadı. Bu sayfa atlanacak.")
@@ -368,8 +398,11 @@ def handle_export_pdf(main_window: 'MainWindow'):
         canvas_width = canvas.width() if canvas else 800
         canvas_height = canvas.height() if canvas else 600
         background_path = canvas._current_background_image_path if canvas else None
-        # Özel PDF arka planını al (QPixmap olarak)
-        page_background_pixmap = canvas._page_background_pixmap if canvas and canvas._has_page_background else None
+        # Özel PDF arka planını al (QPixmap olarak); PDF sayfasına bağlı arka plan
+        # resme çevrilmez, özgün sayfa vektör olarak yerleştirilir (bkz. pdf_export_helpers)
+        page_background_pixmap = None
+        if canvas and canvas._has_page_background and getattr(canvas, '_pdf_page_source', None) is None:
+            page_background_pixmap = canvas._page_background_pixmap
 
         logging.debug(f"  PDF Export için {i+1}. sayfa verisi toplandı. Arka plan: {background_path if background_path else 'Özel PDF Arka Planı' if page_background_pixmap else 'Yok'}")
 
@@ -387,15 +420,44 @@ def handle_export_pdf(main_window: 'MainWindow'):
         QMessageBox.information(main_window, "Sayfa Yok", "Dışa aktarılacak geçerli sayfa verisi bulunamadı.")
         return
 
-    # Güncellenmiş dışa aktarma fonksiyonunu çağır
-    success = export_notebook_to_pdf(
-        filepath,
-        all_pages_render_data, # Toplanan tüm sayfa verileri
-        image_export_dpi=export_dpi
-    )
+    # Sayfa aralıkları işçi süreçlerde yazılırken ilerleme gösterilir ve iptal edilebilir
+    progress_dialog = QProgressDialog("PDF dışa aktarılıyor...", "İptal", 0, len(all_pages_render_data), main_window)
+    progress_dialog.setWindowTitle("PDF Dışa Aktarma")
+    progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    progress_dialog.setMinimumDuration(500)
+
+    def on_progress(done: int, total: int):
+        progress_dialog.setValue(done)
+        QApplication.processEvents()
 
-    if success:
-        QMessageBox.information(main_window, "Başarılı", f"Not defteri başarıyla PDF olarak dışa aktarıldı:\n{filepath}")
+    export_stats = {}
+    try:
+        success = export_notebook_to_pdf(
+            filepath,
+            all_pages_render_data, # Toplanan tüm sayfa verileri
+            image_export_dpi=export_dpi,
+            progress_callback=on_progress,
+            cancel_check=progress_dialog.wasCanceled,
+            stroke_tolerance_pt=stroke_tolerance_pt,
+            export_stats=export_stats
+        )
+        cancelled = progress_dialog.wasCanceled()
+    finally:
+        progress_dialog.close()
+        progress_dialog.deleteLater()
+
+    if cancelled:
+        main_window.statusBar().showMessage("PDF dışa aktarma iptal edildi.", 5000)
+    elif success:
+        message = f"Not defteri başarıyla PDF olarak dışa aktarıldı:\n{filepath}"
+        points_in = export_stats.get('points_in', 0)
+        if points_in:
+            points_out = export_stats.get('points_out', points_in)
+            message += (f"\n\nKalem çizgileri: {points_in} -> {points_out} nokta "
+                        f"(%{100.0 * (points_in - points_out) / points_in:.0f} azaltma)")
+        if 'file_bytes' in export_stats:
+            message += f"\nDosya boyutu: {export_stats['file_bytes'] / 1024:.0f} KB"
+        QMessageBox.information(main_window, "Başarılı", message)
     else:
         QMessageBox.critical(main_window, "PDF Dışa Aktarma Hatası", "Not defteri PDF olarak dışa aktarılırken bir hata oluştu. Lütfen logları kontrol edin.")
 
@@ -489,9 +551,9 @@ def handle_open_recent_file(main_window: 'MainWindow', page_manager: 'PageManage
     main_window.statusBar().showMessage(f"Son açılan dosya yükleniyor: {filepath}...", 3000)
     
     # Yardımcı fonksiyon ile yükle
-    loaded_data = file_io_helpers.load_notebook(filepath)
+    loader = notebook_loader.open_notebook(filepath)
 
-    if loaded_data is None:
+    if loader is None:
         main_window.statusBar().showMessage(f"Dosya yüklenemedi: {filepath}", 5000)
         QMessageBox.critical(main_window, "Yükleme Hatası", f"Dosya yüklenirken bir hata oluştu veya dosya geçersiz.\nDosya: {filepath}")
         main_window.set_current_notebook_path(None) 
@@ -516,77 +578,13 @@ def handle_open_recent_file(main_window: 'MainWindow', page_manager: 'PageManage
         main_window._update_recent_files_menu()
     # --- --- --- --- --- --- --- --- --- --- ---
 
-    if not loaded_data: # Dosya boşsa
-        page_manager.add_page()
+    if loader.page_count == 0: # Dosya boşsa
+        page_manager.add_page() # Yeni boş bir sayfa ekle
         logging.info("Yüklenen dosya boştu, yeni bir boş sayfa eklendi.")
     else:
-        for page_content in loaded_data:
-            new_page = page_manager.add_page(create_new=True)
-            if not new_page:
-                logging.error(f"Yeni sayfa yükleme sırasında oluşturulamadı.")
-                continue
-            canvas = new_page.get_canvas()
-            canvas.lines = page_content.get('lines', [])
-            canvas.shapes = page_content.get('shapes', [])
-              # --- YENİ: B-Spline strokes verilerini canvas'a ata --- #
-            if 'bspline_strokes' in page_content and hasattr(canvas, 'b_spline_strokes'):
-                # B-spline veri listesini canvas'a ata
-                b_spline_data = page_content.get('bspline_strokes', [])
-                canvas.b_spline_strokes = b_spline_data
-                
-                # ÖNEMLİ: b_spline_widget.strokes referansını güncelle (bu olmadığında görsel olarak çizilmiyor)
-                if hasattr(canvas, 'b_spline_widget') and canvas.b_spline_widget:
-                    canvas.b_spline_widget.strokes = canvas.b_spline_strokes
-                    
-                logging.debug(f"B-Spline strokes yüklendi: {len(canvas.b_spline_strokes)} adet")
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
-
-            # --- YENİ: Resim verisini Page nesnesine ata --- #
-            loaded_images_data = page_content.get('images', [])
-            if loaded_images_data:
-                # Pixmap'ları None olarak başlatmamız gerekiyor.
-                # _ensure_pixmaps_loaded daha sonra bunları yükleyecek.
-                new_page.images = [] # Önce temizle
-                for img_data_loaded in loaded_images_data:
-                    # Gerekli alanları kontrol et (path, rect, angle, uuid)
-                    if all(k in img_data_loaded for k in ('path', 'rect', 'angle', 'uuid')):
-                        img_data_for_page = {
-                            'uuid': img_data_loaded['uuid'],
-                            'path': img_data_loaded['path'],
-                            'rect': QRectF(*img_data_loaded['rect']) if isinstance(img_data_loaded['rect'], list) else img_data_loaded['rect'], # rect list ise QRectF yap
-                            'angle': img_data_loaded['angle'],
-                            'pixmap': None, # Başlangıçta pixmap None
-                            'pixmap_item': None # Başlangıçta None
-                        }
-                        new_page.images.append(img_data_for_page)
-                        logging.debug(f"Loaded image data for page {new_page.page_number}: uuid={img_data_for_page['uuid']}")
-                    else:
-                        logging.warning(f"Skipping loaded image data due to missing keys: {img_data_loaded}")
-            else:
-                 new_page.images = [] # Resim yoksa boş liste
-            # --- --- --- --- --- --- --- --- --- --- --- -- #
-
-            # YENİ: Sayfa yönünü yükle
-            loaded_orientation_name = page_content.get('orientation', Orientation.PORTRAIT.name)
-            try:
-                loaded_orientation = Orientation[loaded_orientation_name]
-            except KeyError:
-                logging.warning(f"Geçersiz orientation değeri '{loaded_orientation_name}' bulundu, varsayılan (PORTRAIT) kullanılıyor.")
-                loaded_orientation = Orientation.PORTRAIT
-            # --- DÜZELTME: set_orientation yerine property kullan ---\
-            new_page.orientation = loaded_orientation
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
-
-            # YENİ: PDF'ten gelen özel arka planı yükle
-            pdf_bg_path = page_content.get('pdf_background_source_path')
-            if pdf_bg_path and os.path.exists(pdf_bg_path):
-                logging.info(f"Sayfa {new_page.page_number} için PDF arka planı yükleniyor: {pdf_bg_path}")
-                new_page.set_background_image(pdf_bg_path)
-            elif pdf_bg_path:
-                logging.warning(f"Sayfa {new_page.page_number} için kayıtlı PDF arka plan yolu ({pdf_bg_path}) bulunamadı.")
-
-            # Sayfayı manager'a ekle -> add_page zaten ekledi
-            # page_manager.add_page(page=new_page)
+        # Sayfalar yalnızca dizinden oluşturulur; içerikler ilk etkinleştirmede çözülür
+        page_manager.load_from_notebook(loader)
+    _resume_journal(main_window, page_manager, filepath)
 
     QApplication.processEvents()
     # --- YENİ: Yükleme sonrası aktif canvas'ı güncelle (Resimlerin görünmesi için) ---\
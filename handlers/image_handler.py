@@ -1,10 +1,11 @@
 import logging
 import os
 from PyQt6.QtWidgets import QFileDialog
-from PyQt6.QtGui import QPixmap, QTransform
+from PyQt6.QtGui import QTransform
 from PyQt6.QtCore import QRectF, QPointF, QSize, QSizeF, Qt
 import uuid
 from utils.commands import AddImageCommand
+from utils.asset_store import get_asset_store
 
 # Gerekli tipler için
 from typing import TYPE_CHECKING
@@ -41,9 +42,11 @@ def handle_add_image(main_window: 'MainWindow', page_manager: 'PageManager'):
         logging.debug("Kullanıcı resim seçimi iptal etti.")
         return
 
-    # Resmi QPixmap olarak yüklemeyi dene
-    pixmap = QPixmap(filepath)
-    if pixmap.isNull():
+    # Resmi içerik özetiyle depoya ekle (aynı resim daha önce eklendiyse aynı pixmap paylaşılır)
+    store = get_asset_store()
+    asset = store.add_file(filepath)
+    pixmap = store.pixmap(asset) if asset else None
+    if pixmap is None or pixmap.isNull():
         logging.error(f"Resim dosyası yüklenemedi veya geçersiz: {filepath}")
         # Kullanıcıya hata mesajı gösterilebilir
         # QMessageBox.critical(main_window, "Hata", f"Resim dosyası yüklenemedi: {os.path.basename(filepath)}")
@@ -110,7 +113,8 @@ def handle_add_image(main_window: 'MainWindow', page_manager: 'PageManager'):
     image_id = str(uuid.uuid4())
     image_data = {
         'uuid': image_id,
-        'path': filepath, 
+        'path': filepath, # Orijinal yol (bilgi amaçlı; baytlar not defterinde saklanır)
+        'asset': asset, # İçerik özeti (utils/asset_store.py)
         'pixmap': scaled_pixmap, # Ölçeklenmiş pixmap (gösterim için)
         'rect': initial_rect_world, # DÜNYA KOORDİNATLARI (Artık 0,0'dan başlıyor)
         'angle': 0.0
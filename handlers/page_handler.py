@@ -1,7 +1,7 @@
 # handlers/page_handler.py
 import logging
 from typing import TYPE_CHECKING
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QScrollArea # Veya başka diyaloglar
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel # Veya başka diyaloglar
 from gui.enums import Orientation # Orientation import et
 
 if TYPE_CHECKING:
@@ -46,14 +46,7 @@ def handle_previous_page(page_manager):
 def handle_set_orientation(page_manager, orientation: Orientation):
     """Aktif sayfanın yönünü ayarlar."""
     if page_manager:
-        current_page_index = page_manager.currentIndex()
-        scroll_area = page_manager.widget(current_page_index)
-        current_page = None
-        if isinstance(scroll_area, QScrollArea):
-            widget_inside = scroll_area.widget()
-            # Döngüsel import sorununu önlemek için sınıf adını string olarak kontrol ediyoruz
-            if widget_inside.__class__.__name__ == 'Page':
-                current_page = widget_inside
+        current_page = page_manager.get_current_page()
 
         if current_page:
             logging.debug(f"Handling set orientation to {orientation.name} for page {current_page.page_number}")
@@ -71,7 +64,7 @@ def handle_set_orientation(page_manager, orientation: Orientation):
             else:
                 logging.warning("handle_set_orientation: MainWindow referansı alınamadı veya metod yok.")
         else:
-            logging.warning(f"Yön ayarlanamadı: Geçerli sayfa bulunamadı veya Page tipinde değil (indeks: {current_page_index})")
+            logging.warning(f"Yön ayarlanamadı: Geçerli sayfa bulunamadı veya Page tipinde değil (indeks: {page_manager.currentIndex()})")
     else:
         logging.error("handle_set_orientation çağrıldı ancak page_manager None.")
 
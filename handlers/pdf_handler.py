@@ -1,45 +1,59 @@
 # handlers/pdf_handler.py
 import logging
+import math
 import os # os modülü eklendi
-from PyQt6.QtWidgets import QFileDialog, QMessageBox
-from PyQt6.QtCore import QStandardPaths, QPointF # Geçici dosya konumu için
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PyQt6.QtCore import Qt, QPointF
 
 from helpers import pdf_helper
+from utils.pdf_importer import PdfImporter
+from utils.pdf_page_renderer import BASE_DPI as PDF_PAGE_BASE_DPI
+from utils.geometry_helpers import bspline_to_cubic_beziers
+import numpy as np
+from scipy.interpolate import splev
 import fitz # PyMuPDF'i doğrudan kullanacağız
 
-# Geçici PDF sayfaları için bir alt klasör adı
-TEMP_PDF_IMAGE_DIR = "temp_pdf_pages"
+def _fit_page_zoom_to_pdf(page, pdf_pixmap_width: int):
+    """Sayfanın zoom'unu PDF pixmap'i şablon genişliğine sığacak şekilde ayarlar."""
+    try:
+        # Hedef canvas genişliğini al (Sayfanın mevcut canvas'ından)
+        # Bu, sayfanın yönelimine göre değişen şablon genişliği olmalı.
+        target_canvas = page.get_canvas()
+        if not target_canvas:
+            logging.warning("  Otomatik zoom ayarlanamadı: hedef canvas yok.")
+            return
+        # Canvas'ın kullandığı _background_pixmap (şablon) genişliği tercih edilir
+        if target_canvas._background_pixmap and not target_canvas._background_pixmap.isNull():
+            canvas_target_width = target_canvas._background_pixmap.width()
+            logging.debug(f"  Hedef canvas şablon genişliği: {canvas_target_width}")
+        elif target_canvas.width() > 0: # Fallback olarak canvas'ın o anki genişliği
+            canvas_target_width = target_canvas.width()
+            logging.debug(f"  Hedef canvas mevcut genişliği: {canvas_target_width}")
+        else: # Varsayılan bir değere fallback
+            canvas_target_width = 800 # Makul bir varsayılan
+            logging.warning(f"  Hedef canvas genişliği alınamadı, varsayılan {canvas_target_width} kullanılıyor.")
 
-def _ensure_temp_dir_exists():
-    """Geçici PDF resimlerinin saklanacağı dizinin var olduğundan emin olur."""
-    # Kullanıcının uygulama veri dizininde bir yer bulmaya çalışalım
-    app_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
-    if not app_data_path: # Eğer alamazsak, çalışma dizinine fallback yap
-        app_data_path = "." 
-    
-    temp_dir = os.path.join(app_data_path, TEMP_PDF_IMAGE_DIR)
-    
-    if not os.path.exists(temp_dir):
-        try:
-            os.makedirs(temp_dir)
-            logging.info(f"Geçici PDF resim klasörü oluşturuldu: {temp_dir}")
-        except OSError as e:
-            logging.error(f"Geçici PDF resim klasörü oluşturulamadı ({temp_dir}): {e}")
-            # Klasör oluşturulamazsa, çalışma dizinini kullanmayı deneyebiliriz
-            # veya hata verip işlemi durdurabiliriz. Şimdilik çalışma dizinine fallback.
-            temp_dir = TEMP_PDF_IMAGE_DIR 
-            if not os.path.exists(temp_dir):
-                try:
-                    os.makedirs(temp_dir)
-                except OSError: # Hala olmuyorsa, null dönebiliriz ya da hata fırlatabiliriz.
-                    logging.error(f"Çalışma dizininde de geçici klasör oluşturulamadı: {temp_dir}")
-                    return None
-    return temp_dir
+        if pdf_pixmap_width > 0 and canvas_target_width > 0:
+            required_zoom = canvas_target_width / pdf_pixmap_width
+            # Çok fazla küçültmeyi veya büyütmeyi engellemek için sınır koyabiliriz
+            required_zoom = max(0.1, min(required_zoom, 3.0))
+            page.set_zoom(required_zoom)
+            page.set_pan(QPointF(0, 0)) # Pan'ı sıfırla
+            logging.info(f"  Sayfa {page.page_number} için otomatik zoom ayarlandı: {required_zoom:.2f} (PDF genişliği: {pdf_pixmap_width}, Hedef Genişlik: {canvas_target_width})")
+        else:
+            logging.warning("  Otomatik zoom ayarlanamadı: PDF veya hedef genişlik sıfır.")
+    except Exception as e_zoom:
+        logging.error(f"  Sayfa için otomatik zoom ayarlanırken hata: {e_zoom}", exc_info=True)
 
 def handle_import_pdf(parent_window=None, page_manager=None): # page_manager eklendi
     """
-    Kullanıcının bir PDF dosyası seçmesini sağlar, dosyayı açar, sayfalarını
-    resim olarak kaydeder ve PageManager'a ekler.
+    Kullanıcının bir PDF dosyası seçmesini sağlar ve sayfalarını PageManager'a ekler.
+
+    Sayfalar içe aktarılırken resme çevrilmez; her sayfa PDF sayfasına bir
+    başvuru tutar ve görünür olduğunda çizilir (utils/pdf_page_renderer.py).
+    Sayfalar küçük gruplar halinde eklenir (utils/pdf_importer.py); ilk sayfa
+    hemen kullanılabilir. İlerleme penceresi modal değildir ve içe aktarma
+    'İptal' ile durdurulabilir.
 
     Args:
         parent_window (QWidget, optional): QFileDialog için ebeveyn pencere.
@@ -65,129 +79,254 @@ def handle_import_pdf(parent_window=None, page_manager=None): # page_manager ekl
     logging.info(f"Seçilen PDF dosyası: {filepath}")
     
     pdf_document = pdf_helper.import_pdf_document(filepath)
-
-    if pdf_document:
-        temp_image_folder = _ensure_temp_dir_exists()
-        if not temp_image_folder:
-            logging.error("Geçici resimler için klasör oluşturulamadı/erişilemedi. PDF içe aktarma iptal edildi.")
-            if parent_window:
-                QMessageBox.critical(parent_window, "Hata", "Geçici resimler için klasör hazırlanamadı.")
-            pdf_document.close()
-            return
-
-        logging.info(f"PDF başarıyla açıldı: {filepath}, Sayfa Sayısı: {len(pdf_document)}")
-        
-        # PDF'den sayfa sayısını kontrol et
-        if len(pdf_document) == 0:
-            logging.warning("PDF dosyasında içe aktarılacak sayfa bulunamadı.")
-            if parent_window:
-                QMessageBox.warning(parent_window, "PDF İçe Aktarma", f"'{os.path.basename(filepath)}' dosyasında içe aktarılacak sayfa bulunamadı.")
-            pdf_document.close()
-            return
-            
-        # Mevcut sayfaları temizle - eğer hiç sayfa yoksa bu işlem atlanır
-        if page_manager.count() > 0:
-            page_manager.clear_all_pages()
-        
-        imported_page_count = 0
-        first_page_index = 0  # İlk eklenen sayfanın indeksini sakla
-        
-        try:
-            for i, page_fitz in enumerate(pdf_document):
-                try:
-                    # Sayfayı pixmap olarak al (DPI ayarı çözünürlüğü etkiler)
-                    pix = page_fitz.get_pixmap(dpi=150) # DPI değeri 300'den 150'ye düşürüldü
-                    
-                    # Dosya adını oluştur (orijinal dosya adı + sayfa no)
-                    base_pdf_name = os.path.splitext(os.path.basename(filepath))[0]
-                    image_filename = f"{base_pdf_name}_page_{i+1}.png"
-                    image_path = os.path.join(temp_image_folder, image_filename)
-                    
-                    pix.save(image_path)
-                    logging.info(f"  Sayfa {i+1} şuraya kaydedildi: {image_path}")
-
-                    # PageManager'a bu resmi yeni bir sayfa olarak ekle.
-                    if hasattr(page_manager, 'add_page_from_image'):
-                        newly_added_page = page_manager.add_page_from_image(image_path)
-                        if newly_added_page:
-                            if imported_page_count == 0:
-                                first_page_index = page_manager.currentIndex()  # İlk sayfanın indeksini kaydet
-                            
-                            imported_page_count += 1
-                            logging.info(f"PageManager'a eklendi: {image_path}")
-                            
-                            # --- YENİ: Zoom Seviyesini Ayarla ---
-                            try:
-                                # PDF'ten oluşturulan pixmap'in genişliği
-                                pdf_pixmap_width = pix.width
-                                
-                                # Hedef canvas genişliğini al (Sayfanın mevcut canvas'ından)
-                                # Bu, sayfanın yönelimine göre değişen şablon genişliği olmalı.
-                                target_canvas = newly_added_page.get_canvas()
-                                if target_canvas:
-                                    # Canvas'ın o anki gerçek genişliğini veya sizeHint'ini kullanabiliriz.
-                                    # Veya daha iyisi, canvas'ın kullandığı _background_pixmap (şablon) genişliğini.
-                                    canvas_target_width = 0
-                                    if target_canvas._background_pixmap and not target_canvas._background_pixmap.isNull():
-                                        canvas_target_width = target_canvas._background_pixmap.width()
-                                        logging.debug(f"  Hedef canvas şablon genişliği: {canvas_target_width}")
-                                    elif target_canvas.width() > 0: # Fallback olarak canvas'ın o anki genişliği
-                                        canvas_target_width = target_canvas.width()
-                                        logging.debug(f"  Hedef canvas mevcut genişliği: {canvas_target_width}")
-                                    else: # Varsayılan bir değere fallback
-                                        canvas_target_width = 800 # Makul bir varsayılan
-                                        logging.warning(f"  Hedef canvas genişliği alınamadı, varsayılan {canvas_target_width} kullanılıyor.")
-
-                                    if pdf_pixmap_width > 0 and canvas_target_width > 0:
-                                        required_zoom = canvas_target_width / pdf_pixmap_width
-                                        # Çok fazla küçültmeyi veya büyütmeyi engellemek için sınır koyabiliriz
-                                        required_zoom = max(0.1, min(required_zoom, 3.0)) 
-                                        newly_added_page.set_zoom(required_zoom)
-                                        newly_added_page.set_pan(QPointF(0,0)) # Pan'ı sıfırla
-                                        logging.info(f"  Sayfa {newly_added_page.page_number} için otomatik zoom ayarlandı: {required_zoom:.2f} (PDF genişliği: {pdf_pixmap_width}, Hedef Genişlik: {canvas_target_width})")
-                                else:
-                                    logging.warning("  Otomatik zoom ayarlanamadı: PDF veya hedef genişlik sıfır.")
-                            except Exception as e_zoom:
-                                logging.error(f"  Sayfa için otomatik zoom ayarlanırken hata: {e_zoom}", exc_info=True)
-                            # --- --- --- --- --- --- --- --- ---
-                        else:
-                            logging.error(f"PageManager.add_page_from_image çağrıldı ancak sayfa eklenemedi: {image_path}")
-                    else:
-                        logging.warning(f"PageManager'da `add_page_from_image` metodu bulunamadı. Sayfa {i+1} ({image_path}) eklenemedi.")
-                    
-                except Exception as e_page:
-                    logging.error(f"PDF sayfası {i+1} işlenirken hata: {e_page}", exc_info=True)
-                    if parent_window:
-                        QMessageBox.warning(parent_window, "Sayfa Hatası", f"{os.path.basename(filepath)} dosyasının {i+1}. sayfası işlenirken bir sorun oluştu.")
-            
-            # PDF içe aktarma tamamlandığında ilk sayfaya git
-            if imported_page_count > 0:
-                page_manager.setCurrentIndex(first_page_index)  # İlk sayfaya dön
-                logging.info(f"PDF içe aktarma tamamlandı. İlk sayfa gösteriliyor (index: {first_page_index})")
-                
-                # Başarılı içe aktarma mesajı
-                if parent_window:
-                    QMessageBox.information(parent_window, 
-                                           "PDF İçe Aktarıldı", 
-                                           f"'{os.path.basename(filepath)}' dosyasından {imported_page_count} sayfa başarıyla yeni sayfa olarak eklendi.")
-            elif len(pdf_document) > 0 and imported_page_count == 0 : # Sayfa var ama eklenemedi
-                if parent_window:
-                    QMessageBox.warning(parent_window, 
-                                            "PDF İçe Aktarma", 
-                                            f"'{os.path.basename(filepath)}' dosyasındaki sayfalar okundu ancak uygulamaya eklenemedi (PageManager entegrasyonu bekleniyor).")
-            else: # Hiç sayfa yoksa veya 0 sayfa işlendiyse
-                if parent_window:
-                    QMessageBox.information(parent_window, "PDF İçe Aktarma", f"'{os.path.basename(filepath)}' dosyasında işlenecek sayfa bulunamadı veya bir sorun oluştu.")
-
-        finally:
-            # Açılan belgeyi kapat
-            pdf_document.close()
-    else:
+    if not pdf_document:
         logging.error(f"PDF dosyası ({filepath}) açılamadı veya yüklenemedi.")
         if parent_window:
             QMessageBox.critical(parent_window, 
                                  "Hata", 
                                  f"PDF dosyası ({filepath}) yüklenirken bir sorun oluştu.")
+        return
+    # Sayfalar işçilerde yeniden açılır; burada yalnızca sayfa sayısı gerekli
+    page_count = len(pdf_document)
+    pdf_document.close()
+    logging.info(f"PDF başarıyla açıldı: {filepath}, Sayfa Sayısı: {page_count}")
+
+    # PDF'den sayfa sayısını kontrol et
+    if page_count == 0:
+        logging.warning("PDF dosyasında içe aktarılacak sayfa bulunamadı.")
+        if parent_window:
+            QMessageBox.warning(parent_window, "PDF İçe Aktarma", f"'{os.path.basename(filepath)}' dosyasında içe aktarılacak sayfa bulunamadı.")
+        return
+
+    # Mevcut sayfaları temizle (süren bir içe aktarma varsa o da durdurulur)
+    if page_manager.count() > 0:
+        page_manager.clear_all_pages()
+    page_manager.cancel_pdf_import()
+
+    importer = PdfImporter(filepath, page_count, parent=page_manager)
+    page_manager.pdf_importer = importer
+    state = {'added': 0, 'failed': 0}
+
+    progress_dialog = QProgressDialog(f"'{os.path.basename(filepath)}' içe aktarılıyor...", "İptal", 0, page_count, parent_window)
+    progress_dialog.setWindowTitle("PDF İçe Aktarma")
+    progress_dialog.setWindowModality(Qt.WindowModality.NonModal) # İlk sayfalar içe aktarma sürerken kullanılabilsin
+    progress_dialog.setMinimumDuration(0)
+    progress_dialog.setAutoClose(False)
+    progress_dialog.setAutoReset(False)
+    progress_dialog.canceled.connect(page_manager.cancel_pdf_import)
+
+    def on_page_ready(index: int, page_reference: str, width: int, height: int):
+        # PDF sayfasını arka plan olarak kullanan yeni bir sayfa ekle; aktif sayfa değişmez
+        newly_added_page = page_manager.add_page_from_image(page_reference, make_current=False)
+        if newly_added_page:
+            state['added'] += 1
+            logging.info(f"PageManager'a eklendi: {page_reference}")
+            _fit_page_zoom_to_pdf(newly_added_page, width)
+        else:
+            state['failed'] += 1
+            logging.error(f"PageManager.add_page_from_image çağrıldı ancak sayfa eklenemedi: {page_reference}")
+
+    def on_page_failed(index: int, message: str):
+        state['failed'] += 1
+        logging.error(f"PDF sayfası {index + 1} işlenirken hata: {message}")
+
+    def on_finished(rendered: int, cancelled: bool):
+        if page_manager.pdf_importer is importer:
+            page_manager.pdf_importer = None
+        progress_dialog.close()
+        progress_dialog.deleteLater()
+        importer.deleteLater()
+        name = os.path.basename(filepath)
+        logging.info(f"PDF içe aktarma {'iptal edildi' if cancelled else 'tamamlandı'}: {state['added']}/{page_count} sayfa eklendi.")
+        if not parent_window:
+            return
+        if cancelled:
+            parent_window.statusBar().showMessage(f"PDF içe aktarma iptal edildi: '{name}' dosyasından {state['added']} sayfa eklendi.", 5000)
+        elif state['added'] > 0:
+            message = f"'{name}' dosyasından {state['added']} sayfa başarıyla yeni sayfa olarak eklendi."
+            if state['failed']:
+                message += f"\n{state['failed']} sayfa işlenirken bir sorun oluştu."
+            QMessageBox.information(parent_window, "PDF İçe Aktarıldı", message)
+        else:
+            QMessageBox.warning(parent_window, "PDF İçe Aktarma", f"'{name}' dosyasındaki sayfalar uygulamaya eklenemedi.")
+
+    importer.page_ready.connect(on_page_ready)
+    importer.page_failed.connect(on_page_failed)
+    importer.progress.connect(lambda done, total: progress_dialog.setValue(done))
+    importer.finished.connect(on_finished)
+    importer.start()
+
+# --- YENİ: Mürekkebi kaynak PDF'e kaydetme --- #
+INK_ELLIPSE_SEGMENTS = 48
+INK_CURVE_STEPS = 16  # Her kübik Bézier parçası için örnek sayısı
+INK_SPLINE_SAMPLES = 100  # Sabitlenmemiş B-spline'lar için splev örnek sayısı (canvas ile aynı)
+
+def _xy(point) -> tuple:
+    """QPointF ya da (x, y) dizisini (x, y) demetine çevirir."""
+    if isinstance(point, QPointF):
+        return (point.x(), point.y())
+    return (float(point[0]), float(point[1]))
+
+def _sample_cubics(segments) -> list:
+    """Kübik Bézier parçalarını (p0, p1, p2, p3) ardışık nokta listesine örnekler."""
+    points = []
+    for p0, p1, p2, p3 in segments:
+        start = 1 if points else 0  # Parçalar uç noktayı paylaşır
+        for k in range(start, INK_CURVE_STEPS + 1):
+            t = k / INK_CURVE_STEPS
+            a, b, c, d = (1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3
+            points.append((a * p0[0] + b * p1[0] + c * p2[0] + d * p3[0],
+                           a * p0[1] + b * p1[1] + c * p2[1] + d * p3[1]))
+    return points
+
+def _shape_to_ink_points(shape) -> list:
+    """Şekli (çizgi, dikdörtgen, elips, serbest yol, düzenlenebilir çizgi) ink notu için nokta listesine çevirir."""
+    tool_name = shape[0].name
+    if tool_name == 'PATH':
+        # shape[3] zaten nokta listesi
+        return [_xy(p) for p in shape[3]]
+    if tool_name == 'EDITABLE_LINE':
+        # (3n+1) nokta kübik Bézier kontrol noktalarıdır; değilse kırık çizgi olarak yaz
+        control = [_xy(p) for p in shape[3]]
+        if len(control) >= 4 and (len(control) - 1) % 3 == 0:
+            return _sample_cubics([tuple(control[j:j + 4]) for j in range(0, len(control) - 1, 3)])
+        return control
+    if tool_name not in ('LINE', 'RECTANGLE', 'CIRCLE'):
+        return []
+    (x0, y0), (x1, y1) = _xy(shape[3]), _xy(shape[4])
+    if tool_name == 'LINE':
+        return [(x0, y0), (x1, y1)]
+    if tool_name == 'RECTANGLE':
+        return [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+    cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, abs(x1 - x0) / 2, abs(y1 - y0) / 2
+    return [(cx + rx * math.cos(2 * math.pi * k / INK_ELLIPSE_SEGMENTS),
+             cy + ry * math.sin(2 * math.pi * k / INK_ELLIPSE_SEGMENTS)) for k in range(INK_ELLIPSE_SEGMENTS + 1)]
+
+def _bspline_to_ink_points(stroke_data: dict) -> list:
+    """B-spline çizgisini nokta listesine çevirir.
+
+    Sabitlenmiş eğriler kübik Bézier parçalarına ayrılıp örneklenir;
+    sabitlenmemiş olanlar canvas'ın yaptığı gibi splev ile örneklenir.
+    """
+    knots, control_points, degree = stroke_data['knots'], stroke_data['control_points'], stroke_data['degree']
+    beziers = bspline_to_cubic_beziers(knots, control_points, degree)
+    if beziers:
+        return _sample_cubics(beziers)
+    u_params = stroke_data.get('u')
+    if u_params is None or len(u_params) == 0:
+        return []
+    tck = (knots, np.array(control_points).T, degree)
+    x_fine, y_fine = splev(np.linspace(0, u_params[-1], INK_SPLINE_SAMPLES), tck)
+    return [(float(x), float(y)) for x, y in zip(x_fine, y_fine)]
+
+def _page_ink_strokes(canvas) -> list:
+    """Canvas'taki çizgi, şekil ve B-spline'ları PDF puntosu cinsinden (renk, kalınlık, noktalar) listesine çevirir.
+
+    Dönüştürülemeyen tek bir öğe loglanıp atlanır; sayfanın geri kalanı yazılır.
+    """
+    to_points = 72.0 / PDF_PAGE_BASE_DPI  # Sayfa koordinatları BASE_DPI'da piksel
+    strokes = []
+
+    def add(color, width, points):
+        if len(points) >= 2:
+            strokes.append((color, width * to_points, [(x * to_points, y * to_points) for x, y in points]))
+
+    for i, line in enumerate(canvas.lines):
+        try:
+            add(line[0], line[1], [_xy(p) for p in line[2]])
+        except Exception as e:
+            logging.error(f"Ink: Çizgi {i} dönüştürülemedi: {e}", exc_info=True)
+    for i, shape in enumerate(canvas.shapes):
+        try:
+            add(shape[1], shape[2], _shape_to_ink_points(shape))
+        except Exception as e:
+            logging.error(f"Ink: Şekil {i} dönüştürülemedi: {e}", exc_info=True)
+    for i, stroke_data in enumerate(getattr(canvas, 'b_spline_strokes', None) or []):
+        try:
+            color = stroke_data.get('color') or (0.0, 0.0, 0.0, 1.0)
+            thickness = stroke_data.get('thickness')
+            add(tuple(color), 2.0 if thickness is None else thickness, _bspline_to_ink_points(stroke_data))
+        except Exception as e:
+            logging.error(f"Ink: B-spline {i} dönüştürülemedi: {e}", exc_info=True)
+    return strokes
+
+def handle_save_ink_to_pdf(parent_window, page_manager):
+    """PDF'ten içe aktarılan sayfaların mürekkebini kaynak PDF'lere ink notları olarak yazar.
+
+    Not defteri yeniden dışa aktarılmaz: her kaynak PDF artımlı kaydedilir ve
+    yalnızca mürekkebi değişen sayfaların notları dosyanın sonuna eklenir.
+    Açılmamış sayfaların PDF kaynağı dosyanın sayfa dizininden okunur; son geri
+    yazımdan beri değişmemiş (özeti PDF'teki notlarla eşleşen) sayfalar çözülmez.
+    """
+    if page_manager is None or page_manager.count() == 0:
+        return
+    pages_by_pdf = {}   # pdf yolu -> {pdf sayfa indeksi: (not defteri indeksi, Page)}
+    unopened_by_pdf = {}
+    for i in range(page_manager.count()):
+        page = page_manager._page_at(i)
+        source = page.pdf_page_source if page else None
+        if source is None:
+            continue
+        pdf_path, page_index = source
+        target = unopened_by_pdf if page.has_pending_content and page.ink_digest else pages_by_pdf
+        target.setdefault(pdf_path, {})[page_index] = (i, page)
+    if not pages_by_pdf and not unopened_by_pdf:
+        QMessageBox.information(parent_window, "Mürekkebi PDF'e Kaydet", "Not defterinde PDF'ten içe aktarılmış sayfa yok.")
+        return
+
+    failed = []
+    for pdf_path in sorted(set(pages_by_pdf) | set(unopened_by_pdf)):
+        if not os.path.exists(pdf_path):
+            failed.append(f"{os.path.basename(pdf_path)}: dosya bulunamadı")
+            pages_by_pdf.pop(pdf_path, None)
+            unopened_by_pdf.pop(pdf_path, None)
+
+    # Önceden geri yazılmış, açılmamış sayfalar: notları hâlâ güncelse çözülmeden atlanır
+    for pdf_path, unopened in unopened_by_pdf.items():
+        try:
+            current = pdf_helper.current_ink_pages(
+                pdf_path, {page_index: page.ink_digest for page_index, (_, page) in unopened.items()})
+        except Exception as e:
+            logging.warning(f"Mürekkep notları okunamadı ({pdf_path}): {e}")
+            current = set()
+        pages = pages_by_pdf.setdefault(pdf_path, {})
+        for page_index, entry in unopened.items():
+            if page_index not in current:
+                pages.setdefault(page_index, entry)
+
+    page_manager.ensure_pages_loaded([page for pages in pages_by_pdf.values() for _, page in pages.values()])
+    strokes_by_pdf = {}
+    digests_by_pdf = {}
+    for pdf_path, pages in pages_by_pdf.items():
+        page_strokes = strokes_by_pdf.setdefault(pdf_path, {})
+        for page_index, (i, page) in sorted(pages.items()):
+            try:
+                page_strokes[page_index] = _page_ink_strokes(page.drawing_canvas)
+            except Exception as e:
+                logging.error(f"Sayfa {i + 1} mürekkebi dönüştürülemedi: {e}", exc_info=True)
+                failed.append(f"Sayfa {i + 1}: {e}")
+                continue
+            digests_by_pdf.setdefault(pdf_path, []).append((page, pdf_helper.ink_strokes_digest(page_strokes[page_index])))
+
+    changed_pages = 0
+    for pdf_path, page_strokes in strokes_by_pdf.items():
+        if not page_strokes:
+            continue
+        try:
+            changed_pages += pdf_helper.write_ink_annotations(pdf_path, page_strokes)
+            # Sonraki geri yazımda bu sayfalar çözülmeden karşılaştırılabilir (özet dosyaya kaydedilir)
+            for page, digest in digests_by_pdf.get(pdf_path, []):
+                page.ink_digest = digest
+        except Exception as e:
+            logging.error(f"Mürekkep PDF'e yazılamadı ({pdf_path}): {e}", exc_info=True)
+            failed.append(f"{os.path.basename(pdf_path)}: {e}")
+
+    if failed:
+        QMessageBox.warning(parent_window, "Mürekkebi PDF'e Kaydet",
+                            "Bazı PDF dosyalarına yazılamadı:\n" + "\n".join(failed))
+    elif parent_window:
+        parent_window.statusBar().showMessage(f"Mürekkep PDF'e kaydedildi: {changed_pages} sayfa güncellendi.", 5000)
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
 
 def handle_annotate_pdf(pdf_document, annotation_data):
     """
@@ -1,6 +1,6 @@
 import logging
 import os
-from PyQt6.QtWidgets import QApplication, QDialog, QMessageBox, QColorDialog, QScrollArea
+from PyQt6.QtWidgets import QApplication, QDialog, QMessageBox, QColorDialog
 from PyQt6.QtGui import QGuiApplication
 
 # Dialogları import et
@@ -48,14 +48,10 @@ def handle_open_template_settings(main_window: 'MainWindow'):
     def _handle_template_type_changed():
         new_settings = dialog.get_settings()
         for i in range(main_window.page_manager.count()):
-            scroll_area = main_window.page_manager.widget(i)
-            page = None
-            if hasattr(scroll_area, 'widget'):
-                widget_inside = scroll_area.widget()
-                if widget_inside.__class__.__name__ == 'Page':
-                    page = widget_inside
-            if page and hasattr(page, 'get_canvas'):
-                canvas = page.get_canvas()
+            page = main_window.page_manager._page_at(i)
+            if page:
+                # Widget'sız sayfada ayarlar saklanır ve canvas oluşturulunca uygulanır
+                canvas = page.drawing_canvas
                 if canvas:
                     try:
                         canvas.apply_template_settings(new_settings)
@@ -85,14 +81,9 @@ def handle_open_template_settings(main_window: 'MainWindow'):
         # Tüm mevcut canvasları yeni ayarlarla güncelle
         logging.debug("Mevcut tüm canvaslar güncelleniyor...")
         for i in range(main_window.page_manager.count()):
-            scroll_area = main_window.page_manager.widget(i)
-            page = None
-            if isinstance(scroll_area, QScrollArea):
-                widget_inside = scroll_area.widget()
-                if widget_inside.__class__.__name__ == 'Page':
-                    page = widget_inside
-            if page and hasattr(page, 'get_canvas'):
-                canvas = page.get_canvas()
+            page = main_window.page_manager._page_at(i)
+            if page:
+                canvas = page.drawing_canvas
                 if canvas:
                     try:
                         canvas.apply_template_settings(new_settings)
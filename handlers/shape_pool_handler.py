@@ -14,6 +14,7 @@ import numpy as np
 
 from gui.enums import ToolType
 from utils import file_io_helpers
+from utils.item_ids import retag_item
 
 # Kök dizindeki config klasörünü kullan
 def get_config_dir():
@@ -476,14 +477,14 @@ def handle_load_shape(page_manager, main_window):
                         deserialized = file_io_helpers._deserialize_item(item_data)
                         if deserialized:
                             # Normal çizgi olarak ekle
-                            canvas.lines.append(deserialized)
+                            canvas.lines.append(retag_item(deserialized))  # Havuzdan her ekleme yeni kimlik alır
                             added_count += 1
                     
                     elif item_type == 'shape':
                         # Şekil verilerini deserialize et
                         deserialized = file_io_helpers._deserialize_item(item_data)
                         if deserialized:
-                            canvas.shapes.append(deserialized)
+                            canvas.shapes.append(retag_item(deserialized))
                             added_count += 1
                     
                     elif item_type == 'editable_line':
@@ -491,7 +492,7 @@ def handle_load_shape(page_manager, main_window):
                         deserialized = file_io_helpers._deserialize_item(item_data)
                         if deserialized:
                             # Düzenlenebilir çizgiler artık shapes listesine ekleniyor
-                            canvas.shapes.append(deserialized)
+                            canvas.shapes.append(retag_item(deserialized))
                             logging.debug(f"Düzenlenebilir çizgi yüklendi: {deserialized}")
                             added_count += 1
                     
@@ -506,7 +507,7 @@ def handle_load_shape(page_manager, main_window):
                                 if hasattr(canvas, 'b_spline_widget') and canvas.b_spline_widget:
                                     canvas.b_spline_widget.strokes = canvas.b_spline_strokes # Referansı tekrar ata
 
-                            canvas.b_spline_strokes.append(deserialized_bspline)
+                            canvas.b_spline_strokes.append(retag_item(deserialized_bspline))
                             logging.debug(f"B-spline (deserialize ile) yüklendi: {deserialized_bspline.get('control_points')}")
                             added_count += 1
                         else:
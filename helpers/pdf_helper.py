@@ -1,4 +1,6 @@
+import hashlib
 import logging
+import os
 
 # PDF işleme için PyMuPDF (fitz) veya reportlab gibi kütüphaneler kullanılabilir.
 # Örnek olarak PyMuPDF (fitz) kullanalım. Kurulum: pip install PyMuPDF
@@ -22,6 +24,147 @@ def import_pdf_document(filepath: str):
         logging.error(f"PDF dosyası ({filepath}) açılırken PyMuPDF hatası: {e}", exc_info=True)
         return None
 
+# --- YENİ: PDF sayfalarının görünür oldukça çizilmesi --- #
+# Süreç başına açık belgeler (her çizimde PDF'i yeniden açmamak için);
+# çizim süreç havuzunda yapılır (bkz. utils/pdf_page_renderer.py)
+_open_documents = {}
+
+def _cached_document(pdf_path: str) -> fitz.Document:
+    doc = _open_documents.get(pdf_path)
+    if doc is None:
+        doc = _open_documents[pdf_path] = fitz.open(pdf_path)
+    return doc
+
+def close_cached_documents():
+    """Bu süreçte açık tutulan belgeleri kapatır."""
+    for doc in _open_documents.values():
+        doc.close()
+    _open_documents.clear()
+
+def get_page_pixel_size(pdf_path: str, page_index: int, dpi: float) -> tuple:
+    """Sayfanın (döndürme uygulanmış) verilen DPI'daki piksel boyutu; get_pixmap ile aynı yuvarlama."""
+    zoom = dpi / 72.0
+    irect = (_cached_document(pdf_path).load_page(page_index).rect * fitz.Matrix(zoom, zoom)).irect
+    return irect.width, irect.height
+
+def render_page_pixels(pdf_path: str, page_index: int, zoom: float, clip: tuple | None = None) -> tuple:
+    """PDF sayfasını (ya da clip dikdörtgenini, punto cinsinden) verilen ölçekte RGB olarak çizer.
+
+    Qt kullanmadığı için süreç havuzunda çalıştırılabilir. Sonuç
+    (genişlik, yükseklik, satır uzunluğu, RGB baytları). Uygulamanın
+    PDF'e geri yazdığı mürekkep notları çizilmez (canvas zaten çiziyor).
+    """
+    page = _cached_document(pdf_path).load_page(page_index)
+    _hide_own_ink_annotations(page)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=fitz.Rect(clip) if clip else None, alpha=False)
+    return pix.width, pix.height, pix.stride, pix.samples
+
+# --- YENİ: Mürekkebin kaynak PDF'e not (annotation) olarak geri yazılması --- #
+INK_ANNOT_TITLE = "Dijital Mürekkep"  # Uygulamanın yazdığı notları ayırt eder
+INK_DIGEST_PREFIX = "dndink:"          # Not konusunda (subject) sayfa mürekkebinin özeti
+
+def _hide_own_ink_annotations(page: fitz.Page):
+    # Yalnızca bellekteki kopyada gizlenir; belge kaydedilmez
+    for annot in page.annots(types=[fitz.PDF_ANNOT_INK]):
+        if annot.info.get('title') == INK_ANNOT_TITLE and not annot.flags & fitz.PDF_ANNOT_IS_HIDDEN:
+            annot.set_flags(annot.flags | fitz.PDF_ANNOT_IS_HIDDEN)
+
+def ink_strokes_digest(strokes: list) -> str:
+    """Sayfa mürekkebinin özeti; değişmeyen sayfalar yeniden yazılmaz."""
+    hasher = hashlib.sha1()
+    for color, width, points in strokes:
+        hasher.update(repr((tuple(round(c, 3) for c in color[:3]), round(width, 2),
+                            tuple((round(x, 2), round(y, 2)) for x, y in points))).encode())
+    return hasher.hexdigest()
+
+def _own_ink_annotations(page: fitz.Page) -> list:
+    return [annot for annot in page.annots(types=[fitz.PDF_ANNOT_INK])
+            if annot.info.get('title') == INK_ANNOT_TITLE]
+
+def _ink_annotations_current(own_annots: list, digest: str) -> bool:
+    # Mürekkebi boş sayfada not yoksa da güncel sayılır
+    if not own_annots:
+        return digest == ink_strokes_digest([])
+    subject = INK_DIGEST_PREFIX + digest
+    return all(annot.info.get('subject') == subject for annot in own_annots)
+
+def current_ink_pages(pdf_path: str, page_digests: dict) -> set:
+    """PDF'teki notları verilen mürekkep özetleriyle (sayfa indeksi -> özet) eşleşen sayfa indeksleri.
+
+    Not defteri sayfaları çözülmeden hangilerinin geri yazılması gerekmediği anlaşılır.
+    """
+    current = set()
+    doc = fitz.open(pdf_path)
+    try:
+        for page_index, digest in page_digests.items():
+            if digest and 0 <= page_index < len(doc) and \
+                    _ink_annotations_current(_own_ink_annotations(doc.load_page(page_index)), digest):
+                current.add(page_index)
+    finally:
+        doc.close()
+    return current
+
+def write_ink_annotations(pdf_path: str, page_strokes: dict) -> int:
+    """Sayfaların mürekkebini kaynak PDF'e ink notları olarak artımlı (incremental) kaydeder.
+
+    Args:
+        pdf_path (str): Kaynak PDF.
+        page_strokes (dict): Sayfa indeksi -> [(renk (r, g, b[, a]), kalınlık, [(x, y), ...]), ...];
+            koordinatlar ve kalınlık döndürülmüş sayfanın puntoları cinsinden.
+            Listede olup mürekkebi boş olan sayfalardaki eski notlar silinir.
+
+    Returns:
+        int: Değişen sayfa sayısı (0 ise dosyaya dokunulmaz).
+
+    Yalnızca mürekkebi son yazımdan beri değişen sayfaların notları yeniden
+    yazılır; artımlı kayıt da yalnızca değişen nesneleri dosyanın sonuna ekler.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        changed_pages = 0
+        for page_index, strokes in sorted(page_strokes.items()):
+            if not (0 <= page_index < len(doc)):
+                logging.warning(f"write_ink_annotations: Geçersiz sayfa {page_index} ({pdf_path}), atlandı.")
+                continue
+            page = doc.load_page(page_index)
+            digest = ink_strokes_digest(strokes)
+            subject = INK_DIGEST_PREFIX + digest
+            own_annots = _own_ink_annotations(page)
+            if _ink_annotations_current(own_annots, digest):
+                continue
+            for annot in own_annots:
+                page.delete_annot(annot)
+            # add_ink_annot döndürülmemiş sayfa koordinatlarını bekler
+            derotate = page.derotation_matrix
+            groups = {}
+            for color, width, points in strokes:
+                if len(points) >= 2:
+                    groups.setdefault((tuple(color[:3]), width, color[3] if len(color) > 3 else 1.0), []).append(
+                        [tuple(fitz.Point(x, y) * derotate) for x, y in points])
+            for (color, width, opacity), ink_list in groups.items():
+                annot = page.add_ink_annot(ink_list)
+                annot.set_border(width=width)
+                annot.set_colors(stroke=color)
+                annot.set_info(title=INK_ANNOT_TITLE, subject=subject)
+                annot.update(opacity=opacity)
+            changed_pages += 1
+        if changed_pages:
+            if doc.can_save_incrementally():
+                doc.save(pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            else:
+                # Onarılmış/yeniden yapılandırılmış belgeler artımlı kaydedilemez
+                logging.warning(f"write_ink_annotations: {pdf_path} artımlı kaydedilemiyor, tam kayıt yapılıyor.")
+                temp_path = pdf_path + '.tmp'
+                doc.save(temp_path, garbage=1, encryption=fitz.PDF_ENCRYPT_KEEP)
+                doc.close()
+                os.replace(temp_path, pdf_path)
+        logging.info(f"write_ink_annotations: {pdf_path} - {changed_pages}/{len(page_strokes)} sayfa güncellendi.")
+        return changed_pages
+    finally:
+        if not doc.is_closed:
+            doc.close()
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
 def add_annotation_to_pdf(doc: fitz.Document, page_number: int, rect_coords: tuple, text: str, author: str = "AI Assistant", output_filepath: str | None = None) -> bool:
     """
     Verilen PyMuPDF belge nesnesinin belirtilen sayfasına bir metin notu (annotation) ekler.
@@ -1,5 +1,6 @@
 import sys
 import logging
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QScreen
 
@@ -54,4 +55,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Paketlenmiş (frozen) Windows sürümünde süreç havuzları için gerekli (bkz. utils/process_pool.py)
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
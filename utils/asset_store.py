@@ -0,0 +1,202 @@
+# utils/asset_store.py
+"""İçerik adresli (SHA-256) resim deposu.
+
+Sayfalardaki resimler dosya yolu yerine içerik özetiyle ('asset' anahtarı)
+başvurur; baytlar ikili not defteri dosyasının içinde parça olarak saklanır
+(bkz. notebook_format, dizindeki 'assets'). Böylece:
+
+- Not defteri taşındığında resimler kırılmaz.
+- Aynı resim birçok sayfaya eklense de dosyada bir kez saklanır.
+- Her özet için tek bir QPixmap çözülür ve tüm sayfalarca paylaşılır.
+- Hiçbir sayfanın başvurmadığı resimler kayıtta dosyaya yazılmaz (çöp
+  toplama); çözülmüş pixmap'ları da bellekten atılır.
+
+Baytlara kayıt iş parçacığından da erişilir (kilitli); QPixmap işlemleri
+yalnızca GUI iş parçacığında yapılmalıdır.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtGui import QPixmap
+
+from utils import notebook_format
+
+
+class Asset:
+    """Depodaki tek bir resim: bellekteki baytları ve/veya bir not defteri dosyasındaki parçası."""
+    __slots__ = ('digest', 'ext', 'data', 'location')
+
+    def __init__(self, digest: str, ext: str = '', data: Optional[bytes] = None,
+                 location: Optional[Tuple[str, notebook_format.PageEntry]] = None):
+        self.digest = digest
+        self.ext = ext
+        self.data = data
+        self.location = location
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class AssetStore:
+    """Açık not defterinin resim deposu."""
+
+    def __init__(self):
+        self._assets: Dict[str, Asset] = {}
+        self._pixmaps: Dict[str, QPixmap] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Not defteri kapatıldığında/yenisi açıldığında çağrılır."""
+        with self._lock:
+            self._assets.clear()
+        self._pixmaps.clear()
+
+    def attach(self, filepath: str, entries: Dict[str, notebook_format.PageEntry]):
+        """Not defteri dosyasındaki resim parçalarını tanıtır; baytlar gerektiğinde okunur."""
+        with self._lock:
+            for digest, entry in (entries or {}).items():
+                asset = self._assets.get(digest)
+                if asset is None:
+                    self._assets[digest] = Asset(digest, entry.meta.get('ext', ''), location=(filepath, entry))
+                elif asset.data is None:
+                    asset.location = (filepath, entry)
+
+    def has(self, digest: Optional[str]) -> bool:
+        with self._lock:
+            return bool(digest) and digest in self._assets
+
+    def ext(self, digest: str) -> str:
+        with self._lock:
+            asset = self._assets.get(digest)
+            return asset.ext if asset else ''
+
+    def is_persisted(self, digest: str) -> bool:
+        """Resim bir not defteri dosyasında saklanıyor mu (yoksa yalnızca bellekte)."""
+        with self._lock:
+            asset = self._assets.get(digest)
+            return asset is not None and asset.location is not None
+
+    def add_bytes(self, data: bytes, ext: str = '') -> str:
+        """Baytları depoya ekler (aynı içerik zaten varsa yeniden eklenmez) ve özetini döndürür."""
+        digest = content_digest(data)
+        with self._lock:
+            asset = self._assets.get(digest)
+            if asset is None:
+                self._assets[digest] = Asset(digest, ext.lower(), data=data)
+            elif asset.data is None and asset.location is None:
+                asset.data = data
+        return digest
+
+    def add_file(self, path: str) -> Optional[str]:
+        """Dosyayı okuyup depoya ekler; okunamazsa None."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logging.error(f"AssetStore: Resim dosyası okunamadı: {path} - {e}")
+            return None
+        return self.add_bytes(data, os.path.splitext(path)[1])
+
+    def data(self, digest: str) -> Optional[bytes]:
+        """Resmin baytları (gerekirse not defteri dosyasından okunur)."""
+        with self._lock:
+            asset = self._assets.get(digest)
+            if asset is None:
+                return None
+            if asset.data is not None:
+                return asset.data
+            location = asset.location
+        try:
+            return notebook_format.read_chunk(*location)
+        except (OSError, notebook_format.NotebookFormatError) as e:
+            logging.error(f"AssetStore: Resim {digest[:12]} not defterinden okunamadı: {e}")
+            return None
+
+    def pixmap(self, digest: Optional[str]) -> Optional[QPixmap]:
+        """Özet için paylaşılan QPixmap (ilk çağrıda çözülür). Yalnızca GUI iş parçacığında."""
+        if not digest:
+            return None
+        pixmap = self._pixmaps.get(digest)
+        if pixmap is not None:
+            return pixmap
+        data = self.data(digest)
+        if data is None:
+            return None
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            logging.error(f"AssetStore: Resim {digest[:12]} çözülemedi.")
+            return None
+        self._pixmaps[digest] = pixmap
+        return pixmap
+
+    # --- Kayıt (iş parçacığında çağrılabilir) --- #
+    def chunk_slot(self, digest: str, filepath: str):
+        """Kayıt için parça: resim zaten hedef dosyadaysa onun PageEntry'si, değilse yeni (veri, ...) parçası."""
+        with self._lock:
+            asset = self._assets.get(digest)
+            location = asset.location if asset else None
+            ext = asset.ext if asset else ''
+        if location is not None and os.path.normcase(os.path.abspath(location[0])) == os.path.normcase(os.path.abspath(filepath)):
+            return location[1]
+        data = self.data(digest)
+        if data is None:
+            return None
+        return (data, len(data), notebook_format.CODEC_NONE, {'ext': ext})
+
+    def relocate(self, filepath: str, entries: Dict[str, notebook_format.PageEntry]):
+        """Kayıttan sonra resimlerin dosyadaki yeni parçalarını kaydeder; bellekteki baytlar bırakılır."""
+        with self._lock:
+            for digest, entry in entries.items():
+                asset = self._assets.get(digest)
+                if asset is not None:
+                    asset.location = (filepath, entry)
+                    asset.data = None
+
+    def retain_unreferenced(self, referenced: Iterable[str]):
+        """Dosyaya yazılmayacak (başvurulmayan) resimlerin baytlarını belleğe alır.
+
+        Geri al/yinele ile tekrar eklenebilirler; dosya sıkıştırılınca eski
+        parçaları kaybolacağı için baytlar bellekte tutulur.
+        """
+        referenced = set(referenced)
+        with self._lock:
+            orphans = [asset for digest, asset in self._assets.items() if digest not in referenced and asset.data is None]
+        for asset in orphans:
+            data = self.data(asset.digest)
+            with self._lock:
+                asset.data = data
+                if data is not None:
+                    asset.location = None
+
+    # --- Çöp toplama (GUI iş parçacığı) --- #
+    def collect_garbage(self, referenced: Iterable[str]):
+        """Başvurulmayan resimlerin çözülmüş pixmap'larını bırakır."""
+        referenced = set(referenced)
+        for digest in [d for d in self._pixmaps if d not in referenced]:
+            del self._pixmaps[digest]
+
+
+def page_asset_refs(images: Optional[List[dict]]) -> List[str]:
+    """Sayfanın resim listesindeki asset özetleri (sıralı, tekrarsız)."""
+    refs = []
+    for image in images or []:
+        digest = image.get('asset') if isinstance(image, dict) else None
+        if digest and digest not in refs:
+            refs.append(digest)
+    return refs
+
+
+_store: Optional[AssetStore] = None
+
+
+def get_asset_store() -> AssetStore:
+    """Uygulama genelindeki (açık not defterine ait) resim deposu."""
+    global _store
+    if _store is None:
+        _store = AssetStore()
+    return _store
@@ -0,0 +1,155 @@
+# utils/background_saver.py
+"""Not defterini GUI iş parçacığını bloklamadan kaydeden yardımcı.
+
+Kayıt isteğinde sayfaların ucuz bir anlık görüntüsü (PageSnapshot) GUI
+iş parçacığında alınır; serileştirme, sıkıştırma ve dosyaya yazma ayrı bir
+iş parçacığında yapılır. Kayıt sürerken düzenlemeye devam edilebilir: kayıt
+bitince yalnızca anlık görüntüden sonra değişmemiş sayfalar 'kaydedildi'
+olarak işaretlenir. Kayıt sürerken gelen yeni istekler birleştirilir; iş
+bitince en son istek (güncel bir anlık görüntüyle) bir kez çalıştırılır.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from utils import file_io_helpers, notebook_format
+
+
+class SaveJob:
+    """Tek bir kayıt işinin girdi ve sonucu."""
+
+    def __init__(self, filepath: str, file_format: str, compression: str,
+                 precision: Optional[float] = notebook_format.DEFAULT_COORDINATE_PRECISION):
+        self.filepath = filepath
+        self.file_format = file_format
+        self.compression = compression
+        self.precision = precision
+        self.snapshots: List[file_io_helpers.PageSnapshot] = []
+        self.success = False
+        self.error: Optional[str] = None
+        self.thread: Optional[threading.Thread] = None
+        self.delivered = False
+
+
+class BackgroundSaver(QObject):
+    """Kayıt işlerini sırayla arka planda çalıştırır ve sonuçları sinyallerle bildirir."""
+
+    save_started = pyqtSignal(str)             # dosya yolu
+    save_progress = pyqtSignal(str, int, int)  # dosya yolu, işlenen sayfa, toplam sayfa
+    save_finished = pyqtSignal(str)            # dosya yolu
+    save_failed = pyqtSignal(str, str)         # dosya yolu, hata mesajı
+    _job_done = pyqtSignal(object)             # iş parçacığından GUI iş parçacığına (kuyruklu)
+
+    def __init__(self, collect_pages: Callable[[], list], parent=None):
+        super().__init__(parent)
+        self._collect_pages = collect_pages
+        self._current: Optional[SaveJob] = None
+        self._pending: Optional[SaveJob] = None
+        self._job_done.connect(self._deliver)
+
+    @property
+    def is_busy(self) -> bool:
+        return self._current is not None
+
+    def request_save(self, filepath: str, file_format: str, compression: str,
+                     precision: Optional[float] = notebook_format.DEFAULT_COORDINATE_PRECISION) -> bool:
+        """Kaydı arka planda başlatır. Bir kayıt sürüyorsa isteği sıraya alır (öncekinin yerine) ve False döner."""
+        job = SaveJob(filepath, file_format, compression, precision)
+        if self._current is not None:
+            if self._pending is not None:
+                logging.debug(f"BackgroundSaver: Bekleyen kayıt isteği birleştirildi: {self._pending.filepath} -> {filepath}")
+            self._pending = job
+            return False
+        self._start(job)
+        return True
+
+    def save_now(self, filepath: str, file_format: str, compression: str,
+                 precision: Optional[float] = notebook_format.DEFAULT_COORDINATE_PRECISION) -> bool:
+        """Kaydı çağıran iş parçacığında yapar (ör. kapanışta); sürmekte olan kaydı önce bekler."""
+        self._pending = None  # Bu kayıt bekleyen isteği de karşılar
+        self.wait()
+        return self._run_blocking(SaveJob(filepath, file_format, compression, precision))
+
+    def wait(self):
+        """Sürmekte olan kaydın ve sıradaki isteğin bitmesini bekler; sonuçlar hemen uygulanır."""
+        job = self._current
+        if job is not None:
+            if job.thread is not None:
+                job.thread.join()
+            self._deliver(job, start_pending=False)
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._run_blocking(pending)
+
+    def _run_blocking(self, job: SaveJob) -> bool:
+        self._current = job
+        try:
+            job.snapshots = file_io_helpers.snapshot_pages(self._collect_pages(), job.filepath, job.file_format)
+        except Exception as e:
+            logging.error(f"BackgroundSaver: Sayfaların anlık görüntüsü alınamadı: {e}", exc_info=True)
+            job.error = str(e)
+            self._deliver(job, start_pending=False)
+            return False
+        self.save_started.emit(job.filepath)
+        self._run(job)
+        self._deliver(job, start_pending=False)
+        return job.success
+
+    def _start(self, job: SaveJob):
+        self._current = job
+        try:
+            job.snapshots = file_io_helpers.snapshot_pages(self._collect_pages(), job.filepath, job.file_format)
+        except Exception as e:
+            logging.error(f"BackgroundSaver: Sayfaların anlık görüntüsü alınamadı: {e}", exc_info=True)
+            job.error = str(e)
+            self._deliver(job)
+            return
+        self.save_started.emit(job.filepath)
+        job.thread = threading.Thread(target=self._run_and_notify, args=(job,), name='notebook-save', daemon=True)
+        job.thread.start()
+
+    def _run(self, job: SaveJob):
+        def progress(done: int, total: int):
+            self.save_progress.emit(job.filepath, done, total)
+        try:
+            job.success = file_io_helpers.save_notebook(job.filepath, job.snapshots, file_format=job.file_format,
+                                                        compression=job.compression, progress_callback=progress,
+                                                        precision=job.precision)
+            if not job.success:
+                job.error = "Not defteri dosyaya yazılamadı (ayrıntılar günlükte)."
+        except Exception as e:
+            logging.error(f"BackgroundSaver: Kayıt sırasında hata: {e}", exc_info=True)
+            job.success = False
+            job.error = str(e)
+
+    def _run_and_notify(self, job: SaveJob):
+        self._run(job)
+        self._job_done.emit(job)
+
+    def _deliver(self, job: SaveJob, start_pending: bool = True):
+        """GUI iş parçacığında: sonucu sayfalara uygular, sinyal yayınlar ve bekleyen isteği başlatır."""
+        if job.delivered:
+            return
+        job.delivered = True
+        if self._current is job:
+            self._current = None
+        if job.success:
+            for snapshot in job.snapshots:
+                page = snapshot.page
+                try:
+                    page.set_file_chunk(snapshot.file_chunk)
+                    # Anlık görüntüden sonra düzenlenen sayfalar kaydedilmemiş sayılır
+                    if getattr(page, 'modification_generation', 0) == snapshot.generation:
+                        page.mark_as_saved()
+                except RuntimeError:
+                    pass  # Kayıt sürerken sayfa kapatılmış (Qt nesnesi silinmiş)
+            self.save_finished.emit(job.filepath)
+        else:
+            self.save_failed.emit(job.filepath, job.error or "Bilinmeyen hata")
+        job.snapshots = []
+        if start_pending and self._current is None and self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._start(pending)
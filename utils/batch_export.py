@@ -0,0 +1,320 @@
+# utils/batch_export.py
+"""Not defterlerini pencere açmadan toplu dışa aktarma ve dönüştürme.
+
+.dnd dosyaları (ikili ya da eski JSON) widget oluşturulmadan okunur. Sayfa
+boyutu ve arka planı GUI'nin kullandığı kaynaklardan hesaplanır: PDF sayfası
+başvurusu, eski resim arka planı ya da şablon resmi. PDF'ler GUI'deki PDF
+dışa aktarmayla aynı kodla (pdf_export_helpers), PNG'ler canvas'ın çizim
+yardımcılarıyla (page_rendering.render_page_at_dpi) çizilir. Dosyalar bir
+süreç havuzunda paralel işlenir:
+
+    python -m utils.batch_export notlar/ cikti/ --to pdf
+    python -m utils.batch_export notlar/ cikti/ --to png --scale 2
+    python -m utils.batch_export eski.dnd yeni.dnd --to dnd --compression lz4
+
+Hedefler:
+- pdf: Not defteri başına bir PDF.
+- png: Her sayfa için '<ad>-001.png'.
+- dnd: Güncel ikili biçim.
+- json: Eski JSON biçimi.
+
+Klasör verildiğinde alt klasörlerdeki .dnd dosyaları da işlenir ve çıktı
+klasöründe aynı yapı korunur. Başarısız dosya varsa çıkış kodu 1'dir.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from PyQt6.QtCore import QPointF
+
+from gui.enums import Orientation, TemplateType
+from utils import file_io_helpers, notebook_format, pdf_export_helpers
+from utils.asset_store import get_asset_store
+from utils.logger import LOG_FORMAT
+from utils.page_rendering import BASE_DIR, DEFAULT_TEMPLATE_DIR, page_background, page_world_dpi, render_page_at_dpi
+from utils.process_pool import create_process_pool
+
+NOTEBOOK_EXTENSION = '.dnd'
+TARGETS = ('pdf', 'png', 'dnd', 'json')
+TARGET_EXTENSIONS = {'pdf': '.pdf', 'png': '.png', 'dnd': NOTEBOOK_EXTENSION, 'json': NOTEBOOK_EXTENSION}
+DEFAULT_SETTINGS_PATH = os.path.join(BASE_DIR, 'config', 'settings.json')
+
+
+# --- Dosya Bulma --- #
+def find_notebooks(paths: List[str]) -> List[Tuple[str, str]]:
+    """Verilen dosya/klasörlerdeki not defterleri: (dosya yolu, çıktı için göreli yol) listesi."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(NOTEBOOK_EXTENSION):
+                        full_path = os.path.join(root, name)
+                        found.append((full_path, os.path.relpath(full_path, path)))
+        elif os.path.isfile(path):
+            found.append((path, os.path.basename(path)))
+        else:
+            logging.warning(f"Toplu dışa aktarma: Bulunamadı, atlanıyor: {path}")
+    return found
+
+
+def output_path_for(relative_path: str, output: str, target: str, single_file: bool) -> str:
+    """Not defterinin çıktı yolu; tek dosyada output bir dosya adı olabilir."""
+    extension = TARGET_EXTENSIONS[target]
+    if single_file and os.path.splitext(output)[1].lower() == extension:
+        return output
+    return os.path.join(output, os.path.splitext(relative_path)[0] + extension)
+
+
+def png_page_paths(output_path: str, page_count: int) -> List[str]:
+    """'ad.png' -> ['ad-001.png', 'ad-002.png', ...]"""
+    stem = os.path.splitext(output_path)[0]
+    return [f"{stem}-{number:03d}.png" for number in range(1, page_count + 1)]
+
+
+def is_up_to_date(source: str, output_path: str) -> bool:
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+# --- Ayarlar --- #
+def load_template_settings(settings_path: str = DEFAULT_SETTINGS_PATH) -> dict:
+    """Uygulama ayarlarındaki şablon ayarları (okunamazsa boş sözlük)."""
+    try:
+        with open(settings_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('template_settings', {}) or {}
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ayarlar okunamadı ({settings_path}): {e}. Varsayılanlar kullanılacak.")
+        return {}
+
+
+# --- Sayfa Verisi (widget'sız) --- #
+def load_notebook_pages(filepath: str) -> Optional[List[dict]]:
+    """Not defterini yükler; ikili dosyadaki resimler asset deposuna tanıtılır.
+
+    Depo süreç başınadır ve her not defterinde temizlenir.
+    """
+    store = get_asset_store()
+    store.clear()
+    if notebook_format.is_binary_notebook(filepath):
+        try:
+            store.attach(filepath, notebook_format.read_directory(filepath).assets)
+        except (OSError, notebook_format.NotebookFormatError) as e:
+            logging.error(f"Not defteri dizini okunamadı: {filepath} - {e}")
+            return None
+    return file_io_helpers.load_notebook(filepath)
+
+
+def page_render_data(page: dict, template_type: TemplateType, template_dir: str = DEFAULT_TEMPLATE_DIR) -> dict:
+    """Yüklenmiş sayfadan, GUI'nin handle_export_pdf'te topladığı biçimde render verisi."""
+    (width, height), background_path = page_background(page, template_type, template_dir)
+    store = get_asset_store()
+    images = []
+    for image in page.get('images') or []:
+        rect = image.get('rect')
+        if rect is None or rect.isEmpty():
+            continue
+        export_image = {'path': image.get('path'), 'x': rect.x(), 'y': rect.y(), 'width': rect.width(),
+                        'height': rect.height(), 'rotation': image.get('angle', 0.0)}
+        if image.get('asset'):
+            export_image['asset'] = image['asset']
+            export_image['data'] = store.data(image['asset'])
+        images.append(export_image)
+    return {
+        "page_content": {
+            'lines': page.get('lines', []),
+            'shapes': page.get('shapes', []),
+            'images': images,
+            'bspline_strokes': page.get('bspline_strokes', []),
+            'pdf_background_source_path': page.get('pdf_background_source_path'),
+        },
+        "width": width,
+        "height": height,
+        "background_path": background_path,
+        "page_background_pixmap": None,
+        "zoom_level": 1.0,
+        "pan_offset": QPointF(0, 0),
+    }
+
+
+def _page_for_saving(page: dict, page_number: int) -> SimpleNamespace:
+    """Yüklenmiş sayfayı save_notebook'un beklediği arayüzle sarar (bkz. PageSnapshot)."""
+    canvas = SimpleNamespace(lines=page.get('lines', []), shapes=page.get('shapes', []),
+                             b_spline_strokes=page.get('bspline_strokes', []),
+                             _pdf_background_source_path=page.get('pdf_background_source_path'))
+    try:
+        orientation = Orientation[page.get('orientation') or Orientation.PORTRAIT.name]
+    except KeyError:
+        orientation = Orientation.PORTRAIT
+    return SimpleNamespace(page_number=page_number, orientation=orientation, images=page.get('images', []),
+                           drawing_canvas=canvas, get_canvas=lambda: canvas)
+
+
+# --- Tek Not Defteri (işçi süreçte çalışır) --- #
+def process_notebook(source: str, output_path: str, target: str, options: dict) -> Tuple[bool, str]:
+    """Bir not defterini hedef biçime aktarır; (başarılı mı, açıklama) döndürür.
+
+    options: 'template' (TemplateType adı), 'template_dir', 'template_settings', 'dpi',
+    'stroke_tolerance_pt', 'scale' (png), 'compression' ve 'precision' (dnd), 'log_level'.
+    """
+    logging.basicConfig(level=options.get('log_level', logging.WARNING), format=LOG_FORMAT)
+    pages = load_notebook_pages(source)
+    if pages is None:
+        return False, "okunamadı"
+    if not pages:
+        return False, "sayfa yok"
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    if target in ('dnd', 'json'):
+        file_format = file_io_helpers.FILE_FORMAT_JSON if target == 'json' else file_io_helpers.FILE_FORMAT_BINARY
+        saved = file_io_helpers.save_notebook(
+            output_path, [_page_for_saving(page, i + 1) for i, page in enumerate(pages)], file_format=file_format,
+            compression=options.get('compression', notebook_format.DEFAULT_COMPRESSION),
+            precision=options.get('precision', notebook_format.DEFAULT_COORDINATE_PRECISION))
+        return saved, f"{len(pages)} sayfa" if saved else "kaydedilemedi"
+
+    template_type = TemplateType[options.get('template', TemplateType.LINED.name)]
+    template_dir = options.get('template_dir', DEFAULT_TEMPLATE_DIR)
+    if target == 'png':
+        # Ölçek canvas pikseline göredir; PDF sayfalarında canvas pikseli BASE_DPI'dadır
+        scale = options.get('scale', 1.0)
+        written = 0
+        for page, page_path in zip(pages, png_page_paths(output_path, len(pages))):
+            image = render_page_at_dpi(page, scale * page_world_dpi(page), template_type, template_dir,
+                                       options.get('template_settings'))
+            if image.save(page_path):
+                written += 1
+            else:
+                logging.error(f"PNG yazılamadı: {page_path}")
+        return written == len(pages), f"{written}/{len(pages)} sayfa"
+
+    render_data = [page_render_data(page, template_type, template_dir) for page in pages]
+    dpi = options.get('dpi', 150)
+    export_stats = {}
+    exported = pdf_export_helpers.export_notebook_to_pdf(
+        output_path, render_data, image_export_dpi=dpi, max_workers=1,  # Not defterleri zaten paralel işleniyor
+        stroke_tolerance_pt=options.get('stroke_tolerance_pt', 0.0), export_stats=export_stats)
+    if not exported:
+        return False, "dışa aktarılamadı"
+    return True, f"{len(render_data)} sayfa, {export_stats.get('file_bytes', 0) / 1024:.0f} KB"
+
+
+# --- Toplu İşlem --- #
+def run_batch(jobs: List[Tuple[str, str]], target: str, options: dict, workers: int = 1) -> int:
+    """(kaynak, çıktı) işlerini çalıştırır; ilerlemeyi yazdırır ve başarısız iş sayısını döndürür."""
+    pool = create_process_pool(workers, preload=['helpers.pdf_helper', 'utils.notebook_format']) if workers > 1 else None
+    failed = 0
+    started = time.perf_counter()
+
+    def report(done: int, source: str, output_path: str, ok: bool, message: str):
+        print(f"[{done}/{len(jobs)}] {'OK ' if ok else 'HATA'} {source} -> {output_path} ({message})", flush=True)
+
+    if pool is None:
+        for done, (source, output_path) in enumerate(jobs, 1):
+            try:
+                ok, message = process_notebook(source, output_path, target, options)
+            except Exception as e:
+                logging.error(f"Toplu dışa aktarma: {source} işlenemedi: {e}", exc_info=True)
+                ok, message = False, str(e)
+            failed += not ok
+            report(done, source, output_path, ok, message)
+    else:
+        with pool:
+            futures = {pool.submit(process_notebook, source, output_path, target, options): (source, output_path)
+                       for source, output_path in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                source, output_path = futures[future]
+                try:
+                    ok, message = future.result()
+                except Exception as e:
+                    ok, message = False, str(e)
+                failed += not ok
+                report(done, source, output_path, ok, message)
+    print(f"{len(jobs) - failed}/{len(jobs)} not defteri {time.perf_counter() - started:.1f} sn'de işlendi"
+          f"{f', {failed} başarısız' if failed else ''}.")
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="Not defteri dosyaları ve/veya klasörleri")
+    parser.add_argument('output', help="Çıktı klasörü (tek not defterinde dosya adı da olabilir)")
+    parser.add_argument('--to', dest='target', choices=TARGETS, default='pdf', help="Hedef biçim (varsayılan: pdf)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Paralel işçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--settings', default=DEFAULT_SETTINGS_PATH,
+                        help="Şablon ve dışa aktarma ayarlarının okunacağı settings.json")
+    parser.add_argument('--template', choices=[t.name for t in TemplateType],
+                        help="Sayfa şablonu (varsayılan: ayarlardaki şablon)")
+    parser.add_argument('--template-dir', default=DEFAULT_TEMPLATE_DIR, help="Şablon resimlerinin klasörü")
+    parser.add_argument('--dpi', type=int, help="PDF'e gömülen resimlerin çözünürlüğü (varsayılan: ayarlardan)")
+    parser.add_argument('--stroke-tolerance', type=float,
+                        help="PDF'te kalem çizgisi sadeleştirme toleransı, punto (0: kapalı; varsayılan: ayarlardan)")
+    parser.add_argument('--scale', type=float, default=1.0, help="PNG ölçeği (1.0 = canvas pikseli)")
+    parser.add_argument('--compression', choices=(notebook_format.CODEC_ZLIB, notebook_format.CODEC_LZ4,
+                                                   notebook_format.CODEC_NONE),
+                        default=notebook_format.DEFAULT_COMPRESSION, help="dnd hedefinde sayfa sıkıştırması")
+    parser.add_argument('--precision', type=float, default=notebook_format.DEFAULT_COORDINATE_PRECISION,
+                        help="dnd hedefinde koordinat adımı, px (0: float32)")
+    parser.add_argument('--skip-up-to-date', action='store_true',
+                        help="Çıktısı kaynaktan yeni olan not defterlerini atla")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Ayrıntılı log")
+    args = parser.parse_args(argv)
+
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    if args.target in ('pdf', 'png') and not pdf_export_helpers.PYMUPDF_AVAILABLE:
+        print("PDF/PNG dışa aktarma için PyMuPDF gerekli (pip install pymupdf).", file=sys.stderr)
+        return 2
+
+    notebooks = find_notebooks(args.inputs)
+    if not notebooks:
+        print("İşlenecek not defteri bulunamadı.", file=sys.stderr)
+        return 2
+    single_file = len(notebooks) == 1 and os.path.isfile(args.inputs[0])
+    jobs = []
+    for source, relative_path in notebooks:
+        output_path = output_path_for(relative_path, args.output, args.target, single_file)
+        check_path = png_page_paths(output_path, 1)[0] if args.target == 'png' else output_path
+        if args.skip_up_to_date and is_up_to_date(source, check_path):
+            continue
+        jobs.append((source, output_path))
+    if not jobs:
+        print("Tüm çıktılar güncel.")
+        return 0
+
+    template_settings = load_template_settings(args.settings)
+    options = {
+        'template': args.template or template_settings.get('template_type_name', TemplateType.LINED.name),
+        'template_dir': args.template_dir,
+        'template_settings': template_settings,
+        'dpi': args.dpi or template_settings.get('pdf_export_image_dpi', 150),
+        'stroke_tolerance_pt': (args.stroke_tolerance if args.stroke_tolerance is not None else
+                                template_settings.get('pdf_export_stroke_tolerance_pt',
+                                                      pdf_export_helpers.DEFAULT_STROKE_TOLERANCE_PT)),
+        'scale': args.scale,
+        'compression': args.compression,
+        'precision': args.precision or None,
+        'log_level': log_level,
+    }
+    if options['template'] not in TemplateType.__members__:
+        logging.warning(f"Ayarlarda geçersiz şablon '{options['template']}', LINED kullanılacak.")
+        options['template'] = TemplateType.LINED.name
+    workers = max(1, min(args.jobs, len(jobs)))
+    return 1 if run_batch(jobs, args.target, options, workers) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# utils/benchmark_notebook_format.py
+"""Eski JSON (.dnd v1) ile ikili (.dnd v2) not defteri biçimini karşılaştırır.
+
+Sentetik bir not defteri (varsayılan 100 sayfa) üretir, her biçimde
+kaydedip yükler ve süre / dosya boyutu / en büyük koordinat hatası yazdırır
+('q' ile biten satırlar nicemlenmiş koordinatlardır). Pencere açmaz:
+
+    python -m utils.benchmark_notebook_format --pages 100 --strokes 60
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from PyQt6.QtCore import QPointF
+
+from gui.enums import Orientation, ToolType
+from utils import file_io_helpers, notebook_format
+from utils.item_ids import tag_item
+
+
+def _synthetic_stroke(rng: random.Random, n_points: int):
+    x, y = rng.uniform(50, 700), rng.uniform(50, 1000)
+    angle = rng.uniform(0, 2 * math.pi)
+    points = []
+    for _ in range(n_points):
+        angle += rng.uniform(-0.3, 0.3)
+        x += 2.0 * math.cos(angle)
+        y += 2.0 * math.sin(angle)
+        points.append(QPointF(x, y))
+    return points
+
+
+def build_synthetic_pages(page_count: int, strokes_per_page: int, points_per_stroke: int, seed: int = 1):
+    """save_notebook'un beklediği arayüze sahip hafif sahte sayfalar üretir."""
+    rng = random.Random(seed)
+    pages = []
+    for page_number in range(page_count):
+        lines = [tag_item([(0.0, 0.0, 0.0, 1.0), 2.0, _synthetic_stroke(rng, points_per_stroke), 'solid'])
+                 for _ in range(strokes_per_page)]
+        shapes = [tag_item([ToolType.RECTANGLE, (1.0, 0.0, 0.0, 1.0), 3.0, QPointF(10, 10), QPointF(200, 120), 'solid', None])]
+        control_points = [np.array([p.x(), p.y()]) for p in _synthetic_stroke(rng, 12)]
+        bspline = tag_item({
+            'control_points': control_points,
+            'knots': np.linspace(0.0, 1.0, 16),
+            'u': np.linspace(0.0, 1.0, 40),
+            'degree': 3,
+            'color': [0.0, 0.0, 1.0, 1.0],
+            'width': 2.0,
+            'line_style': 'solid',
+            'original_points_with_pressure': [(p, 0.5) for p in _synthetic_stroke(rng, points_per_stroke)],
+        })
+        canvas = SimpleNamespace(lines=lines, shapes=shapes, b_spline_strokes=[bspline], _pdf_background_source_path=None)
+        pages.append(SimpleNamespace(page_number=page_number + 1, orientation=Orientation.PORTRAIT,
+                                     images=[], drawing_canvas=canvas, get_canvas=lambda c=canvas: c))
+    return pages
+
+
+def _max_point_error(pages, loaded) -> float:
+    """Kaydedilen ve geri yüklenen çizgi noktaları arasındaki en büyük fark (px)."""
+    error = 0.0
+    for page, page_data in zip(pages, loaded):
+        for line, loaded_line in zip(page.get_canvas().lines, page_data['lines']):
+            for p, q in zip(line[2], loaded_line[2]):
+                error = max(error, abs(p.x() - q.x()), abs(p.y() - q.y()))
+    return error
+
+
+def run(page_count: int = 100, strokes_per_page: int = 60, points_per_stroke: int = 150,
+        precision: float = notebook_format.DEFAULT_COORDINATE_PRECISION):
+    pages = build_synthetic_pages(page_count, strokes_per_page, points_per_stroke)
+    results = []
+    variants = (('json', None, None), ('binary', 'none', None), ('binary', 'zlib', None), ('binary', 'lz4', None),
+                ('binary', 'none', precision), ('binary', 'zlib', precision), ('binary', 'lz4', precision))
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_format, compression, step in variants:
+            name = f"{file_format}/{compression}" if compression else file_format
+            if step:
+                name += ' q'
+            path = os.path.join(tmp, f"bench_{len(results)}.dnd")
+            t0 = time.perf_counter()
+            ok = file_io_helpers.save_notebook(path, pages, file_format=file_format, compression=compression or 'none',
+                                               precision=step)
+            t1 = time.perf_counter()
+            loaded = file_io_helpers.load_notebook(path)
+            t2 = time.perf_counter()
+            if not ok or loaded is None or len(loaded) != page_count:
+                raise RuntimeError(f"{name} kaydet/yükle başarısız")
+            results.append((name, t1 - t0, t2 - t1, os.path.getsize(path), _max_point_error(pages, loaded)))
+    print(f"{page_count} sayfa x {strokes_per_page} vuruş x {points_per_stroke} nokta (nicemleme adımı {precision} px)")
+    print(f"{'biçim':<14}{'kaydet (s)':>12}{'yükle (s)':>12}{'boyut (KB)':>14}{'hata (px)':>12}")
+    for name, save_s, load_s, size, error in results:
+        print(f"{name:<14}{save_s:>12.3f}{load_s:>12.3f}{size / 1024:>14.0f}{error:>12.4f}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--strokes', type=int, default=60)
+    parser.add_argument('--points', type=int, default=150)
+    parser.add_argument('--precision', type=float, default=notebook_format.DEFAULT_COORDINATE_PRECISION)
+    args = parser.parse_args()
+    run(args.pages, args.strokes, args.points, args.precision)
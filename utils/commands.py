@@ -8,9 +8,11 @@ from PyQt6.QtWidgets import QGraphicsPixmapItem
 import uuid
 import hashlib
 import numpy as np # YENİ: NumPy importu eklendi
+from utils.asset_store import get_asset_store
 from scipy.interpolate import splev  # B-spline eğrisi hesaplaması için eklendi
 
 from gui.enums import ToolType # ToolType import'u EKLENDİ
+from utils.item_ids import capture_ids, resolve_index, tag_item, retag_item, get_item_id, new_item_id
 
 # Type hints
 if TYPE_CHECKING:
@@ -35,6 +37,18 @@ class Command(ABC):
         pass
 
 
+def _resolve_item_indices(canvas: 'DrawingCanvas', item_indices: List[Tuple[str, int]], item_ids: List[Any]) -> List[Tuple[str, int]]:
+    """Komut oluşturulurken yakalanan kimliklerden güncel (tip, indeks) listesini çözer.
+
+    Aradaki ekleme/silmeler indeksleri kaydırsa bile doğru öğe bulunur;
+    silinmiş öğeler -1 indeksiyle döner (çağıranın sınır kontrolü atlar).
+    """
+    return [
+        (item_type, resolve_index(canvas, item_type, index, item_ids[i] if i < len(item_ids) else None))
+        for i, (item_type, index) in enumerate(item_indices)
+    ]
+
+
 class DrawLineCommand(Command):
     """Bir çizgi çizme işlemini temsil eder."""
     def __init__(self, canvas: 'DrawingCanvas', line_data: LineDataType):
@@ -55,6 +69,8 @@ class DrawLineCommand(Command):
                 self.line_data = [ (0,0,0,1), 1.0, [] ]
         except Exception as e:
             self.line_data = [ (0,0,0,1), 1.0, [] ]
+        # Kalıcı kimlik: redo'da yeniden eklenen kopya da aynı kimliği taşır
+        self.line_data = tag_item(self.line_data)
         self._line_added = False
         self._added_index = -1
 
@@ -95,6 +111,7 @@ class DrawLineCommand(Command):
         if not self._line_added or self._added_index < 0:
             return
         try:
+            self._added_index = resolve_index(self.canvas, 'lines', self._added_index, get_item_id(self.line_data))
             if 0 <= self._added_index < len(self.canvas.lines):
                 del self.canvas.lines[self._added_index]
                 self.canvas.update()
@@ -142,6 +159,7 @@ class DrawShapeCommand(Command):
         # Fill_rgba None değilse ekle (liste 7 elemanlı olacak)
         if fill_rgba is not None:
             self.shape_data.append(fill_rgba)
+        self.shape_data = tag_item(self.shape_data)
 
         self._shape_added = False
         self._added_index = -1
@@ -182,6 +200,7 @@ class DrawShapeCommand(Command):
         if not self._shape_added or self._added_index < 0:
             return
         try:
+            self._added_index = resolve_index(self.canvas, 'shapes', self._added_index, get_item_id(self.shape_data))
             if 0 <= self._added_index < len(self.canvas.shapes):
                 del self.canvas.shapes[self._added_index]
                 self._shape_added = False
@@ -357,6 +376,7 @@ class MoveItemsCommand(Command):
     def __init__(self, canvas: 'DrawingCanvas', item_indices: List[Tuple[str, int]], original_states: List[Any], final_states: List[Any]):
         self.canvas = canvas
         self.item_indices = item_indices # [('lines', 0), ('shapes', 5), ...]
+        self.item_ids = capture_ids(canvas, item_indices)
         # Derin kopyaları sakla
         self.original_states = _copy_states_without_pixmap(original_states)
         self.final_states = _copy_states_without_pixmap(final_states)
@@ -369,7 +389,7 @@ class MoveItemsCommand(Command):
         # --- RESİM TAŞIMA HANDLER ENTEGRASYONU --- #
         try:
             from handlers import resim_islem_handler
-            for idx, (item_type, index) in enumerate(self.item_indices):
+            for idx, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 if item_type == 'images' and hasattr(self.canvas._parent_page, 'images') and 0 <= index < len(self.canvas._parent_page.images):
                     img_data = self.canvas._parent_page.images[index]
                     dosya_yolu = img_data.get('path', None)
@@ -404,7 +424,7 @@ class MoveItemsCommand(Command):
         # --- RESİM TAŞIMA HANDLER ENTEGRASYONU (UNDO) --- #
         try:
             from handlers import resim_islem_handler
-            for idx, (item_type, index) in enumerate(self.item_indices):
+            for idx, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 if item_type == 'images' and hasattr(self.canvas._parent_page, 'images') and 0 <= index < len(self.canvas._parent_page.images):
                     img_data = self.canvas._parent_page.images[index]
                     dosya_yolu = img_data.get('path', None)
@@ -442,7 +462,7 @@ class MoveItemsCommand(Command):
                 logging.error("MoveItemsCommand._apply_state: Canvas'ın _parent_page referansı yok!")
                 return
                 
-            for i, (item_type, index) in enumerate(self.item_indices):
+            for i, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 item_full_data = states[i]
                 if item_full_data is None:
                     logging.warning(f"MoveItemsCommand._apply_state: Öğenin state'i None: {item_type}[{index}]")
@@ -498,6 +518,7 @@ class ResizeItemsCommand(Command):
     def __init__(self, canvas: 'DrawingCanvas', item_indices: List[Tuple[str, int]], original_states: List[Any], final_states: List[Any]):
         self.canvas = canvas
         self.item_indices = item_indices # [('lines', 0), ('shapes', 5), ...]
+        self.item_ids = capture_ids(canvas, item_indices)
         # deepcopy kullanarak orijinal ve son halleri sakla
         self.original_states = _copy_states_without_pixmap(original_states)
         self.final_states = _copy_states_without_pixmap(final_states)
@@ -514,7 +535,7 @@ class ResizeItemsCommand(Command):
         # --- RESİM BOYUTLANDIRMA HANDLER ENTEGRASYONU --- #
         try:
             from handlers import resim_islem_handler
-            for idx, (item_type, index) in enumerate(self.item_indices):
+            for idx, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 if item_type == 'images' and hasattr(self.canvas._parent_page, 'images') and 0 <= index < len(self.canvas._parent_page.images):
                     img_data = self.canvas._parent_page.images[index]
                     dosya_yolu = img_data.get('path', None)
@@ -548,7 +569,7 @@ class ResizeItemsCommand(Command):
         # --- RESİM BOYUTLANDIRMA HANDLER ENTEGRASYONU (UNDO) --- #
         try:
             from handlers import resim_islem_handler
-            for idx, (item_type, index) in enumerate(self.item_indices):
+            for idx, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 if item_type == 'images' and hasattr(self.canvas._parent_page, 'images') and 0 <= index < len(self.canvas._parent_page.images):
                     img_data = self.canvas._parent_page.images[index]
                     dosya_yolu = img_data.get('path', None)
@@ -586,7 +607,7 @@ class ResizeItemsCommand(Command):
                 logging.error("ResizeItemsCommand._apply_state: Canvas'ın _parent_page referansı yok!")
                 return
                 
-            for i, (item_type, index) in enumerate(self.item_indices):
+            for i, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 item_full_data = states[i]
                 if item_full_data is None: 
                     logging.warning(f"ResizeItemsCommand._apply_state: Öğenin state'i None: {item_type}[{index}]")
@@ -804,7 +825,8 @@ class AddImageCommand(Command):
             if isinstance(value, QPixmap):
                 if key == 'pixmap': # Bu, handle_add_image'dan gelen, başlangıçta ölçeklenmiş pixmap
                     self.image_data[key] = value 
-                    self.image_data['original_pixmap_for_scaling'] = value.copy() # Ölçekleme için temel kopya
+                    # Ölçekleme için temel; depodaki resimlerin pixmap'ı paylaşılır (kopyalanmaz)
+                    self.image_data['original_pixmap_for_scaling'] = value if image_data.get('asset') else value.copy()
                 else: # Başka bir QPixmap alanı varsa (beklenmiyor ama güvenli)
                     self.image_data[key] = value
             else:
@@ -822,15 +844,23 @@ class AddImageCommand(Command):
             self.page.images = []
 
         # --- YENİ: Aynı hash'e sahip resim var mı kontrolü ---
-        new_path = self.image_data.get('path')
-        new_hash = get_file_md5(new_path) if new_path else None
-        if new_hash:
-            for img in self.page.images:
-                img_path = img.get('path')
-                img_hash = get_file_md5(img_path) if img_path else None
-                if img_hash == new_hash:
-                    logging.info(f"Aynı içeriğe sahip resim zaten ekli: {new_path}")
-                    return  # Aynı resim tekrar eklenmez
+        # Depodaki resimler içerik özetiyle karşılaştırılır; MD5 yalnızca yolu olan eski resimler için
+        new_asset = self.image_data.get('asset')
+        if new_asset:
+            if any(img.get('asset') == new_asset and img.get('uuid') != self.image_data.get('uuid')
+                   for img in self.page.images):
+                logging.info(f"Aynı içeriğe sahip resim zaten ekli: {new_asset[:12]}")
+                return  # Aynı resim tekrar eklenmez
+        else:
+            new_path = self.image_data.get('path')
+            new_hash = get_file_md5(new_path) if new_path else None
+            if new_hash:
+                for img in self.page.images:
+                    img_path = img.get('path')
+                    img_hash = get_file_md5(img_path) if img_path and not img.get('asset') else None
+                    if img_hash == new_hash:
+                        logging.info(f"Aynı içeriğe sahip resim zaten ekli: {new_path}")
+                        return  # Aynı resim tekrar eklenmez
         # --- --- ---
 
         try:
@@ -913,6 +943,7 @@ class RotateItemsCommand(Command):
         super().__init__() 
         self.canvas = canvas
         self.item_indices = copy.deepcopy(item_indices) 
+        self.item_ids = capture_ids(canvas, self.item_indices)
         
         # original_states ve final_states zaten _get_current_selection_states'ten
         # QPixmap/QGraphicsPixmapItem olmadan geldiği varsayılıyor.
@@ -942,7 +973,7 @@ class RotateItemsCommand(Command):
                 logging.error("RotateItemsCommand._apply_item_states: Canvas'ın _parent_page referansı yok!")
                 return
                 
-            for i, (item_type, index) in enumerate(self.item_indices):
+            for i, (item_type, index) in enumerate(_resolve_item_indices(self.canvas, self.item_indices, self.item_ids)):
                 item_full_data = states_to_apply[i]
                 if item_full_data is None:
                     logging.warning(f"RotateItemsCommand._apply_item_states: Öğenin state'i None: {item_type}[{index}]")
@@ -1047,8 +1078,11 @@ class PasteItemsCommand(Command):
     
     def execute(self):
         self.pasted_indices = []
+        self.pasted_ids = []
         for item_type, item_data in self.items_to_paste:
-            yeni_data = copy.deepcopy(item_data)
+            # Yapıştırılan kopya kaynaktan bağımsız yeni bir kimlik alır
+            yeni_data = retag_item(copy.deepcopy(item_data))
+            self.pasted_ids.append(get_item_id(yeni_data))
             if item_type == 'lines' and len(yeni_data) > 2:
                 yeni_data[2] = [QPointF(pt.x()+20, pt.y()+20) for pt in yeni_data[2]]
                 self.canvas.lines.append(yeni_data)
@@ -1102,8 +1136,9 @@ class PasteItemsCommand(Command):
         return True
     
     def undo(self):
-        # Yapıştırılan öğeleri geri al
-        for item_type, idx in sorted(self.pasted_indices, reverse=True):
+        # Yapıştırılan öğeleri geri al (kimlikten güncel indeks çözülür)
+        current = _resolve_item_indices(self.canvas, self.pasted_indices, getattr(self, 'pasted_ids', []))
+        for item_type, idx in sorted(current, key=lambda x: x[1], reverse=True):
             if item_type == 'lines' and 0 <= idx < len(self.canvas.lines):
                 del self.canvas.lines[idx]
             elif item_type == 'shapes' and 0 <= idx < len(self.canvas.shapes):
@@ -1134,11 +1169,13 @@ class DeleteItemsCommand(Command):
     def __init__(self, canvas: 'DrawingCanvas', item_indices: list):
         self.canvas = canvas
         self.item_indices = sorted(item_indices, reverse=True)  # [('lines', idx), ...] - Büyükten küçüğe silinecek
+        self.item_ids = capture_ids(canvas, self.item_indices)
         self.deleted_items = []  # [('lines', idx, data), ...]
 
     def execute(self):
         self.deleted_items = []
-        for item_type, idx in self.item_indices:
+        current = _resolve_item_indices(self.canvas, self.item_indices, self.item_ids)
+        for item_type, idx in sorted(current, key=lambda x: x[1], reverse=True):
             if item_type == 'lines' and 0 <= idx < len(self.canvas.lines):
                 data = copy.deepcopy(self.canvas.lines[idx])
                 del self.canvas.lines[idx]
@@ -1181,7 +1218,11 @@ class DeleteItemsCommand(Command):
                 # QPixmap'ı path üzerinden tekrar yükle
                 from PyQt6.QtGui import QPixmap
                 img_data = dict(data) # Kopya oluştur
-                if 'path' in img_data:
+                pixmap = get_asset_store().pixmap(img_data.get('asset'))
+                if pixmap is not None:
+                    img_data['pixmap'] = pixmap
+                    img_data['original_pixmap_for_scaling'] = pixmap
+                elif 'path' in img_data:
                     pixmap = QPixmap(img_data['path'])
                     img_data['pixmap'] = pixmap
                     img_data['original_pixmap_for_scaling'] = pixmap
@@ -1223,6 +1264,7 @@ class DrawEditableLineCommand(Command):
             'width': width,
             'line_style': line_style
         }
+        self._item_id = new_item_id()
 
         self._line_added = False
         self._added_index = -1
@@ -1243,6 +1285,7 @@ class DrawEditableLineCommand(Command):
                 copy.deepcopy(self.line_data['control_points']),  # Tüm kontrol noktaları
                 self.line_data['line_style']
             ]
+            shape_data_to_add = tag_item(shape_data_to_add, self._item_id)
 
             if self._line_added: # Redo durumu
                 if 0 <= self._added_index <= len(self.canvas.shapes):
@@ -1273,6 +1316,7 @@ class DrawEditableLineCommand(Command):
         if not self._line_added or self._added_index < 0:
             return
         try:
+            self._added_index = resolve_index(self.canvas, 'shapes', self._added_index, self._item_id)
             if 0 <= self._added_index < len(self.canvas.shapes):
                 del self.canvas.shapes[self._added_index]
                 self._line_added = False
@@ -1308,6 +1352,7 @@ class UpdateEditableLineCommand:
         """
         self.canvas = canvas
         self.shape_index = shape_index
+        self.shape_id = capture_ids(canvas, [('shapes', shape_index)])[0]
         self.original_points = original_points.copy()
         self.new_points = new_points.copy()
         self.original_width = original_width
@@ -1318,6 +1363,7 @@ class UpdateEditableLineCommand:
     
     def execute(self):
         """Komutu uygular: Düzenlenebilir çizginin kontrol noktalarını, kalınlığını ve rengini günceller."""
+        self.shape_index = resolve_index(self.canvas, 'shapes', self.shape_index, self.shape_id)
         if 0 <= self.shape_index < len(self.canvas.shapes):
             self.canvas.shapes[self.shape_index][3] = self.new_points.copy()
             if self.new_width is not None:
@@ -1330,6 +1376,7 @@ class UpdateEditableLineCommand:
     
     def undo(self):
         """Komutu geri alır: Düzenlenebilir çizginin kontrol noktalarını, kalınlığını ve rengini orijinal haline döndürür."""
+        self.shape_index = resolve_index(self.canvas, 'shapes', self.shape_index, self.shape_id)
         if 0 <= self.shape_index < len(self.canvas.shapes):
             self.canvas.shapes[self.shape_index][3] = self.original_points.copy()
             if self.original_width is not None:
@@ -1353,7 +1400,7 @@ class DrawBsplineCommand(Command):
             stroke_data: Çizilecek B-Spline verisi.
         """
         self.canvas = canvas
-        self.stroke_data = copy.deepcopy(stroke_data) # Derin kopya al
+        self.stroke_data = tag_item(copy.deepcopy(stroke_data)) # Derin kopya al (kalıcı 'uuid' ile)
         self._stroke_added = False # Stroke'un listeye eklenip eklenmediğini takip eder
         self._added_index = -1     # Listeye eklendiği indeksi saklar
 
@@ -1398,6 +1445,7 @@ class DrawBsplineCommand(Command):
             return
 
         try:
+            self._added_index = resolve_index(self.canvas, 'bspline_strokes', self._added_index, get_item_id(self.stroke_data))
             if 0 <= self._added_index < len(self.canvas.b_spline_strokes):
                 # Stroke'u silmeden önce bir kontrol (opsiyonel): self.canvas.b_spline_strokes[self._added_index] == self.stroke_data
                 del self.canvas.b_spline_strokes[self._added_index]
@@ -1421,6 +1469,7 @@ class UpdateBsplineControlPointCommand(Command):
     def __init__(self, canvas: 'DrawingCanvas', stroke_idx: int, cp_idx: int, old_pos_np, new_pos_np):
         self.canvas = canvas
         self.stroke_idx = stroke_idx
+        self.stroke_id = capture_ids(canvas, [('bspline_strokes', stroke_idx)])[0]
         self.cp_idx = cp_idx
         self.old_pos_np = old_pos_np.copy() # Pozisyonları kopyala
         self.new_pos_np = new_pos_np.copy()
@@ -1428,6 +1477,7 @@ class UpdateBsplineControlPointCommand(Command):
     def _set_control_point_position(self, pos_array: np.ndarray):
         """Belirtilen pozisyonu stroke'taki kontrol noktasına atar."""
         try:
+            self.stroke_idx = resolve_index(self.canvas, 'bspline_strokes', self.stroke_idx, self.stroke_id)
             if 0 <= self.stroke_idx < len(self.canvas.b_spline_strokes):
                 stroke_data = self.canvas.b_spline_strokes[self.stroke_idx]
                 if 'control_points' in stroke_data and \
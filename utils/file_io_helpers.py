@@ -1,12 +1,23 @@
 # utils/file_io_helpers.py
 """Not defterini kaydetme ve yükleme ile ilgili yardımcı fonksiyonlar."""
 
+import base64
 import json
 import logging
-from typing import List, Dict, Any, Tuple
+import os
+from types import SimpleNamespace
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import numpy as np  # NumPy dizileri için gerekli
 from PyQt6.QtCore import QPointF, QRectF
 from gui.enums import ToolType, Orientation # Orientation eklendi
+from utils.item_ids import get_item_id, tag_item
+from utils import notebook_format
+from utils.asset_store import get_asset_store
+
+# Kaydetme biçimleri
+FILE_FORMAT_BINARY = 'binary'  # .dnd v2 (bkz. utils/notebook_format.py)
+FILE_FORMAT_JSON = 'json'      # Eski (v1) girintili JSON biçimi
+DEFAULT_FILE_FORMAT = FILE_FORMAT_BINARY
 
 # --- Veri Dönüştürme Yardımcıları ---
 
@@ -18,6 +29,12 @@ def _list_to_point(p_list: List[float]) -> QPointF:
     """[x, y] listesini QPointF'e dönüştürür."""
     return QPointF(p_list[0], p_list[1])
 
+def _points_from_data(points_data) -> List[QPointF]:
+    """[[x, y], ...] listesini veya (n, 2) NumPy dizisini (ikili biçim) QPointF listesine dönüştürür."""
+    if isinstance(points_data, np.ndarray):
+        points_data = points_data.tolist()  # Eleman bazında numpy skaler erişiminden çok daha hızlı
+    return [QPointF(x, y) for x, y in points_data]
+
 # --- YENİ: Rect ve Image Serialize/Deserialize ---
 def _rect_to_list(r: QRectF) -> List[float]:
     """QRectF'i [left, top, width, height] listesine dönüştürür."""
@@ -41,11 +58,13 @@ def _serialize_image(image_data: Dict[str, Any]) -> Dict[str, Any]:
             serialized['path'] = value
         elif key == 'uuid': # UUID'yi de alalım
              serialized['uuid'] = value
+        elif key == 'asset' and value: # İçerik özeti (resim baytları not defteri dosyasında)
+             serialized['asset'] = value
         # Gelecekte eklenebilecek diğer anahtarlar buraya eklenebilir
     # Path'in mutlaka eklendiğinden emin olalım (eski format uyumu için?)
     if 'path' not in serialized:
          serialized['path'] = image_data.get('path', None) # Path yoksa None
-         if serialized['path'] is None:
+         if serialized['path'] is None and 'asset' not in serialized:
              logging.warning(f"Kaydedilecek resim verisinde 'path' bulunamadı: UUID {image_data.get('uuid')}")
 
     serialized['type'] = 'image' # Türünü belirtelim
@@ -64,7 +83,12 @@ def _deserialize_image(image_dict: Dict[str, Any]) -> Dict[str, Any] | None:
             'rect': _list_to_rect(image_dict['rect']) if 'rect' in image_dict else QRectF(),
             'pixmap': None # Pixmap burada yüklenmeyecek
         }
-        if not deserialized['path']:
+        if image_dict.get('asset'):
+            deserialized['asset'] = image_dict['asset']
+            if image_dict.get('asset_data'):
+                # JSON biçimi: resim baytları sayfanın içinde gömülü
+                get_asset_store().add_bytes(base64.b64decode(image_dict['asset_data']), image_dict.get('asset_ext', ''))
+        elif not deserialized['path']:
              logging.warning(f"Deserialize image: Resim yolu eksik: UUID {deserialized['uuid']}")
              # Belki burada hata vermek yerine None döndürmek daha iyi? Şimdilik devam edelim.
         return deserialized
@@ -74,6 +98,14 @@ def _deserialize_image(image_dict: Dict[str, Any]) -> Dict[str, Any] | None:
 # --- --- --- --- --- --- --- --- --- --- --- --- ---
 
 def _serialize_item(item_data: List[Any]) -> Dict[str, Any]:
+    """Tek bir çizgi veya şekil verisini (kalıcı kimliğiyle) JSON uyumlu sözlüğe dönüştürür."""
+    serialized = _serialize_item_fields(item_data)
+    item_id = get_item_id(item_data)
+    if serialized is not None and item_id:
+        serialized['id'] = item_id
+    return serialized
+
+def _serialize_item_fields(item_data: List[Any]) -> Dict[str, Any]:
     """Tek bir çizgi veya şekil verisini JSON uyumlu sözlüğe dönüştürür."""
     if not item_data or len(item_data) < 3:
         logging.warning(f"Serileştirme için eksik veri: {item_data}")
@@ -148,6 +180,17 @@ def _serialize_item(item_data: List[Any]) -> Dict[str, Any]:
             return serialized
 
 def _deserialize_item(item_dict: Dict[str, Any]) -> List[Any] | None:
+    """JSON uyumlu sözlüğü çizgi veya şekil verisine dönüştürür.
+
+    Kayıtlı 'id' varsa öğe aynı kimlikle geri yüklenir; eski dosyalarda yeni
+    kimlik atanır.
+    """
+    item = _deserialize_item_fields(item_dict)
+    if item is None:
+        return None
+    return tag_item(item, item_dict.get('id'))
+
+def _deserialize_item_fields(item_dict: Dict[str, Any]) -> List[Any] | None:
     """JSON uyumlu sözlüğü çizgi veya şekil verisine dönüştürür."""
     if not item_dict:
         return None
@@ -167,7 +210,7 @@ def _deserialize_item(item_dict: Dict[str, Any]) -> List[Any] | None:
         line_style = item_dict.get('line_style')
             
         # Noktaları QPointF'e dönüştür
-        points = [_list_to_point(p) for p in points_list]
+        points = _points_from_data(points_list)
         
         # Çizgi listesi döndür: [color_tuple, width_float, List[QPointF], Optional[line_style_str]]
         result = [tuple(color), width, points]
@@ -185,7 +228,7 @@ def _deserialize_item(item_dict: Dict[str, Any]) -> List[Any] | None:
         # PATH için özel kontrol
         if tool_type_str == 'PATH':
             points_list = item_dict.get('points')
-            if not points_list:
+            if points_list is None or len(points_list) == 0:
                 logging.warning(f"PATH deserialize: 'points' listesi bulunamadı: {item_dict}")
                 return None
                 
@@ -202,7 +245,7 @@ def _deserialize_item(item_dict: Dict[str, Any]) -> List[Any] | None:
                 return None
                 
             # Noktaları QPointF'e dönüştür 
-            points = [_list_to_point(p) for p in points_list]
+            points = _points_from_data(points_list)
             logging.debug(f"PATH deserialize edildi: {len(points)} nokta")
             
             # [ToolType.PATH, color_tuple, width_float, List[QPointF], line_style]
@@ -258,7 +301,7 @@ def _deserialize_item(item_dict: Dict[str, Any]) -> List[Any] | None:
         line_style = item_dict.get('line_style', 'solid')
             
         # Noktaları QPointF'e dönüştür
-        points = [_list_to_point(p) for p in points_list]
+        points = _points_from_data(points_list)
         
         # Düzenlenebilir çizgi formatı döndür: [ToolType.EDITABLE_LINE, color_tuple, width_float, List[QPointF], line_style_str]
         return [ToolType.EDITABLE_LINE, tuple(color), width, points, line_style]
@@ -315,6 +358,8 @@ def _serialize_bspline(stroke_data: Dict[str, Any]) -> Dict[str, Any]:
         serialized['color'] = stroke_data.get('color', [0.0, 0.0, 0.0, 1.0]) # Renk zaten list of float olmalı
         serialized['width'] = float(stroke_data.get('width', 2.0))
         serialized['line_style'] = stroke_data.get('line_style', 'solid')
+        if stroke_data.get('uuid'):
+            serialized['uuid'] = stroke_data['uuid']
 
         # Orijinal noktaları da kaydet (varsa)
         if 'original_points_with_pressure' in stroke_data:
@@ -338,6 +383,24 @@ def _serialize_bspline(stroke_data: Dict[str, Any]) -> Dict[str, Any]:
         logging.error(f"B-Spline serialize edilirken hata: {e}", exc_info=True)
         return None
 
+def _bspline_parameters(original_points, knots: np.ndarray, degree: int) -> np.ndarray:
+    """splprep'in varsayılan 'u' parametrelerini (normalize kiriş uzunluğu) yeniden hesaplar.
+
+    Orijinal noktalar yoksa knot vektörünün geçerli aralığı ([t_k, t_-k-1]) döndürülür;
+    çizimde yalnızca u[-1] (eğrinin bitiş parametresi) kullanılır.
+    """
+    if original_points is not None and len(original_points) >= 2:
+        if isinstance(original_points, np.ndarray):
+            xy = np.asarray(original_points[:, :2], dtype=float)
+        else:
+            xy = np.array([point for point, _pressure in original_points], dtype=float)
+        distances = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))))
+        if distances[-1] > 0:
+            return distances / distances[-1]
+    if len(knots) > 2 * degree + 1:
+        return np.array([knots[degree], knots[-degree - 1]], dtype=float)
+    return np.array([0.0, 1.0])
+
 def _deserialize_bspline(stroke_dict: Dict[str, Any]) -> Dict[str, Any]:
     """JSON uyumlu sözlükten B-Spline stroke verisi oluşturur."""
     if stroke_dict.get('type') != 'bspline':
@@ -349,15 +412,23 @@ def _deserialize_bspline(stroke_dict: Dict[str, Any]) -> Dict[str, Any]:
         control_points_list_of_lists = stroke_dict.get('control_points')
         
         # YENİ: control_points'i List[np.array([x,y])] formatına çevir
-        if isinstance(control_points_list_of_lists, list) and all(isinstance(cp, list) and len(cp) == 2 for cp in control_points_list_of_lists):
+        if isinstance(control_points_list_of_lists, np.ndarray) and control_points_list_of_lists.ndim == 2:
+            # İkili biçim: (n, 2) float32 dizi
+            control_points = list(control_points_list_of_lists.astype(float))
+        elif isinstance(control_points_list_of_lists, list) and all(isinstance(cp, list) and len(cp) == 2 for cp in control_points_list_of_lists):
             control_points = [np.array(cp_row, dtype=float) for cp_row in control_points_list_of_lists]
         else:
             # Eğer format beklenmedikse, eski davranışa (2D array) geri dön veya hata logla
             logging.warning(f"B-Spline deserialize: 'control_points' beklenen formatta değil (List[List[float, float]]). 2D NumPy array olarak yükleniyor: {control_points_list_of_lists}")
             control_points = np.array(control_points_list_of_lists) # Eski davranış (2D array)
 
-        knots = np.array(stroke_dict.get('knots'))
-        u_params = np.array(stroke_dict.get('u'))
+        knots = np.array(stroke_dict.get('knots'), dtype=float)
+        if stroke_dict.get('u') is None:
+            # Nicemlenmiş ikili biçim 'u'yu yazmaz; orijinal noktalardan yeniden hesaplanır
+            u_params = _bspline_parameters(stroke_dict.get('original_points_with_pressure'), knots,
+                                           stroke_dict.get('degree', 3))
+        else:
+            u_params = np.array(stroke_dict.get('u'), dtype=float)
         
         deserialized = {
             'control_points': control_points,
@@ -368,13 +439,17 @@ def _deserialize_bspline(stroke_dict: Dict[str, Any]) -> Dict[str, Any]:
             'width': stroke_dict.get('width', 2.0),
             'line_style': stroke_dict.get('line_style', 'solid')
         }
+        tag_item(deserialized, stroke_dict.get('uuid'))
         
         # Orijinal noktaları da yükle (varsa)
         if 'original_points_with_pressure' in stroke_dict:
             original_points_list = stroke_dict['original_points_with_pressure']
-            # Format: [ [[x,y], pressure], ... ] 
+            # Format: [ [[x,y], pressure], ... ] veya ikili biçimde (n, 3) dizi [x, y, pressure]
             # Hedef: [ (QPointF(x,y), pressure), ... ]
             deserialized_orig_points = []
+            if isinstance(original_points_list, np.ndarray):
+                deserialized_orig_points = [(QPointF(x, y), pressure) for x, y, pressure in original_points_list.tolist()]
+                original_points_list = []
             for item in original_points_list:
                 if isinstance(item, list) and len(item) == 2 and isinstance(item[0], list) and len(item[0]) == 2:
                     try:
@@ -393,66 +468,332 @@ def _deserialize_bspline(stroke_dict: Dict[str, Any]) -> Dict[str, Any]:
         return None
 # --- --- --- --- --- --- --- --- --- --- --- ---
 
+# --- Sayfa Serialize/Deserialize ---
+
+def serialize_page(page: 'Page') -> Dict[str, Any]:
+    """Bir Page nesnesini JSON uyumlu sayfa sözlüğüne dönüştürür (her iki dosya biçimi için ortak)."""
+    # Canvas yerine doğrudan Page'den alalım (veriler Page'de tutuluyordu)
+    orientation = page.orientation # Yönü al
+    # Çizimler canvas verisinden okunur; widget'ı olmayan sayfa için canvas oluşturulmaz
+    if hasattr(page, 'ensure_content_loaded'):
+        page.ensure_content_loaded()
+        page._ensure_pixmaps_loaded()
+    canvas = page.drawing_canvas
+
+    # --- YENİ: images listesini de al ---
+    images_to_serialize = []
+    if hasattr(page, 'images') and isinstance(page.images, list):
+         for img_data in page.images:
+              serialized_img = _serialize_image(img_data)
+              if serialized_img: # Başarılı serialize olduysa ekle
+                   images_to_serialize.append(serialized_img)
+    else:
+         logging.warning(f"Sayfa {page.page_number}: 'images' özelliği bulunamadı veya liste değil.")
+    # --- --- --- --- --- --- --- --- ---
+
+    # YENİ: PDF arka plan yolunu al
+    pdf_bg_path = None
+    if canvas and hasattr(canvas, '_pdf_background_source_path'):
+        pdf_bg_path = canvas._pdf_background_source_path
+        
+    # YENİ: B-Spline strokes verilerini al
+    bspline_strokes_to_serialize = []
+    if canvas and hasattr(canvas, 'b_spline_strokes') and canvas.b_spline_strokes:
+        for stroke_data in canvas.b_spline_strokes:
+            serialized_stroke = _serialize_bspline(stroke_data)
+            if serialized_stroke:
+                bspline_strokes_to_serialize.append(serialized_stroke)
+
+    return {
+        'lines': [_serialize_item(line) for line in canvas.lines if line],
+        'shapes': [_serialize_item(shape) for shape in canvas.shapes if shape],
+        'images': images_to_serialize, # Serileştirilmiş resimleri ekle
+        'orientation': orientation.name, # Yön ismini kaydet
+        'pdf_background_source_path': pdf_bg_path, # YENİ: PDF arka plan yolunu kaydet
+        'ink_digest': getattr(page, 'ink_digest', None), # PDF'e son geri yazılan mürekkebin özeti
+        'bspline_strokes': bspline_strokes_to_serialize # YENİ: B-Spline verilerini ekle
+    }
+
+def deserialize_page(page_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON uyumlu (veya ikili biçimden çözülmüş) sayfa sözlüğünü yüklenmiş sayfa verisine dönüştürür."""
+    # --- YENİ: images listesini de deserialize et ---
+    deserialized_images = []
+    for image_dict in page_dict.get('images', []):
+         deserialized_img = _deserialize_image(image_dict)
+         if deserialized_img:
+              deserialized_images.append(deserialized_img)
+    # --- --- --- --- --- --- --- --- --- --- --- ---
+
+    # --- YENİ: B-Spline stroke verilerini deserialize et ---
+    deserialized_bsplines = []
+    for bspline_dict in page_dict.get('bspline_strokes', []):
+        deserialized_bspline = _deserialize_bspline(bspline_dict)
+        if deserialized_bspline:
+            deserialized_bsplines.append(deserialized_bspline)
+    # --- --- --- --- --- --- --- --- --- --- --- ---
+
+    # --- YENİ: orientation'ı tuple yerine string olarak sakla ---
+    deserialized_page = {
+        'lines': [],
+        'shapes': [],
+        'images': deserialized_images, # Deserialize edilmiş resimleri ekle
+        'orientation': page_dict.get('orientation', Orientation.PORTRAIT.name), # String olarak al
+        'pdf_background_source_path': page_dict.get('pdf_background_source_path'), # YENİ: PDF arka plan yolunu oku
+        'bspline_strokes': deserialized_bsplines # YENİ: B-Spline verilerini ekle
+    }
+    # --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
+    for item_dict in page_dict.get('lines', []):
+        item = _deserialize_item(item_dict)
+        if item: deserialized_page['lines'].append(item)
+
+    for item_dict in page_dict.get('shapes', []):
+        item = _deserialize_item(item_dict)
+        if item: deserialized_page['shapes'].append(item)
+
+    return deserialized_page
+# --- --- --- --- --- --- --- --- --- --- --- ---
+
+# --- YENİ: Arka plan kaydı için sayfa anlık görüntüsü --- #
+
+def _snapshot_item(item: List[Any]) -> List[Any]:
+    """Çizgi/şekil listesinin kaydedilebilir kopyası (kimlik korunur).
+
+    Düzenleme kodu nokta listelerinin elemanlarını yerinde değiştirmez, yeni
+    liste/QPointF atar; bu yüzden nokta listelerinin yüzeysel kopyası yeterlidir.
+    Şekillerin p1/p2 noktaları ise yerinde (+=, setX) değiştiği için kopyalanır.
+    """
+    copied = [list(value) if isinstance(value, list) else QPointF(value) if isinstance(value, QPointF) else value
+              for value in item]
+    item_id = get_item_id(item)
+    return tag_item(copied, item_id) if item_id else copied
+
+def _snapshot_bspline(stroke_data: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(stroke_data)
+    for key in ('control_points', 'original_points_with_pressure'):
+        if isinstance(copied.get(key), list):
+            copied[key] = list(copied[key])
+    return copied
+
+def _snapshot_image(image_data: Dict[str, Any]) -> Dict[str, Any]:
+    copied = {key: value for key, value in image_data.items() if key != 'pixmap'}
+    if isinstance(copied.get('rect'), QRectF):
+        copied['rect'] = QRectF(copied['rect'])
+    return copied
+
+class PageSnapshot:
+    """Bir sayfanın kayıt anındaki değişmez kopyası; iş parçacığında kaydedilebilir.
+
+    serialize_page ve artımlı kayıt Page yerine bunu kullanabilir (aynı
+    alanlar: page_number, orientation, images, drawing_canvas, is_modified,
+    file_chunk, ink_digest, has_pending_content). İçerik yalnızca yeniden kodlanacaksa
+    kopyalanır; dosyadaki parçası kullanılacak sayfalarda kopyalanmaz.
+    """
+
+    def __init__(self, page: 'Page', filepath: str, file_format: str = DEFAULT_FILE_FORMAT):
+        self.page = page
+        self.generation = getattr(page, 'modification_generation', 0)
+        if getattr(page, 'has_pending_content', False) and (
+                file_format == FILE_FORMAT_JSON or getattr(page, 'file_chunk', None) is None):
+            # Eski JSON dosyasından açılmış ya da JSON'a kaydedilecek sayfa: içerik burada çözülmeli
+            page.ensure_content_loaded()
+        self.page_number = page.page_number
+        self.orientation = page.orientation
+        self.is_modified = page.is_modified
+        self.has_pending_content = getattr(page, 'has_pending_content', False)
+        self.file_chunk = getattr(page, 'file_chunk', None)
+        self.ink_digest = getattr(page, 'ink_digest', None)
+        self._content_source = getattr(page, '_content_source', None)
+        self.images = []
+        self.drawing_canvas = None
+        if self.has_pending_content:
+            return
+        canvas = page.drawing_canvas
+        pdf_bg_path = getattr(canvas, '_pdf_background_source_path', None)
+        if file_format != FILE_FORMAT_JSON and _reusable_chunk(page, filepath) is not None:
+            # Parça aynen kullanılacak; yalnızca karşılaştırılan alanlar gerekli
+            self.drawing_canvas = SimpleNamespace(_pdf_background_source_path=pdf_bg_path)
+            return
+        self.images = [_snapshot_image(img) for img in getattr(page, 'images', []) or []]
+        self.drawing_canvas = SimpleNamespace(
+            lines=[_snapshot_item(line) for line in canvas.lines if line],
+            shapes=[_snapshot_item(shape) for shape in canvas.shapes if shape],
+            b_spline_strokes=[_snapshot_bspline(stroke) for stroke in getattr(canvas, 'b_spline_strokes', []) or []],
+            _pdf_background_source_path=pdf_bg_path,
+        )
+
+    def get_canvas(self):
+        return self.drawing_canvas
+
+    def set_file_chunk(self, chunk):
+        """Kayıt sonrası parça konumu; açılmamış sayfalar için okuyucu hemen yönlendirilir."""
+        self.file_chunk = chunk
+        if chunk is not None and self._content_source is not None:
+            loader, index = self._content_source
+            if hasattr(loader, 'relocate'):
+                loader.relocate(index, *chunk)
+
+def snapshot_pages(pages: List['Page'], filepath: str, file_format: str = DEFAULT_FILE_FORMAT) -> List[PageSnapshot]:
+    """GUI iş parçacığında çağrılır; dönen liste arka planda save_notebook'a verilebilir."""
+    return [PageSnapshot(page, filepath, file_format) for page in pages]
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- #
+
 # --- Ana Kaydet/Yükle Fonksiyonları ---
 
-def save_notebook(filepath: str, pages: List['Page']):
-    """Verilen sayfa listesini belirtilen dosyaya JSON formatında kaydeder.
+def _set_page_file_chunk(page: 'Page', chunk):
+    """Sayfanın dosyadaki güncel parçasını ((dosya yolu, PageEntry) veya None) kaydeder."""
+    if hasattr(page, 'set_file_chunk'):
+        page.set_file_chunk(chunk)
+    else:
+        page.file_chunk = chunk
+
+def _reusable_chunk(page: 'Page', filepath: str):
+    """Sayfa değişmediyse ve parçası aynı dosyadaysa o parçanın PageEntry'sini döndürür, yoksa None.
+
+    Yön, PDF arka planı ve mürekkep özeti gibi 'değiştirildi' bayrağını tetiklemeyen alanlar
+    parçanın dizin meta verisiyle ayrıca karşılaştırılır.
+    """
+    chunk = getattr(page, 'file_chunk', None)
+    if not chunk or getattr(page, 'is_modified', True):
+        return None
+    chunk_path, entry = chunk
+    if os.path.normcase(os.path.abspath(chunk_path)) != os.path.normcase(os.path.abspath(filepath)):
+        return None
+    if entry.meta.get('orientation') != page.orientation.name:
+        return None
+    if entry.meta.get('ink_digest') != getattr(page, 'ink_digest', None):
+        return None
+    if not getattr(page, 'has_pending_content', False):
+        # İçerik yüklendiyse arka plan değişmiş olabilir (canvas'a get_canvas ile değil doğrudan bakılır)
+        canvas = getattr(page, 'drawing_canvas', None)
+        if entry.meta.get('pdf_background_source_path') != getattr(canvas, '_pdf_background_source_path', None):
+            return None
+    return entry
+
+def _encode_page_chunk(page: 'Page', compression: str, precision: Optional[float] = None):
+    page_dict = serialize_page(page)
+    data, raw_length, codec = notebook_format.encode_page(page_dict, compression, precision)
+    return data, raw_length, codec, notebook_format.page_directory_meta(page_dict)
+
+def embed_page_assets(page_dict: Dict[str, Any], unsaved_only: bool = False):
+    """Resim baytlarını serileştirilmiş sayfaya base64 olarak gömer.
+
+    JSON biçiminde kapsayıcı olmadığından tüm resimler; işlem günlüğünde ise
+    yalnızca henüz hiçbir not defteri dosyasına yazılmamış olanlar gömülür.
+    """
+    store = get_asset_store()
+    for image in page_dict.get('images', []):
+        digest = image.get('asset')
+        if not digest or (unsaved_only and store.is_persisted(digest)):
+            continue
+        data = store.data(digest)
+        if data is not None:
+            image['asset_data'] = base64.b64encode(data).decode('ascii')
+            image['asset_ext'] = store.ext(digest)
+
+def _save_binary_incremental(filepath: str, pages: List['Page'], compression: str,
+                             progress_callback: Optional[Callable[[int, int], None]] = None,
+                             precision: Optional[float] = None):
+    """İkili biçimde kaydeder; değişmemiş sayfaların parçaları yeniden kodlanmaz.
+
+    Aynı dosyaya kaydederken yalnızca değişen sayfalar ve dizin dosyaya
+    eklenir (bkz. notebook_format.save_incremental). Farklı bir dosyaya
+    kaydederken değişmemiş ama hiç açılmamış sayfaların parçaları eski
+    dosyadan çözülmeden ham olarak kopyalanır.
+    """
+    slots = []
+    for page in pages:
+        if progress_callback:
+            progress_callback(len(slots), len(pages))
+        entry = _reusable_chunk(page, filepath)
+        if entry is not None:
+            slots.append(entry)
+            continue
+        chunk = getattr(page, 'file_chunk', None)
+        if chunk and not getattr(page, 'is_modified', True) and getattr(page, 'has_pending_content', False):
+            # Başka dosyadaki açılmamış sayfa: ham parçayı kopyala
+            try:
+                source_path, source_entry = chunk
+                slots.append((notebook_format.read_chunk(source_path, source_entry), source_entry.raw_length,
+                              source_entry.codec, dict(source_entry.meta, orientation=page.orientation.name)))
+                continue
+            except (OSError, notebook_format.NotebookFormatError) as e:
+                logging.warning(f"Sayfa {getattr(page, 'page_number', '?')} parçası kopyalanamadı, yeniden kodlanıyor: {e}")
+        slots.append(_encode_page_chunk(page, compression, precision))
+
+    # Yalnızca en az bir sayfanın başvurduğu resimler yazılır (aynı resim bir kez)
+    store = get_asset_store()
+    referenced = []
+    for slot in slots:
+        meta = slot.meta if isinstance(slot, notebook_format.PageEntry) else slot[3]
+        for digest in meta.get(notebook_format.DIRECTORY_ASSET_REFS) or []:
+            if digest not in referenced:
+                referenced.append(digest)
+    store.retain_unreferenced(referenced)
+    asset_slots = {}
+    for digest in referenced:
+        asset_slot = store.chunk_slot(digest, filepath)
+        if asset_slot is None:
+            logging.error(f"Resim {digest[:12]} depoda bulunamadı, kaydedilemiyor.")
+            continue
+        asset_slots[digest] = asset_slot
+
+    try:
+        directory = notebook_format.save_incremental(filepath, slots, asset_slots=asset_slots)
+    except notebook_format.StaleChunkError as e:
+        # Dosya dışarıdan değişmiş: tüm sayfaları ve resimleri yeniden kodlayıp tam yaz
+        logging.warning(f"Artımlı kayıt yapılamadı, tam kayıt yapılıyor: {e}")
+        asset_chunks = {}
+        for digest in asset_slots:
+            data = store.data(digest)
+            if data is not None:
+                asset_chunks[digest] = (data, len(data), notebook_format.CODEC_NONE, {'ext': store.ext(digest)})
+        directory = notebook_format.write_chunks(filepath, [_encode_page_chunk(page, compression, precision) for page in pages],
+                                                 assets=asset_chunks)
+    store.relocate(filepath, directory.assets)
+    for page, entry in zip(pages, directory.pages):
+        _set_page_file_chunk(page, (filepath, entry))
+
+def save_notebook(filepath: str, pages: List['Page'], file_format: str = DEFAULT_FILE_FORMAT,
+                  compression: str = notebook_format.DEFAULT_COMPRESSION,
+                  progress_callback: Optional[Callable[[int, int], None]] = None,
+                  precision: Optional[float] = notebook_format.DEFAULT_COORDINATE_PRECISION):
+    """Verilen sayfa listesini belirtilen dosyaya kaydeder.
     
     Args:
         filepath: Kaydedilecek dosyanın yolu.
-        pages: Kaydedilecek Page nesnelerinin listesi.
+        pages: Kaydedilecek Page nesnelerinin (veya PageSnapshot'ların) listesi.
+        file_format: 'binary' (.dnd v2, varsayılan) veya 'json' (eski v1 biçimi).
+        compression: İkili biçimde sayfa sıkıştırması ('zlib', 'lz4' veya 'none').
+        progress_callback: İsteğe bağlı, (işlenen sayfa, toplam sayfa) ile çağrılır.
+        precision: İkili biçimde koordinat adımı (px); değişen sayfaların koordinatları
+            bu adımla nicemlenir (hata en fazla precision / 2). None/0: float32.
     """
     try:
-        notebook_to_save = []
-        for page in pages:
-            # Canvas yerine doğrudan Page'den alalım (veriler Page'de tutuluyordu)
-            orientation = page.orientation # Yönü al
-            canvas = page.get_canvas() # Çizimler için canvas yine de lazım
-
-            # --- YENİ: images listesini de al ---
-            images_to_serialize = []
-            if hasattr(page, 'images') and isinstance(page.images, list):
-                 for img_data in page.images:
-                      serialized_img = _serialize_image(img_data)
-                      if serialized_img: # Başarılı serialize olduysa ekle
-                           images_to_serialize.append(serialized_img)
-            else:
-                 logging.warning(f"Sayfa {page.page_number}: 'images' özelliği bulunamadı veya liste değil.")
-            # --- --- --- --- --- --- --- --- ---
-
-            # YENİ: PDF arka plan yolunu al
-            pdf_bg_path = None
-            if canvas and hasattr(canvas, '_pdf_background_source_path'):
-                pdf_bg_path = canvas._pdf_background_source_path
-                
-            # YENİ: B-Spline strokes verilerini al
-            bspline_strokes_to_serialize = []
-            if canvas and hasattr(canvas, 'b_spline_strokes') and canvas.b_spline_strokes:
-                for stroke_data in canvas.b_spline_strokes:
-                    serialized_stroke = _serialize_bspline(stroke_data)
-                    if serialized_stroke:
-                        bspline_strokes_to_serialize.append(serialized_stroke)
-
-            serialized_page = {
-                'lines': [_serialize_item(line) for line in canvas.lines if line],
-                'shapes': [_serialize_item(shape) for shape in canvas.shapes if shape],
-                'images': images_to_serialize, # Serileştirilmiş resimleri ekle
-                'orientation': orientation.name, # Yön ismini kaydet
-                'pdf_background_source_path': pdf_bg_path, # YENİ: PDF arka plan yolunu kaydet
-                'bspline_strokes': bspline_strokes_to_serialize # YENİ: B-Spline verilerini ekle
-            }
-            notebook_to_save.append(serialized_page)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(notebook_to_save, f, ensure_ascii=False, indent=4)
-        logging.info(f"Not defteri başarıyla kaydedildi: {filepath}")
+        if file_format == FILE_FORMAT_JSON:
+            notebook_to_save = []
+            for page in pages:
+                if progress_callback:
+                    progress_callback(len(notebook_to_save), len(pages))
+                page_dict = serialize_page(page)
+                embed_page_assets(page_dict)
+                notebook_to_save.append(page_dict)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(notebook_to_save, f, ensure_ascii=False, indent=4)
+            for page in pages:
+                _set_page_file_chunk(page, None)
+        else:
+            _save_binary_incremental(filepath, pages, compression, progress_callback, precision)
+        if progress_callback:
+            progress_callback(len(pages), len(pages))
+        logging.info(f"Not defteri başarıyla kaydedildi ({file_format}): {filepath}")
         return True
     except Exception as e:
         logging.error(f"Not defteri kaydedilirken hata oluştu: {e}", exc_info=True)
         return False
 
 def load_notebook(filepath: str) -> List[Dict[str, Any]] | None:
-    """Belirtilen JSON dosyasından not defteri verilerini yükler.
+    """Belirtilen dosyadan not defteri verilerini yükler (ikili v2 veya eski JSON).
 
     Args:
         filepath: Yüklenecek dosyanın yolu.
@@ -462,8 +803,11 @@ def load_notebook(filepath: str) -> List[Dict[str, Any]] | None:
         içeren sözlüklerden oluşan liste veya hata durumunda None.
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            loaded_notebook = json.load(f)
+        if notebook_format.is_binary_notebook(filepath):
+            loaded_notebook = notebook_format.read_notebook(filepath)
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                loaded_notebook = json.load(f)
         
         pages_data = []
         if not isinstance(loaded_notebook, list):
@@ -474,43 +818,7 @@ def load_notebook(filepath: str) -> List[Dict[str, Any]] | None:
             if not isinstance(page_dict, dict):
                 logging.warning(f"Sayfa verisi sözlük değil, atlanıyor: {page_dict}")
                 continue
-
-            # --- YENİ: images listesini de deserialize et ---
-            deserialized_images = []
-            for image_dict in page_dict.get('images', []):
-                 deserialized_img = _deserialize_image(image_dict)
-                 if deserialized_img:
-                      deserialized_images.append(deserialized_img)
-            # --- --- --- --- --- --- --- --- --- --- --- ---
-
-            # --- YENİ: B-Spline stroke verilerini deserialize et ---
-            deserialized_bsplines = []
-            for bspline_dict in page_dict.get('bspline_strokes', []):
-                deserialized_bspline = _deserialize_bspline(bspline_dict)
-                if deserialized_bspline:
-                    deserialized_bsplines.append(deserialized_bspline)
-            # --- --- --- --- --- --- --- --- --- --- --- ---
-
-            # --- YENİ: orientation'ı tuple yerine string olarak sakla ---
-            deserialized_page = {
-                'lines': [],
-                'shapes': [],
-                'images': deserialized_images, # Deserialize edilmiş resimleri ekle
-                'orientation': page_dict.get('orientation', Orientation.PORTRAIT.name), # String olarak al
-                'pdf_background_source_path': page_dict.get('pdf_background_source_path'), # YENİ: PDF arka plan yolunu oku
-                'bspline_strokes': deserialized_bsplines # YENİ: B-Spline verilerini ekle
-            }
-            # --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
-
-            for item_dict in page_dict.get('lines', []):
-                item = _deserialize_item(item_dict)
-                if item: deserialized_page['lines'].append(item)
-
-            for item_dict in page_dict.get('shapes', []):
-                item = _deserialize_item(item_dict)
-                if item: deserialized_page['shapes'].append(item)
-
-            pages_data.append(deserialized_page)
+            pages_data.append(deserialize_page(page_dict))
 
         logging.info(f"Not defteri başarıyla yüklendi: {filepath} ({len(pages_data)} sayfa)")
         return pages_data
@@ -521,6 +829,9 @@ def load_notebook(filepath: str) -> List[Dict[str, Any]] | None:
     except json.JSONDecodeError as e:
         logging.error(f"Dosya yüklenirken JSON hatası: {filepath} - {e}", exc_info=True)
         return None
+    except notebook_format.NotebookFormatError as e:
+        logging.error(f"İkili not defteri okunamadı: {filepath} - {e}", exc_info=True)
+        return None
     except Exception as e:
         logging.error(f"Not defteri yüklenirken genel hata oluştu: {filepath} - {e}", exc_info=True)
         return None 
\ No newline at end of file
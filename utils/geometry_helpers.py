@@ -246,6 +246,100 @@ def get_bspline_bounding_box(stroke_data: dict, num_samples: int = 100) -> QRect
             logging.error(f"get_bspline_bounding_box (fallback): Kontrol noktası bbox hesaplanırken hata: {e_fallback}")
         return QRectF()
 
+# --- YENİ: B-spline'ın kübik Bézier parçalarına dönüştürülmesi --- #
+def _insert_knot(knots: list, points: list, degree: int, u: float):
+    """Boehm algoritmasıyla u düğümünü bir kez ekler (eğri değişmez)."""
+    span = max(i for i in range(len(knots) - 1) if knots[i] <= u < knots[i + 1])
+    new_points = []
+    for i in range(len(points) + 1):
+        if i <= span - degree:
+            new_points.append(points[i])
+        elif i > span:
+            new_points.append(points[i - 1])
+        else:
+            a = (u - knots[i]) / (knots[i + degree] - knots[i])
+            (x0, y0), (x1, y1) = points[i - 1], points[i]
+            new_points.append((x0 + a * (x1 - x0), y0 + a * (y1 - y0)))
+    knots.insert(span + 1, u)
+    points[:] = new_points
+
+def _elevate_to_cubic(segment: list) -> tuple:
+    # Doğrusal ve ikinci derece Bézier'in tam kübik karşılığı
+    if len(segment) == 2:
+        (x0, y0), (x1, y1) = segment
+        return ((x0, y0), (x0 + (x1 - x0) / 3, y0 + (y1 - y0) / 3),
+                (x0 + 2 * (x1 - x0) / 3, y0 + 2 * (y1 - y0) / 3), (x1, y1))
+    if len(segment) == 3:
+        (x0, y0), (x1, y1), (x2, y2) = segment
+        return ((x0, y0), (x0 + 2 * (x1 - x0) / 3, y0 + 2 * (y1 - y0) / 3),
+                (x2 + 2 * (x1 - x2) / 3, y2 + 2 * (y1 - y2) / 3), (x2, y2))
+    return tuple(segment)
+
+def bspline_to_cubic_beziers(knots, control_points, degree: int) -> List[Tuple[Tuple[float, float], ...]]:
+    """Uçları sabitlenmiş (clamped) B-spline'ı parça parça kübik Bézier eğrilerine çevirir.
+
+    İç düğümler çoklukları dereceye ulaşana dek eklenir; her aralığın
+    degree+1 kontrol noktası bir Bézier parçasıdır (derece < 3 ise tam
+    olarak kübiğe yükseltilir). Sonuç örneklenmiş değil, eğrinin kendisidir.
+    scipy splprep çıktısı (tck) doğrudan verilebilir.
+
+    Returns:
+        [(p0, p1, p2, p3), ...]; desteklenmeyen veri (derece > 3, sabitlenmemiş
+        uçlar) için boş liste.
+    """
+    if degree < 1 or degree > 3:
+        return []
+    points = [(float(cp[0]), float(cp[1])) for cp in control_points]
+    knots = [float(k) for k in knots][:len(points) + degree + 1]  # scipy c dizisini doldurabilir
+    if len(points) < degree + 1 or len(knots) != len(points) + degree + 1:
+        return []
+    start, end = knots[degree], knots[len(points)]
+    if knots[0] != start or knots[-1] != end or not start < end:
+        logging.warning("bspline_to_cubic_beziers: Uçları sabitlenmemiş B-spline desteklenmiyor.")
+        return []
+    for u in sorted({k for k in knots if start < k < end}):
+        for _ in range(degree - knots.count(u)):
+            _insert_knot(knots, points, degree, u)
+    return [_elevate_to_cubic(points[i:i + degree + 1]) for i in range(0, len(points) - 1, degree)]
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
+# --- YENİ: Toleransa göre çizgi sadeleştirme --- #
+def simplify_polyline(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker ile (N, 2) nokta dizisini sadeleştirir.
+
+    Hiçbir noktanın sadeleştirilmiş çizginin ilgili parçasına uzaklığı
+    tolerance'ı geçmez; ilk ve son nokta korunur. Her aralıktaki uzaklıklar numpy ile tek seferde
+    hesaplanır (özyineleme yerine yığın kullanılır).
+    """
+    count = len(points)
+    if count < 3 or tolerance <= 0:
+        return points
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx, dy = points[end] - points[start]
+        rel = points[start + 1:end] - points[start]
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:  # Kapalı çizgi: başlangıç noktasına uzaklık
+            distances = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            # Sonsuz doğruya değil parçaya uzaklık: izdüşüm [0, 1]'e sıkıştırılır,
+            # böylece kalemin geri döndüğü (retrace) noktalar kaybolmaz
+            t = np.clip((rel[:, 0] * dx + rel[:, 1] * dy) / length_sq, 0.0, 1.0)
+            distances = np.hypot(rel[:, 0] - t * dx, rel[:, 1] - t * dy)
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
 def is_point_on_line(point, line_start, line_end, tolerance=5.0):
     """Bir noktanın çizgi üzerinde olup olmadığını kontrol eder.
     
@@ -0,0 +1,182 @@
+# utils/item_ids.py
+"""Canvas öğeleri için kalıcı (stable) kimlikler ve ID -> öğe indeksleri.
+
+Çizgi ve şekiller konumsal listeler olarak saklandığından kimlik, listenin
+kendisine `TaggedItem.item_id` niteliği olarak iliştirilir; B-Spline ve resim
+sözlüklerinde ise 'uuid' anahtarı kullanılır (resimlerde zaten vardı).
+Seçim, komutlar ve clipboard öğeleri bu kimliklerle adresler; liste
+indeksleri yalnızca son anda, indeks üzerinden O(1) çözülür.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gui.drawing_canvas import DrawingCanvas
+
+# Seçim / komutlarda kullanılan öğe tipleri
+ITEM_TYPES = ('lines', 'shapes', 'images', 'bspline_strokes')
+
+
+class TaggedItem(list):
+    """Kalıcı kimlik taşıyan çizgi/şekil listesi.
+
+    Normal bir list gibi davranır (indeksleme, json.dump, deepcopy); deepcopy
+    ve pickle __dict__'i koruduğu için kimlik kopyalarda da aynı kalır.
+    """
+    item_id: Optional[str] = None
+
+
+def new_item_id() -> str:
+    """Yeni bir öğe kimliği üretir (resimlerdeki uuid formatıyla aynı)."""
+    return str(uuid.uuid4())
+
+
+def get_item_id(item: Any) -> Optional[str]:
+    """Öğenin kimliğini döndürür, yoksa None."""
+    if isinstance(item, dict):
+        return item.get('uuid')
+    return getattr(item, 'item_id', None)
+
+
+def tag_item(item: Any, item_id: Optional[str] = None) -> Any:
+    """Öğeye kimlik atar ve (gerekirse sarmalanmış) öğeyi döndürür.
+
+    Sözlüklerde 'uuid' anahtarı yerinde ayarlanır. Düz listeler TaggedItem'a
+    sarılır (yüzeysel kopya, iç nesneler paylaşılır). item_id verilmezse mevcut
+    kimlik korunur, hiç yoksa yenisi üretilir.
+    """
+    if isinstance(item, dict):
+        if item_id is not None or not item.get('uuid'):
+            item['uuid'] = item_id or new_item_id()
+        return item
+    if isinstance(item, list):
+        if not isinstance(item, TaggedItem):
+            item = TaggedItem(item)
+        if item_id is not None or not item.item_id:
+            item.item_id = item_id or new_item_id()
+        return item
+    logging.warning(f"tag_item: Desteklenmeyen öğe tipi: {type(item)}")
+    return item
+
+
+def retag_item(item: Any) -> Any:
+    """Öğeye yeni bir kimlik verir (yapıştırma gibi kopya üreten işlemler için)."""
+    return tag_item(item, new_item_id())
+
+
+def _item_sequence(canvas: 'DrawingCanvas', item_type: str) -> Optional[list]:
+    """Öğe tipine karşılık gelen canvas listesini döndürür."""
+    if item_type == 'lines':
+        return getattr(canvas, 'lines', None)
+    if item_type == 'shapes':
+        return getattr(canvas, 'shapes', None)
+    if item_type == 'bspline_strokes':
+        return getattr(canvas, 'b_spline_strokes', None)
+    if item_type == 'images':
+        page = getattr(canvas, '_parent_page', None)
+        return getattr(page, 'images', None) if page is not None else None
+    return None
+
+
+class ItemIdIndex:
+    """Bir canvas için ID -> (tip, indeks) sözlüğü.
+
+    İndeks tembel (lazy) yeniden kurulur: içerik değiştiğinde `mark_dirty()`
+    çağrılır, ilk sorguda tek bir O(n) geçişle güncellenir. Sorgular konumu
+    ayrıca O(1) doğrular; indeks bayatsa (kirli işaretlenmeden değişiklik
+    yapılmışsa) kendini bir kez yeniler.
+    """
+
+    def __init__(self, canvas: 'DrawingCanvas'):
+        self._canvas = canvas
+        self._positions: Dict[str, Tuple[str, int]] = {}
+        self._dirty = True
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def rebuild(self):
+        """Tüm öğeleri tarar, kimliği olmayanlara kimlik atar ve indeksi kurar."""
+        positions: Dict[str, Tuple[str, int]] = {}
+        for item_type in ITEM_TYPES:
+            seq = _item_sequence(self._canvas, item_type)
+            if not seq:
+                continue
+            for i, item in enumerate(seq):
+                item_id = get_item_id(item)
+                if not item_id or item_id in positions:
+                    # Kimliksiz (eski veri) veya kopyalanarak çoğalmış kimlik
+                    tagged = tag_item(item, new_item_id())
+                    if tagged is not item:
+                        seq[i] = tagged
+                    item_id = get_item_id(tagged)
+                positions[item_id] = (item_type, i)
+        self._positions = positions
+        self._dirty = False
+
+    def _ensure_fresh(self):
+        if self._dirty:
+            self.rebuild()
+
+    def _check(self, item_id: str, location: Tuple[str, int]) -> bool:
+        seq = _item_sequence(self._canvas, location[0])
+        return seq is not None and 0 <= location[1] < len(seq) and get_item_id(seq[location[1]]) == item_id
+
+    def locate(self, item_id: Optional[str]) -> Optional[Tuple[str, int]]:
+        """Kimliğin güncel (tip, indeks) konumunu döndürür, yoksa None."""
+        if not item_id:
+            return None
+        self._ensure_fresh()
+        location = self._positions.get(item_id)
+        if location is not None and self._check(item_id, location):
+            return location
+        # Bayat indeks: bir kez yeniden kur ve tekrar dene
+        self.rebuild()
+        location = self._positions.get(item_id)
+        return location if location is not None and self._check(item_id, location) else None
+
+    def get(self, item_id: Optional[str]) -> Any:
+        """Kimliğe karşılık gelen öğe nesnesini döndürür, yoksa None."""
+        location = self.locate(item_id)
+        if location is None:
+            return None
+        return _item_sequence(self._canvas, location[0])[location[1]]
+
+    def id_at(self, item_type: str, index: int) -> Optional[str]:
+        """Verilen konumdaki öğenin kimliğini döndürür (gerekirse atar)."""
+        seq = _item_sequence(self._canvas, item_type)
+        if seq is None or not (0 <= index < len(seq)):
+            return None
+        item_id = get_item_id(seq[index])
+        if not item_id:
+            self.rebuild()
+            item_id = get_item_id(seq[index])
+        return item_id
+
+    def ids_for(self, item_indices: List[Tuple[str, int]]) -> List[Optional[str]]:
+        return [self.id_at(item_type, index) for item_type, index in item_indices]
+
+    def locate_all(self, item_ids: List[Optional[str]]) -> Iterator[Optional[Tuple[str, int]]]:
+        for item_id in item_ids:
+            yield self.locate(item_id)
+
+
+def resolve_index(canvas: 'DrawingCanvas', item_type: str, index: int, item_id: Optional[str]) -> int:
+    """Komutlar için: kimlikten güncel indeksi çözer, çözülemezse eski indeksi döndürür."""
+    id_index = getattr(canvas, 'item_ids', None)
+    if item_id and id_index is not None:
+        location = id_index.locate(item_id)
+        if location is not None and location[0] == item_type:
+            return location[1]
+        return -1
+    return index
+
+
+def capture_ids(canvas: 'DrawingCanvas', item_indices: List[Tuple[str, int]]) -> List[Optional[str]]:
+    """Komutlar için: (tip, indeks) listesinin kimliklerini yakalar."""
+    id_index = getattr(canvas, 'item_ids', None)
+    if id_index is None:
+        return [None] * len(item_indices)
+    return id_index.ids_for(item_indices)
@@ -0,0 +1,613 @@
+# utils/notebook_format.py
+"""İkili (binary) sütunlu not defteri dosya biçimi (.dnd v2).
+
+Dosya düzeni:
+
+    +--------------------------------------------------------------+
+    | Başlık (32 bayt): sihirli sayı, sürüm, bayraklar, sayfa      |
+    |                   sayısı, dizin ofseti, dizin uzunluğu       |
+    +--------------------------------------------------------------+
+    | Sayfa parçası 0 (isteğe bağlı sıkıştırılmış)                 |
+    | Sayfa parçası 1                                              |
+    | ...                                                          |
+    | Resim parçaları (ham dosya baytları, içerik özetiyle)        |
+    +--------------------------------------------------------------+
+    | Sayfa dizini (zlib + JSON): her sayfa için ofset, uzunluk,   |
+    | codec, crc32 ve hafif meta veriler (yön, PDF arka planı,     |
+    | başvurulan resimler); 'assets' altında resim parçaları       |
+    +--------------------------------------------------------------+
+
+Bir sayfa parçası (sıkıştırma öncesi) şunlardan oluşur:
+
+    u32 meta_uzunluğu | meta JSON | float32 nokta bloğu
+
+Meta JSON sayfa alanlarını ve her öğe listesi (lines, shapes,
+bspline_strokes) için sütun tabanlı bir meta veri tablosu içerir. Nokta,
+kontrol noktası, knot vb. diziler tabloya değil, sayfanın tek float32
+bloğuna paketlenir; tabloda yalnızca [ofset, satır] referansı tutulur.
+
+Sürüm 3'ten itibaren sayfa nicemlenmiş (quantized) olarak da kodlanabilir
+(meta'da 'coordinate_precision'). Bu durumda blok bir bayt bloğudur ve her
+dizi sütunu ayrı saklanır; referans [bayt ofseti, satır, sütun kodları]
+olur (bkz. COLUMN_CODECS):
+
+- Koordinatlar 'precision' adımlı tam sayılara yuvarlanır ve satırlar arası
+  farkları (delta) sığdığı en küçük tamsayı tipinde (int8/16/32) saklanır.
+- Basınç 0-1 aralığındaysa uint8 (1/255) olarak saklanır.
+- Knot'lar float32 kalır; yeniden hesaplanabilen 'u' parametreleri hiç
+  yazılmaz (bkz. DERIVED_FIELDS).
+
+Geri çözülen koordinatların hatası en fazla precision / 2'dir.
+
+Bu modül Qt'ye bağımlı değildir: file_io_helpers'ın ürettiği JSON uyumlu
+sayfa sözlüklerini bayta çevirir ve geri çözer. Çözülen dizi alanları
+NumPy dizileri olarak döner (bkz. ARRAY_FIELDS).
+"""
+
+import json
+import logging
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import lz4.frame as _lz4_frame  # İsteğe bağlı, daha hızlı sıkıştırma
+    LZ4_AVAILABLE = True
+except ImportError:
+    _lz4_frame = None
+    LZ4_AVAILABLE = False
+
+MAGIC = b'DNDNB\r\n\x1a'  # İkili dosya imzası (metin modunda bozulmayı fark eder)
+FORMAT_VERSION = 3  # 3: nicemlenmiş sayfa parçaları (2 ile yazılmış dosyalar okunmaya devam eder)
+HEADER = struct.Struct('<8sHHIQQ')  # magic, version, flags, page_count, dir_offset, dir_length
+META_LENGTH = struct.Struct('<I')
+
+# Sayfa parçası codec'leri
+CODEC_NONE = 'none'
+CODEC_ZLIB = 'zlib'
+CODEC_LZ4 = 'lz4'
+DEFAULT_COMPRESSION = CODEC_ZLIB
+
+# Öğe listeleri (sütun tablosu olarak saklanır)
+ITEM_TABLES = ('lines', 'shapes', 'bspline_strokes')
+
+# float32 bloğa paketlenen alanlar ve sütun sayıları
+ARRAY_FIELDS = {
+    'points': 2,
+    'control_points': 2,
+    'knots': 1,
+    'u': 1,
+    'original_points_with_pressure': 3,  # [[x, y], basınç] -> [x, y, basınç]
+}
+
+# Nicemlenmiş kodlamada dizi sütunlarının türü: koordinat, basınç veya ham float
+COLUMN_KINDS = {
+    'points': ('coord', 'coord'),
+    'control_points': ('coord', 'coord'),
+    'knots': ('float',),
+    'u': ('float',),
+    'original_points_with_pressure': ('coord', 'coord', 'pressure'),
+}
+# Sütun kodu -> saklama tipi ('b/h/i': koordinat deltası, 'B': basınç, 'f': ham float32)
+COLUMN_CODECS = {'b': '<i1', 'h': '<i2', 'i': '<i4', 'B': 'u1', 'f': '<f4'}
+COLUMN_DTYPES = {code: np.dtype(dtype) for code, dtype in COLUMN_CODECS.items()}
+# Nicemlenmiş kodlamada yazılmayan, yüklemede yeniden hesaplanan alanlar
+DERIVED_FIELDS = ('u',)
+# Koordinat adımı (px); 0.01 = 1/100 piksel. None/0: nicemleme yok (float32)
+DEFAULT_COORDINATE_PRECISION = 0.01
+PRESSURE_LEVELS = 255
+
+# Dizinde tutulan (sayfa açılmadan okunabilen) hafif sayfa alanları
+DIRECTORY_PAGE_FIELDS = ('orientation', 'pdf_background_source_path', 'ink_digest')
+# Sayfanın başvurduğu resim özetleri de dizinde tutulur (açılmamış sayfaların resimleri kayıtta korunur)
+DIRECTORY_ASSET_REFS = 'assets'
+
+
+class NotebookFormatError(Exception):
+    """Dosya ikili not defteri biçimine uymadığında fırlatılır."""
+
+
+def is_binary_notebook(filepath: str) -> bool:
+    """Dosyanın .dnd v2 (ikili) biçiminde olup olmadığını imzadan anlar."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# --- Sıkıştırma --- #
+
+def _compress(data: bytes, codec: str) -> Tuple[bytes, str]:
+    if codec == CODEC_LZ4:
+        if LZ4_AVAILABLE:
+            return _lz4_frame.compress(data), CODEC_LZ4
+        logging.debug("notebook_format: lz4 bulunamadı, zlib kullanılıyor.")
+        codec = CODEC_ZLIB
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, 6), CODEC_ZLIB
+    return data, CODEC_NONE
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_NONE:
+        return data
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_LZ4:
+        if not LZ4_AVAILABLE:
+            raise NotebookFormatError("Sayfa lz4 ile sıkıştırılmış ama 'lz4' kütüphanesi yüklü değil (pip install lz4).")
+        return _lz4_frame.decompress(data)
+    raise NotebookFormatError(f"Bilinmeyen sayfa codec'i: {codec}")
+
+
+# --- Dizi alanları --- #
+
+def _field_to_array(key: str, value: Any, dtype: str = '<f4') -> np.ndarray:
+    """Dizi alanını (n, sütun) float32 (veya verilen tipte) diziye çevirir."""
+    if key == 'original_points_with_pressure' and not isinstance(value, np.ndarray):
+        value = [(p[0][0], p[0][1], p[1]) for p in value]
+    arr = np.asarray(value, dtype=dtype)
+    columns = ARRAY_FIELDS[key]
+    return arr.reshape(-1, columns) if columns > 1 else arr.reshape(-1)
+
+
+def _quantize_column(values: np.ndarray, kind: str, precision: float) -> Tuple[str, bytes]:
+    """Tek bir dizi sütununu nicemler; (sütun kodu, baytlar) döndürür."""
+    if kind == 'coord' and np.all(np.isfinite(values)):
+        steps = np.rint(values / precision)
+        if steps.size == 0 or np.abs(steps).max() < 2 ** 31:
+            deltas = np.diff(steps.astype(np.int64), prepend=0)
+            for code in ('b', 'h', 'i'):
+                info = np.iinfo(COLUMN_CODECS[code])
+                if deltas.size == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+                    return code, deltas.astype(COLUMN_CODECS[code]).tobytes()
+    elif kind == 'pressure' and (values.size == 0 or (values.min() >= 0.0 and values.max() <= 1.0)):
+        return 'B', np.rint(values * PRESSURE_LEVELS).astype(COLUMN_CODECS['B']).tobytes()
+    return 'f', values.astype(COLUMN_CODECS['f']).tobytes()
+
+
+def _dequantize_arrays(raw: bytes, base: int, refs: List[Tuple[list, int]], precision: float) -> List[np.ndarray]:
+    """_quantize_column'ın tersi; sayfadaki tüm nicemlenmiş dizileri toplu çözer.
+
+    Dizi ve sütun başına ayrı cumsum/column_stack yerine tüm sütunlar
+    başvuru sırasıyla tek bir float64 diziye okunur; delta'lar tek cumsum
+    ile toplanır (her sütunun ilk deltasından önceki sütunun toplamı düşülür).
+    Tam sayı toplamları float64'te kesin olduğundan sonuç sütun sütun
+    çözmeyle bit düzeyinde aynıdır.
+
+    Args:
+        base: Bloğun raw içindeki başlangıcı (meta sonu).
+        refs: (başvuru [ofset, satır, kodlar], sütun sayısı) çiftleri.
+
+    Returns:
+        refs sırasıyla float32 diziler. Çok sütunlu diziler ortak tampon
+        üzerinde (satır, sütun) görünümleridir; sütunlar bitişik tutulur.
+    """
+    parts, codes_in_order, counts = [], [], []
+    for (offset, rows, codes), _ in refs:
+        offset += base
+        for code in codes:
+            dtype = COLUMN_DTYPES[code]
+            parts.append(np.frombuffer(raw, dtype=dtype, count=rows, offset=offset))
+            codes_in_order.append(code)
+            counts.append(rows)
+            offset += rows * dtype.itemsize
+    if not parts:
+        return []
+    values = np.concatenate(parts).astype(np.float64)
+    counts = np.array(counts, dtype=np.int64)
+    is_coord = np.array([code in 'bhi' for code in codes_in_order])
+    coord = np.repeat(is_coord, counts)
+    deltas = np.where(coord, values, 0.0)
+    starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    starts = starts[counts > 0]  # Boş sütunlar atlanır
+    if len(starts) > 1:
+        deltas[starts[1:]] -= np.add.reduceat(deltas, starts)[:-1]
+    values = np.where(coord, np.cumsum(deltas) * precision, values)
+    if 'B' in codes_in_order:
+        pressure = np.repeat(np.array([code == 'B' for code in codes_in_order]), counts)
+        values[pressure] /= PRESSURE_LEVELS
+    out = values.astype(np.float32)
+    arrays = []
+    start = 0
+    for (_, rows, codes), ncols in refs:
+        arr = out[start:start + rows * len(codes)]
+        arrays.append(arr.reshape(ncols, rows).T if ncols > 1 else arr)
+        start += rows * len(codes)
+    return arrays
+
+
+def _encode_table(items: List[Dict[str, Any]], blob: List[bytes], blob_offset: List[int],
+                  precision: Optional[float] = None) -> Dict[str, Any]:
+    """Öğe sözlüklerini sütun tablosuna çevirir; dizi alanlarını bloğa ekler.
+
+    Bir satırda bulunmayan anahtarlar 'absent' listesinde tutulur, böylece
+    "anahtar yok" ile "değer None" ayrımı korunur. precision verilirse
+    diziler nicemlenir ve blob_offset bayt cinsinden ilerler.
+    """
+    count = len(items)
+    columns: Dict[str, List[Any]] = {}
+    absent: Dict[str, List[int]] = {}
+    for row, item in enumerate(items):
+        for key, value in item.items():
+            if precision and key in DERIVED_FIELDS:
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * count
+                if row:
+                    absent[key] = list(range(row))
+            if key in ARRAY_FIELDS and value is not None:
+                if precision:
+                    arr = _field_to_array(key, value, np.float64)
+                    start, codes = blob_offset[0], ''
+                    for col, kind in enumerate(COLUMN_KINDS[key]):
+                        code, data = _quantize_column(arr.reshape(arr.shape[0], ARRAY_FIELDS[key])[:, col], kind, precision)
+                        codes += code
+                        blob.append(data)
+                        blob_offset[0] += len(data)
+                    column[row] = [start, int(arr.shape[0]), codes]
+                else:
+                    arr = _field_to_array(key, value)
+                    column[row] = [blob_offset[0], int(arr.shape[0])]
+                    blob.append(arr.tobytes())
+                    blob_offset[0] += arr.size
+            else:
+                column[row] = value
+        for key in columns:
+            if key not in item:
+                absent.setdefault(key, []).append(row)
+    table = {'count': count, 'columns': columns}
+    if absent:
+        table['absent'] = absent
+    return table
+
+
+def _decode_table(table: Dict[str, Any], read_array) -> List[Dict[str, Any]]:
+    count = table.get('count', 0)
+    columns = table.get('columns', {})
+    absent = {key: set(rows) for key, rows in table.get('absent', {}).items()}
+    items: List[Dict[str, Any]] = [{} for _ in range(count)]
+    for key, column in columns.items():
+        skip = absent.get(key, ())
+        ncols = ARRAY_FIELDS.get(key)
+        for row, value in enumerate(column):
+            if row in skip:
+                continue
+            if ncols is not None and value is not None:
+                value = read_array(value, ncols)
+            items[row][key] = value
+    return items
+
+
+# --- Sayfa parçaları --- #
+
+def encode_page(page_dict: Dict[str, Any], compression: str = DEFAULT_COMPRESSION,
+                precision: Optional[float] = None) -> Tuple[bytes, int, str]:
+    """JSON uyumlu sayfa sözlüğünü bayta çevirir.
+
+    Args:
+        precision: Verilirse koordinatlar bu adımla (px) nicemlenip delta
+            kodlanır (bkz. modül açıklaması); None ise float32 saklanır.
+
+    Returns:
+        (parça baytları, sıkıştırılmamış uzunluk, kullanılan codec)
+    """
+    blob: List[bytes] = []
+    blob_offset = [0]  # float32 eleman (nicemlenmişse bayt) cinsinden
+    meta: Dict[str, Any] = {}
+    tables: Dict[str, Any] = {}
+    for key, value in page_dict.items():
+        if key in ITEM_TABLES:
+            tables[key] = _encode_table(value or [], blob, blob_offset, precision)
+        else:
+            meta[key] = value
+    meta['tables'] = tables
+    if precision:
+        meta['coordinate_precision'] = precision
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    raw = b''.join([META_LENGTH.pack(len(meta_bytes)), meta_bytes] + blob)
+    data, codec = _compress(raw, compression)
+    return data, len(raw), codec
+
+
+def decode_page(data: bytes, codec: str = CODEC_NONE) -> Dict[str, Any]:
+    """encode_page çıktısını JSON uyumlu sayfa sözlüğüne geri çözer.
+
+    Dizi alanları (bkz. ARRAY_FIELDS) float32 NumPy dizileri olarak döner;
+    nicemlenmemiş sayfalarda diziler çözülmüş bayt tamponunun üzerine kopyasız
+    (salt okunur) görünümlerdir. Nicemlenmiş sayfalarda diziler sayfa başına
+    ortak bir tamponun görünümleridir ve DERIVED_FIELDS yoktur.
+    """
+    raw = _decompress(data, codec)
+    (meta_len,) = META_LENGTH.unpack_from(raw, 0)
+    meta_end = META_LENGTH.size + meta_len
+    meta = json.loads(raw[META_LENGTH.size:meta_end].decode('utf-8'))
+    tables = meta.pop('tables', {})
+    precision = meta.pop('coordinate_precision', None)
+    if precision:
+        # Tüm dizi başvuruları önce toplanıp tek seferde çözülür (bkz. _dequantize_arrays)
+        refs = []
+        for table in tables.values():
+            for key, column in table.get('columns', {}).items():
+                ncols = ARRAY_FIELDS.get(key)
+                if ncols is not None:
+                    refs.extend((ref, ncols) for ref in column if ref is not None)
+        decoded = {id(ref): arr for (ref, _), arr in zip(refs, _dequantize_arrays(raw, meta_end, refs, precision))}
+
+        def read_array(ref, ncols):
+            return decoded[id(ref)]
+    else:
+        floats = np.frombuffer(raw, dtype='<f4', offset=meta_end)
+
+        def read_array(ref, ncols):
+            offset, rows = ref
+            arr = floats[offset:offset + rows * ncols]
+            return arr.reshape(rows, ncols) if ncols > 1 else arr
+    page_dict = dict(meta)
+    for key in ITEM_TABLES:
+        page_dict[key] = _decode_table(tables[key], read_array) if key in tables else []
+    return page_dict
+
+
+# --- Dosya düzeyi --- #
+
+class PageEntry:
+    """Sayfa dizinindeki bir kayıt."""
+    __slots__ = ('offset', 'length', 'raw_length', 'codec', 'crc32', 'meta')
+
+    def __init__(self, offset: int, length: int, raw_length: int, codec: str, crc32: int, meta: Optional[Dict[str, Any]] = None):
+        self.offset = offset
+        self.length = length
+        self.raw_length = raw_length
+        self.codec = codec
+        self.crc32 = crc32
+        self.meta = meta or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'offset': self.offset, 'length': self.length, 'raw_length': self.raw_length,
+                'codec': self.codec, 'crc32': self.crc32, 'meta': self.meta}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'PageEntry':
+        return cls(d['offset'], d['length'], d.get('raw_length', 0), d.get('codec', CODEC_NONE), d.get('crc32', 0), d.get('meta'))
+
+
+class NotebookDirectory:
+    """Dosyanın başlık + sayfa dizini bilgisi (sayfa içerikleri okunmadan)."""
+
+    def __init__(self, filepath: str, version: int, pages: List[PageEntry], notebook_meta: Optional[Dict[str, Any]] = None,
+                 assets: Optional[Dict[str, PageEntry]] = None):
+        self.filepath = filepath
+        self.version = version
+        self.pages = pages
+        self.notebook_meta = notebook_meta or {}
+        self.assets = assets or {}  # içerik özeti -> resim parçası (bkz. utils/asset_store.py)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def read_page_bytes(self, index: int, f=None) -> bytes:
+        """index'teki sayfanın ham (sıkıştırılmış) parçasını okur ve CRC'sini doğrular."""
+        entry = self.pages[index]
+        if f is None:
+            with open(self.filepath, 'rb') as fh:
+                fh.seek(entry.offset)
+                data = fh.read(entry.length)
+        else:
+            f.seek(entry.offset)
+            data = f.read(entry.length)
+        if len(data) != entry.length or (zlib.crc32(data) & 0xFFFFFFFF) != entry.crc32:
+            raise NotebookFormatError(f"Sayfa {index} bozuk (uzunluk/CRC uyuşmuyor): {self.filepath}")
+        return data
+
+    def read_page(self, index: int, f=None) -> Dict[str, Any]:
+        """index'teki sayfayı okuyup çözer."""
+        return decode_page(self.read_page_bytes(index, f), self.pages[index].codec)
+
+
+def read_directory(filepath: str) -> NotebookDirectory:
+    """Başlığı ve sayfa dizinini okur; sayfa içeriklerine dokunmaz."""
+    with open(filepath, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise NotebookFormatError(f"Dosya başlığı eksik: {filepath}")
+        magic, version, _flags, page_count, dir_offset, dir_length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise NotebookFormatError(f"İkili not defteri değil: {filepath}")
+        if version > FORMAT_VERSION:
+            raise NotebookFormatError(f"Desteklenmeyen not defteri sürümü {version} (en fazla {FORMAT_VERSION}): {filepath}")
+        f.seek(dir_offset)
+        directory_data = f.read(dir_length)
+    if len(directory_data) != dir_length:
+        raise NotebookFormatError(f"Sayfa dizini eksik: {filepath}")
+    directory = json.loads(zlib.decompress(directory_data).decode('utf-8'))
+    pages = [PageEntry.from_dict(d) for d in directory.get('pages', [])]
+    if len(pages) != page_count:
+        raise NotebookFormatError(f"Sayfa dizini başlıkla uyuşmuyor ({len(pages)} != {page_count}): {filepath}")
+    assets = {digest: PageEntry.from_dict(d) for digest, d in directory.get('assets', {}).items()}
+    return NotebookDirectory(filepath, version, pages, directory.get('notebook'), assets)
+
+
+def page_directory_meta(page_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Sayfa dizinine yazılan hafif alanlar (yön, PDF arka planı, mürekkep özeti, başvurulan resimler)."""
+    meta = {key: page_dict.get(key) for key in DIRECTORY_PAGE_FIELDS}
+    refs = []
+    for image in page_dict.get('images') or []:
+        digest = image.get('asset') if isinstance(image, dict) else None
+        if digest and digest not in refs:
+            refs.append(digest)
+    if refs:
+        meta[DIRECTORY_ASSET_REFS] = refs
+    return meta
+
+
+def write_notebook(filepath: str, page_dicts: List[Dict[str, Any]], compression: str = DEFAULT_COMPRESSION,
+                   notebook_meta: Optional[Dict[str, Any]] = None,
+                   precision: Optional[float] = None) -> NotebookDirectory:
+    """Sayfa sözlüklerini ikili biçimde yazar.
+
+    Önce aynı klasörde geçici bir dosyaya yazılır, ardından os.replace ile
+    atomik olarak yerine taşınır; yarıda kalan kayıt eski dosyayı bozmaz.
+    """
+    chunks = []
+    for page_dict in page_dicts:
+        data, raw_length, codec = encode_page(page_dict, compression, precision)
+        chunks.append((data, raw_length, codec, page_directory_meta(page_dict)))
+    return write_chunks(filepath, chunks, notebook_meta)
+
+
+def write_chunks(filepath: str, chunks: List[Tuple[bytes, int, str, Dict[str, Any]]],
+                 notebook_meta: Optional[Dict[str, Any]] = None,
+                 assets: Optional[Dict[str, Tuple[bytes, int, str, Dict[str, Any]]]] = None) -> NotebookDirectory:
+    """Hazır (kodlanmış) sayfa ve resim parçalarını dosyaya yazar ve yeni dizini döndürür."""
+    tmp_path = f"{filepath}.tmp"
+    entries: List[PageEntry] = []
+    asset_entries: Dict[str, PageEntry] = {}
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * HEADER.size)  # Başlık en sonda doldurulur
+            offset = HEADER.size
+            for data, raw_length, codec, meta in chunks:
+                f.write(data)
+                entries.append(PageEntry(offset, len(data), raw_length, codec, zlib.crc32(data) & 0xFFFFFFFF, meta))
+                offset += len(data)
+            for digest, (data, raw_length, codec, meta) in (assets or {}).items():
+                f.write(data)
+                asset_entries[digest] = PageEntry(offset, len(data), raw_length, codec, zlib.crc32(data) & 0xFFFFFFFF, meta)
+                offset += len(data)
+            directory_data = _encode_directory(entries, notebook_meta, asset_entries)
+            f.write(directory_data)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), offset, len(directory_data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        raise
+    return NotebookDirectory(filepath, FORMAT_VERSION, entries, notebook_meta, asset_entries)
+
+
+# --- Artımlı (incremental) kayıt --- #
+
+# Dosyadaki ölü (artık dizinde olmayan) baytların oranı bunu aşarsa dosya sıkıştırılarak yeniden yazılır
+DEFAULT_MAX_DEAD_RATIO = 0.5
+
+ChunkSlot = Union[PageEntry, Tuple[bytes, int, str, Dict[str, Any]]]
+
+
+class StaleChunkError(NotebookFormatError):
+    """Yeniden kullanılmak istenen sayfa parçası dosyada artık yoksa fırlatılır (dosya dışarıdan değişmiş)."""
+
+
+def read_chunk(filepath: str, entry: PageEntry) -> bytes:
+    """Bir sayfa parçasını çözmeden (ham, sıkıştırılmış haliyle) okur."""
+    with open(filepath, 'rb') as f:
+        f.seek(entry.offset)
+        data = f.read(entry.length)
+    if len(data) != entry.length or (zlib.crc32(data) & 0xFFFFFFFF) != entry.crc32:
+        raise StaleChunkError(f"Sayfa parçası dosyada bulunamadı (ofset {entry.offset}): {filepath}")
+    return data
+
+
+def _encode_directory(entries: List[PageEntry], notebook_meta: Optional[Dict[str, Any]],
+                      assets: Optional[Dict[str, PageEntry]] = None) -> bytes:
+    directory = {'pages': [e.to_dict() for e in entries], 'notebook': notebook_meta or {}}
+    if assets:
+        directory['assets'] = {digest: e.to_dict() for digest, e in assets.items()}
+    return zlib.compress(json.dumps(directory, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def save_incremental(filepath: str, slots: List[ChunkSlot], notebook_meta: Optional[Dict[str, Any]] = None,
+                     max_dead_ratio: float = DEFAULT_MAX_DEAD_RATIO,
+                     asset_slots: Optional[Dict[str, ChunkSlot]] = None) -> NotebookDirectory:
+    """Yalnızca değişen sayfa parçalarını yazarak kaydeder.
+
+    slots listesindeki her öğe ya mevcut dosyadaki değişmemiş bir parçanın
+    PageEntry'si ya da yeni kodlanmış (veri, ham_uzunluk, codec, meta)
+    parçasıdır. Yeni parçalar ve yeni dizin dosyanın sonuna eklenir, en son
+    başlık yeni dizini gösterecek şekilde güncellenir. Başlık yazılmadan önce
+    kesilen bir kayıtta eski başlık hâlâ eski (sağlam) dizini gösterir.
+
+    Ölü bayt oranı max_dead_ratio'yu aşarsa (veya dosya ikili değilse) tüm
+    parçalar kopyalanarak geçici dosyaya yazılır ve atomik olarak değiştirilir.
+    asset_slots resim parçalarını (içerik özeti -> parça) aynı kurallarla verir;
+    burada olmayan eski resim parçaları yeni dizine alınmaz.
+    """
+    asset_slots = asset_slots or {}
+    all_slots = list(slots) + list(asset_slots.values())
+    reused = [slot for slot in all_slots if isinstance(slot, PageEntry)]
+    try:
+        current = read_directory(filepath) if os.path.exists(filepath) else None
+    except NotebookFormatError:
+        current = None
+    if reused:
+        known = ({(e.offset, e.length, e.crc32) for e in list(current.pages) + list(current.assets.values())}
+                 if current is not None else set())
+        for entry in reused:
+            if (entry.offset, entry.length, entry.crc32) not in known:
+                raise StaleChunkError(f"Yeniden kullanılacak sayfa parçası güncel dizinde yok: {filepath}")
+
+    new_chunks = [slot for slot in all_slots if not isinstance(slot, PageEntry)]
+    if current is not None:
+        file_size = os.path.getsize(filepath)
+        new_bytes = sum(len(chunk[0]) for chunk in new_chunks)
+        live_bytes = HEADER.size + sum(e.length for e in reused) + new_bytes
+        size_after = file_size + new_bytes
+        dead_ratio = 1.0 - live_bytes / size_after if size_after else 0.0
+    if current is None or dead_ratio > max_dead_ratio:
+        # Sıkıştırarak yeniden yaz: değişmemiş parçalar çözülmeden ham kopyalanır
+        def materialize(slot):
+            if isinstance(slot, PageEntry):
+                return (read_chunk(filepath, slot), slot.raw_length, slot.codec, slot.meta)
+            return slot
+        logging.debug(f"notebook_format: Dosya sıkıştırılarak yeniden yazılıyor: {filepath}")
+        return write_chunks(filepath, [materialize(slot) for slot in slots], notebook_meta,
+                            {digest: materialize(slot) for digest, slot in asset_slots.items()})
+
+    entries: List[PageEntry] = []
+    asset_entries: Dict[str, PageEntry] = {}
+    with open(filepath, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+
+        def append(slot) -> PageEntry:
+            nonlocal offset
+            if isinstance(slot, PageEntry):
+                return slot
+            data, raw_length, codec, meta = slot
+            f.write(data)
+            entry = PageEntry(offset, len(data), raw_length, codec, zlib.crc32(data) & 0xFFFFFFFF, meta)
+            offset += len(data)
+            return entry
+
+        entries = [append(slot) for slot in slots]
+        asset_entries = {digest: append(slot) for digest, slot in asset_slots.items()}
+        directory_data = _encode_directory(entries, notebook_meta, asset_entries)
+        f.write(directory_data)
+        f.flush()
+        os.fsync(f.fileno())
+        # Yeni dizin diske yazıldıktan sonra başlığı çevir
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), offset, len(directory_data)))
+        f.flush()
+        os.fsync(f.fileno())
+    logging.debug(f"notebook_format: Artımlı kayıt: {len(new_chunks)}/{len(all_slots)} parça yazıldı: {filepath}")
+    return NotebookDirectory(filepath, FORMAT_VERSION, entries, notebook_meta, asset_entries)
+
+
+def read_notebook(filepath: str) -> List[Dict[str, Any]]:
+    """Tüm sayfaları okuyup çözer (JSON uyumlu sayfa sözlükleri, diziler NumPy)."""
+    directory = read_directory(filepath)
+    with open(filepath, 'rb') as f:
+        return [directory.read_page(i, f) for i in range(len(directory))]
@@ -0,0 +1,183 @@
+# utils/notebook_loader.py
+"""Not defterlerini sayfa sayfa (tembel) yükleyen okuyucu.
+
+Açılışta yalnızca sayfa dizini (sayfa sayısı, yön, PDF arka plan yolu)
+okunur. Sayfa içerikleri ilk etkinleştirmede çözülür; aktif sayfa ve
+komşuları arka planda bir iş parçacığında önceden çözülür (prefetch).
+
+İkili (.dnd v2) dosyalarda sayfa parçaları dizindeki ofsetlerden tek tek
+okunur. Eski JSON dosyalarında dosya bir kez ayrıştırılır ama Qt nesnelerine
+dönüştürme (QPointF, QRectF, NumPy) yine sayfa başına ertelenir.
+
+Tüm sayfalar gerektiğinde (PDF'e aktarma, JSON'a kaydetme) load_pages
+sayfaları sırayla çözer; sıradaki sayfa bu sırada önceden çözülür.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from gui.enums import Orientation
+from utils import notebook_format
+from utils.file_io_helpers import deserialize_page
+
+RELOCATION_RETRIES = 20
+RELOCATION_RETRY_DELAY = 0.05  # saniye
+
+
+class NotebookLoader:
+    """Bir not defteri dosyasının sayfalarını isteğe bağlı çözer."""
+
+    def __init__(self, filepath: str,
+                 directory: Optional[notebook_format.NotebookDirectory] = None,
+                 raw_pages: Optional[List[Dict[str, Any]]] = None,
+                 prefetch_workers: int = 1,
+                 assets: Optional[Dict[str, notebook_format.PageEntry]] = None):
+        self.filepath = filepath
+        self._directory = directory
+        self._raw_pages = raw_pages
+        self._assets = assets or {}
+        self._futures: Dict[int, Future] = {}
+        self._relocated: Dict[int, tuple] = {}  # Kayıttan sonra parçası taşınan sayfalar: indeks -> (yol, PageEntry)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix='notebook-prefetch')
+        self._closed = False
+
+    @property
+    def page_count(self) -> int:
+        if self._directory is not None:
+            return len(self._directory)
+        return len(self._raw_pages or [])
+
+    @property
+    def assets(self) -> Dict[str, notebook_format.PageEntry]:
+        """Dosyadaki resim parçaları (içerik özeti -> PageEntry), bkz. utils/asset_store.py."""
+        if self._directory is not None:
+            return self._directory.assets
+        return self._assets
+
+    def page_meta(self, index: int) -> Dict[str, Any]:
+        """Sayfa içeriği çözülmeden okunabilen hafif alanlar (yön, PDF arka planı, mürekkep özeti)."""
+        if self._directory is not None:
+            meta = self._directory.pages[index].meta
+        else:
+            raw = self._raw_pages[index] or {}
+            meta = {key: raw.get(key) for key in notebook_format.DIRECTORY_PAGE_FIELDS}
+        return {
+            'orientation': meta.get('orientation') or Orientation.PORTRAIT.name,
+            'pdf_background_source_path': meta.get('pdf_background_source_path'),
+            'ink_digest': meta.get('ink_digest'),
+        }
+
+    def file_chunk(self, index: int):
+        """Sayfanın dosyadaki parçası (dosya yolu, PageEntry); eski JSON dosyalarında None."""
+        if index in self._relocated:
+            return self._relocated[index]
+        if self._directory is not None:
+            return (self.filepath, self._directory.pages[index])
+        return None
+
+    def relocate(self, index: int, filepath: str, entry: notebook_format.PageEntry):
+        """Henüz çözülmemiş sayfanın parçası yeni bir konuma yazıldığında (ör. sıkıştırmalı kayıt) çağrılır."""
+        self._relocated[index] = (filepath, entry)
+
+    def _read_raw(self, index: int) -> Dict[str, Any]:
+        if self._directory is not None:
+            # Arka plan kaydı dosyayı sıkıştırıp yeniden yazdıysa eski ofsetler geçersizdir;
+            # kaydedici yeni konumu relocate ile bildirene kadar kısa süre bekleyip yeniden dene
+            for attempt in range(RELOCATION_RETRIES + 1):
+                path, entry = self.file_chunk(index)
+                try:
+                    return notebook_format.decode_page(notebook_format.read_chunk(path, entry), entry.codec)
+                except notebook_format.StaleChunkError:
+                    if attempt == RELOCATION_RETRIES:
+                        raise
+                    if self.file_chunk(index)[1] is entry:
+                        time.sleep(RELOCATION_RETRY_DELAY)
+        raw = self._raw_pages[index]
+        if not isinstance(raw, dict):
+            logging.warning(f"NotebookLoader: Sayfa {index} verisi sözlük değil, boş sayfa yükleniyor.")
+            raw = {}
+        return raw
+
+    def _decode(self, index: int) -> Dict[str, Any]:
+        """Sayfayı okuyup çözer. Qt widget'ı oluşturmadığı için iş parçacığında çalışabilir."""
+        return deserialize_page(self._read_raw(index))
+
+    def prefetch(self, index: int):
+        """Sayfayı arka planda çözmeye başlar (zaten başlatıldıysa bir şey yapmaz)."""
+        if self._closed or not (0 <= index < self.page_count):
+            return
+        with self._lock:
+            if index not in self._futures:
+                self._futures[index] = self._executor.submit(self._decode, index)
+
+    def load_page(self, index: int) -> Dict[str, Any]:
+        """Sayfanın çözülmüş içeriğini döndürür; önceden çözüldüyse bekler/hazırı kullanır."""
+        with self._lock:
+            future = self._futures.pop(index, None)
+        content = None
+        if future is not None:
+            try:
+                content = future.result()
+            except Exception as e:
+                # Ön yükleme sırasında dosya yeniden yazılmış olabilir; güncel konumdan tekrar dene
+                logging.warning(f"NotebookLoader: Sayfa {index} ön yüklemesi başarısız, yeniden okunuyor: {e}")
+        if content is None:
+            content = self._decode(index)
+        if self._raw_pages is not None:
+            self._raw_pages[index] = None  # Çözülen JSON sayfasını bellekte tutma
+        return content
+
+    def load_pages(self, indices: List[int],
+                   progress_callback: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Birçok sayfayı çözer; (indeks, içerik) çiftlerini indices sırasıyla üretir.
+
+        Sıradaki sayfa, mevcut sayfa uygulanırken ön yükleme iş parçacığında
+        çözülür (dosya okuma ve zlib açma GIL'i bırakır). Süreç havuzu
+        kullanılmaz: yükleme süresinin çoğu GIL altında yapılan QPointF/QRectF
+        kurulumudur ve işçi süreçlerine dağıtılamaz.
+        """
+        indices = list(indices)
+        total = len(indices)
+        for done, index in enumerate(indices, 1):
+            if done < total:
+                self.prefetch(indices[done])
+            yield index, self.load_page(index)
+            if progress_callback:
+                progress_callback(done, total)
+
+    def close(self):
+        """Bekleyen ön yüklemeleri iptal eder."""
+        self._closed = True
+        with self._lock:
+            self._futures.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def open_notebook(filepath: str) -> NotebookLoader | None:
+    """Dosyanın yalnızca sayfa dizinini okuyarak tembel bir okuyucu döndürür, hata durumunda None."""
+    try:
+        if notebook_format.is_binary_notebook(filepath):
+            loader = NotebookLoader(filepath, directory=notebook_format.read_directory(filepath))
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                raw_pages = json.load(f)
+            if not isinstance(raw_pages, list):
+                logging.error(f"Yüklenen dosya formatı geçersiz (liste değil): {filepath}")
+                return None
+            loader = NotebookLoader(filepath, raw_pages=raw_pages)
+        logging.info(f"Not defteri açıldı (tembel yükleme): {filepath} ({loader.page_count} sayfa)")
+        return loader
+    except FileNotFoundError:
+        logging.error(f"Yüklenecek dosya bulunamadı: {filepath}")
+    except json.JSONDecodeError as e:
+        logging.error(f"Dosya yüklenirken JSON hatası: {filepath} - {e}", exc_info=True)
+    except notebook_format.NotebookFormatError as e:
+        logging.error(f"İkili not defteri okunamadı: {filepath} - {e}", exc_info=True)
+    except Exception as e:
+        logging.error(f"Not defteri açılırken genel hata oluştu: {filepath} - {e}", exc_info=True)
+    return None
@@ -0,0 +1,360 @@
+# utils/operation_journal.py
+"""Çökme kurtarma için yalnızca eklemeli (append-only) işlem günlüğü.
+
+Her not defteri için bir günlük dosyası tutulur (`<dosya>.dndj`, başlıksız
+not defterleri için ayar klasöründe `untitled.dndj`). Yürütülen, geri alınan
+ve yeniden yapılan her komut, etkilediği sayfanın öğe düzeyindeki farkı
+olarak günlüğe eklenir: değişen öğeler (kalıcı kimlikleriyle, bkz.
+utils/item_ids.py) ve sayfadaki öğe sırası. Komut nesneleri canlı Qt/Python
+nesneleri tuttuğu için komutun kendisi değil, uygulandıktan sonraki farkı
+yazılır; böylece geri yükleme komut sınıflarından bağımsızdır.
+
+Yazma ve fsync, zamanlayıcıyla toplu yapılır (varsayılan 1 sn); aynı
+aralıkta aynı sayfaya gelen komutlar tek kayıtta birleşir. Anlık görüntü
+GUI iş parçacığında alınır, serileştirme ve yazma ayrı bir iş parçacığında
+yapılır. Başarılı kayıttan sonra günlük sıfırlanır (içeriği ana dosyaya
+geçmiştir); temiz kapanışta silinir. Açılışta kalmış bir günlük, önceki
+oturumun düzgün kapanmadığını gösterir ve son tam kaydın üzerine yeniden
+oynatılabilir (replay_journal).
+
+Dosya düzeni: JOURNAL_MAGIC, ardından kayıtlar. Her kayıt
+[u32 uzunluk][u32 crc32][zlib(JSON)] biçimindedir; yarım yazılmış son kayıt
+CRC ile fark edilip yok sayılır.
+"""
+
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer
+
+from gui.enums import Orientation
+from utils import file_io_helpers, notebook_format
+
+JOURNAL_MAGIC = b'DNDJ\x01\r\n\x1a'
+JOURNAL_SUFFIX = '.dndj'
+UNTITLED_JOURNAL_NAME = 'untitled' + JOURNAL_SUFFIX
+RECORD = struct.Struct('<II')  # yük uzunluğu, crc32
+DEFAULT_FLUSH_INTERVAL_MS = 1000
+
+ITEM_TABLES = ('lines', 'shapes', 'bspline_strokes', 'images')
+PAGE_FIELDS = ('orientation', 'pdf_background_source_path')
+
+
+def journal_path_for(notebook_path: Optional[str], untitled_dir: str) -> str:
+    """Not defteri dosyasına ait günlük dosyasının yolu."""
+    if notebook_path:
+        return notebook_path + JOURNAL_SUFFIX
+    return os.path.join(untitled_dir, UNTITLED_JOURNAL_NAME)
+
+
+# --- Kayıt Okuma/Yazma --- #
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    payload = zlib.compress(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1)
+    return RECORD.pack(len(payload), zlib.crc32(payload) & 0xFFFFFFFF) + payload
+
+
+def read_journal(path: str) -> List[Dict[str, Any]]:
+    """Günlükteki kayıtları sırayla döndürür; ilk kayıt 'base' kaydıdır.
+
+    Yarım kalmış veya bozuk bir kayıtta okuma durur (önceki kayıtlar geçerlidir).
+    """
+    records = []
+    with open(path, 'rb') as f:
+        if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            raise notebook_format.NotebookFormatError(f"İşlem günlüğü değil: {path}")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                break
+            length, crc = RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) != length or (zlib.crc32(payload) & 0xFFFFFFFF) != crc:
+                logging.warning(f"İşlem günlüğünün sonunda yarım kayıt yok sayıldı: {path}")
+                break
+            records.append(json.loads(zlib.decompress(payload).decode('utf-8')))
+    if not records or records[0].get('t') != 'base':
+        raise notebook_format.NotebookFormatError(f"İşlem günlüğünde başlangıç kaydı yok: {path}")
+    return records
+
+
+def has_recoverable_changes(path: str) -> bool:
+    """Günlük, son tam kayıttan sonra yapılmış değişiklik içeriyorsa True."""
+    try:
+        return any(record.get('t') in ('page', 'layout') for record in read_journal(path)[1:])
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logging.warning(f"İşlem günlüğü okunamadı: {path} - {e}")
+        return False
+
+
+# --- Sayfa Farkı --- #
+
+def _item_key(table: str, index: int, item_dict: Dict[str, Any], seen: set) -> str:
+    key = item_dict.get('id') or item_dict.get('uuid') or f"#{index}"
+    if key in seen:  # Kimliği çakışan öğeler (ör. eski dosyalardan) konumla ayrıştırılır
+        key = f"{key}#{index}"
+    seen.add(key)
+    return key
+
+
+def _keyed_items(table: str, items: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    seen = set()
+    return [(_item_key(table, i, item, seen), item) for i, item in enumerate(items) if item]
+
+
+def page_delta(page_dict: Dict[str, Any], cache: Optional[Dict[str, Dict[str, int]]]):
+    """Serileştirilmiş sayfanın önceki günlük durumuna göre farkını ve yeni önbelleği döndürür.
+
+    cache None ise (sayfa bu günlükte henüz yazılmadı) tüm öğeler yazılır.
+    """
+    order, items, new_cache = {}, {}, {}
+    for table in ITEM_TABLES:
+        previous = (cache or {}).get(table, {})
+        table_cache, changed = {}, {}
+        keyed = _keyed_items(table, page_dict.get(table) or [])
+        for key, item in keyed:
+            digest = zlib.crc32(json.dumps(item, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+            table_cache[key] = digest
+            if previous.get(key) != digest:
+                changed[key] = item
+        order[table] = [key for key, _ in keyed]
+        if changed:
+            items[table] = changed
+        new_cache[table] = table_cache
+    return order, items, new_cache
+
+
+# --- Yeniden Oynatma --- #
+
+class RecoveredNotebook:
+    """replay_journal sonucu: son tam kaydın yolu ve günlük uygulanmış sayfa sözlükleri."""
+
+    def __init__(self, base_path: Optional[str], pages: List[Dict[str, Any]], record_count: int,
+                 assets: Optional[Dict[str, notebook_format.PageEntry]] = None):
+        self.base_path = base_path
+        self.pages = pages
+        self.record_count = record_count
+        self.assets = assets or {}  # Son tam kayıttaki resim parçaları (yeni resimler günlükte gömülü)
+
+
+def _blank_state(orientation: Optional[str]) -> Dict[str, Any]:
+    state = {table: {} for table in ITEM_TABLES}
+    state['orientation'] = orientation or Orientation.PORTRAIT.name
+    state['pdf_background_source_path'] = None
+    return state
+
+
+def _state_from_page_dict(page_dict: Dict[str, Any]) -> Dict[str, Any]:
+    state = _blank_state(page_dict.get('orientation'))
+    state['pdf_background_source_path'] = page_dict.get('pdf_background_source_path')
+    for table in ITEM_TABLES:
+        state[table] = dict(_keyed_items(table, page_dict.get(table) or []))
+    return state
+
+
+def _load_base_pages(base_path: Optional[str]) -> List[Dict[str, Any]]:
+    if not base_path or not os.path.exists(base_path):
+        return []
+    if notebook_format.is_binary_notebook(base_path):
+        return notebook_format.read_notebook(base_path)
+    with open(base_path, 'r', encoding='utf-8') as f:
+        pages = json.load(f)
+    return [page if isinstance(page, dict) else {} for page in pages]
+
+
+def replay_journal(path: str) -> RecoveredNotebook:
+    """Günlüğü son tam kaydın (base) üzerine uygular; sonuç sayfaları deserialize_page'e verilebilir."""
+    records = read_journal(path)
+    base = records[0]
+    base_path = base.get('notebook')
+    base_pages = _load_base_pages(base_path)
+    states: Dict[str, Dict[str, Any]] = {}
+    page_order: List[str] = []
+    for index, (uid, orientation) in enumerate(base.get('pages', [])):
+        states[uid] = _state_from_page_dict(base_pages[index]) if index < len(base_pages) else _blank_state(orientation)
+        page_order.append(uid)
+    for record in records[1:]:
+        kind = record.get('t')
+        if kind == 'layout':
+            page_order = []
+            for uid, orientation in record.get('pages', []):
+                if uid not in states:
+                    states[uid] = _blank_state(orientation)
+                states[uid]['orientation'] = orientation
+                page_order.append(uid)
+        elif kind == 'page':
+            state = states.setdefault(record['uid'], _blank_state(record.get('orientation')))
+            for field in PAGE_FIELDS:
+                if field in record:
+                    state[field] = record[field]
+            changed_items = record.get('items', {})
+            for table in ITEM_TABLES:
+                changed = changed_items.get(table, {})
+                current = state[table]
+                state[table] = {key: changed[key] if key in changed else current[key]
+                                for key in record.get('order', {}).get(table, [])
+                                if key in changed or key in current}
+    pages = []
+    for uid in page_order:
+        state = states[uid]
+        page_dict = {table: list(state[table].values()) for table in ITEM_TABLES}
+        for field in PAGE_FIELDS:
+            page_dict[field] = state[field]
+        pages.append(page_dict)
+    assets = {}
+    if base_path and os.path.exists(base_path) and notebook_format.is_binary_notebook(base_path):
+        assets = notebook_format.read_directory(base_path).assets
+    return RecoveredNotebook(base_path, pages, len(records) - 1, assets)
+
+
+# --- Canlı Günlük --- #
+
+class OperationJournal(QObject):
+    """PageManager'daki komutları günlüğe yazar; fsync zamanlayıcıyla toplu yapılır."""
+
+    def __init__(self, page_manager, untitled_dir: str, flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.page_manager = page_manager
+        self.untitled_dir = untitled_dir
+        self.path: Optional[str] = None
+        self._dirty_pages: Dict[str, Tuple[Any, List[List[str]]]] = {}  # page_uid -> (Page, [[işlem, komut], ...])
+        self._layout_dirty = False
+        self._caches: Dict[str, Dict[str, Dict[str, int]]] = {}  # Yalnızca yazıcı iş parçacığında kullanılır
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='operation-journal')
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # --- GUI iş parçacığı --- #
+    def record_command(self, page, operation: str, command):
+        """Bir komut yürütüldüğünde/geri alındığında/yeniden yapıldığında çağrılır."""
+        if self.path is None:
+            return
+        _, operations = self._dirty_pages.setdefault(page.page_uid, (page, []))
+        operations.append([operation, type(command).__name__])
+        self._schedule_flush()
+
+    def record_layout(self):
+        """Sayfa eklendi/silindi/sırası değişti."""
+        if self.path is None:
+            return
+        self._layout_dirty = True
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _layout(self) -> List[List[str]]:
+        pages = []
+        for index in range(self.page_manager.count()):
+            page = self.page_manager._page_at(index)
+            if page is not None:
+                pages.append([page.page_uid, page.orientation.name])
+        return pages
+
+    def flush(self):
+        """Bekleyen değişikliklerin anlık görüntüsünü alır ve yazıcıya verir (yazma + fsync arka planda)."""
+        self._flush_timer.stop()
+        if self.path is None or (not self._dirty_pages and not self._layout_dirty):
+            return
+        layout = self._layout() if self._layout_dirty else None
+        batch = []
+        for uid, (page, operations) in self._dirty_pages.items():
+            try:
+                snapshot = file_io_helpers.PageSnapshot(page, '', file_io_helpers.FILE_FORMAT_JSON)
+            except RuntimeError:
+                continue  # Sayfa bu arada silinmiş
+            batch.append((uid, operations, snapshot))
+        self._dirty_pages = {}
+        self._layout_dirty = False
+        self._executor.submit(self._write_batch, self.path, layout, batch)
+
+    def rebase(self, notebook_path: Optional[str]):
+        """Günlüğü not defterinin son tam kaydına göre sıfırlar (kayıt/yükleme sonrası).
+
+        Kayıt arka planda sürerken düzenlenen ve bu yüzden hâlâ değiştirilmiş
+        görünen sayfalar yeni günlüğe hemen tam olarak yazılır.
+        """
+        self._flush_timer.stop()
+        old_path = self.path
+        self.path = journal_path_for(notebook_path, self.untitled_dir)
+        self._dirty_pages = {}
+        self._layout_dirty = False
+        base = {'t': 'base', 'notebook': notebook_path, 'pages': self._layout(), 'time': time.time()}
+        self._executor.submit(self._write_base, old_path, self.path, base)
+        for index in range(self.page_manager.count()):
+            page = self.page_manager._page_at(index)
+            if page is not None and page.is_modified:
+                self._dirty_pages[page.page_uid] = (page, [['rebase', '']])
+        if self._dirty_pages:
+            self._schedule_flush()
+
+    def discard(self):
+        """Temiz kapanış: bekleyen yazmalar bitince günlük dosyası silinir."""
+        self._flush_timer.stop()
+        self._dirty_pages = {}
+        self._layout_dirty = False
+        path, self.path = self.path, None
+        if path:
+            self._executor.submit(self._remove, path)
+        self._executor.shutdown(wait=True)
+
+    # --- Yazıcı iş parçacığı --- #
+    def _write_base(self, old_path: Optional[str], path: str, base: Dict[str, Any]):
+        self._caches.clear()
+        try:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(JOURNAL_MAGIC + _encode_record(base))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            if old_path and old_path != path:
+                self._remove(old_path)
+        except OSError as e:
+            logging.error(f"İşlem günlüğü oluşturulamadı: {path} - {e}")
+
+    def _write_batch(self, path: str, layout, batch):
+        records = []
+        if layout is not None:
+            records.append({'t': 'layout', 'pages': layout})
+        for uid, operations, snapshot in batch:
+            try:
+                page_dict = file_io_helpers.serialize_page(snapshot)
+                file_io_helpers.embed_page_assets(page_dict, unsaved_only=True)
+                order, items, self._caches[uid] = page_delta(page_dict, self._caches.get(uid))
+                record = {'t': 'page', 'uid': uid, 'ops': operations, 'order': order, 'items': items}
+                for field in PAGE_FIELDS:
+                    record[field] = page_dict.get(field)
+                records.append(record)
+            except Exception as e:
+                self._caches.pop(uid, None)  # Sonraki kayıt sayfayı tam yazsın
+                logging.error(f"İşlem günlüğü kaydı oluşturulamadı (sayfa {uid}): {e}", exc_info=True)
+        if not records:
+            return
+        try:
+            with open(path, 'ab') as f:
+                f.write(b''.join(_encode_record(record) for record in records))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logging.error(f"İşlem günlüğüne yazılamadı: {path} - {e}")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"İşlem günlüğü silinemedi: {path} - {e}")
@@ -0,0 +1,277 @@
+# utils/page_rendering.py
+"""Sayfa içeriğini görünür bir DrawingCanvas olmadan QImage'a çizme.
+
+Sayfa verisi, load_notebook'un döndürdüğü sayfa sözlüğüdür: 'lines',
+'shapes', 'images', 'bspline_strokes', 'orientation' ve
+'pdf_background_source_path'. Öğeler canvas'taki yardımcılarla çizilir
+(draw_pen_stroke, draw_shape); böylece küçük resimler, PNG dışa aktarma ve
+testler ekrandakiyle aynı çıktıyı alır.
+
+QImage üzerine çizim iş parçacığı güvenlidir, QPixmap değildir. Bu yüzden
+resimler her zaman QImage olarak çözülür. Sayfadaki 'pixmap' alanları
+kullanılmaz; baytlar asset deposundan ya da dosyadan okunur. PDF sayfası
+arka planları PyMuPDF ile çizilir. PyMuPDF iş parçacığı güvenli olmadığından
+bu çizimler kilitle sıralanır. Çok sayfada arka planlar süreç havuzunda
+hazırlanıp background parametresiyle verilebilir (bkz.
+pdf_render_cache.render_page_cached).
+"""
+
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPen, QTransform
+from scipy.interpolate import splev
+
+from gui.enums import Orientation, TemplateType
+from helpers import pdf_helper
+from utils.asset_store import get_asset_store
+from utils.drawing_helpers import draw_pen_stroke, draw_shape, draw_template, rgba_to_qcolor
+from utils.geometry_helpers import bspline_to_cubic_beziers
+from utils.pdf_page_renderer import BASE_DPI, parse_page_reference
+from utils.pixmap_bridge import qimage_from_samples
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Canvas ile aynı şablon resimleri (bkz. DrawingCanvas.load_background_template_image)
+DEFAULT_TEMPLATE_DIR = os.path.join(BASE_DIR, 'generated_templates')
+# Şablon resmi olmayan sayfalarda canvas'ın varsayılan boyutu (bkz. DrawingCanvas.sizeHint)
+DEFAULT_PAGE_SIZE = (600, 800)
+# Şablonlu sayfalarda bir canvas pikseli ekran DPI'sında (bkz. settings_handler.PT_TO_PX)
+SCREEN_DPI = 96
+PT_TO_PX = SCREEN_DPI / 72.0
+DEFAULT_BACKGROUND_COLOR = (1.0, 1.0, 1.0, 1.0)
+BSPLINE_SAMPLE_COUNT = 100  # Bézier'e çevrilemeyen B-spline'lar canvas gibi örneklenir
+MAX_DECODED_IMAGES = 32
+
+_pdf_lock = threading.Lock()
+_image_lock = threading.Lock()
+_decoded_images: 'OrderedDict[tuple, QImage]' = OrderedDict()
+
+
+# --- Sayfa Boyutu ve Arka Planı --- #
+def _image_size(path: str) -> Optional[Tuple[int, int]]:
+    # Yalnızca başlık okunur, resim çözülmez
+    size = QImageReader(path).size()
+    return (size.width(), size.height()) if size.isValid() else None
+
+
+def page_background(page: dict, template_type: TemplateType,
+                    template_dir: str = DEFAULT_TEMPLATE_DIR) -> Tuple[Tuple[int, int], Optional[str]]:
+    """Sayfanın canvas boyutu ve arka plan resmi yolu (canvas ile aynı öncelik).
+
+    Arka plan resmi ya şablon resmidir ya da eski içe aktarmadan kalan resim
+    arka planıdır. PDF sayfası başvurusunda yol None'dır; sayfa
+    page_background_image ile ya da PDF dışa aktarmada vektör olarak çizilir.
+    """
+    source = page.get('pdf_background_source_path')
+    reference = parse_page_reference(source)
+    if reference and os.path.exists(reference[0]):
+        try:
+            with _pdf_lock:
+                return pdf_helper.get_page_pixel_size(reference[0], reference[1], BASE_DPI), None
+        except Exception as e:
+            logging.error(f"PDF sayfa boyutu okunamadı ({source}): {e}")
+    elif source and reference is None and os.path.exists(source):
+        size = _image_size(source)  # Eski içe aktarma: PNG sayfa arka planı
+        if size:
+            return size, source
+    if template_type != TemplateType.PLAIN:
+        orientation = 'landscape' if page.get('orientation') == Orientation.LANDSCAPE.name else 'portrait'
+        template_path = os.path.join(template_dir, f"{template_type.name.lower()}_{orientation}_screen.jpg")
+        size = _image_size(template_path) if os.path.exists(template_path) else None
+        if size:
+            return size, template_path
+    return DEFAULT_PAGE_SIZE, None
+
+
+def page_world_dpi(page: dict) -> float:
+    """Bir canvas pikselinin DPI'sı: PDF sayfalarında BASE_DPI, diğerlerinde ekran DPI'sı."""
+    return BASE_DPI if parse_page_reference(page.get('pdf_background_source_path')) else SCREEN_DPI
+
+
+def page_background_image(page: dict, background_path: Optional[str], scale: float = 1.0) -> Optional[QImage]:
+    """Sayfanın arka planı (PDF sayfası verilen ölçekte çizilir, resimler dosyadan okunur); yoksa None."""
+    reference = parse_page_reference(page.get('pdf_background_source_path'))
+    if reference and os.path.exists(reference[0]):
+        try:
+            with _pdf_lock:
+                result = pdf_helper.render_page_pixels(reference[0], reference[1], scale * BASE_DPI / 72.0)
+            return qimage_from_samples(*result)
+        except Exception as e:
+            logging.error(f"PDF sayfası çizilemedi ({reference[0]}, sayfa {reference[1] + 1}): {e}")
+            return None
+    if background_path:
+        image = _decoded_image(('file', background_path), lambda: QImage(background_path))
+        return image
+    return None
+
+
+# --- Resimler --- #
+def _decoded_image(key: tuple, load) -> Optional[QImage]:
+    """Çözülmüş resimler için küçük, kilitli LRU önbellek (QImage örtük paylaşımlıdır)."""
+    with _image_lock:
+        image = _decoded_images.get(key)
+        if image is not None:
+            _decoded_images.move_to_end(key)
+            return image
+    image = load()
+    if image is None or image.isNull():
+        return None
+    with _image_lock:
+        _decoded_images[key] = image
+        while len(_decoded_images) > MAX_DECODED_IMAGES:
+            _decoded_images.popitem(last=False)
+    return image
+
+
+def _page_image(image_data: dict) -> Optional[QImage]:
+    image = image_data.get('image')
+    if isinstance(image, QImage):
+        return image
+    digest = image_data.get('asset')
+    if digest:
+        return _decoded_image(('asset', digest), lambda: QImage.fromData(get_asset_store().data(digest) or b''))
+    path = image_data.get('path')
+    if path and os.path.exists(path):
+        return _decoded_image(('file', path), lambda: QImage(path))
+    return None
+
+
+def _draw_images(painter: QPainter, images: list):
+    # Canvas gibi: en-boy oranı korunarak dikdörtgene ortalanır, merkez etrafında döndürülür
+    for image_data in images or []:
+        rect = image_data.get('rect')
+        if rect is None or not rect.isValid():
+            continue
+        image = _page_image(image_data)
+        if image is None:
+            continue
+        fitted = image.size().scaled(rect.size().toSize(), Qt.AspectRatioMode.KeepAspectRatio)
+        target = QRectF(0, 0, fitted.width(), fitted.height())
+        target.moveCenter(QPointF(rect.width() / 2, rect.height() / 2))
+        painter.save()
+        painter.translate(rect.topLeft())
+        angle = image_data.get('angle', 0.0)
+        if angle:
+            painter.translate(rect.width() / 2, rect.height() / 2)
+            painter.rotate(angle)
+            painter.translate(-rect.width() / 2, -rect.height() / 2)
+        painter.drawImage(target, image)
+        painter.restore()
+
+
+# --- B-spline'lar --- #
+def _bspline_path(stroke_data: dict) -> Optional[QPainterPath]:
+    knots = stroke_data.get('knots')
+    control_points = stroke_data.get('control_points')
+    degree = stroke_data.get('degree')
+    if knots is None or control_points is None or degree is None or len(control_points) < degree + 1:
+        return None
+    path = QPainterPath()
+    beziers = bspline_to_cubic_beziers(knots, control_points, degree)
+    if beziers:
+        path.moveTo(*beziers[0][0])
+        for _p0, p1, p2, p3 in beziers:
+            path.cubicTo(QPointF(*p1), QPointF(*p2), QPointF(*p3))
+        return path
+    # Uçları sabitlenmemiş eğri: canvas gibi örneklenir
+    tck = (np.asarray(knots), np.asarray(control_points, dtype=float).T, degree)
+    x_fine, y_fine = splev(np.linspace(knots[degree], knots[len(control_points)], BSPLINE_SAMPLE_COUNT), tck)
+    path.moveTo(float(x_fine[0]), float(y_fine[0]))
+    for x, y in zip(x_fine[1:], y_fine[1:]):
+        path.lineTo(float(x), float(y))
+    return path
+
+
+def _draw_bspline_strokes(painter: QPainter, strokes: list):
+    for stroke_data in strokes or []:
+        try:
+            path = _bspline_path(stroke_data)
+        except Exception as e:
+            logging.error(f"render_page_image: B-spline çizilemedi: {e}")
+            continue
+        if path is None:
+            continue
+        thickness = stroke_data.get('thickness')
+        pen = QPen(rgba_to_qcolor(stroke_data.get('color') or (0.0, 0.0, 0.0, 1.0)),
+                   float(2.0 if thickness is None else thickness), Qt.PenStyle.SolidLine,
+                   Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(path)
+
+
+# --- Çizim --- #
+def render_page_image(page: dict, target_size: Tuple[int, int], view_transform: Optional[QTransform] = None,
+                      page_size: Optional[Tuple[int, int]] = None, background: Optional[QImage] = None,
+                      template_type: TemplateType = TemplateType.PLAIN, template_settings: Optional[dict] = None,
+                      background_color: tuple = DEFAULT_BACKGROUND_COLOR) -> QImage:
+    """Sayfayı target_size boyutunda bir QImage'a çizer (iş parçacığında çağrılabilir).
+
+    Args:
+        view_transform: Canvas (dünya) koordinatlarından resim piksellerine dönüşüm;
+            None ise sayfa (page_size) resme sığdırılır.
+        page_size: Sayfanın canvas boyutu; arka plan bu dikdörtgene çizilir
+            (None ise page_background ile hesaplanır).
+        background: Hazır arka plan (ör. page_background_image ya da PdfPageRenderer
+            önbelleği); None ise ve şablon seçiliyse şablon çizgileri çizilir.
+        template_settings: Şablon renkleri ve aralıkları ('line_color', 'grid_color',
+            'line_spacing_pt', 'grid_spacing_pt').
+    """
+    width, height = target_size
+    image = QImage(max(1, int(width)), max(1, int(height)), QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(rgba_to_qcolor(background_color))
+    if page_size is None:
+        page_size = page_background(page, template_type)[0]
+    if view_transform is None:
+        scale = min(width / page_size[0], height / page_size[1])
+        view_transform = QTransform.fromScale(scale, scale)
+
+    painter = QPainter(image)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        painter.setTransform(view_transform)
+        page_rect = QRectF(0, 0, page_size[0], page_size[1])
+        if background is not None and not background.isNull():
+            painter.drawImage(page_rect, background)
+        elif template_type != TemplateType.PLAIN:
+            settings = template_settings or {}
+            painter.save()
+            painter.setClipRect(page_rect)
+            draw_template(painter, page_size[0], page_size[1], template_type,
+                          settings.get('line_color', (0.8, 0.8, 1.0, 1.0)), settings.get('grid_color', (0.9, 0.9, 0.9, 1.0)),
+                          settings.get('line_spacing_pt', 30), settings.get('grid_spacing_pt', 14), PT_TO_PX)
+            painter.restore()
+
+        # Canvas ile aynı sıra: resimler, kalem çizgileri, şekiller, B-spline'lar
+        _draw_images(painter, page.get('images'))
+        for line_data in page.get('lines') or []:
+            if len(line_data) >= 3:
+                draw_pen_stroke(painter, line_data[2], line_data[0], line_data[1],
+                                line_data[3] if len(line_data) >= 4 else 'solid')
+        for shape_data in page.get('shapes') or []:
+            if shape_data and len(shape_data) >= 5:
+                draw_shape(painter, shape_data, shape_data[5] if len(shape_data) >= 6 else 'solid')
+        _draw_bspline_strokes(painter, page.get('bspline_strokes'))
+    finally:
+        painter.end()
+    return image
+
+
+def render_page_at_dpi(page: dict, dpi: float, template_type: TemplateType = TemplateType.PLAIN,
+                       template_dir: str = DEFAULT_TEMPLATE_DIR, template_settings: Optional[dict] = None) -> QImage:
+    """Tüm sayfayı verilen DPI'da çizer; PDF arka planı da aynı çözünürlükte çizilir.
+
+    Örn. küçük resim için düşük DPI, baskı kalitesinde PNG için 300 DPI.
+    """
+    page_size, background_path = page_background(page, template_type, template_dir)
+    scale = dpi / page_world_dpi(page)
+    target_size = (max(1, math.ceil(page_size[0] * scale)), max(1, math.ceil(page_size[1] * scale)))
+    return render_page_image(page, target_size, QTransform.fromScale(scale, scale), page_size,
+                             page_background_image(page, background_path, scale), template_type, template_settings)
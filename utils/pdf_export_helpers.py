@@ -1,9 +1,12 @@
 """Sayfaları PDF olarak dışa aktarma ile ilgili yardımcı fonksiyonlar (PyMuPDF/fitz kullanarak)."""
 
+import hashlib
 import logging
 import os
+import shutil
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, wait
 from typing import TYPE_CHECKING
-from io import BytesIO
 import tempfile # tempfile modülünü en başa ekle
 
 # PyMuPDF importları
@@ -15,10 +18,14 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
 
 # PyQt importları (sadece type hinting için gerekli olabilir)
-from PyQt6.QtCore import QRectF, QPointF, QBuffer, QIODevice
+from PyQt6.QtCore import QRectF, QPointF
 
-# YENİ: Pillow ve BytesIO importları
-from io import BytesIO
+from utils.pixmap_bridge import fitz_pixmap_from_qimage
+from utils.pdf_page_renderer import BASE_DPI as PDF_PAGE_BASE_DPI, parse_page_reference
+from utils.process_pool import create_process_pool, spare_cpu_count
+from utils.geometry_helpers import bspline_to_cubic_beziers, simplify_polyline
+
+# YENİ: Pillow importları
 try:
     from PIL import Image
     from PIL import ImageDraw
@@ -150,6 +157,110 @@ def generate_template_image_pillow(output_dir: str, filename_base: str,
         return False
 # --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
 
+# --- YENİ: PDF'ten içe aktarılan sayfaların vektör olarak aktarılması --- #
+def _open_source_document(source_documents: dict, pdf_path: str):
+    """Kaynak PDF'i dışa aktarma boyunca bir kez açar (show_pdf_page kaynakları paylaşabilsin)."""
+    if pdf_path not in source_documents:
+        try:
+            source_documents[pdf_path] = fitz.open(pdf_path)
+        except Exception as e:
+            logging.error(f"    Kaynak PDF açılamadı: {pdf_path} - {e}")
+            source_documents[pdf_path] = None
+    return source_documents[pdf_path]
+
+def _show_source_pdf_page(pdf_page: 'fitz.Page', page_reference: str | None, origin_x: float, origin_y: float,
+                          view_zoom: float, source_documents: dict) -> bool:
+    """Arka plan bir PDF sayfası başvurusuysa ('belge.pdf#page=3') sayfayı vektör içerik olarak yerleştirir.
+
+    Sayfa canvas'ta BASE_DPI ile ölçeklendiği için hedef dikdörtgen aynı
+    ölçekle hesaplanır; mürekkep bunun üzerine çizilir. Başarılıysa True.
+    """
+    reference = parse_page_reference(page_reference)
+    if reference is None or not os.path.exists(reference[0]):
+        return False
+    pdf_path, page_index = reference
+    source_doc = _open_source_document(source_documents, pdf_path)
+    if source_doc is None or not (0 <= page_index < len(source_doc)):
+        return False
+    source_page = source_doc[page_index]
+    source_rect = source_page.rect  # Döndürme uygulanmış (canvas'taki) boyut
+    scale = PDF_PAGE_BASE_DPI / 72.0 * view_zoom
+    target_rect = fitz.Rect(origin_x, origin_y,
+                            origin_x + source_rect.width * scale, origin_y + source_rect.height * scale)
+    # show_pdf_page kaynak sayfanın /Rotate değerini hesaba katmıyor: döndürme
+    # bellekteki kopyada geçici olarak kaldırılıp yerleştirme matrisine verilir
+    rotation = source_page.rotation
+    if rotation:
+        source_page.set_rotation(0)
+    try:
+        pdf_page.show_pdf_page(target_rect, source_doc, page_index, overlay=False, rotate=-rotation)
+    finally:
+        if rotation:
+            source_page.set_rotation(rotation)
+    logging.debug(f"    Arka Plan: Kaynak PDF sayfası vektör olarak yerleştirildi ({pdf_path}, sayfa {page_index + 1}), Hedef Rect = {target_rect}")
+    return True
+
+def _close_source_documents(source_documents: dict):
+    for source_doc in source_documents.values():
+        if source_doc is not None:
+            source_doc.close()
+    source_documents.clear()
+
+# --- YENİ: Aynı resimlerin belgeye bir kez gömülmesi --- #
+def _image_file_key(path: str) -> tuple:
+    # Dosya okunmadan hesaplanan ucuz anahtar
+    stat = os.stat(path)
+    return ('file', os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+def _pixmap_digest(pixmap: 'fitz.Pixmap') -> tuple:
+    return ('pixmap', pixmap.width, pixmap.height, pixmap.n, hashlib.sha1(pixmap.samples_mv).hexdigest())
+
+def _image_xref_size(doc: 'fitz.Document', xref: int) -> tuple:
+    return int(doc.xref_get_key(xref, 'Width')[1]), int(doc.xref_get_key(xref, 'Height')[1])
+
+def _insert_shared_image(pdf_page: 'fitz.Page', rect: 'fitz.Rect', image_xrefs: dict, key: tuple,
+                         load_source, **placement) -> int:
+    """Resmi yerleştirir; aynı içerik belgede zaten gömülüyse yalnızca xref'i yeniden kullanılır.
+
+    Args:
+        image_xrefs: Belge başına anahtar/içerik özeti -> xref.
+        key: Ucuz anahtar (ör. dosya yolu, boyutu ve mtime'ı).
+        load_source: Anahtar bilinmiyorsa çağrılır; (insert_image kaynak
+            argümanları (stream=/pixmap=), içerik özeti) döndürür. Farklı
+            yollardaki aynı içerik de tek kez gömülür.
+        placement: insert_image yerleştirme argümanları (rotate, keep_proportion, overlay).
+    """
+    xref = image_xrefs.get(key)
+    if xref is None:
+        source, digest = load_source()
+        xref = image_xrefs.get(digest)
+        if xref is None:
+            xref = pdf_page.insert_image(rect, **source, **placement)
+            image_xrefs[digest] = image_xrefs[key] = xref
+            return xref
+        image_xrefs[key] = xref
+    return pdf_page.insert_image(rect, xref=xref, **placement)
+
+# --- YENİ: Eğri yolları (PATH, EDITABLE_LINE, B-spline) --- #
+def _draw_curve_path(pdf_page: 'fitz.Page', segments: list, color: tuple, width: float):
+    """Doğru (2 nokta) ve kübik Bézier (4 nokta) parçalarını tek bir PDF yolu olarak çizer."""
+    if not segments:
+        return
+    shape = pdf_page.new_shape()
+    for segment in segments:
+        if len(segment) == 4:
+            shape.draw_bezier(*segment)
+        else:
+            shape.draw_line(*segment)
+    shape.finish(color=color, width=width, closePath=False, lineCap=1, lineJoin=1)
+    shape.commit()
+
+def _load_image_file(path: str):
+    with open(path, "rb") as img_file:
+        data = img_file.read()
+    return {'stream': data}, ('stream', hashlib.sha1(data).hexdigest())
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
 def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                               page_data: dict,
                               canvas_width_px: int, 
@@ -158,12 +269,24 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                               page_background_pixmap: fitz.Pixmap | None = None, # QPixmap yerine fitz.Pixmap veya BytesIO
                               image_export_dpi: int = 150,
                               view_zoom: float = 1.0,                   # YENİ
-                              view_pan_offset: QPointF = QPointF(0,0) # YENİ
+                              view_pan_offset: QPointF = QPointF(0,0), # YENİ
+                              source_documents: dict | None = None,    # YENİ: Açık kaynak PDF'ler (yol -> fitz.Document)
+                              image_xrefs: dict | None = None,         # YENİ: Gömülü resimler (anahtar -> xref), belge başına
+                              stroke_tolerance_pt: float = 0.0,        # YENİ: Kalem çizgisi sadeleştirme toleransı (punto)
+                              export_stats: dict | None = None         # YENİ: Nokta sayıları ('points_in', 'points_out') buraya eklenir
                               ): 
     """
     Verilen sayfa verilerini (çizgiler, şekiller, resimler) PDF sayfasına çizer.
     PDF arka planı, verilen view_zoom ve view_pan_offset'e göre konumlandırılır.
     Kullanıcı çizimleri de bu transformasyona göre PDF'e yerleştirilir.
+
+    page_data['pdf_background_source_path'] bir PDF sayfası başvurusuysa
+    arka plan resim yerine özgün sayfa olarak (vektör, seçilebilir metin)
+    yerleştirilir. source_documents verilmezse kaynak PDF'ler bu çağrı
+    içinde açılıp kapatılır. Aynı belgenin sayfaları için aynı image_xrefs
+    verilirse tekrar eden resimler ve arka planlar bir kez gömülür.
+    stroke_tolerance_pt > 0 ise kalem çizgileri, çıktıda bu kadar puntodan
+    fazla sapmayacak şekilde sadeleştirilir (Ramer-Douglas-Peucker).
     """
     if not PYMUPDF_AVAILABLE:
         logging.error("PDF içeriği çizilemedi: PyMuPDF (fitz) kütüphanesi bulunamadı.")
@@ -180,18 +303,46 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
         actual_bg_to_draw = None
         bg_draw_x = -view_pan_offset.x()
         bg_draw_y = -view_pan_offset.y()
-
-        if page_background_pixmap:
+        if image_xrefs is None:
+            image_xrefs = {}
+        bg_key = None
+        bg_load_source = None
+
+        owns_source_documents = source_documents is None
+        if owns_source_documents:
+            source_documents = {}
+        try:
+            background_drawn = _show_source_pdf_page(pdf_page, page_data.get('pdf_background_source_path'),
+                                                     bg_draw_x, bg_draw_y, view_zoom, source_documents)
+        except Exception as e_show_pdf:
+            logging.error(f"    HATA: Kaynak PDF sayfası yerleştirilirken: {e_show_pdf}", exc_info=True)
+        finally:
+            if owns_source_documents:
+                _close_source_documents(source_documents)
+
+        if background_drawn:
+            pass  # Özgün PDF sayfası yerleştirildi; resim arka planı gerekmez
+        elif page_background_pixmap:
             if page_background_pixmap.width > 0 and page_background_pixmap.height > 0:
                 actual_bg_to_draw = page_background_pixmap
+                bg_size = (page_background_pixmap.width, page_background_pixmap.height)
+                bg_key = _pixmap_digest(page_background_pixmap)
+                bg_load_source = lambda: ({'pixmap': page_background_pixmap}, bg_key)
                 logging.debug(f"    Arka Plan: Özel PDF Pixmap kullanılacak. Boyut: {actual_bg_to_draw.width}x{actual_bg_to_draw.height}")
             else:
                 logging.warning("    Arka Plan: Özel PDF Pixmap geçersiz (0 boyut). Atlanıyor.")
         elif background_image_path and os.path.exists(background_image_path):
             try:
-                loaded_pixmap = fitz.Pixmap(background_image_path)
-                if loaded_pixmap.width > 0 and loaded_pixmap.height > 0:
+                # Şablon her sayfada aynı: belgede zaten gömülüyse yeniden çözülmez
+                bg_key = _image_file_key(background_image_path)
+                if bg_key in image_xrefs:
+                    actual_bg_to_draw = bg_key
+                    bg_size = _image_xref_size(pdf_page.parent, image_xrefs[bg_key])
+                    logging.debug(f"    Arka Plan: Şablon dosyası belgede zaten gömülü ({background_image_path}), xref={image_xrefs[bg_key]}")
+                elif (loaded_pixmap := fitz.Pixmap(background_image_path)).width > 0 and loaded_pixmap.height > 0:
                     actual_bg_to_draw = loaded_pixmap
+                    bg_size = (loaded_pixmap.width, loaded_pixmap.height)
+                    bg_load_source = lambda: ({'pixmap': loaded_pixmap}, _pixmap_digest(loaded_pixmap))
                     logging.debug(f"    Arka Plan: Şablon dosyası kullanılacak ({background_image_path}). Boyut: {actual_bg_to_draw.width}x{actual_bg_to_draw.height}")
                 else:
                     logging.warning(f"    Arka Plan: Şablon dosyası ({background_image_path}) yüklendi ama boyutu geçersiz. Atlanıyor.")
@@ -199,14 +350,15 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                 logging.error(f"    Arka Plan: Şablon dosyası ({background_image_path}) yüklenirken hata: {e_bg_path_load}")
         
         if actual_bg_to_draw:
-            bg_target_w = actual_bg_to_draw.width * view_zoom
-            bg_target_h = actual_bg_to_draw.height * view_zoom
+            bg_target_w = bg_size[0] * view_zoom
+            bg_target_h = bg_size[1] * view_zoom
             target_bg_rect_on_pdf = fitz.Rect(bg_draw_x, bg_draw_y, bg_draw_x + bg_target_w, bg_draw_y + bg_target_h)
-            source_bg_rect = fitz.Rect(0, 0, actual_bg_to_draw.width, actual_bg_to_draw.height)
+            source_bg_rect = fitz.Rect(0, 0, bg_size[0], bg_size[1])
             logging.debug(f"    Arka Plan Çizim Detayları: Hedef Rect = {target_bg_rect_on_pdf}, Kaynak Rect = {source_bg_rect}")
             
             try:
-                pdf_page.insert_image(target_bg_rect_on_pdf, pixmap=actual_bg_to_draw, keep_proportion=True, overlay=False)
+                _insert_shared_image(pdf_page, target_bg_rect_on_pdf, image_xrefs, bg_key, bg_load_source,
+                                     keep_proportion=True, overlay=False)
                 background_drawn = True
                 logging.info(f"    Arka Plan Başarıyla Çizildi.")
             except Exception as e_insert_bg:
@@ -223,6 +375,9 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
             transformed_y = bg_draw_y + (world_y * view_zoom)
             return fitz.Point(transformed_x, transformed_y)
 
+        def transform_xy(x: float, y: float) -> fitz.Point:
+            return fitz.Point(bg_draw_x + x * view_zoom, bg_draw_y + y * view_zoom)
+
         def transform_width(w: float) -> float:
             # Genişliği en az 0.1 yapalım (0 olmasın)
             return max(0.1, w * view_zoom) 
@@ -230,7 +385,8 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
         line_items = page_data.get('lines', [])
         shape_items = page_data.get('shapes', [])
         image_items = page_data.get('images', [])
-        logging.debug(f"    İçerik: {len(line_items)} çizgi, {len(shape_items)} şekil, {len(image_items)} resim.")
+        bspline_items = page_data.get('bspline_strokes') or []
+        logging.debug(f"    İçerik: {len(line_items)} çizgi, {len(shape_items)} şekil, {len(image_items)} resim, {len(bspline_items)} B-spline.")
 
         # --- Çizgiler --- #
         for i, line_data in enumerate(line_items):
@@ -242,7 +398,16 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                 if len(points_qpointf) >= 2:
                     fitz_color = color[:3]
                     fitz_width = transform_width(original_width)
-                    fitz_points = [transform_point(p) for p in points_qpointf]
+                    if stroke_tolerance_pt > 0 and len(points_qpointf) > 2:
+                        # Tolerans çıktı puntosu cinsinden; dünya koordinatlarına zoom ile çevrilir
+                        world_points = np.array([(p.x(), p.y()) for p in points_qpointf])
+                        simplified = simplify_polyline(world_points, stroke_tolerance_pt / view_zoom)
+                        fitz_points = [transform_xy(x, y) for x, y in simplified]
+                    else:
+                        fitz_points = [transform_point(p) for p in points_qpointf]
+                    if export_stats is not None:
+                        export_stats['points_in'] = export_stats.get('points_in', 0) + len(points_qpointf)
+                        export_stats['points_out'] = export_stats.get('points_out', 0) + len(fitz_points)
                     
                     if i == 0: # Sadece ilk çizgi için detay logla
                         logging.debug(f"      Çizgi 0 Orijinal: width={original_width:.2f}, ilk_nokta={points_qpointf[0]}")
@@ -259,6 +424,15 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                 tool_type = shape_data[0]
                 color = shape_data[1]
                 original_pen_width = shape_data[2]
+                if tool_type.name in ('PATH', 'EDITABLE_LINE'):
+                    # shape_data[3] nokta listesi; EDITABLE_LINE'da (3n+1) nokta kübik Bézier kontrol noktalarıdır
+                    points = [transform_point(p) for p in shape_data[3]]
+                    if tool_type.name == 'EDITABLE_LINE' and len(points) >= 4 and (len(points) - 1) % 3 == 0:
+                        segments = [tuple(points[j:j + 4]) for j in range(0, len(points) - 1, 3)]
+                    else:
+                        segments = list(zip(points, points[1:]))
+                    _draw_curve_path(pdf_page, segments, color[:3], transform_width(original_pen_width))
+                    continue
                 start_qpointf = shape_data[3]
                 end_qpointf = shape_data[4]
 
@@ -289,17 +463,30 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
             except Exception as e_shape:
                 logging.error(f"    HATA: Şekil {i} ({tool_type.name if tool_type else 'Bilinmeyen'}) PDF'e çizilirken: {e_shape}", exc_info=True)
 
+        # --- B-spline'lar (düzenlenebilir çizgiler) --- #
+        # Örneklenmiş çoklu çizgi yerine düğüm ekleme ile elde edilen kübik Bézier parçaları (tam ve küçük)
+        for i, stroke_data in enumerate(bspline_items):
+            try:
+                beziers = bspline_to_cubic_beziers(stroke_data['knots'], stroke_data['control_points'], stroke_data['degree'])
+                segments = [tuple(transform_xy(x, y) for x, y in bezier) for bezier in beziers]
+                color = stroke_data.get('color') or (0.0, 0.0, 0.0, 1.0)
+                thickness = stroke_data.get('thickness')
+                _draw_curve_path(pdf_page, segments, tuple(color[:3]), transform_width(2.0 if thickness is None else thickness))
+            except Exception as e_bspline:
+                logging.error(f"    HATA: B-spline {i} PDF'e çizilirken: {e_bspline}", exc_info=True)
+
         # --- Resimler --- #
         for i, img_data in enumerate(image_items):
             try:
                 original_path = img_data.get('path')
+                image_bytes = img_data.get('data') # YENİ: Not defterine gömülü resim baytları (asset)
                 world_x = img_data.get('x') 
                 world_y = img_data.get('y')
                 world_w = img_data.get('width')
                 world_h = img_data.get('height')
                 angle = img_data.get('rotation', 0.0)
 
-                if not (original_path and os.path.exists(original_path) and 
+                if not ((image_bytes or (original_path and os.path.exists(original_path))) and 
                         world_x is not None and world_y is not None and 
                         world_w is not None and world_h is not None and 
                         world_w > 0 and world_h > 0):
@@ -320,28 +507,23 @@ def _draw_page_content_to_pdf(pdf_page: fitz.Page,
                 # stream_to_pdf ve angle_for_pdf burada oluşturulur.
                 # Bu kısım loglama açısından zaten detaylıydı, ekstra log eklemeye gerek yok.
                 
-                stream_to_pdf = None
                 angle_for_pdf = int(angle)
-                # ... (Pillow/Stream oluşturma mantığı - KISALTILDI) ...
-                # Önemli olan, sonunda stream_to_pdf'in dolu ve angle_for_pdf'in doğru olması.
-                # Test amaçlı, stream'i orijinal dosyadan alalım:
+                # Dosya yalnızca belgede henüz gömülü değilse okunur; aynı resim xref ile yeniden kullanılır
                 try:
-                    with open(original_path, "rb") as img_file:
-                        stream_to_pdf = BytesIO(img_file.read())
-                except Exception as e_read_img:
+                    logging.debug(f"    Resim {i} PDF'e ekleniyor: rect={pdf_rect}, angle={angle_for_pdf}")
+                    if image_bytes:
+                        image_key = (('asset', img_data['asset']) if img_data.get('asset')
+                                     else ('stream', hashlib.sha1(image_bytes).hexdigest()))
+                        _insert_shared_image(pdf_page, pdf_rect, image_xrefs, image_key,
+                                             lambda: ({'stream': image_bytes}, ('stream', hashlib.sha1(image_bytes).hexdigest())),
+                                             rotate=angle_for_pdf)
+                    else:
+                        _insert_shared_image(pdf_page, pdf_rect, image_xrefs, _image_file_key(original_path),
+                                             lambda: _load_image_file(original_path), rotate=angle_for_pdf)
+                except OSError as e_read_img:
                     logging.error(f"    HATA: Resim dosyası okunamadı ({original_path}): {e_read_img}")
                     continue # Bu resmi atla
 
-                if stream_to_pdf:
-                    logging.debug(f"    Resim {i} PDF'e ekleniyor: rect={pdf_rect}, angle={angle_for_pdf}")
-                    pdf_page.insert_image(
-                        pdf_rect,
-                        stream=stream_to_pdf,
-                        rotate=angle_for_pdf 
-                    )
-                else:
-                    logging.error(f"    HATA: Resim {i} için stream oluşturulamadı: {original_path}")
-
             except Exception as e_image:
                 logging.error(f"    HATA: Resim {i} PDF'e eklenirken: {e_image}", exc_info=True)
         
@@ -467,10 +649,179 @@ def generate_template_image_for_screen(output_dir: str, filename_base: str,
 
 # --- Ana Dışa Aktarma Fonksiyonları ---
 
+# --- YENİ: Paralel (çok süreçli) dışa aktarma --- #
+# Süreç havuzunu başlatmak ~1 sn sürer; tahmini iş (kalem noktası cinsinden,
+# bkz. _estimate_export_work) bundan azsa seri yol daha hızlıdır.
+# Ölçüm: seri yol nokta başına ~30-40 µs, 1.9 MP resim başına ~30 ms.
+PARALLEL_EXPORT_MIN_WORK = 100_000
+# Gömülen bir resim / arka plan pikselinin iş karşılığı (nokta)
+IMAGE_EXPORT_WORK = 1_000
+# Sayfa aralığı başına en az sayfa; işçi başına birkaç aralık ilerlemeyi sıklaştırır
+EXPORT_CHUNK_MIN_PAGES = 8
+EXPORT_CHUNKS_PER_WORKER = 4
+EXPORT_POLL_INTERVAL_S = 0.1
+# Kalem çizgisi sadeleştirmede varsayılan en fazla sapma (punto); ~0.09 mm, gözle fark edilmez
+DEFAULT_STROKE_TOLERANCE_PT = 0.25
+
+def _serialize_render_data(render_data: dict) -> dict | None:
+    """Sayfa render verisini süreçler arasında aktarılabilir (pickle) hale getirir.
+
+    QPixmap arka plan ham RGB(A) örneklerine çevrilir; QPointF ve ToolType
+    olduğu gibi aktarılabilir. page_content yoksa None.
+    """
+    if not render_data.get("page_content"):
+        return None
+    page_background = None
+    page_bg_pixmap_qpixmap = render_data.get("page_background_pixmap") # Bu QPixmap
+    if page_bg_pixmap_qpixmap and not page_bg_pixmap_qpixmap.isNull():
+        try:
+            fitz_page_bg = fitz_pixmap_from_qimage(page_bg_pixmap_qpixmap)
+            if fitz_page_bg is None or not (fitz_page_bg.width > 0 and fitz_page_bg.height > 0):
+                logging.warning("PDF Export: QPixmap'tan dönüştürülen fitz.Pixmap boş.")
+            else:
+                page_background = (fitz_page_bg.width, fitz_page_bg.height, bool(fitz_page_bg.alpha), fitz_page_bg.samples)
+        except Exception as e_conv:
+            logging.error(f"PDF Export: QPixmap'ı fitz.Pixmap'a dönüştürürken hata: {e_conv}", exc_info=True)
+    return {
+        "page_content": render_data["page_content"],
+        "width": render_data.get("width", 800), # Varsayılan değerler ekle
+        "height": render_data.get("height", 600),
+        "background_path": render_data.get("background_path"),
+        "page_background": page_background,
+        "zoom_level": render_data.get("zoom_level", 1.0),
+        "pan_offset": render_data.get("pan_offset", QPointF(0,0)),
+    }
+
+def _estimate_export_work(page_data: dict) -> int:
+    """Serileştirilmiş sayfanın dışa aktarma maliyetini kalem noktası cinsinden tahmin eder."""
+    content = page_data["page_content"]
+    work = sum(len(line[2]) for line in content.get('lines') or [] if len(line) > 2 and line[2])
+    work += 10 * len(content.get('shapes') or [])
+    for stroke in content.get('bspline_strokes') or []:
+        control_points = stroke.get('control_points')
+        work += len(control_points) if control_points is not None else 0
+    work += IMAGE_EXPORT_WORK * len(content.get('images') or [])
+    if page_data.get("page_background") is not None:
+        work += IMAGE_EXPORT_WORK
+    return work
+
+def _add_pages_to_pdf(doc: 'fitz.Document', pages_data: list[dict], image_export_dpi: int,
+                      progress_callback=None, cancel_check=None,
+                      stroke_tolerance_pt: float = 0.0, export_stats: dict | None = None) -> bool:
+    """Serileştirilmiş sayfaları belgeye ekler (seri yol ve işçiler aynı kodu kullanır).
+
+    cancel_check True döndürürse durur ve False döndürür.
+    """
+    source_documents = {} # Kaynak PDF'ler tüm sayfalar için bir kez açılır
+    image_xrefs = {}      # Tekrar eden resimler/arka planlar belgeye bir kez gömülür
+    try:
+        for i, page_data in enumerate(pages_data):
+            if cancel_check and cancel_check():
+                return False
+            # PDF sayfasını canvas boyutuyla oluştur (bu 1:1 çizim alanı için)
+            pdf_export_page = doc.new_page(width=float(page_data["width"]), height=float(page_data["height"]))
+            fitz_page_bg = None
+            if page_data["page_background"] is not None:
+                width, height, alpha, samples = page_data["page_background"]
+                fitz_page_bg = fitz.Pixmap(fitz.csRGB, width, height, samples, alpha)
+            _draw_page_content_to_pdf(pdf_export_page, page_data["page_content"],
+                                      page_data["width"], page_data["height"],
+                                      page_data["background_path"],
+                                      page_background_pixmap=fitz_page_bg,
+                                      image_export_dpi=image_export_dpi,
+                                      view_zoom=page_data["zoom_level"],
+                                      view_pan_offset=page_data["pan_offset"],
+                                      source_documents=source_documents,
+                                      image_xrefs=image_xrefs,
+                                      stroke_tolerance_pt=stroke_tolerance_pt,
+                                      export_stats=export_stats)
+            if progress_callback:
+                progress_callback(i + 1, len(pages_data))
+        return True
+    finally:
+        _close_source_documents(source_documents)
+
+def _export_page_range(part_path: str, pages_data: list[dict], image_export_dpi: int,
+                       stroke_tolerance_pt: float = 0.0) -> dict:
+    """İşçi süreçte bir sayfa aralığını ara PDF'e yazar; aralığın istatistiklerini döndürür."""
+    doc = fitz.open()
+    export_stats = {}
+    try:
+        _add_pages_to_pdf(doc, pages_data, image_export_dpi,
+                          stroke_tolerance_pt=stroke_tolerance_pt, export_stats=export_stats)
+        doc.save(part_path)
+        return export_stats
+    finally:
+        doc.close()
+
+def _export_pages_in_parallel(doc: 'fitz.Document', pages_data: list[dict], image_export_dpi: int, workers: int,
+                              progress_callback=None, cancel_check=None,
+                              stroke_tolerance_pt: float = 0.0, export_stats: dict | None = None) -> bool | None:
+    """Sayfa aralıklarını işçi süreçlerde ara PDF'lere yazar ve sırayla doc'a birleştirir (insert_pdf).
+
+    Havuz oluşturulamazsa None (çağıran seri yola döner); iptal edilirse False.
+    """
+    executor = create_process_pool(workers, preload=['utils.pdf_export_helpers'])
+    if executor is None:
+        return None
+    chunk_size = max(EXPORT_CHUNK_MIN_PAGES, -(-len(pages_data) // (workers * EXPORT_CHUNKS_PER_WORKER)))
+    part_dir = tempfile.mkdtemp(prefix='dnd_export_')
+    try:
+        futures = []
+        for part_index, start in enumerate(range(0, len(pages_data), chunk_size)):
+            part_path = os.path.join(part_dir, f"part_{part_index:05d}.pdf")
+            chunk = pages_data[start:start + chunk_size]
+            futures.append((part_path, len(chunk), executor.submit(_export_page_range, part_path, chunk, image_export_dpi,
+                                                                          stroke_tolerance_pt)))
+        logging.info(f"PDF Export: {len(pages_data)} sayfa {len(futures)} aralık halinde {workers} işçiye dağıtıldı.")
+
+        pending = {future for _part_path, _count, future in futures}
+        while pending:
+            if cancel_check and cancel_check():
+                for future in pending:
+                    future.cancel()
+                return False
+            _done, pending = wait(pending, timeout=EXPORT_POLL_INTERVAL_S, return_when=FIRST_COMPLETED)
+            if progress_callback:
+                progress_callback(sum(count for _part_path, count, future in futures if future.done()), len(pages_data))
+
+        # Aralıklar sayfa sırasıyla birleştirilir (ilk hata burada yükseltilir)
+        for part_path, _count, future in futures:
+            part_stats = future.result()
+            if export_stats is not None:
+                for key, value in part_stats.items():
+                    export_stats[key] = export_stats.get(key, 0) + value
+            with fitz.open(part_path) as part_doc:
+                doc.insert_pdf(part_doc)
+        return True
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(part_dir, ignore_errors=True)
+# --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- --- ---
+
 def export_notebook_to_pdf(filepath: str, 
                            pages_render_data: list[dict], # page_manager yerine bu listeyi al
-                           image_export_dpi: int = 150):
-    """Tüm not defterini (verilen sayfa render verilerini) tek bir PDF dosyasına aktarır."""
+                           image_export_dpi: int = 150,
+                           progress_callback=None,
+                           cancel_check=None,
+                           max_workers: int | None = None,
+                           stroke_tolerance_pt: float = 0.0,
+                           export_stats: dict | None = None):
+    """Tüm not defterini (verilen sayfa render verilerini) tek bir PDF dosyasına aktarır.
+
+    Tahmini iş PARALLEL_EXPORT_MIN_WORK'ü geçtiğinde (yoğun çizimli büyük
+    not defterleri) sayfa aralıkları işçi süreçlerde ara PDF'lere yazılır ve
+    insert_pdf ile birleştirilir; çıktı seri yol ile aynıdır. Hafif not
+    defterleri havuz başlatma maliyetine girmeden seri yazılır.
+
+    Args:
+        progress_callback: (tamamlanan sayfa, toplam sayfa) ile çağrılır.
+        cancel_check: True döndürürse dışa aktarma durur ve dosya yazılmaz.
+        max_workers: İşçi süreç sayısı; None ise boşta kalan çekirdek sayısı.
+        stroke_tolerance_pt: Kalem çizgilerinin en fazla sapması (punto); 0 ise sadeleştirilmez.
+        export_stats: Verilirse kalem çizgisi nokta sayıları ('points_in', 'points_out')
+            ve dosya boyutu ('file_bytes') yazılır.
+    """
     if not PYMUPDF_AVAILABLE:
         logging.error("PDF dışa aktarma başarısız: PyMuPDF kütüphanesi yüklü değil.")
         return False
@@ -479,59 +830,38 @@ def export_notebook_to_pdf(filepath: str,
         logging.warning("Dışa aktarılacak sayfa verisi bulunamadı.")
         return False
 
+    pages_data = []
+    for i, render_data in enumerate(pages_render_data):
+        page_data = _serialize_render_data(render_data)
+        if page_data is None:
+            logging.warning(f"Sayfa veri indeksi {i} için 'page_content' bulunamadı, atlanıyor.")
+            continue
+        pages_data.append(page_data)
+
     doc = fitz.open() # Yeni boş PDF belgesi oluştur
-        
     try:
-        for i, render_data in enumerate(pages_render_data):
-            logging.debug(f"Exporting page data index {i} to PDF (PyMuPDF)...")
-            
-            page_content = render_data.get("page_content")
-            canvas_w = render_data.get("width", 800) # Varsayılan değerler ekle
-            canvas_h = render_data.get("height", 600)
-            bg_path = render_data.get("background_path")
-            page_bg_pixmap_qpixmap = render_data.get("page_background_pixmap") # Bu QPixmap
-            current_zoom = render_data.get("zoom_level", 1.0) # YENİ
-            current_pan = render_data.get("pan_offset", QPointF(0,0)) # YENİ
-
-            if not page_content:
-                logging.warning(f"Sayfa veri indeksi {i} için 'page_content' bulunamadı, atlanıyor.")
-                continue
-                
-            # PDF sayfasını canvas boyutuyla oluştur (bu 1:1 çizim alanı için)
-            pdf_export_page = doc.new_page(width=float(canvas_w), height=float(canvas_h))
-            
-            # page_background_pixmap_qpixmap'ı (QPixmap) fitz.Pixmap'a dönüştür (eğer varsa)
-            fitz_page_bg = None
-            if page_bg_pixmap_qpixmap and not page_bg_pixmap_qpixmap.isNull():
-                try:
-                    buffer = QBuffer()
-                    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
-                    success = page_bg_pixmap_qpixmap.save(buffer, "PNG")
-                    buffer.close()
-                    if success:
-                        img_bytes = bytes(buffer.data())
-                        if img_bytes:
-                            fitz_page_bg = fitz.Pixmap(img_bytes)
-                            if not (fitz_page_bg.width > 0 and fitz_page_bg.height > 0):
-                                logging.warning("PDF Export: QPixmap'tan dönüştürülen fitz.Pixmap boş.")
-                                fitz_page_bg = None
-                        else: logging.warning("PDF Export: QPixmap'tan byte alınamadı.")
-                    else: logging.warning("PDF Export: QPixmap buffer'a kaydedilemedi.")
-                except Exception as e_conv:
-                    logging.error(f"PDF Export: QPixmap'ı fitz.Pixmap'a dönüştürürken hata: {e_conv}", exc_info=True)
-            
-            _draw_page_content_to_pdf(pdf_export_page, page_content,
-                                      canvas_w, canvas_h,
-                                      bg_path,
-                                      page_background_pixmap=fitz_page_bg, # Dönüştürülmüşü gönder
-                                      image_export_dpi=image_export_dpi,
-                                      view_zoom=current_zoom,             # YENİ
-                                      view_pan_offset=current_pan         # YENİ
-                                      )
+        workers = min(spare_cpu_count() if max_workers is None else max_workers,
+                      -(-len(pages_data) // EXPORT_CHUNK_MIN_PAGES))
+        completed = None
+        if workers > 1 and sum(_estimate_export_work(page_data) for page_data in pages_data) >= PARALLEL_EXPORT_MIN_WORK:
+            completed = _export_pages_in_parallel(doc, pages_data, image_export_dpi, workers,
+                                                  progress_callback, cancel_check,
+                                                  stroke_tolerance_pt, export_stats)
+        if completed is None:
+            completed = _add_pages_to_pdf(doc, pages_data, image_export_dpi, progress_callback, cancel_check,
+                                          stroke_tolerance_pt, export_stats)
+        if not completed:
+            logging.info("PDF dışa aktarma iptal edildi.")
+            doc.close()
+            return False
 
         if len(doc) > 0:
             doc.save(filepath, garbage=4, deflate=True)
             logging.info(f"Not defteri başarıyla PDF olarak dışa aktarıldı ({len(doc)} sayfa): {filepath}")
+            if export_stats is not None:
+                export_stats['file_bytes'] = os.path.getsize(filepath)
+                if stroke_tolerance_pt > 0 and export_stats.get('points_in'):
+                    logging.info(f"Çizgi sadeleştirme ({stroke_tolerance_pt} pt): {export_stats['points_in']} -> {export_stats['points_out']} nokta.")
             doc.close()
             return True
         else:
@@ -563,11 +893,12 @@ def export_selected_pages_to_pdf(filepath: str, page_manager: 'PageManager',
 
     doc = fitz.open() # Yeni boş PDF belgesi oluştur
     exported_page_count = 0
+    image_xrefs = {} # Tekrar eden resimler/arka planlar belgeye bir kez gömülür
 
     try:
         # Seçilen indekslerdeki sayfaları işle
         for index in page_indices:
-            page_obj = page_manager.widget(index)
+            page_obj = page_manager._page_at(index)
             if page_obj and hasattr(page_obj, 'get_canvas'):
                 logging.debug(f"Exporting selected page (index {index}, number {page_obj.page_number}) to PDF (PyMuPDF)...")
                 # Ayar değerlerini yardımcı fonksiyona aktar
@@ -584,7 +915,8 @@ def export_selected_pages_to_pdf(filepath: str, page_manager: 'PageManager',
                 _draw_page_content_to_pdf(pdf_export_page, page_data,
                                           canvas_w, canvas_h,
                                           bg_path,
-                                          image_export_dpi=image_export_dpi) # YENİ: DPI parametresi aktarıldı
+                                          image_export_dpi=image_export_dpi, # YENİ: DPI parametresi aktarıldı
+                                          image_xrefs=image_xrefs)
                 exported_page_count += 1
             else:
                  logging.warning(f"Seçilen sayfa (Indeks: {index}) PDF'e aktarılırken alınamadı veya geçerli değil, atlanıyor.")
@@ -0,0 +1,78 @@
+# utils/pdf_importer.py
+"""PDF sayfalarını GUI'yi bloklamadan sayfa olarak ekleyen içe aktarıcı.
+
+Sayfalar içe aktarılırken çizilmez: her sayfa için yalnızca boyutu okunur
+ve bir PDF sayfası başvurusu ('belge.pdf#page=3') page_ready sinyaliyle
+bildirilir; arka plan sayfa görünür olduğunda çizilir (bkz.
+utils/pdf_page_renderer.py). Sayfalar olay döngüsünün her turunda küçük
+gruplar halinde eklenir, böylece uzun belgelerde de ilk sayfalar hemen
+kullanılabilir ve içe aktarma iptal edilebilir.
+"""
+
+import logging
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.pdf_page_renderer import get_pdf_page_renderer, make_page_reference
+
+PAGES_PER_BATCH = 8
+
+
+class PdfImporter(QObject):
+    """Bir PDF'in sayfalarını sırayla, olay döngüsünü bloklamadan bildirir."""
+
+    page_ready = pyqtSignal(int, str, int, int)  # sayfa indeksi, sayfa başvurusu, genişlik, yükseklik
+    page_failed = pyqtSignal(int, str)           # sayfa indeksi, hata mesajı
+    progress = pyqtSignal(int, int)              # işlenen sayfa, toplam sayfa
+    finished = pyqtSignal(int, bool)             # eklenen sayfa sayısı, iptal edildi mi
+
+    def __init__(self, pdf_path: str, page_count: int, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.page_count = page_count
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._import_batch)
+        self._next_index = 0
+        self._imported = 0
+        self._done = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer.isActive() and not self._done
+
+    def start(self):
+        """İlk grubu hemen ekler, kalanları olay döngüsünün sonraki turlarına bırakır."""
+        logging.info(f"PdfImporter: {self.page_count} sayfa içe aktarılıyor: {self.pdf_path}")
+        self._timer.start()
+        self._import_batch()
+
+    def _import_batch(self):
+        if self._done:
+            return
+        renderer = get_pdf_page_renderer()
+        end = min(self._next_index + PAGES_PER_BATCH, self.page_count)
+        while self._next_index < end and not self._done:
+            index = self._next_index
+            size = renderer.page_size(self.pdf_path, index)
+            self._next_index += 1
+            if size is None:
+                self.page_failed.emit(index, f"Sayfa {index + 1} okunamadı.")
+            else:
+                self._imported += 1
+                self.page_ready.emit(index, make_page_reference(self.pdf_path, index), size.width(), size.height())
+            self.progress.emit(self._next_index, self.page_count)
+        if not self._done and self._next_index >= self.page_count:
+            self._finish(cancelled=False)
+
+    def cancel(self):
+        """Kalan sayfaları eklemeden durur; eklenmiş sayfalar kalır."""
+        if self._done:
+            return
+        self._finish(cancelled=True)
+
+    def _finish(self, cancelled: bool):
+        self._done = True
+        self._timer.stop()
+        logging.info(f"PdfImporter: {'İptal edildi' if cancelled else 'Tamamlandı'}; {self._imported}/{self.page_count} sayfa eklendi.")
+        self.finished.emit(self._imported, cancelled)
@@ -0,0 +1,222 @@
+# utils/pdf_page_renderer.py
+"""İçe aktarılan PDF sayfalarının görünür oldukça çizilmesi.
+
+PDF'ten içe aktarılan sayfalar resim dosyası yerine bir sayfa başvurusu
+('belge.pdf#page=3') tutar; bu başvuru not defterinde mevcut
+'pdf_background_source_path' alanında saklanır. Sayfa arka planı yalnızca
+sayfa görünür olduğunda ekranın piksel yoğunluğunda çizilir. Canvas önbelleği
+sayfa zoom'uyla ölçeklenmediğinden sayfa zoom'a göre yeniden çizilmez.
+
+PyMuPDF çizim sırasında GIL'i bırakmadığından çizimler bir süreç havuzunda
+yapılır (helpers.pdf_helper.render_page_pixels); sonuçlar bellek sınırlı bir
+LRU önbellekte tutulur ve rendered sinyaliyle bildirilir. Çizimler ayrıca
+kalıcı bir disk önbelleğine yazılır (utils/pdf_render_cache.py); aynı PDF
+yeniden açıldığında sayfalar diskten okunur.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QSize, QStandardPaths, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from helpers import pdf_helper
+from utils import pdf_render_cache
+from utils.pixmap_bridge import qimage_from_samples
+from utils.process_pool import create_process_pool, spare_cpu_count
+
+PAGE_REFERENCE_MARKER = '#page='
+# Sayfa koordinatları: 1.0 ölçekte bir punto BASE_DPI/72 piksel (eski 150 DPI PNG içe aktarmayla aynı)
+BASE_DPI = 150
+MAX_RENDER_SCALE = 8.0
+DEFAULT_CACHE_BYTES = 192 * 1024 * 1024
+MAX_RENDER_WORKERS = 2
+DISK_CACHE_DIR_NAME = 'pdf_page_cache'
+
+
+def make_page_reference(pdf_path: str, page_index: int) -> str:
+    """PDF sayfası başvurusu (sayfa numarası 1 tabanlı, PDF açma parametresi biçiminde)."""
+    return f"{pdf_path}{PAGE_REFERENCE_MARKER}{page_index + 1}"
+
+
+def parse_page_reference(reference: Optional[str]) -> Optional[Tuple[str, int]]:
+    """'belge.pdf#page=3' -> ('belge.pdf', 2); başvuru değilse (ör. PNG yolu) None."""
+    if not reference:
+        return None
+    pdf_path, marker, number = reference.rpartition(PAGE_REFERENCE_MARKER)
+    if not marker or not pdf_path or not number.isdigit() or int(number) < 1:
+        return None
+    return pdf_path, int(number) - 1
+
+
+def background_source_exists(source: Optional[str]) -> bool:
+    """Arka plan kaynağı (resim yolu ya da PDF sayfası başvurusu) diskte var mı."""
+    if not source:
+        return False
+    reference = parse_page_reference(source)
+    return os.path.exists(reference[0] if reference else source)
+
+
+def default_disk_cache_dir() -> str:
+    """Platformun önbellek dizinindeki PDF sayfa önbelleği (bulunamazsa çalışma dizini)."""
+    cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(cache_root or '.', DISK_CACHE_DIR_NAME)
+
+
+def _quantize_scale(scale: float) -> float:
+    # Yakın ölçekler aynı önbellek girdisini kullansın
+    return min(MAX_RENDER_SCALE, max(0.25, round(scale * 4) / 4))
+
+
+def _image_from_pixels(result: tuple) -> QImage:
+    # Kopyasız: önbellekteki QImage sarmalayıcısı örnek baytlarına başvuru tutar
+    return qimage_from_samples(*result)
+
+
+class PdfPageRenderer(QObject):
+    """PDF sayfalarını arka planda çizer ve sonuçları LRU önbellekte tutar."""
+
+    rendered = pyqtSignal(str, int)      # PDF yolu, sayfa indeksi (yeni çizim önbellekte)
+    _result = pyqtSignal(object, object)  # işçiden GUI iş parçacığına (kuyruklu): anahtar, çizim/hata
+
+    def __init__(self, cache_bytes: int = DEFAULT_CACHE_BYTES, parent=None):
+        super().__init__(parent)
+        self.cache_bytes = cache_bytes
+        # Kalıcı disk önbelleği; disk_cache_bytes 0 ise kullanılmaz
+        self.disk_cache_dir: Optional[str] = default_disk_cache_dir()
+        self.disk_cache_bytes = pdf_render_cache.DEFAULT_CACHE_MB * 1024 * 1024
+        self._cache: 'OrderedDict[tuple, QImage]' = OrderedDict()
+        self._cached_bytes = 0
+        self._pending: Dict[tuple, Future] = {}
+        self._page_sizes: Dict[Tuple[str, int], QSize] = {}
+        self._executor = None
+        self._result.connect(self._on_result)
+
+    # --- Sayfa Boyutu --- #
+    def page_size(self, pdf_path: str, page_index: int) -> Optional[QSize]:
+        """Sayfanın canvas boyutu (BASE_DPI'da piksel); sayfa çizilmeden okunur."""
+        key = (pdf_path, page_index)
+        size = self._page_sizes.get(key)
+        if size is None:
+            try:
+                size = QSize(*pdf_helper.get_page_pixel_size(pdf_path, page_index, BASE_DPI))
+            except Exception as e:
+                logging.error(f"PdfPageRenderer: Sayfa boyutu okunamadı ({pdf_path}, sayfa {page_index + 1}): {e}")
+                return None
+            self._page_sizes[key] = size
+        return QSize(size)
+
+    # --- Çizim --- #
+    def request(self, pdf_path: str, page_index: int, scale: float) -> Optional[QImage]:
+        """Önbellekteki çizimi döndürür; yoksa çizimi kuyruğa alır ve None döndürür.
+
+        Args:
+            scale: Sayfa koordinatlarının (BASE_DPI) kaç katı çözünürlükte çizileceği
+                (ör. cihaz piksel oranı).
+        """
+        key = (pdf_path, page_index, _quantize_scale(scale))
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            return image
+        if key not in self._pending:
+            self._submit(key)
+        return None
+
+    def render_now(self, pdf_path: str, page_index: int, scale: float = 1.0) -> Optional[QImage]:
+        """Tüm sayfayı bu iş parçacığında çizer (ör. dışa aktarma); önbellekte varsa onu döndürür."""
+        key = (pdf_path, page_index, _quantize_scale(scale))
+        image = self._cache.get(key)
+        if image is None:
+            try:
+                image = _image_from_pixels(pdf_render_cache.render_page_cached(
+                    self.disk_cache_dir, self.disk_cache_bytes, pdf_path, page_index, key[2] * BASE_DPI))
+            except Exception as e:
+                logging.error(f"PdfPageRenderer: Sayfa çizilemedi ({pdf_path}, sayfa {page_index + 1}): {e}")
+                return None
+            self._store(key, image)
+        return image
+
+    def _submit(self, key: tuple):
+        if self._executor is None:
+            workers = min(MAX_RENDER_WORKERS, max(1, spare_cpu_count()))
+            self._executor = create_process_pool(workers, preload=['helpers.pdf_helper', 'utils.pdf_render_cache'])
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-render')
+        pdf_path, page_index, scale = key
+        future = self._executor.submit(pdf_render_cache.render_page_cached, self.disk_cache_dir, self.disk_cache_bytes,
+                                       pdf_path, page_index, scale * BASE_DPI)
+        self._pending[key] = future
+        future.add_done_callback(lambda f, k=key: self._deliver(k, f))
+
+    def _deliver(self, key: tuple, future: Future):
+        # Havuzun iş parçacığında çağrılır
+        if future.cancelled():
+            return
+        error = future.exception()
+        try:
+            self._result.emit(key, error if error is not None else future.result())
+        except RuntimeError:
+            pass  # Çizici bu arada silinmiş (kapanış)
+
+    def _on_result(self, key: tuple, result):
+        if self._pending.pop(key, None) is None:
+            return  # shutdown sonrası
+        if isinstance(result, Exception):
+            logging.error(f"PdfPageRenderer: Sayfa çizilemedi ({key[0]}, sayfa {key[1] + 1}): {result}")
+            if isinstance(result, BrokenExecutor):
+                self._reset_executor()
+            return
+        self._store(key, _image_from_pixels(result))
+        self.rendered.emit(key[0], key[1])
+
+    def _store(self, key: tuple, image: QImage):
+        self._cache[key] = image
+        self._cached_bytes += image.sizeInBytes()
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            _old_key, old_image = self._cache.popitem(last=False)
+            self._cached_bytes -= old_image.sizeInBytes()
+
+    def _reset_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def set_disk_cache(self, directory: Optional[str], max_bytes: int):
+        """Disk önbelleğinin yerini ve boyut sınırını ayarlar (max_bytes 0 ise kapalı)."""
+        self.disk_cache_dir = directory
+        self.disk_cache_bytes = max(0, int(max_bytes))
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    def shutdown(self):
+        """Bekleyen çizimleri iptal eder ve işçileri kapatır (uygulama kapanırken)."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._reset_executor()
+        self.clear_cache()
+        pdf_helper.close_cached_documents()
+
+
+_renderer: Optional[PdfPageRenderer] = None
+
+
+def get_pdf_page_renderer() -> PdfPageRenderer:
+    """Uygulama genelindeki PDF sayfa çizicisi."""
+    global _renderer
+    if _renderer is None:
+        _renderer = PdfPageRenderer()
+    return _renderer
+
+
+def shutdown_pdf_page_renderer():
+    global _renderer
+    if _renderer is not None:
+        _renderer.shutdown()
+        _renderer = None
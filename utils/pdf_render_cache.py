@@ -0,0 +1,160 @@
+# utils/pdf_render_cache.py
+"""Çizilmiş PDF sayfaları için kalıcı disk önbelleği.
+
+Girdiler (PDF içerik özeti, sayfa indeksi, DPI, clip) ile anahtarlanır;
+aynı PDF yeniden açıldığında veya içe aktarıldığında (başka bir yolda olsa
+bile) sayfalar yeniden çizilmez. Toplam boyut sınırı aşıldığında en uzun
+süredir kullanılmayan girdiler silinir (kullanım zamanı dosyanın mtime'ı).
+
+Modül Qt kullanmaz; önbellek okuma/yazma çizimle birlikte süreç havuzundaki
+işçilerde yapılır (bkz. utils/pdf_page_renderer.py).
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import zlib
+from typing import Dict, Optional, Tuple
+
+from helpers import pdf_helper
+
+CACHE_MAGIC = b'DNDP'
+CACHE_HEADER = struct.Struct('<4sIII')  # sihirli baytlar, genişlik, yükseklik, satır uzunluğu
+CACHE_SUFFIX = '.pgc'
+DEFAULT_CACHE_MB = 512
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Süreç başına: (yol, boyut, mtime_ns) -> içerik özeti
+_content_hashes: Dict[Tuple[str, int, int], str] = {}
+# Süreç başına: dizin -> yaklaşık toplam boyut (ilk kullanımda taranır)
+_directory_sizes: Dict[str, int] = {}
+
+
+def pdf_content_hash(pdf_path: str) -> str:
+    """PDF dosyasının içerik özeti; dosya değişmedikçe süreç başına bir kez hesaplanır."""
+    stat = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+    digest = _content_hashes.get(key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        digest = _content_hashes[key] = hasher.hexdigest()[:32]
+    return digest
+
+
+def cache_file_name(content_hash: str, page_index: int, dpi: float, clip: Optional[tuple]) -> str:
+    clip_part = 'full' if clip is None else '_'.join(f"{value:g}" for value in clip)
+    return f"{content_hash}-p{page_index}-{dpi:g}dpi-{clip_part}{CACHE_SUFFIX}"
+
+
+def read_entry(path: str) -> Optional[tuple]:
+    """Önbellek girdisini okur ((genişlik, yükseklik, satır uzunluğu, RGB baytları)); yoksa/bozuksa None."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, width, height, stride = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC:
+            return None
+        samples = zlib.decompress(data[CACHE_HEADER.size:])
+        if len(samples) != stride * height:
+            return None
+        os.utime(path)  # LRU: kullanım zamanı
+        return width, height, stride, samples
+    except FileNotFoundError:
+        return None
+    except (OSError, struct.error, zlib.error) as e:
+        logging.warning(f"PDF sayfa önbelleği girdisi okunamadı: {path} - {e}")
+        return None
+
+
+def write_entry(cache_dir: str, path: str, result: tuple, max_bytes: int):
+    """Girdiyi atomik olarak yazar ve gerekirse eski girdileri siler."""
+    width, height, stride, samples = result
+    payload = CACHE_HEADER.pack(CACHE_MAGIC, width, height, stride) + zlib.compress(samples, 1)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.warning(f"PDF sayfa önbelleğine yazılamadı: {path} - {e}")
+        return
+    total = _directory_sizes.get(cache_dir)
+    total = directory_size(cache_dir) if total is None else total + len(payload)
+    _directory_sizes[cache_dir] = total
+    if total > max_bytes:
+        _directory_sizes[cache_dir] = evict(cache_dir, max_bytes)
+
+
+def directory_size(cache_dir: str) -> int:
+    total = 0
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    try:
+                        total += entry.stat().st_size
+                    except FileNotFoundError:
+                        pass
+    except FileNotFoundError:
+        pass
+    return total
+
+
+def evict(cache_dir: str, max_bytes: int) -> int:
+    """En eski girdileri, toplam boyut sınırın %80'ine inene dek siler; kalan boyutu döndürür.
+
+    Birden çok işçi aynı anda silebilir; bulunamayan dosyalar yok sayılır.
+    """
+    files = []
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except FileNotFoundError:
+        return 0
+    total = sum(size for _mtime, size, _path in files)
+    target = int(max_bytes * 0.8)
+    removed = 0
+    for _mtime, size, path in sorted(files):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"PDF sayfa önbelleği girdisi silinemedi: {path} - {e}")
+            continue
+        total -= size
+    logging.debug(f"PDF sayfa önbelleği: {removed} girdi silindi, kalan {total} bayt.")
+    return total
+
+
+def render_page_cached(cache_dir: Optional[str], max_bytes: int, pdf_path: str, page_index: int,
+                       dpi: float, clip: Optional[tuple] = None) -> tuple:
+    """Sayfayı önbellekten okur ya da çizip önbelleğe yazar (süreç havuzunda çalıştırılabilir).
+
+    Args:
+        cache_dir: Önbellek dizini; None ise önbellek kullanılmaz.
+        dpi: Çizim çözünürlüğü; clip punto cinsinden (x0, y0, x1, y1).
+    """
+    if not cache_dir or max_bytes <= 0:
+        return pdf_helper.render_page_pixels(pdf_path, page_index, dpi / 72.0, clip)
+    path = os.path.join(cache_dir, cache_file_name(pdf_content_hash(pdf_path), page_index, dpi, clip))
+    result = read_entry(path)
+    if result is None:
+        result = pdf_helper.render_page_pixels(pdf_path, page_index, dpi / 72.0, clip)
+        write_entry(cache_dir, path, result, max_bytes)
+    return result
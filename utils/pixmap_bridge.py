@@ -0,0 +1,63 @@
+# utils/pixmap_bridge.py
+"""PyMuPDF (fitz) pixmap'ları ile Qt resimleri arasında ham piksel aktarımı.
+
+PNG kodlama/çözme yapılmaz: fitz örnekleri doğru satır uzunluğu ve biçimle
+QImage olarak sarılır; ters yönde resim doğrudan fitz.Pixmap'ın örnek
+belleğine çizilir.
+"""
+
+import logging
+from typing import Optional, Union
+
+from PyQt6 import sip
+from PyQt6.QtGui import QImage, QPainter, QPixmap
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+def qimage_from_samples(width: int, height: int, stride: int, samples: bytes, alpha: bool = False) -> QImage:
+    """fitz örneklerini (RGB ya da RGBA) kopyalamadan QImage olarak sarar.
+
+    PyQt, QImage sarmalayıcısı yaşadıkça samples nesnesine başvuru tutar;
+    QImage'ın C++ tarafında ayrıca saklanacağı yerlerde (ör. başka bir
+    iş parçacığına aktarım) copy() kullanılmalıdır. MuPDF saydamlığı önceden
+    çarpılmış (premultiplied) tuttuğundan RGBA örnekleri o biçimde sarılır.
+    """
+    image_format = QImage.Format.Format_RGBA8888_Premultiplied if alpha else QImage.Format.Format_RGB888
+    return QImage(samples, width, height, stride, image_format)
+
+
+def qimage_from_fitz_pixmap(pix: 'fitz.Pixmap') -> QImage:
+    """fitz.Pixmap'tan QImage; örnekler bir kez kopyalanır (pixmap serbest bırakılabilir)."""
+    if pix.n - pix.alpha != 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)  # Gri/CMYK -> RGB
+    return qimage_from_samples(pix.width, pix.height, pix.stride, pix.samples, bool(pix.alpha))
+
+
+def fitz_pixmap_from_qimage(image: Union[QImage, QPixmap]) -> Optional['fitz.Pixmap']:
+    """QImage (veya QPixmap) içeriğinden fitz.Pixmap oluşturur; saydamlık varsa korunur.
+
+    Boş bir fitz.Pixmap ayrılır ve resim QPainter ile doğrudan pixmap'ın
+    örnek belleğine çizilir (biçim dönüşümü tek geçişte, ara kopya yok).
+    MuPDF saydamlığı önceden çarpılmış (premultiplied) tutar.
+    """
+    if not PYMUPDF_AVAILABLE:
+        logging.error("fitz_pixmap_from_qimage: PyMuPDF bulunamadı.")
+        return None
+    if isinstance(image, QPixmap):
+        image = image.toImage()
+    if image.isNull():
+        return None
+    alpha = image.hasAlphaChannel()
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, image.width(), image.height()), alpha)
+    target_format = QImage.Format.Format_RGBA8888_Premultiplied if alpha else QImage.Format.Format_RGB888
+    target = QImage(sip.voidptr(pix.samples_ptr), pix.width, pix.height, pix.stride, target_format)
+    painter = QPainter(target)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return pix
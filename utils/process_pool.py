@@ -0,0 +1,41 @@
+# utils/process_pool.py
+"""Qt uygulamasından güvenle süreç havuzu oluşturma yardımcıları.
+
+Çalışan bir Qt uygulamasını çatallamak (fork) güvenli değildir; işçiler
+POSIX'te 'forkserver' ile yalnızca gerekli modülleri yükleyen temiz bir
+süreçten, diğer sistemlerde 'spawn' ile başlatılır. Paketlenmiş (frozen)
+Windows sürümünde main.py'deki multiprocessing.freeze_support() gereklidir.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+
+def spare_cpu_count() -> int:
+    """Ana (GUI) iş parçacığına bir çekirdek bırakıldığında kalan çekirdek sayısı."""
+    return max(0, (os.cpu_count() or 1) - 1)
+
+
+def create_process_pool(max_workers: int, preload: Sequence[str] = ()) -> Optional[ProcessPoolExecutor]:
+    """Süreç havuzu oluşturur; oluşturulamazsa None (çağıran sırayla/iş parçacığında çalışmalı).
+
+    Args:
+        max_workers: İşçi süreç sayısı.
+        preload: forkserver'da önceden yüklenecek (Qt'siz) modüller; işçi
+            başlatma süresini kısaltır. forkserver süreç başına bir kez
+            başlatıldığından yalnızca ilk oluşturulan havuzun listesi geçerlidir.
+    """
+    try:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            if preload:
+                context.set_forkserver_preload(list(preload))
+        else:
+            context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    except (OSError, ValueError, NotImplementedError) as e:
+        logging.warning(f"Süreç havuzu oluşturulamadı: {e}")
+        return None
@@ -0,0 +1,232 @@
+# utils/stroke_input.py
+"""Kalem girdisi ön işleme aşaması (tabletEvent ile araç handler'ları arasında).
+
+200-500 Hz tabletler neredeyse aynı noktaları çok sık gönderir. Bu modül her
+örneği sırasıyla şu adımlardan geçirir:
+  1. Tekrar eden (çakışık) örneklerin atılması
+  2. İsteğe bağlı yumuşatma (one-euro veya Kalman filtresi)
+  3. Mesafe/açı tabanlı seyreltme (decimation)
+ve vuruş başına alınan / tutulan nokta sayılarını raporlar.
+
+Mesafeler ekran pikseli cinsinden ayarlanır, zoom'a bölünerek dünya
+koordinatına çevrilir; böylece yakınlaştırılmış sayfada daha fazla detay
+korunur.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QPointF
+
+# Varsayılan ayarlar (settings.json içindeki 'pen_input_filter' anahtarı ile ezilir)
+DEFAULT_INPUT_FILTER_SETTINGS = {
+    "enabled": True,
+    "smoothing": "none",          # 'none', 'one_euro' veya 'kalman'
+    "min_distance_px": 1.5,       # Yön değişiminde bile bundan yakın noktalar atılır
+    "max_distance_px": 6.0,       # Düz giderken en fazla bu kadar aralıkla nokta tutulur
+    "angle_threshold_deg": 8.0,   # Bu açıdan fazla yön değişiminde nokta tutulur
+    "duplicate_epsilon_px": 0.05, # Bundan yakın ardışık örnekler tekrar sayılır
+    "one_euro_min_cutoff": 1.0,
+    "one_euro_beta": 0.02,
+    "one_euro_d_cutoff": 1.0,
+    "kalman_process_noise": 0.05,
+    "kalman_measurement_noise": 0.5,
+}
+
+
+class _LowPass:
+    """Üstel düşük geçiren filtre (one-euro için yardımcı)."""
+    def __init__(self):
+        self.value: Optional[float] = None
+
+    def apply(self, x: float, alpha: float) -> float:
+        self.value = x if self.value is None else alpha * x + (1.0 - alpha) * self.value
+        return self.value
+
+
+class OneEuroFilter:
+    """Tek eksenli one-euro filtresi (Casiez vd.). Yavaşta titremeyi, hızlıda gecikmeyi azaltır."""
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.02, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x = _LowPass()
+        self._dx = _LowPass()
+        self._last_t: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x: float, t: float) -> float:
+        if self._last_t is None or self._x.value is None:
+            self._last_t = t
+            self._dx.value = 0.0
+            return self._x.apply(x, 1.0)
+        dt = max(t - self._last_t, 1e-4)
+        self._last_t = t
+        dx = (x - self._x.value) / dt
+        edx = self._dx.apply(dx, self._alpha(self.d_cutoff, dt))
+        cutoff = self.min_cutoff + self.beta * abs(edx)
+        return self._x.apply(x, self._alpha(cutoff, dt))
+
+
+class ScalarKalmanFilter:
+    """Tek eksenli basit (rastgele yürüyüş modelli) Kalman filtresi."""
+    def __init__(self, process_noise: float = 0.05, measurement_noise: float = 0.5):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.x: Optional[float] = None
+        self.p = 1.0
+
+    def filter(self, z: float, t: float = 0.0) -> float:
+        if self.x is None:
+            self.x = z
+            return z
+        self.p += self.q
+        k = self.p / (self.p + self.r)
+        self.x += k * (z - self.x)
+        self.p *= (1.0 - k)
+        return self.x
+
+
+class StrokeInputProcessor:
+    """Bir kalem vuruşunun ham örneklerini filtreleyip seyrelten işlemci.
+
+    Kullanım: begin() -> her örnek için add() -> finish(). add() ve finish()
+    vuruş tamponuna eklenecek noktaları döndürür.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = dict(DEFAULT_INPUT_FILTER_SETTINGS)
+        if settings:
+            self.apply_settings(settings)
+        self._reset_stroke_state()
+        self.last_stats: Dict[str, Any] = {}
+
+    def apply_settings(self, settings: Dict[str, Any]):
+        """Ayarları günceller (bilinmeyen anahtarlar yok sayılır)."""
+        for key, value in settings.items():
+            if key in DEFAULT_INPUT_FILTER_SETTINGS and value is not None:
+                self.settings[key] = value
+
+    def _reset_stroke_state(self):
+        self._filters = None
+        self._last_raw: Optional[QPointF] = None
+        self._last_kept: Optional[QPointF] = None
+        self._prev_kept: Optional[QPointF] = None
+        self._pending: Optional[QPointF] = None
+        self._scale = 1.0
+        self.received = 0
+        self.kept = 0
+        self.duplicates = 0
+
+    def _make_filters(self):
+        mode = self.settings.get('smoothing', 'none')
+        if mode == 'one_euro':
+            args = (self.settings['one_euro_min_cutoff'], self.settings['one_euro_beta'], self.settings['one_euro_d_cutoff'])
+            return OneEuroFilter(*args), OneEuroFilter(*args)
+        if mode == 'kalman':
+            args = (self.settings['kalman_process_noise'], self.settings['kalman_measurement_noise'])
+            return ScalarKalmanFilter(*args), ScalarKalmanFilter(*args)
+        return None
+
+    def begin(self, pos: QPointF, zoom: float = 1.0, timestamp: Optional[float] = None) -> List[QPointF]:
+        """Yeni bir vuruş başlatır; ilk nokta her zaman tutulur."""
+        self._reset_stroke_state()
+        # Ekran pikseli -> dünya birimi (zoom arttıkça tolerans küçülür)
+        self._scale = 1.0 / zoom if zoom and zoom > 0 else 1.0
+        self._filters = self._make_filters()
+        self.received = 1
+        point = self._smooth(pos, timestamp)
+        self._last_raw = QPointF(pos)
+        self._keep(point)
+        return [point]
+
+    def _smooth(self, pos: QPointF, timestamp: Optional[float]) -> QPointF:
+        if not self._filters:
+            return QPointF(pos)
+        t = timestamp if timestamp is not None else time.monotonic()
+        fx, fy = self._filters
+        return QPointF(fx.filter(pos.x(), t), fy.filter(pos.y(), t))
+
+    def _keep(self, point: QPointF):
+        self._prev_kept = self._last_kept
+        self._last_kept = point
+        self._pending = None
+        self.kept += 1
+
+    def add(self, pos: QPointF, timestamp: Optional[float] = None) -> List[QPointF]:
+        """Bir örneği işler; tutulursa [nokta], atılırsa [] döndürür."""
+        if self._last_kept is None:
+            return self.begin(pos, 1.0 / self._scale, timestamp)
+        self.received += 1
+        if not self.settings.get('enabled', True):
+            self._keep(QPointF(pos))
+            return [self._last_kept]
+
+        # 1. Tekrar eden örnekler
+        eps = self.settings['duplicate_epsilon_px'] * self._scale
+        if self._last_raw is not None and abs(pos.x() - self._last_raw.x()) <= eps and abs(pos.y() - self._last_raw.y()) <= eps:
+            self.duplicates += 1
+            return []
+        self._last_raw = QPointF(pos)
+
+        # 2. Yumuşatma
+        point = self._smooth(pos, timestamp)
+
+        # 3. Mesafe / açı tabanlı seyreltme
+        dx = point.x() - self._last_kept.x()
+        dy = point.y() - self._last_kept.y()
+        dist = math.hypot(dx, dy)
+        if dist < self.settings['min_distance_px'] * self._scale:
+            self._pending = point
+            return []
+        keep = dist >= self.settings['max_distance_px'] * self._scale
+        if not keep and self._prev_kept is not None:
+            px = self._last_kept.x() - self._prev_kept.x()
+            py = self._last_kept.y() - self._prev_kept.y()
+            prev_len = math.hypot(px, py)
+            if prev_len > 1e-9:
+                cos_a = (px * dx + py * dy) / (prev_len * dist)
+                angle = math.degrees(math.acos(max(-1.0, min(1.0, cos_a))))
+                keep = angle >= self.settings['angle_threshold_deg']
+        if keep:
+            self._keep(point)
+            return [point]
+        self._pending = point
+        return []
+
+    def finish(self, pos: Optional[QPointF] = None, timestamp: Optional[float] = None) -> List[QPointF]:
+        """Vuruşu bitirir; uç noktanın kaybolmaması için son örneği ekler ve istatistikleri kaydeder."""
+        tail: List[QPointF] = []
+        if pos is not None and self._last_kept is not None:
+            tail.extend(self.add(pos, timestamp))
+        if self._pending is not None:
+            tail.append(self._pending)
+            self._keep(self._pending)
+        if pos is not None and self._filters and self._last_kept is not None:
+            # Filtre gecikmesi uç noktayı kaydırmasın: vuruş ham bırakma noktasında biter
+            eps = self.settings['duplicate_epsilon_px'] * self._scale
+            if abs(pos.x() - self._last_kept.x()) > eps or abs(pos.y() - self._last_kept.y()) > eps:
+                tail.append(QPointF(pos))
+                self._keep(tail[-1])
+        self.last_stats = self.stats()
+        if self.received:
+            logging.debug(
+                f"StrokeInputProcessor: alınan={self.received}, tutulan={self.kept}, "
+                f"tekrar={self.duplicates}, oran={self.last_stats['reduction']:.1f}x"
+            )
+        return tail
+
+    def stats(self) -> Dict[str, Any]:
+        """Alınan / tutulan nokta istatistiklerini döndürür."""
+        return {
+            'received': self.received,
+            'kept': self.kept,
+            'duplicates': self.duplicates,
+            'reduction': (self.received / self.kept) if self.kept else 1.0,
+        }
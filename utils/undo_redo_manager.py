@@ -13,14 +13,23 @@ class UndoRedoManager(QObject):
     can_undo_changed = pyqtSignal(bool)
     can_redo_changed = pyqtSignal(bool)
     content_modified = pyqtSignal() # İçerik değiştiğinde yayınlanır
+    command_applied = pyqtSignal(str, object) # YENİ: ('execute'|'undo'|'redo', komut) - işlem günlüğü için
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.undo_stack = []
         self.redo_stack = []
         self._is_processing = False # YENİ: İşlem devam ediyor mu bayrağı
+        # YENİ: Sayfa verisini o an tutan canvas (Page ayarlar); widget'ı yeniden oluşturulan
+        # sayfada eski komutlar geri alınırken bu canvas'a yönlendirilir
+        self.canvas = None
         logging.info("UndoRedoManager başlatıldı.")
 
+    def _retarget(self, command: Command):
+        """Komutu sayfanın güncel canvas'ına yönlendirir (komut oluşturulduktan sonra canvas değişmiş olabilir)."""
+        if self.canvas is not None and hasattr(command, 'canvas'):
+            command.canvas = self.canvas
+
     def execute(self, command: Command):
         """Yeni bir komutu çalıştırır ve undo yığınına ekler."""
         if self._is_processing: # Ekleme: Eğer işlem devam ediyorsa yeni komut ekleme
@@ -40,6 +49,7 @@ class UndoRedoManager(QObject):
             self._emit_stack_signals()
             #logging.debug(f"Komut yürütüldü ve undo yığınına eklendi: {type(command).__name__}")
             self.content_modified.emit() # İçerik değişti
+            self.command_applied.emit('execute', command)
             return True
         except Exception as e:
             #logging.error(f"Komut execute edilirken hata oluştu: {type(command).__name__} - {e}")
@@ -68,6 +78,7 @@ class UndoRedoManager(QObject):
         try:
             command = self.undo_stack.pop()
             command_type_name = type(command).__name__
+            self._retarget(command)
             # YENİ LOG
             # logging.debug(f"UndoRedoManager.undo: Komut YIĞINDAN ALINDI: {command_type_name}. Canvas.shapes id={id(command.canvas.shapes)}, içerik={command.canvas.shapes}")
             
@@ -89,6 +100,7 @@ class UndoRedoManager(QObject):
                 self._emit_stack_signals()
                 # logging.debug(f"Komut {command_type_name} geri alındı (başarı={command_undone_successfully}) ve redo yığınına eklendi.")
                 self.content_modified.emit()
+                self.command_applied.emit('undo', command_to_redo)
             
             self._is_processing = False
 
@@ -107,6 +119,7 @@ class UndoRedoManager(QObject):
             command = self.redo_stack.pop()
             command_type_name = type(command).__name__
             # logging.debug(f"Redo: Popped command {command_type_name} from redo_stack.")
+            self._retarget(command)
             command.execute()
             command_redone_successfully = True # Varsayım
             command_to_undo = command
@@ -119,6 +132,7 @@ class UndoRedoManager(QObject):
                  self._emit_stack_signals()
                 #  logging.debug(f"Komut {command_type_name} yeniden uygulandı (başarı={command_redone_successfully}) ve undo yığınına eklendi.")
                  self.content_modified.emit()
+                 self.command_applied.emit('redo', command_to_undo)
                  
             self._is_processing = False
 